@@ -66,16 +66,40 @@ INSTALLED_APPS = [
 CACHE_DIR = BASE_DIR / 'django_cache'
 CACHE_DIR.mkdir(exist_ok=True)
 
+# 캐시 2단 — default는 워커별 메모리 L1(pricehub/tiered_cache.py)이고, L1_PREFIXES에 맞는
+# 작고 자주 읽는 키만 L1에 {접두사: TTL초} 동안 둔다. 나머지 키와 L1 미스는 shared로 간다.
+# shared는 워커 간 공유 캐시 — SQLite(WAL) 파일 하나(pricehub/sqlite_cache.py). 만료는
+# 인덱스로, 한도(개수/전체 크기)를 넘으면 가장 오래 안 쓴 항목부터 지운다.
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
-        'LOCATION': str(CACHE_DIR),
+        'BACKEND': 'pricehub.tiered_cache.TieredCache',
+        'LOCATION': 'shared',
+        'OPTIONS': {
+            'L1_PREFIXES': {
+                'card-controltower:token:': 60,
+                'card-controltower:sale-status:': 30,
+                'card-controltower:cards-fetched-at:': 30,
+                'cardlist:ver:': 30,
+                'api-key:version': 30,
+                'purchase:rarity-prices:': 60,
+            },
+            'L1_MAX_ENTRIES': 1000,
+            'L1_VERSION_CHECK': 1,  # 다른 워커가 쓴 값이 이 워커 L1에 보이기까지 최대 초
+        },
+    },
+    'shared': {
+        'BACKEND': 'pricehub.sqlite_cache.SQLiteCache',
+        'LOCATION': str(CACHE_DIR / 'cache.sqlite3'),
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+            'MAX_SIZE': 512 * 1024 * 1024,  # 바이트(pickle 크기 합)
+        },
     }
 }
 
 # DRF — 외부 연동 API(Authorization: Api-Key ...)에 기본 레이트리밋 적용.
-# 위 CACHES(파일 기반, 워커 간 공유)를 그대로 사용하므로 워커 수와 무관하게
-# 정확한 전역 한도가 적용된다.
+# 한도 상태는 워커 간 공유 SQLite 파일(아래 API_THROTTLE_DB)의 토큰 버킷이라 워커 수와
+# 무관하게 정확한 전역 한도가 적용된다.
 REST_FRAMEWORK = {
     'DEFAULT_THROTTLE_CLASSES': [
         'pricehub.throttling.APIKeyRateThrottle',
@@ -85,6 +109,14 @@ REST_FRAMEWORK = {
     },
 }
 
+# API Key 요청 한도(토큰 버킷) 상태를 두는 SQLite 파일 — 워커 간 공유(pricehub/rate_limit.py).
+# 비어 있으면 CACHE_DIR/throttle.sqlite3.
+API_THROTTLE_DB = os.getenv('API_THROTTLE_DB', '')
+
+# manage.py test — 요청 한도 상태 파일(API_THROTTLE_DB)을 실행마다 임시 파일로 돌린다
+# (pricehub/test_runner.py). 운영 django_cache/ 파일을 건드리지 않게.
+TEST_RUNNER = 'pricehub.test_runner.TestRunner'
+
 # pricesite(공개 가격 검색 사이트)가 pricehub REST API를 호출할 때 쓰는 서버 간
 # 인증 정보. 같은 서버에서 도는 동안엔 localhost로 호출하지만, 추후 pricesite가
 # 별도 프로젝트/도메인으로 분리돼도 이 두 값만 바꾸면 그대로 동작한다.
@@ -108,6 +140,17 @@ CARD_CONTROLTOWER_STORES = {
     },
 }
 
+# 판매가 변경 아웃박스 웹훅 — PriceHub 판매가가 바뀌면 dispatch_price_changes 명령이 여기로
+# 변경분만 묶어서 보낸다(pricehub/price_outbox.py). 비어 있으면 기록만 하고 보내지 않는다.
+# SECRET이 있으면 본문 HMAC-SHA256 서명을 X-PriceHub-Signature 헤더로 붙인다.
+PRICE_CHANGE_WEBHOOK_URL = os.getenv('PRICE_CHANGE_WEBHOOK_URL', '')
+PRICE_CHANGE_WEBHOOK_SECRET = os.getenv('PRICE_CHANGE_WEBHOOK_SECRET', '')
+
+# pricesite 공개 카탈로그 페이지를 미리 만들어둘 위치(nginx root) — sync_catalog가 끝날 때마다
+# 다시 만들고 이 경로의 심볼릭 링크를 새 빌드로 바꾼다(pricesite/static_build.py).
+# 비어 있으면 만들지 않고 전부 Django가 그때그때 렌더링한다.
+PRICESITE_STATIC_DIR = os.getenv('PRICESITE_STATIC_DIR', '')
+
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
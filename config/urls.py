@@ -25,6 +25,9 @@ urlpatterns = [
     # 매입리스트
     path('api/purchase-lists/', include(api_urls.purchase_list_urlpatterns)),
 
+    # 전 게임 통합 카드 검색 / 상품코드 조회
+    path('api/cards/', include(api_urls.unified_card_urlpatterns)),
+
     # REST API — 개발자용
     path('api/pokemon/kr/',  include('pricehub.api_urls',               namespace='pokemon_kr')),
     path('api/onepiece/kr/', include(api_urls.onepiece_kr_urlpatterns)),
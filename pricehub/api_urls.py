@@ -15,7 +15,9 @@ def _tcg_api_urls(views):
     views 딕셔너리 keys:
         expansion_list, expansion_detail, expansion_card_list,
         card_search, card_detail (optional),
-        card_by_product_code, card_bulk_by_product_code (optional),
+        card_by_product_code, card_bulk_by_product_code (optional), card_changes (optional),
+        card_export (optional),
+        card_price_snapshots (optional),
         price_latest (optional), price_summary (optional)
     """
     patterns = [
@@ -35,6 +37,18 @@ def _tcg_api_urls(views):
             path('cards/bulk-by-product-code/',
                  views['card_bulk_by_product_code'], name='card-bulk-by-product-code')
         )
+    if 'card_changes' in views:
+        patterns.append(
+            path('cards/changes/', views['card_changes'], name='card-changes')
+        )
+    if 'card_export' in views:
+        patterns.append(
+            path('cards/export.ndjson', views['card_export'], name='card-export')
+        )
+    if 'card_price_snapshots' in views:
+        patterns.append(
+            path('cards/price-snapshots/', views['card_price_snapshots'], name='card-price-snapshots')
+        )
     if 'card_detail' in views:
         patterns.append(
             path('cards/<int:pk>/', views['card_detail'].as_view(), name='card-detail')
@@ -68,6 +82,9 @@ _pokemon_kr_views = {
     'card_detail':          api_views.CardDetailView,
     'card_by_product_code': api_views.card_by_product_code,
     'card_bulk_by_product_code': api_views.card_bulk_by_product_code,
+    'card_changes':         api_views.card_changes,
+    'card_export':          api_views.card_export,
+    'card_price_snapshots': api_views.card_price_snapshots,
     'price_latest':         api_views.LatestNaverPriceListView,
     'price_summary':        api_views.price_collection_summary,
     'price_snapshot':       api_views.PokemonPriceSnapshotView,
@@ -81,6 +98,9 @@ _onepiece_kr_views = {
     'card_search':          api_views.OnePieceCardSearchView,
     'card_by_product_code': api_views.onepiece_card_by_product_code,
     'card_bulk_by_product_code': api_views.onepiece_card_bulk_by_product_code,
+    'card_changes':         api_views.onepiece_card_changes,
+    'card_export':          api_views.onepiece_card_export,
+    'card_price_snapshots': api_views.onepiece_card_price_snapshots,
     'price_snapshot':       api_views.OnePiecePriceSnapshotView,
     'price_history':        api_views.OnePiecePriceHistoryView,
 }
@@ -92,6 +112,9 @@ _digimon_kr_views = {
     'card_search':          api_views.DigimonCardSearchView,
     'card_by_product_code': api_views.digimon_card_by_product_code,
     'card_bulk_by_product_code': api_views.digimon_card_bulk_by_product_code,
+    'card_changes':         api_views.digimon_card_changes,
+    'card_export':          api_views.digimon_card_export,
+    'card_price_snapshots': api_views.digimon_card_price_snapshots,
     'price_snapshot':       api_views.DigimonPriceSnapshotView,
     'price_history':        api_views.DigimonPriceHistoryView,
 }
@@ -102,6 +125,8 @@ _pokemon_jp_views = {
     'expansion_card_list':  api_views.JapanCardListView,
     'card_search':          api_views.JapanCardSearchView,
     'card_by_product_code': api_views.japan_card_by_product_code,
+    'card_changes':         api_views.japan_card_changes,
+    'card_export':          api_views.japan_card_export,
     'price_snapshot':       api_views.JapanPriceSnapshotView,
     'price_history':        api_views.JapanPriceHistoryView,
 }
@@ -129,6 +154,20 @@ app_name = 'pokemon_kr'
 urlpatterns = _tcg_api_urls(_pokemon_kr_views) + bulk_price_api_urls('pokemon_kr')
 
 
+# ════════════════════════════════════════════════════════════════
+# 전 게임 통합 카드 검색 / 상품코드 조회 (별도 include)
+# ════════════════════════════════════════════════════════════════
+
+_unified_card_patterns = [
+    path('search/', api_views.unified_card_search, name='unified-card-search'),
+    path('resolve/<str:shop_product_code>/', api_views.card_resolve, name='card-resolve'),
+]
+
+# 프로젝트 루트 urls.py에서 아래처럼 include:
+#   path('api/cards/', include(api_urls.unified_card_urlpatterns)),
+unified_card_urlpatterns = (_unified_card_patterns, 'cards')
+
+
 # ════════════════════════════════════════════════════════════════
 # 매입리스트 (외부 연동용, 별도 include)
 # ════════════════════════════════════════════════════════════════
@@ -12,7 +12,10 @@ TCG 카드 가격 API — API Key 인증 적용.
     GET /api/pokemon/kr/expansions/<code>/cards/
     GET /api/pokemon/kr/cards/<id>/
     GET /api/pokemon/kr/cards/search/
+    GET /api/pokemon/kr/cards/export.ndjson
     GET /api/pokemon/kr/cards/by-product-code/<code>/
+    GET /api/pokemon/kr/cards/changes/?since=<token>
+    GET /api/pokemon/kr/cards/price-snapshots/?ids=1,2,3
     GET /api/pokemon/kr/prices/latest/
     GET /api/pokemon/kr/prices/summary/
 
@@ -21,15 +24,41 @@ TCG 카드 가격 API — API Key 인증 적용.
     GET /api/onepiece/kr/expansions/<code>/
     GET /api/onepiece/kr/expansions/<code>/cards/
     GET /api/onepiece/kr/cards/search/
+    GET /api/onepiece/kr/cards/export.ndjson
     GET /api/onepiece/kr/cards/by-product-code/<code>/
+    GET /api/onepiece/kr/cards/changes/?since=<token>
+    GET /api/onepiece/kr/cards/price-snapshots/?ids=1,2,3
+
+전 게임 통합:
+    GET /api/cards/search/?q=
+    GET /api/cards/resolve/<code>/
+
+조건부 요청: 확장팩 카드 목록·가격 스냅샷·가격 이력은 ETag를 붙인다. 같은 ETag로
+If-None-Match를 보내면 목록 조회/직렬화 없이 304로 끝난다 — 값은 하루 한 번 수집 때만
+바뀌므로 매번 전체를 다시 받을 필요가 없다.
+
+카드 목록/검색은 ?limit=(또는 ?cursor=)을 주면 커서 페이지로 나눠 준다. 카탈로그 전체가
+필요하면 cards/export.ndjson(한 줄에 카드 하나, 스트리밍)을 쓴다.
 """
-from datetime import timedelta
+import base64
+import hashlib
+import json
+import re
+from datetime import datetime, timedelta
 
+from django.http import StreamingHttpResponse
 from django.utils import timezone
-from django.db.models import Count, Max, Subquery, OuterRef
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.text import compress_sequence
+from django.db.models import Count, Max, Q, Subquery, OuterRef
 from rest_framework import generics, filters, status
-from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.decorators import (
+    api_view, authentication_classes, permission_classes, renderer_classes,
+)
+from rest_framework.pagination import CursorPagination
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from django_filters.rest_framework import DjangoFilterBackend
 import django_filters
 
@@ -54,13 +83,16 @@ from .serializers import (
     JapanExpansionListSerializer,
     JapanCardListSerializer,
 )
+from . import list_cache, search_index
 from .authentication import APIKeyAuthentication
 from .permissions import HasAPIKey
+from .purchase_config import GAME_TYPE_CARD_MODEL
 from .views import (
     _PRICE_HISTORY_RANGE_DAYS,
     _calc_stats,
     _jp_latest_prices,
     _jp_price_history_data,
+    _parse_id_list,
     _parse_market_items,
     _price_history_data,
 )
@@ -70,6 +102,37 @@ from .views import (
 # 공통 기반
 # ════════════════════════════════════════════════════════════════
 
+_GAME_TYPE_BY_CARD_MODEL = {model: game_type for game_type, model in GAME_TYPE_CARD_MODEL.items()}
+
+# 조건부 응답 Cache-Control max-age — 이 안에서는 클라이언트가 재검증 없이 재사용
+_CARD_LIST_MAX_AGE = 300
+_PRICE_MAX_AGE = 60
+
+# 카드 상세 가격 이력 개수(price_limit) 기본/최대
+_PRICE_LIMIT_DEFAULT = 30
+_PRICE_LIMIT_MAX = 100
+
+
+def _conditional_response(request, etag_source, build, max_age):
+    """
+    etag_source(데이터 버전을 담은 문자열)의 해시를 ETag로 쓰고, 같은 ETag로 재요청하면
+    build()를 부르지 않고 304로 끝낸다(views.raw_data_json_response와 같은 방식).
+    API Key별 응답이라 공유 캐시에는 못 넣게 private.
+    """
+    etag = '"%s"' % hashlib.md5(etag_source.encode('utf-8')).hexdigest()
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = build()
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=max_age)
+    return response
+
+
+def _latest_price_stamp(card):
+    """카드 가격 행 중 가장 최근 id — 수집이 새 행을 쌓을 때만 바뀐다(인덱스 조회 1번)"""
+    return card.prices.aggregate(latest=Max('id'))['latest']
+
+
 class APIKeyMixin:
     """모든 API 뷰에 공통 인증·권한을 주입하는 Mixin"""
     authentication_classes = [APIKeyAuthentication]
@@ -100,8 +163,31 @@ class ExpansionDetailMixin(APIKeyMixin, generics.RetrieveAPIView):
         return self.expansion_model.objects.annotate(card_count=Count('cards'))
 
 
+class CatalogCursorPagination(CursorPagination):
+    """
+    카드 목록/검색 커서 페이지 — ?limit= 또는 ?cursor=가 있을 때만 나눈다. 없으면 예전처럼
+    배열 전체(기존 클라이언트 호환). 나눌 때 응답은 {"next", "previous", "results"}, 한 페이지
+    기본 500건·최대 1000건. 순서는 ?ordering=과 상관없이 id 순 — 정렬 키가 겹치거나
+    (card_number) 관계 필드(expansion__release_date)면 커서 위치를 잡을 수 없어서다.
+    """
+    ordering = 'id'
+    page_size = 500
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+
+    def get_page_size(self, request):
+        params = request.query_params
+        if self.page_size_query_param not in params and self.cursor_query_param not in params:
+            return None
+        return super().get_page_size(request)
+
+    def get_ordering(self, request, queryset, view):
+        return (self.ordering,)
+
+
 class CardListMixin(APIKeyMixin, generics.ListAPIView):
     """확장팩별 카드 목록 공통 뷰"""
+    pagination_class = CatalogCursorPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['rarity']
     search_fields = ['name', 'card_number']
@@ -110,6 +196,20 @@ class CardListMixin(APIKeyMixin, generics.ListAPIView):
 
     card_model = None
 
+    def list(self, request, *args, **kwargs):
+        # ETag = 요청 URL(필터/정렬/페이지) + 그 확장팩의 목록 캐시 버전(list_cache) — 카드·가격·
+        # 확장팩이 바뀌면 시그널/일괄 작업이 올리는 그 버전이다
+        expansion_model = self.card_model._meta.get_field('expansion').related_model
+        expansion_id = (
+            expansion_model.objects.filter(code=kwargs['code']).values_list('id', flat=True).first()
+        )
+        version = list_cache.current_version(_GAME_TYPE_BY_CARD_MODEL[self.card_model], expansion_id)
+        return _conditional_response(
+            request, f'{request.get_full_path()}|{version}',
+            lambda: super(CardListMixin, self).list(request, *args, **kwargs),
+            _CARD_LIST_MAX_AGE,
+        )
+
     def get_queryset(self):
         return (
             self.card_model.objects
@@ -120,6 +220,7 @@ class CardListMixin(APIKeyMixin, generics.ListAPIView):
 
 class CardSearchMixin(APIKeyMixin, generics.ListAPIView):
     """카드 검색 공통 뷰"""
+    pagination_class = CatalogCursorPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['name', 'card_number', 'expansion__name']
     ordering_fields = ['card_number', 'name', 'expansion__release_date']
@@ -142,6 +243,12 @@ class PriceSnapshotMixin(APIKeyMixin, generics.GenericAPIView):
 
     def get(self, request, pk):
         card = get_object_or_404(self.card_model, pk=pk)
+        return _conditional_response(
+            request, f'snapshot|{card.pk}|{_latest_price_stamp(card)}',
+            lambda: self._snapshot(card), _PRICE_MAX_AGE,
+        )
+
+    def _snapshot(self, card):
         if self.is_japan:
             latest_prices = _jp_latest_prices(card)
             price_values = [int(p.price) for p in latest_prices.values()]
@@ -165,6 +272,13 @@ class PriceHistoryMixin(APIKeyMixin, generics.GenericAPIView):
     def get(self, request, pk):
         card = get_object_or_404(self.card_model, pk=pk)
         range_key = request.query_params.get('range', 'month')
+        # 기간 창이 날마다 밀리므로 날짜도 ETag에 넣는다
+        etag_source = f'history|{card.pk}|{range_key}|{timezone.localdate()}|{_latest_price_stamp(card)}'
+        return _conditional_response(
+            request, etag_source, lambda: self._history(card, range_key), _PRICE_MAX_AGE,
+        )
+
+    def _history(self, card, range_key):
         days = _PRICE_HISTORY_RANGE_DAYS.get(range_key, 30)
         if self.is_japan:
             history = _jp_price_history_data(card, days=days)
@@ -241,6 +355,238 @@ def _card_bulk_by_product_code_view(request, card_model):
     return Response({'results': results})
 
 
+# ════════════════════════════════════════════════════════════════
+# 가격 스냅샷 일괄 — cards/price-snapshots/?ids=1,2,3
+# ════════════════════════════════════════════════════════════════
+# pricesite 카드 목록처럼 한 화면에 카드 100장의 가격 요약이 필요한 곳에서 price-snapshot을
+# 카드마다 부르지 않도록, 요약(min/median/max/count + 수집 시각)만 한 번에 돌려준다.
+# 가격 히스토리를 카드마다 뒤지지 않고 수집 때 갱신되는 캐시 컬럼(latest_raw_data — 마지막
+# 수집 판매처 목록)에서 계산하므로 카드 조회 쿼리 1번으로 끝난다. 통계는 price-snapshot의
+# stats와 같은 기준. latest_raw_data가 있는 한글판 3종만 지원.
+
+_SNAPSHOTS_MAX_IDS = 300
+
+
+def _raw_data_stats(raw):
+    items = raw if isinstance(raw, list) else [raw] if isinstance(raw, dict) and raw else []
+    prices = []
+    for item in items:
+        # 저장된 raw_data에 숫자가 아닌 lprice나 dict가 아닌 항목이 섞여 있으면 건너뛴다(_calc_shop_stats와 같게)
+        try:
+            price = int(float(item.get('lprice', 0) or 0))
+        except (TypeError, ValueError, AttributeError):
+            continue
+        if price > 0:
+            prices.append(price)
+    return _calc_stats(prices)
+
+
+def _card_price_snapshots_view(request, card_model):
+    """
+    GET cards/price-snapshots/?ids=1,2,3 (최대 _SNAPSHOTS_MAX_IDS개)
+    → {"results": {"<id>": {"min", "median", "max", "count", "collected_at"}}}
+
+    없는 id는 빠진다. 수집된 가격이 없는 카드는 값이 전부 null(count는 0).
+    """
+    try:
+        ids = _parse_id_list(request.query_params.get('ids', ''), limit=_SNAPSHOTS_MAX_IDS + 1)
+    except ValueError:
+        return Response({'error': "'ids'는 쉼표로 구분한 카드 ID여야 합니다."},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if not ids:
+        return Response({'error': "'ids'가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(ids) > _SNAPSHOTS_MAX_IDS:
+        return Response({'error': f'한 번에 최대 {_SNAPSHOTS_MAX_IDS}개까지 조회할 수 있습니다.'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    price_model = card_model._meta.get_field('prices').related_model
+    latest_collected = Subquery(
+        price_model.objects.filter(card=OuterRef('pk')).order_by('-collected_at').values('collected_at')[:1]
+    )
+    rows = (
+        card_model.objects.filter(pk__in=ids)
+        .annotate(collected_at=latest_collected)
+        .values_list('id', 'latest_raw_data', 'collected_at')
+    )
+    results = {}
+    for card_id, raw, collected_at in rows:
+        stats = _raw_data_stats(raw)
+        results[str(card_id)] = {
+            'min': stats.get('min'),
+            'median': stats.get('median'),
+            'max': stats.get('max'),
+            'count': stats.get('count', 0),
+            'collected_at': collected_at,
+        }
+    return Response({'results': results})
+
+
+# ════════════════════════════════════════════════════════════════
+# 변경분 동기화 — cards/changes/?since=<token>
+# ════════════════════════════════════════════════════════════════
+# 확장팩 단위 카드 목록이나 상품코드 1,000개씩 bulk 조회로 카탈로그 전체를 다시 받던 걸,
+# 마지막 동기화 이후 바뀐 카드만 받게 한다. 카드의 updated_at(SyncTrackedCard — 카탈로그
+# 필드/판매가/시장가가 실제로 바뀔 때만 올라감, 일괄 update 경로도 같이 올림) 기준
+# (updated_at, id) 키셋 페이지네이션.
+#
+# 토큰은 "여기까지 받았다"는 위치(updated_at, id)를 담은 불투명 문자열. since 없이 부르면
+# 처음부터 전부(첫 전체 동기화), 응답의 next_since를 저장해뒀다가 다음에 그대로 넘기면 된다.
+# has_more가 true면 바로 이어서 다시 부른다.
+#
+# 막 커밋된 트랜잭션은 updated_at이 커밋 시각보다 앞설 수 있다(일괄 작업은 시작할 때 시각을
+# 찍고 몇 초 뒤 커밋). 그 사이에 토큰이 그 시각을 지나가면 그 변경을 영영 놓치므로, 최근
+# _CHANGES_SETTLE 안의 변경은 아직 내보내지 않고 다음 호출에 넘긴다.
+# 카드 삭제는 포함되지 않는다 — 삭제는 드물어서 가끔 하는 전체 동기화로 맞춘다.
+
+_CHANGES_PAGE_SIZE = 500
+_CHANGES_MAX_PAGE_SIZE = 2000
+_CHANGES_SETTLE = timedelta(seconds=60)
+
+
+def _encode_changes_token(updated_at, pk):
+    raw = f'{updated_at.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_changes_token(token):
+    """토큰 → (updated_at, id). 형식이 안 맞으면 ValueError."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        stamp, _, pk = raw.partition('|')
+        updated_at = datetime.fromisoformat(stamp)
+        pk = int(pk)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(token) from e
+    if timezone.is_naive(updated_at):
+        raise ValueError(token)
+    return updated_at, pk
+
+
+def _card_change_dict(card):
+    selling_price = card.selling_price
+    return {
+        'id': card.id,
+        'card_number': card.card_number,
+        'name': card.name,
+        'rarity': card.rarity,
+        'image_url': card.image_url,
+        'selling_price': selling_price if selling_price != 0 else None,
+        'latest_market_price': getattr(card, 'latest_market_price', None),
+        'shop_product_code': card.shop_product_code,
+        'expansion': {
+            'code': card.expansion.code,
+            'name': card.expansion.name,
+        },
+        'updated_at': card.updated_at,
+    }
+
+
+def _card_changes_view(request, card_model):
+    """
+    GET cards/changes/[?since=<token>][&limit=500]
+    → {"results": [...], "next_since": <token>, "has_more": bool}
+
+    결과가 없으면 next_since는 받은 since 그대로(처음이면 null) — 그대로 다시 쓰면 된다.
+    """
+    try:
+        limit = min(int(request.query_params.get('limit', _CHANGES_PAGE_SIZE)), _CHANGES_MAX_PAGE_SIZE)
+    except ValueError:
+        return Response({'error': "'limit'은 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    limit = max(limit, 1)
+
+    since = request.query_params.get('since') or None
+    qs = (
+        card_model.objects.select_related('expansion')
+        .filter(updated_at__lte=timezone.now() - _CHANGES_SETTLE)
+        .order_by('updated_at', 'id')
+    )
+    if since:
+        try:
+            since_at, since_id = _decode_changes_token(since)
+        except ValueError:
+            return Response({'error': "'since' 토큰 형식이 올바르지 않습니다."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        qs = qs.filter(Q(updated_at__gt=since_at) | Q(updated_at=since_at, id__gt=since_id))
+
+    cards = list(qs[:limit + 1])
+    has_more = len(cards) > limit
+    cards = cards[:limit]
+    next_since = _encode_changes_token(cards[-1].updated_at, cards[-1].id) if cards else since
+    return Response({
+        'results': [_card_change_dict(card) for card in cards],
+        'next_since': next_since,
+        'has_more': has_more,
+    })
+
+
+# ════════════════════════════════════════════════════════════════
+# 카드 전체 내보내기 — cards/export.ndjson
+# ════════════════════════════════════════════════════════════════
+# card-controltower/pricesite처럼 카탈로그 전체가 필요한 곳이 카드 수만큼 큰 JSON 배열을
+# 양쪽 메모리에 통째로 만들지 않도록, 한 줄에 카드 하나(NDJSON)씩 흘려보낸다. id 키셋으로
+# _EXPORT_CHUNK건씩 읽고(id > 마지막 id LIMIT n — OFFSET 없음) 목록 API와 같은 직렬화를
+# 청크마다 돌리므로 서버 메모리는 카드 수와 상관없이 청크 하나 분량이다.
+# Accept-Encoding에 gzip이 있으면 청크마다 압축해 보낸다(GZipMiddleware가 스트림에 하는 것과
+# 같은 compress_sequence).
+
+_EXPORT_CHUNK = 500
+_ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Accept: application/x-ndjson 요청이 DRF 콘텐츠 협상에서 406으로 끝나지 않게 — 본문은
+    스트림이 직접 만들고, 이 렌더러는 인증 실패/요청 한도 같은 오류 응답만 한 줄로 쓴다.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (json.dumps(data, cls=JSONEncoder, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def _export_chunks(queryset, serializer_class, context):
+    """id 순 청크마다 NDJSON 줄들을 bytes 하나로"""
+    last_id = 0
+    while True:
+        cards = list(queryset.filter(id__gt=last_id)[:_EXPORT_CHUNK])
+        if not cards:
+            return
+        data = serializer_class(cards, many=True, context=context).data
+        yield ''.join(
+            json.dumps(item, cls=JSONEncoder, ensure_ascii=False) + '\n' for item in data
+        ).encode('utf-8')
+        if len(cards) < _EXPORT_CHUNK:
+            return
+        last_id = cards[-1].id
+
+
+def _card_export_view(request, card_model, serializer_class):
+    """
+    GET cards/export.ndjson[?expansion=<code>][&fields=...]
+    → application/x-ndjson, 줄마다 카드 목록 API의 카드 하나(id 순)
+    """
+    queryset = card_model.objects.select_related('expansion').order_by('id')
+    expansion_code = request.query_params.get('expansion')
+    if expansion_code:
+        queryset = queryset.filter(expansion__code=expansion_code)
+
+    content = _export_chunks(queryset, serializer_class, {'request': request})
+    gzipped = bool(_ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+    response = StreamingHttpResponse(
+        compress_sequence(content) if gzipped else content,
+        content_type='application/x-ndjson; charset=utf-8',
+    )
+    if gzipped:
+        response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 # ════════════════════════════════════════════════════════════════
 # 포켓몬 한글판
 # ════════════════════════════════════════════════════════════════
@@ -261,6 +607,10 @@ class ExpansionDetailView(ExpansionDetailMixin):
     serializer_class = ExpansionDetailSerializer
     expansion_model = Expansion
 
+    def get_queryset(self):
+        # price_stats 요약 행을 같은 쿼리로(OneToOne) — 상세 조회가 카드/가격 수와 상관없이 1번
+        return super().get_queryset().select_related('price_summary')
+
 
 class ExpansionCardListView(CardListMixin):
     """
@@ -278,7 +628,7 @@ class ExpansionCardListView(CardListMixin):
     def get_queryset(self):
         # prices를 통째로 prefetch하지 않는다 — 카드당 가격 이력이 수백 건씩
         # 쌓여 있어(raw_data 포함 용량 큼) 확장팩 전체를 순회할 때 매우
-        # 느려짐. serializer가 카드별로 최신 1건만 인덱스 조회한다.
+        # 느려짐. 최신 1건은 serializer가 목록 전체에 윈도 쿼리 1번으로 붙인다.
         return (
             Card.objects
             .select_related('expansion')
@@ -341,19 +691,37 @@ class CardDetailView(APIKeyMixin, generics.RetrieveAPIView):
 
     def get_serializer_context(self):
         ctx = super().get_serializer_context()
-        ctx['price_limit'] = int(self.request.query_params.get('price_limit', 30))
+        try:
+            limit = int(self.request.query_params.get('price_limit', _PRICE_LIMIT_DEFAULT))
+        except ValueError:
+            limit = _PRICE_LIMIT_DEFAULT
+        ctx['price_limit'] = min(max(limit, 0), _PRICE_LIMIT_MAX)
         return ctx
 
 
+class LatestPriceCursorPagination(CursorPagination):
+    """
+    prices/latest/ 커서 페이지 — 응답 {"next", "previous", "results"}, 다음 페이지는 next URL
+    그대로. 한 페이지 기본 200건, ?limit=으로 최대 1000건까지.
+    """
+    ordering = '-collected_at'
+    page_size = 200
+    page_size_query_param = 'limit'
+    max_page_size = 1000
+
+
 class LatestNaverPriceListView(APIKeyMixin, generics.ListAPIView):
     """
-    최신 네이버 가격.
+    최신 네이버 가격 (커서 페이지).
 
     Query Params:
       hours      조회 기간 (기본 24시간)
       expansion  확장팩 코드 필터
+      limit      페이지 크기 (기본 200, 최대 1000)
+      fields / exclude  응답 필드 고르기 — raw_data는 ?fields=에 넣을 때만 나간다
     """
     serializer_class = CardPriceSerializer
+    pagination_class = LatestPriceCursorPagination
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['collected_at', 'price']
     ordering = ['-collected_at']
@@ -361,7 +729,9 @@ class LatestNaverPriceListView(APIKeyMixin, generics.ListAPIView):
     def get_queryset(self):
         hours = int(self.request.query_params.get('hours', 24))
         since = timezone.now() - timedelta(hours=hours)
-        qs = CardPrice.objects.filter(collected_at__gte=since).select_related('card', 'card__expansion')
+        qs = CardPrice.objects.filter(collected_at__gte=since)
+        if 'raw_data' not in self.get_serializer(many=True).child.fields:
+            qs = qs.defer('raw_data')  # 안 내보낼 거면 DB에서도 안 읽는다(용량 큼)
         expansion_code = self.request.query_params.get('expansion')
         if expansion_code:
             qs = qs.filter(card__expansion__code=expansion_code)
@@ -403,6 +773,31 @@ def card_bulk_by_product_code(request):
     return _card_bulk_by_product_code_view(request, Card)
 
 
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+def card_changes(request):
+    """마지막 동기화 이후 바뀐 포켓몬 카드"""
+    return _card_changes_view(request, Card)
+
+
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+@renderer_classes([JSONRenderer, NDJSONRenderer])
+def card_export(request):
+    """포켓몬 카드 전체 NDJSON 스트림"""
+    return _card_export_view(request, Card, CardListSerializer)
+
+
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+def card_price_snapshots(request):
+    """포켓몬 카드 여러 장의 가격 요약을 한 번에"""
+    return _card_price_snapshots_view(request, Card)
+
+
 class PokemonPriceSnapshotView(PriceSnapshotMixin):
     card_model = Card
 
@@ -451,6 +846,31 @@ def onepiece_card_bulk_by_product_code(request):
     return _card_bulk_by_product_code_view(request, OnePieceCard)
 
 
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+def onepiece_card_changes(request):
+    """마지막 동기화 이후 바뀐 원피스 카드"""
+    return _card_changes_view(request, OnePieceCard)
+
+
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+@renderer_classes([JSONRenderer, NDJSONRenderer])
+def onepiece_card_export(request):
+    """원피스 카드 전체 NDJSON 스트림"""
+    return _card_export_view(request, OnePieceCard, OnePieceCardListSerializer)
+
+
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+def onepiece_card_price_snapshots(request):
+    """원피스 카드 여러 장의 가격 요약을 한 번에"""
+    return _card_price_snapshots_view(request, OnePieceCard)
+
+
 class OnePiecePriceSnapshotView(PriceSnapshotMixin):
     card_model = OnePieceCard
 
@@ -499,6 +919,31 @@ def digimon_card_bulk_by_product_code(request):
     return _card_bulk_by_product_code_view(request, DigimonCard)
 
 
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+def digimon_card_changes(request):
+    """마지막 동기화 이후 바뀐 디지몬 카드"""
+    return _card_changes_view(request, DigimonCard)
+
+
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+@renderer_classes([JSONRenderer, NDJSONRenderer])
+def digimon_card_export(request):
+    """디지몬 카드 전체 NDJSON 스트림"""
+    return _card_export_view(request, DigimonCard, DigimonCardListSerializer)
+
+
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+def digimon_card_price_snapshots(request):
+    """디지몬 카드 여러 장의 가격 요약을 한 번에"""
+    return _card_price_snapshots_view(request, DigimonCard)
+
+
 class DigimonPriceSnapshotView(PriceSnapshotMixin):
     card_model = DigimonCard
 
@@ -546,4 +991,82 @@ class JapanPriceHistoryView(PriceHistoryMixin):
 @permission_classes([HasAPIKey])
 def japan_card_by_product_code(request, shop_product_code):
     """상품코드로 포켓몬 일본판 카드 조회"""
-    return _card_by_product_code_view(request, shop_product_code, JapanCard)
\ No newline at end of file
+    return _card_by_product_code_view(request, shop_product_code, JapanCard)
+
+
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+def japan_card_changes(request):
+    """마지막 동기화 이후 바뀐 포켓몬 일본판 카드"""
+    return _card_changes_view(request, JapanCard)
+
+
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+@renderer_classes([JSONRenderer, NDJSONRenderer])
+def japan_card_export(request):
+    """포켓몬 일본판 카드 전체 NDJSON 스트림"""
+    return _card_export_view(request, JapanCard, JapanCardListSerializer)
+
+
+# ════════════════════════════════════════════════════════════════
+# 전 게임 통합 — 검색 / 상품코드 조회
+# ════════════════════════════════════════════════════════════════
+# 게임별 cards/search/, cards/by-product-code/는 어느 게임 카드인지 알아야 호출할
+# 수 있어서, 매장 쪽에서는 상품코드 하나로 4개 게임을 차례로 찔러봐야 했다.
+# 아래 두 엔드포인트는 검색 인덱스(search_index.py) 한 곳만 조회하고, 결과마다
+# game 키(pokemon_kr / pokemon_jp / onepiece_kr / digimon_kr)를 붙여준다.
+
+_UNIFIED_SEARCH_MAX = 50
+
+
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+def unified_card_search(request):
+    """
+    GET /api/cards/search/?q=리자몽[&game=pokemon_kr,onepiece_kr][&limit=30]
+
+    카드명/카드번호/상품코드 통합 검색 — 순위순(코드 일치 > 이름 일치 > 접두사 > 포함).
+    """
+    q = (request.query_params.get('q') or '').strip()
+    if not q:
+        return Response({'error': "'q' 파라미터가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = min(int(request.query_params.get('limit', 30)), _UNIFIED_SEARCH_MAX)
+    except ValueError:
+        return Response({'error': "'limit'은 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+    limit = max(limit, 1)
+
+    game_types = [g for g in (request.query_params.get('game') or '').split(',') if g in GAME_TYPE_CARD_MODEL]
+    entries = search_index.search_entries(q, game_types=game_types or None, limit=limit)
+    prices = search_index.cached_prices(entries)
+    return Response({
+        'count': len(entries),
+        'results': [search_index.entry_to_dict(e, prices) for e in entries],
+    })
+
+
+@api_view(['GET'])
+@authentication_classes([APIKeyAuthentication])
+@permission_classes([HasAPIKey])
+def card_resolve(request, shop_product_code):
+    """
+    GET /api/cards/resolve/<shop_product_code>/
+
+    "상품코드 X는 어느 게임의 어떤 카드인가" — 인덱스 조회 1번. 상품코드는 게임 안에서만
+    유일하므로 results는 목록(보통 1건).
+    """
+    entries = search_index.resolve_code(shop_product_code)
+    if not entries:
+        return Response(
+            {'error': f"상품코드 '{shop_product_code}'에 해당하는 카드가 없습니다."},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    prices = search_index.cached_prices(entries)
+    return Response({
+        'count': len(entries),
+        'results': [search_index.entry_to_dict(e, prices) for e in entries],
+    })
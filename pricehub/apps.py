@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PricehubConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'pricehub'
+
+    def ready(self):
+        from . import signals  # noqa: F401 — 검색 인덱스 갱신 시그널 등록
@@ -4,12 +4,93 @@ pricehub/authentication.py
 DRF 커스텀 인증 클래스.
 요청 헤더:
     Authorization: Api-Key <key>
+
+키 확인 캐시:
+    card-controltower 일괄 동기화처럼 같은 키로 요청을 연달아 보내면 요청마다 api_key
+    SELECT + last_used_at UPDATE가 같은 행에 몰린다. 확인된 키는 프로세스 메모리와 공유
+    캐시(워커 간)에 _KEY_CACHE_TTL 동안 두고, 캐시 키에 "키 버전"을 넣어 키를 끄거나
+    지우면(pricehub/signals.py → invalidate_key_cache) 버전이 바뀌어 바로 무효가 된다.
+    버전은 list_cache와 같은 랜덤 토큰 — 요청마다 캐시 읽기 1번으로 확인한다. 버전 키는
+    워커 메모리 L1(pricehub/tiered_cache.py)에 있으므로 다른 워커에는 최대 L1_VERSION_CHECK초
+    (1초) 뒤에 반영된다.
+
+    last_used_at은 키마다 _LAST_USED_INTERVAL(1분)에 한 번만 쓴다(cache.add로 워커 간
+    합침). 그래서 관리 화면의 "마지막 사용"은 최대 1분 늦을 수 있다. cache.add도 공유
+    캐시(SQLite)에는 쓰기 트랜잭션이라, 워커마다 키별로 마지막 시도 시각을 메모리에 두고
+    _LAST_USED_INTERVAL에 한 번만 시도한다.
 """
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from .models import APIKey
 
+_KEY_CACHE_TTL = 60
+_LAST_USED_INTERVAL = 60
+
+_VERSION_KEY = 'api-key:version'
+_VERSION_TTL = None
+
+# {(버전, 키 해시): (APIKey, 만료 monotonic 시각)} — 프로세스 로컬
+_local_keys = {}
+_local_keys_lock = threading.Lock()
+
+# {APIKey pk: 다음 last_used_at 기록 시도 monotonic 시각} — 프로세스 로컬
+_touch_due = {}
+
+
+def _key_version():
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        cache.add(_VERSION_KEY, uuid.uuid4().hex[:12], _VERSION_TTL)
+        version = cache.get(_VERSION_KEY)
+    return version
+
+
+def invalidate_key_cache():
+    """키를 끄거나/지우거나/새로 만들면 — 모든 워커의 확인 캐시를 한 번에 무효화"""
+    cache.set(_VERSION_KEY, uuid.uuid4().hex[:12], _VERSION_TTL)
+    with _local_keys_lock:
+        _local_keys.clear()
+        _touch_due.clear()
+
+
+def _cached_key(key_hash):
+    version = _key_version()
+    local_key = (version, key_hash)
+    now = time.monotonic()
+    entry = _local_keys.get(local_key)
+    if entry is not None and entry[1] > now:
+        return entry[0]
+
+    shared_key = f'api-key:{version}:{key_hash}'
+    api_key = cache.get(shared_key)
+    if api_key is None:
+        api_key = APIKey.objects.filter(key=key_hash, is_active=True).first()
+        if api_key is None:
+            return None  # 잘못된 키는 캐시하지 않는다
+        cache.set(shared_key, api_key, _KEY_CACHE_TTL)
+    with _local_keys_lock:
+        # 옛 버전 항목이 쌓이지 않게 만료된 것은 여기서 같이 버린다
+        for stale in [k for k, (_, expires) in _local_keys.items() if expires <= now]:
+            del _local_keys[stale]
+        _local_keys[local_key] = (api_key, now + _KEY_CACHE_TTL)
+    return api_key
+
+
+def _touch_last_used(api_key):
+    now = time.monotonic()
+    with _local_keys_lock:
+        if _touch_due.get(api_key.pk, 0) > now:
+            return  # 이 워커는 최근에 시도했다 — 공유 캐시에도 쓰지 않는다
+        _touch_due[api_key.pk] = now + _LAST_USED_INTERVAL
+    if cache.add(f'api-key:touched:{api_key.pk}', 1, _LAST_USED_INTERVAL):
+        APIKey.objects.filter(pk=api_key.pk).update(last_used_at=timezone.now())
+
 
 class APIKeyAuthentication(BaseAuthentication):
     """
@@ -27,13 +108,12 @@ class APIKeyAuthentication(BaseAuthentication):
         return self._validate_key(raw_key)
 
     def _validate_key(self, raw_key: str):
-        try:
-            api_key = APIKey.objects.get(key=APIKey.hash_key(raw_key), is_active=True)
-        except APIKey.DoesNotExist:
+        api_key = _cached_key(APIKey.hash_key(raw_key))
+        if api_key is None:
             raise AuthenticationFailed('유효하지 않은 API Key입니다.')
 
-        # 마지막 사용 시각 업데이트
-        APIKey.objects.filter(pk=api_key.pk).update(last_used_at=timezone.now())
+        # 마지막 사용 시각 — 키마다 1분에 한 번만 기록
+        _touch_last_used(api_key)
 
         return (None, api_key)  # (user, auth)
 
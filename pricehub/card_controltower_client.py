@@ -8,10 +8,20 @@ pricesite/api_client.py가 pricehub 자체 REST API를 부르는 것과 같은 
 card-controltower는 pricehub 같은 API Key 발급 체계가 없고 매장별 관리자 계정
 (Busan_admin/Gwangju_admin) 로그인으로 JWT를 받는 구조라, 로그인도 이 모듈이 담당한다.
 """
+import concurrent.futures
+import logging
+from collections import namedtuple
+import threading
+import time
+import uuid
+
 import requests
 from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
+from datetime import timedelta
+
+logger = logging.getLogger(__name__)
 
 # JWT 만료는 24시간(card-controltower의 jwt.expiration-hours)이지만 안전 마진을 두고
 # 이보다 짧게 캐시한다 — 만료 시각을 정확히 안 챙겨도 재로그인 비용이 크지 않기 때문.
@@ -19,13 +29,52 @@ _TOKEN_CACHE_TTL = 12 * 3600  # 12시간
 
 # 카드 목록 전체(매장당 1만 건 이상)를 매 요청마다 다시 부르면 느리다. 실제 네이버 반영은
 # "오늘의 작업" 흐름을 통해서만 값이 바뀌므로 몇 분 단위로 캐시해도 크게 stale해지지 않는다.
-_CARDS_CACHE_TTL = 300  # 5분
+_CARDS_CACHE_TTL = 300  # 5분 — 이 안이면 "신선", 지나면 백그라운드 갱신 대상
+
+# stale-while-revalidate: 5분이 지나도 캐시 항목 자체는 이만큼 더 남겨두고, 그 사이 요청에는
+# 옛 데이터를 바로 돌려주면서 한 곳에서만 백그라운드로 새로 받는다. 이 시간도 지나면(서버가
+# 오래 쉬었거나 card-controltower가 계속 실패) 그때는 요청이 직접 기다려서 받는다.
+_CARDS_STALE_TTL = 60 * 60  # 1시간
+
+# 갱신 잠금(공유 캐시의 cache.add) — gunicorn 워커 4개가 같은 순간 만료를 보고 다 같이
+# GET /api/cards를 보내지 않도록 한 곳만 갱신. 조회 타임아웃(로그인 10초 + 목록 30초)보다 길게.
+_REFRESH_LOCK_TTL = 60
+_REFRESH_WAIT_INTERVAL = 0.2
+
+# 차단기(circuit breaker) — card-controltower가 죽어 있으면 요청마다 로그인 10초 + 목록 30초
+# 타임아웃을 기다린 뒤에야 빈 배지로 넘어갔다. 매장별로 연속 실패가 이만큼 쌓이면 쿨다운
+# 동안 호출 자체를 안 하고 바로 실패, 쿨다운이 끝나면 한 요청만 시험 삼아 통과시킨다.
+# 상태는 공유 캐시에 둬서 gunicorn 워커들이 같이 본다.
+_BREAKER_THRESHOLD = 3
+_BREAKER_COOLDOWN = 120  # 2분
+_BREAKER_FAILURE_TTL = 60 * 60
+
+# 매장 수만큼 동시에 부르므로 풀도 그만큼(매장 추가돼도 여유 있게)
+_HTTP_POOL_SIZE = 4
+
+# GET /api/cards 응답 카드 1건에서 PriceHub가 실제로 읽는 필드만 — 판매중 배지,
+# store_price_check.categorize, 스토어 가격 비교 템플릿. 응답 그대로(카드마다 dict 수십 필드,
+# 매장당 1만 건 이상)를 캐시하면 읽을 때마다 전부 unpickle하고 워커마다 그만큼 메모리를 쓴다.
+# 화면에 필드를 새로 쓰게 되면 여기 추가 — 필드 구성이 바뀌면 _CARDS_FORMAT도 올린다.
+_CARD_FIELDS = (
+    'sellerProductCode', 'cardType', 'productName', 'expansionName', 'rarity', 'imageUrl',
+    'naverSaleStatus', 'priceChangeStatus', 'priceChangeRate', 'currentPrice', 'suggestedPrice',
+)
+StoreCard = namedtuple('StoreCard', _CARD_FIELDS, defaults=(None,) * len(_CARD_FIELDS))
+
+# 캐시 항목 형식 버전 — 배포 직후 옛 형식(원본 dict 목록)이나 필드 구성이 다른 항목을
+# 새 코드가 읽지 않도록 카드 목록 캐시 키에 넣는다.
+_CARDS_FORMAT = 2
 
 
 class CardControltowerAPIError(Exception):
     """card-controltower API 호출 실패 (네트워크 오류, 인증 실패, 5xx, 타임아웃 등)"""
 
 
+class CardControltowerUnavailable(CardControltowerAPIError):
+    """연속 실패로 차단기가 열린 상태 — 호출 자체를 안 하고 바로 실패"""
+
+
 def _store_config(store):
     cfg = settings.CARD_CONTROLTOWER_STORES.get(store)
     if not cfg:
@@ -37,11 +86,35 @@ def _store_config(store):
     return cfg
 
 
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _get_http_session():
+    """
+    card-controltower 호출용 공유 세션 — 같은 호스트만 부르므로 keep-alive로 커넥션을
+    재사용해 요청마다 TCP 핸드셰이크를 새로 맺지 않는다. 매장별 조회를 동시에 돌리므로
+    풀 크기도 동시 호출 수만큼 확보(views._get_verify_http_session과 같은 구성).
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE,
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _http_session = session
+    return _http_session
+
+
 def _login(store):
     cfg = _store_config(store)
     url = f'{settings.CARD_CONTROLTOWER_BASE_URL}/api/auth/login'
     try:
-        resp = requests.post(
+        resp = _get_http_session().post(
             url,
             json={'id': cfg['username'], 'password': cfg['password']},
             timeout=10,
@@ -55,39 +128,151 @@ def _login(store):
     return token
 
 
-def _get_token(store, force_refresh=False):
+# 매장별 로그인 잠금 — 캐시된 토큰이 만료돼 동시에 들어온 요청들이 전부 401을 받으면
+# 각자 재로그인하던 것을, 먼저 잡은 한 스레드만 로그인하고 나머지는 그 토큰을 쓰게 한다.
+_login_locks = {}
+_login_locks_guard = threading.Lock()
+
+
+def _login_lock(store):
+    with _login_locks_guard:
+        return _login_locks.setdefault(store, threading.Lock())
+
+
+def _get_token(store, force_refresh=False, stale_token=None):
+    """
+    매장 JWT. force_refresh=True(401 받은 뒤)면 다시 로그인하되, 잠금을 기다리는 사이
+    다른 스레드가 이미 새 토큰을 받아뒀으면(캐시 값이 stale_token과 다르면) 그걸 쓴다.
+    """
     cache_key = f'card-controltower:token:{store}'
     if not force_refresh:
         cached = cache.get(cache_key)
         if cached:
             return cached
-    token = _login(store)
-    cache.set(cache_key, token, _TOKEN_CACHE_TTL)
-    return token
+    with _login_lock(store):
+        cached = cache.get(cache_key)
+        if cached and (not force_refresh or cached != stale_token):
+            return cached
+        token = _login(store)
+        cache.set(cache_key, token, _TOKEN_CACHE_TTL)
+        return token
 
 
 def _fetched_at_key(store):
     return f'card-controltower:cards-fetched-at:{store}'
 
 
-def fetch_store_cards(store, force_refresh=False):
+def _cards_key(store):
+    return f'card-controltower:cards:v{_CARDS_FORMAT}:{store}'
+
+
+def project_cards(data):
+    """GET /api/cards 응답 → StoreCard 목록(_CARD_FIELDS만, 없는 필드는 None)"""
+    return [StoreCard(*map(card.get, _CARD_FIELDS)) for card in data]
+
+
+def _refresh_lock_key(store):
+    return f'card-controltower:refresh-lock:{store}'
+
+
+def _breaker_keys(store):
+    prefix = f'card-controltower:breaker:{store}'
+    return f'{prefix}:failures', f'{prefix}:open-until', f'{prefix}:probe'
+
+
+def _breaker_is_open(store):
+    _, open_key, _ = _breaker_keys(store)
+    return cache.get(open_key) is not None
+
+
+def _breaker_allows(store):
     """
-    매장(busan/gwangju)의 전체 카드 목록(GET /api/cards) — 상품명/판매자상품코드/
-    현재가(Naver 실제가)/수정가(PriceHub 최근 조회값)/가격변동상태/판매상태 등 전부 포함.
-    5분 캐시(force_refresh=True면 무시하고 새로 조회, 화면에 "새로고침" 버튼용).
+    닫힘(실패 < N) → 통과. 열림(쿨다운 중) → 차단. 쿨다운이 끝났는데 실패 수가 그대로면
+    반열림 — 시험 호출 잠금(cache.add)을 잡은 한 곳만 통과.
+    """
+    failures_key, open_key, probe_key = _breaker_keys(store)
+    if cache.get(open_key) is not None:
+        return False
+    if (cache.get(failures_key) or 0) < _BREAKER_THRESHOLD:
+        return True
+    return cache.add(probe_key, 1, _REFRESH_LOCK_TTL)
 
-    실제로 card-controltower에 요청을 보낸 시각도 같이 캐시해둔다(get_fetched_at) —
-    "이 비교가 언제 기준 데이터인지" 화면에 표시하기 위함(2026-08-06 요청).
+
+def _record_success(store):
+    cache.delete_many(list(_breaker_keys(store)))
+
+
+def _record_failure(store):
+    failures_key, open_key, probe_key = _breaker_keys(store)
+    cache.add(failures_key, 0, _BREAKER_FAILURE_TTL)
+    try:
+        failures = cache.incr(failures_key)
+    except ValueError:  # add와 incr 사이에 만료
+        failures = 1
+        cache.set(failures_key, failures, _BREAKER_FAILURE_TTL)
+    if failures >= _BREAKER_THRESHOLD:
+        cache.set(open_key, timezone.now() + timedelta(seconds=_BREAKER_COOLDOWN), _BREAKER_COOLDOWN)
+        cache.delete(probe_key)
+        logger.warning('card-controltower 차단기 열림: %s (연속 실패 %d회, %d초간 호출 중단)',
+                       store, failures, _BREAKER_COOLDOWN)
+
+
+def health():
     """
-    cache_key = f'card-controltower:cards:{store}'
-    if not force_refresh:
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
+    매장별 연동 상태(홈 화면 표시용) — 캐시만 읽고 card-controltower는 부르지 않는다.
+    state: 'ok'(정상) / 'failing'(실패 중, 아직 차단 전) / 'open'(차단 중) / 'unknown'(조회 기록 없음)
+    """
+    result = []
+    for store, cfg in settings.CARD_CONTROLTOWER_STORES.items():
+        failures_key, open_key, _ = _breaker_keys(store)
+        found = cache.get_many([failures_key, open_key, _fetched_at_key(store)])
+        failures = found.get(failures_key) or 0
+        fetched_at = found.get(_fetched_at_key(store))
+        if open_key in found:
+            state = 'open'
+        elif failures:
+            state = 'failing'
+        elif fetched_at is None:
+            state = 'unknown'
+        else:
+            state = 'ok'
+        result.append({
+            'store': store,
+            'label': cfg['label'],
+            'state': state,
+            'failures': failures,
+            'open_until': found.get(open_key),
+            'fetched_at': fetched_at,
+        })
+    return result
+
+
+def _fetch_and_cache(store):
+    """
+    card-controltower에서 실제로 받아 목록/판매중 인덱스/조회 시각을 캐시에 쓴다.
+    차단기가 열려 있으면 부르지 않고 CardControltowerUnavailable.
+    """
+    _store_config(store)  # 계정 미설정은 장애가 아니라 설정 문제 — 차단기에 세지 않는다
+    if not _breaker_allows(store):
+        raise CardControltowerUnavailable(f'card-controltower 연속 실패로 잠시 호출 중단: {store}')
+    try:
+        data = project_cards(_request_cards(store))
+    except CardControltowerAPIError:
+        _record_failure(store)
+        raise
+    _record_success(store)
+
+    fetched_at = timezone.now()
+    cache.set(_cards_key(store), data, _CARDS_STALE_TTL)
+    _cache_sale_status(store, data)
+    cache.set(_fetched_at_key(store), fetched_at, _CARDS_STALE_TTL)
+    return data
 
+
+def _request_cards(store):
     def _call(token):
         url = f'{settings.CARD_CONTROLTOWER_BASE_URL}/api/cards'
-        resp = requests.get(
+        resp = _get_http_session().get(
             url,
             headers={'Authorization': f'Bearer {token}'},
             timeout=30,
@@ -99,31 +284,172 @@ def fetch_store_cards(store, force_refresh=False):
         resp = _call(token)
         if resp.status_code == 401:
             # 캐시된 토큰이 만료/무효 — 한 번만 재로그인 후 재시도.
-            token = _get_token(store, force_refresh=True)
+            token = _get_token(store, force_refresh=True, stale_token=token)
             resp = _call(token)
         resp.raise_for_status()
         data = resp.json()
     except requests.RequestException as e:
         raise CardControltowerAPIError(f'card-controltower 카드 목록 조회 실패: {store} ({e})') from e
-
-    fetched_at = timezone.now()
-    cache.set(cache_key, data, _CARDS_CACHE_TTL)
-    cache.set(_fetched_at_key(store), fetched_at, _CARDS_CACHE_TTL)
     return data
 
 
+def _acquire_refresh_lock(store):
+    return cache.add(_refresh_lock_key(store), uuid.uuid4().hex, _REFRESH_LOCK_TTL)
+
+
+def _release_refresh_lock(store):
+    cache.delete(_refresh_lock_key(store))
+
+
+def _run_in_background(func, *args):
+    threading.Thread(target=func, args=args, daemon=True).start()
+
+
+def _background_refresh(store):
+    try:
+        _fetch_and_cache(store)
+    except CardControltowerAPIError as e:
+        # 옛 데이터는 그대로 남아 있으므로 다음 요청이 다시 시도한다
+        logger.warning('card-controltower 백그라운드 갱신 실패: %s', e)
+    finally:
+        _release_refresh_lock(store)
+
+
+def refresh_in_background(store):
+    """
+    잠금을 잡은 경우에만 백그라운드 스레드로 새로 받는다. 이미 누가 갱신 중이거나
+    차단기가 열려 있으면(쿨다운 중) 아무것도 안 함.
+    """
+    if _breaker_is_open(store):
+        return False
+    if _acquire_refresh_lock(store):
+        _run_in_background(_background_refresh, store)
+        return True
+    return False
+
+
+def refresh_now(store):
+    """
+    잠금을 잡고 그 자리에서 새로 받는다(refresh_store_cards 명령용). 이미 누가 갱신 중이면
+    None — 같은 데이터를 두 번 받지 않는다.
+    """
+    if not _acquire_refresh_lock(store):
+        return None
+    try:
+        return _fetch_and_cache(store)
+    finally:
+        _release_refresh_lock(store)
+
+
+def is_fresh(fetched_at):
+    return fetched_at is not None and timezone.now() - fetched_at < timedelta(seconds=_CARDS_CACHE_TTL)
+
+
+def fetch_store_cards(store, force_refresh=False):
+    """
+    매장(busan/gwangju)의 전체 카드 목록(GET /api/cards) — 상품명/판매자상품코드/
+    현재가(Naver 실제가)/수정가(PriceHub 최근 조회값)/가격변동상태/판매상태 등을
+    StoreCard(namedtuple, _CARD_FIELDS만)로 줄인 목록. 호출부는 수정하지 않는다(캐시 공유 객체).
+    force_refresh=True면 캐시를 무시하고 그 자리에서 새로 조회(화면 "새로고침" 버튼용).
+
+    캐시는 stale-while-revalidate — 5분 안이면 그대로, 5분이 지났으면 옛 데이터를 바로
+    돌려주고 백그라운드에서 한 곳만 새로 받는다. 캐시가 아예 없으면 한 요청만 직접 받고
+    나머지는 그 결과를 기다린다(공유 캐시 잠금).
+
+    실제로 card-controltower에 요청을 보낸 시각도 같이 캐시해둔다(get_fetched_at) —
+    "이 비교가 언제 기준 데이터인지" 화면에 표시하기 위함(2026-08-06 요청).
+    """
+    if force_refresh:
+        return _fetch_and_cache(store)
+
+    cached = cache.get(_cards_key(store))
+    if cached is not None:
+        if not is_fresh(get_fetched_at(store)):
+            refresh_in_background(store)
+        return cached
+
+    data = refresh_now(store)
+    if data is not None:
+        return data
+
+    # 다른 요청이 받는 중 — 끝나길 기다렸다가 그 결과를 쓴다(실패해서 잠금만 풀리면 직접 받는다)
+    deadline = time.monotonic() + _REFRESH_LOCK_TTL
+    while time.monotonic() < deadline and cache.get(_refresh_lock_key(store)) is not None:
+        time.sleep(_REFRESH_WAIT_INTERVAL)
+        cached = cache.get(_cards_key(store))
+        if cached is not None:
+            return cached
+    cached = cache.get(_cards_key(store))
+    return cached if cached is not None else _fetch_and_cache(store)
+
+
 def get_fetched_at(store):
     """마지막으로 card-controltower에 실제 요청을 보낸 시각(캐시가 살아있는 동안만 유지,
-    데이터 캐시와 같은 TTL). 아직 한 번도 조회 안 했거나 캐시가 만료됐으면 None."""
+    데이터 캐시와 같은 TTL — 5분이 지나 백그라운드 갱신을 기다리는 옛 데이터여도 그 데이터의
+    시각). 아직 한 번도 조회 안 했거나 캐시가 만료됐으면 None. 화면의 "n분 전 기준" 표시용."""
     return cache.get(_fetched_at_key(store))
 
 
+def fetched_at_stamps(stores=None):
+    """매장별 get_fetched_at을 캐시 1번 읽기로 — (busan 시각, gwangju 시각) 순서 튜플"""
+    stores = list(settings.CARD_CONTROLTOWER_STORES) if stores is None else stores
+    found = cache.get_many([_fetched_at_key(store) for store in stores])
+    return tuple(found.get(_fetched_at_key(store)) for store in stores)
+
+
+def _for_each_store(func, stores):
+    """
+    func(store)를 매장별로 동시에 실행해 {store: 결과}. 매장 하나가 타임아웃(30초)까지
+    걸려도 전체 대기 시간은 합이 아니라 가장 느린 매장 기준. 예외는 그대로 올라간다.
+    """
+    if len(stores) <= 1:
+        return {store: func(store) for store in stores}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(stores)) as executor:
+        futures = {store: executor.submit(func, store) for store in stores}
+        return {store: future.result() for store, future in futures.items()}
+
+
 def fetch_all_store_cards(force_refresh=False):
-    """설정된 전 매장(busan/gwangju)의 카드 목록을 {store: [...]} 형태로 한 번에 반환."""
-    return {
-        store: fetch_store_cards(store, force_refresh=force_refresh)
-        for store in settings.CARD_CONTROLTOWER_STORES
-    }
+    """설정된 전 매장(busan/gwangju)의 카드 목록을 {store: [...]} 형태로 한 번에 반환 (매장별 동시 조회)."""
+    return _for_each_store(
+        lambda store: fetch_store_cards(store, force_refresh=force_refresh),
+        list(settings.CARD_CONTROLTOWER_STORES),
+    )
+
+
+def _sale_status_key(store):
+    return f'card-controltower:sale-status:{store}'
+
+
+def _cache_sale_status(store, cards):
+    """
+    매장 카드 목록 → sellerProductCode → 판매중 여부. 카드 목록을 새로 받을 때 한 번만
+    만들어 별도 캐시 항목으로 둔다 — 배지 표시에 필요한 건 이것뿐인데, 매 요청마다
+    1만 건 넘는 카드 목록 전체를 캐시에서 꺼내(unpickle) 다시 훑지 않기 위함.
+    """
+    status = {}
+    for c in cards:
+        if c.sellerProductCode:
+            status[c.sellerProductCode] = c.naverSaleStatus == 'SALE'
+    cache.set(_sale_status_key(store), status, _CARDS_STALE_TTL)
+    return status
+
+
+def _store_sale_status(store):
+    status = cache.get(_sale_status_key(store))
+    if status is None:
+        cards = fetch_store_cards(store)
+        status = cache.get(_sale_status_key(store))
+        if status is None:
+            # 카드 목록 캐시는 살아있는데 인덱스만 없는 경우(이 캐시 항목이 생기기 전에
+            # 받아둔 목록 등) — 목록에서 바로 만든다.
+            status = _cache_sale_status(store, cards)
+    return status
+
+
+# 프로세스 내 메모 — (매장별 조회 시각, 합친 인덱스). 조회 시각이 그대로면 캐시에서
+# 인덱스를 다시 꺼내지도 않는다. gunicorn 워커마다 따로 갖지만 5분에 한 번 새로 만들 뿐.
+_sale_status_memo = (None, {})
 
 
 def sale_status_index():
@@ -131,17 +457,34 @@ def sale_status_index():
     sellerProductCode → {store: bool(판매중)} 인덱스. 카드 목록/상세 화면에 "부산/광주
     판매중" 배지를 다는 용도 — card-controltower 연동이 실패해도 조용히 빈 dict를 반환해
     배지만 안 뜨고 나머지 화면(PriceHub 자체 기능)은 그대로 동작하게 한다.
+
+    매장별 인덱스는 fetch_store_cards가 목록을 새로 받을 때 만들어 두고, 여기서는
+    매장별 조회 시각(캐시 1번 읽기)이 메모와 같으면 메모를 그대로 돌려준다.
+    반환값은 공유 객체이므로 호출부에서 수정하지 않는다.
     """
+    global _sale_status_memo
+    stores = list(settings.CARD_CONTROLTOWER_STORES)
+    stamps = fetched_at_stamps(stores)
+    for store, stamp in zip(stores, stamps):
+        if stamp is not None and not is_fresh(stamp):
+            refresh_in_background(store)  # 이번 요청은 옛 인덱스로, 다음 요청부터 새 것
+    memo_stamps, memo_index = _sale_status_memo
+    if None not in stamps and stamps == memo_stamps:
+        return memo_index
+
     try:
-        all_cards = fetch_all_store_cards()
+        per_store = _for_each_store(_store_sale_status, stores)
     except CardControltowerAPIError:
         return {}
 
     index = {}
-    for store, cards in all_cards.items():
-        for c in cards:
-            code = c.get('sellerProductCode')
-            if not code:
-                continue
-            index.setdefault(code, {})[store] = c.get('naverSaleStatus') == 'SALE'
+    for store, status in per_store.items():
+        for code, on_sale in status.items():
+            index.setdefault(code, {})[store] = on_sale
+    # 메모 키는 인덱스를 읽기 "전" 조회 시각 — 그 사이 다른 요청이 새로 받았으면 다음 요청에서
+    # 시각이 달라 보여 한 번 더 합칠 뿐, 옛 인덱스가 새 시각에 묶이지 않는다. 캐시가 비어 있어
+    # 여기서 직접 받은 경우만 받은 뒤의 시각을 쓴다.
+    if None in stamps:
+        stamps = fetched_at_stamps(stores)
+    _sale_status_memo = (stamps, index)
     return index
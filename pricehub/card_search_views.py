@@ -0,0 +1,58 @@
+"""
+pricehub/card_search_views.py
+
+전 게임 통합 카드 검색 (staff 전용). 게임별 확장팩 목록의 검색창은 그 게임 카드만
+찾으므로, 어느 게임 카드인지 모르는 상태(매장 문의, 상품코드만 아는 경우 등)에서는
+게임마다 따로 검색해야 했다. 여기서는 검색 인덱스(search_index.py) 한 곳에서
+4개 게임을 한꺼번에 찾고, 결과마다 game 키와 상세 페이지 링크를 붙여준다.
+"""
+from django.http import JsonResponse
+from django.shortcuts import render
+
+from . import search_index
+from .purchase_config import GAME_TYPE_LABELS
+from .views import CATEGORY_CONFIGS, _url, staff_required
+
+_MAX_PAGE_SIZE = 50
+
+
+def _parse_game_types(raw):
+    """'pokemon_kr,onepiece_kr' → ['pokemon_kr', 'onepiece_kr'], 비었거나 전부 모르는 값이면 None(전체)"""
+    games = [g for g in (raw or '').split(',') if g in CATEGORY_CONFIGS]
+    return games or None
+
+
+@staff_required
+def card_search_page(request):
+    return render(request, 'dashboard/card_search.html', {
+        'games': list(GAME_TYPE_LABELS.items()),
+        'q': request.GET.get('q', '').strip(),
+    })
+
+
+@staff_required
+def card_search_results(request):
+    """
+    통합 검색 AJAX — 응답 형태는 게임별 `cards/search/`와 같고(dashboard.js
+    searchCards()가 그대로 그린다) game/game_label/detail_url만 추가된다.
+    """
+    q = request.GET.get('name', '').strip()
+    page_size = min(int(request.GET.get('page_size', 30)), _MAX_PAGE_SIZE)
+    if not q:
+        return JsonResponse({'results': []})
+
+    entries = search_index.search_entries(
+        q, game_types=_parse_game_types(request.GET.get('game')), limit=page_size,
+    )
+    prices = search_index.cached_prices(entries)
+
+    results = []
+    for entry in entries:
+        data = search_index.entry_to_dict(entry, prices)
+        results.append({
+            **data,
+            'latest_price': data['latest_market_price'],
+            'game_label': GAME_TYPE_LABELS.get(entry.game_type, entry.game_type),
+            'detail_url': _url(entry.game_type, f'/cards/{entry.card_id}/'),
+        })
+    return JsonResponse({'results': results})
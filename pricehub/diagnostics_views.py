@@ -0,0 +1,32 @@
+"""
+pricehub/diagnostics_views.py
+
+스태프용 진단 화면 — 지금은 캐시 2단(pricehub/tiered_cache.py)의 접두사별 L1 적중/미스.
+"""
+import os
+
+from django.core.cache import caches
+from django.shortcuts import render
+
+from .tiered_cache import TieredCache
+from .views import staff_required
+
+
+def _ratio(hits, misses):
+    total = hits + misses
+    return round(hits * 100 / total, 1) if total else None
+
+
+@staff_required
+def cache_diagnostics(request):
+    backend = caches['default']
+    stats = backend.stats() if isinstance(backend, TieredCache) else None
+    if stats:
+        for row in stats['rows']:
+            row['local_ratio'] = _ratio(row['local_hits'], row['local_misses'])
+            row['total_ratio'] = _ratio(row['total_hits'], row['total_misses'])
+    return render(request, 'dashboard/cache_diagnostics.html', {
+        'backend': f'{type(backend).__module__}.{type(backend).__name__}',
+        'stats': stats,
+        'pid': os.getpid(),
+    })
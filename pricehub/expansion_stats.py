@@ -0,0 +1,137 @@
+"""
+pricehub/expansion_stats.py
+
+확장팩 가격 통계(ExpansionPriceStats) — 확장팩 상세 API의 price_stats.
+
+예전에는 상세 API를 부를 때마다 그 확장팩 카드들의 가격 이력 전체(CardPrice — 매일 카드마다
+한 행씩 쌓인다)에 MIN/MAX/AVG/COUNT를 돌렸다. 값은 하루 한 번 수집 때만 바뀌므로, 수집이 끝날
+때 refresh()가 확장팩마다 한 행으로 계산해 두고 API는 그 행만 읽는다.
+
+구간:
+    전체     가격 이력 전체 (예전 price_stats와 같은 값)
+    current  카드별 최신 시장가(Card.latest_market_price 캐시 컬럼) — 이력을 뒤지지 않는다
+    30일     최근 RECENT_DAYS일 동안 수집된 가격 이력
+
+갱신:
+    행에 계산할 때의 확장팩 목록 캐시 버전(list_cache — 그 확장팩의 카드/가격이 저장되면
+    시그널이 바꾼다)을 같이 적어둔다. 조회할 때 버전이 달라졌거나(작업자가 bulk-price
+    collect-card API로 가격을 한 건씩 넣는 경우 포함), 계산한 지 _MAX_AGE가 지났거나(30일
+    구간이 밀린다), 행이 없으면 그 확장팩만 다시 계산한다 — 바뀐 게 없으면 행만 읽는다.
+    가격 수집 스크립트(scripts/collect/collect_all_prices.py)는 끝날 때 전체를 미리 계산해
+    두고, 수동으로는 python manage.py refresh_expansion_stats.
+"""
+from datetime import timedelta
+
+from django.db.models import Avg, Count, Max, Min
+from django.utils import timezone
+
+from . import list_cache
+from .models import Card, CardPrice, Expansion, ExpansionPriceStats
+
+RECENT_DAYS = 30
+_MAX_AGE = timedelta(hours=1)
+_GAME_TYPE = 'pokemon_kr'  # list_cache 버전 키 — 포켓몬 한글판만 price_stats가 있다
+
+# 구간 → (행 필드 접두사, 응답 키). 전체는 접두사 없이 예전 키 그대로
+_WINDOWS = (
+    ('', None),
+    ('current_', 'current'),
+    ('recent_', f'last_{RECENT_DAYS}_days'),
+)
+
+
+def _grouped(queryset, group_field, price_field):
+    """{expansion_id: (min, max, avg, count)} — GROUP BY 쿼리 1번"""
+    rows = (
+        queryset.order_by().values(group_field)
+        .annotate(lo=Min(price_field), hi=Max(price_field), mean=Avg(price_field), n=Count('id'))
+    )
+    grouped = {}
+    for row in rows:
+        mean = round(row['mean']) if row['mean'] is not None else None
+        grouped[row[group_field]] = (row['lo'], row['hi'], mean, row['n'])
+    return grouped
+
+
+def refresh(expansion_ids=None):
+    """
+    확장팩 가격 통계 행을 다시 계산해 저장(없으면 만들고 있으면 덮어쓴다). expansion_ids가
+    없으면 전체. 구간마다 GROUP BY 쿼리 1번 + 저장 1번. 저장한 행 수 반환.
+    """
+    expansions = Expansion.objects.all()
+    prices = CardPrice.objects.all()
+    cards = Card.objects.filter(latest_market_price__isnull=False)
+    if expansion_ids is not None:
+        expansions = expansions.filter(id__in=expansion_ids)
+        prices = prices.filter(card__expansion_id__in=expansion_ids)
+        cards = cards.filter(expansion_id__in=expansion_ids)
+
+    now = timezone.now()
+    expansion_ids = list(expansions.values_list('id', flat=True))
+    # 버전은 집계 전에 읽는다 — 집계 도중 저장된 가격은 버전이 또 바뀌어 다음 조회가 다시 계산
+    versions = {eid: list_cache.current_version(_GAME_TYPE, eid) for eid in expansion_ids}
+    by_window = {
+        '': _grouped(prices, 'card__expansion_id', 'price'),
+        'current_': _grouped(cards, 'expansion_id', 'latest_market_price'),
+        'recent_': _grouped(
+            prices.filter(collected_at__gte=now - timedelta(days=RECENT_DAYS)), 'card__expansion_id', 'price',
+        ),
+    }
+
+    rows = []
+    for expansion_id in expansion_ids:
+        values = {'expansion_id': expansion_id, 'computed_at': now, 'source_version': versions[expansion_id]}
+        for prefix, _ in _WINDOWS:
+            lo, hi, mean, n = by_window[prefix].get(expansion_id, (None, None, None, 0))
+            values.update({
+                f'{prefix}min_price': lo, f'{prefix}max_price': hi,
+                f'{prefix}avg_price': mean, f'{prefix}total_records': n,
+            })
+        rows.append(ExpansionPriceStats(**values))
+
+    ExpansionPriceStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['expansion'],
+        update_fields=[
+            f.name for f in ExpansionPriceStats._meta.concrete_fields if f.name not in ('id', 'expansion')
+        ],
+    )
+    return len(rows)
+
+
+def for_expansion(expansion):
+    """확장팩의 통계 행 — 없거나 계산 뒤 가격/카드가 바뀌었거나 오래됐으면 그 확장팩만 다시 계산"""
+    try:
+        stats = expansion.price_summary
+    except ExpansionPriceStats.DoesNotExist:
+        stats = None
+    if (
+        stats is not None
+        and stats.source_version == list_cache.current_version(_GAME_TYPE, expansion.pk)
+        and stats.computed_at > timezone.now() - _MAX_AGE
+    ):
+        return stats
+    refresh([expansion.pk])
+    return ExpansionPriceStats.objects.get(expansion=expansion)
+
+
+def as_dict(stats):
+    """
+    API price_stats — 전체 이력은 예전과 같은 최상위 키(min_price/max_price/avg_price/
+    total_records), 구간별 값은 current/last_30_days 아래에 같은 키로.
+    """
+    data = {}
+    for prefix, key in _WINDOWS:
+        window = {
+            'min_price': getattr(stats, f'{prefix}min_price'),
+            'max_price': getattr(stats, f'{prefix}max_price'),
+            'avg_price': getattr(stats, f'{prefix}avg_price'),
+            'total_records': getattr(stats, f'{prefix}total_records'),
+        }
+        if key is None:
+            data.update(window)
+        else:
+            data[key] = window
+    data['computed_at'] = stats.computed_at
+    return data
@@ -0,0 +1,128 @@
+"""
+pricehub/list_cache.py
+
+확장팩 카드 목록(_card_list_view) 페이지 캐시용 버전 키.
+
+카드 목록은 대시보드에서 가장 많이 열리는 화면인데, 매 요청마다 100행 분량의
+검색어 생성·태그 배지·판매중 배지·사이드 패널 JSON 직렬화를 처음부터 다시 한다.
+그 확장팩에서 아무것도 안 바뀌었으면 결과는 매번 같으므로, 렌더링한 행 HTML과
+사이드 패널 JSON을 "확장팩 버전" 키 아래에 캐시해두고 버전만 확인해서 재사용한다.
+
+버전 키 2단계:
+    cardlist:ver:{cfg_key}:{expansion_id}   확장팩 단위 — 그 확장팩 카드/가격이 바뀌면 갱신
+    cardlist:ver:{cfg_key}                  게임 단위 — 전체 초기화처럼 여러 확장팩이
+                                            한꺼번에 바뀌는 경우 한 번에 무효화
+
+버전 값은 1씩 올리는 카운터가 아니라 매번 새로 뽑는 랜덤 토큰이다 — FileBasedCache의
+incr은 get+set이라 동시에 두 번 올리면 한 번이 묻힐 수 있는데(5→6, 5→6), 그러면
+그 사이에 옛 데이터로 만든 캐시가 새 버전 이름으로 살아남는다. 랜덤 토큰은 덮어써도
+항상 이전 값과 다르다. 옛 버전 키로 저장된 페이지는 지우지 않고 TTL로 자연 만료된다.
+
+갱신 경로:
+    - 카드/가격/확장팩 save·delete → pricehub/signals.py가 자동으로 bump
+    - queryset.update()/bulk_update()는 시그널이 안 나가므로 호출부에서 직접 bump
+      (_bulk_run_view, 판매가 초기화 뷰 등)
+    - 가격 수집 스크립트처럼 한 번에 수천 행을 저장할 때는 `with list_cache.batched():`
+      안에서 돌린다 — 그동안의 bump는 행마다 캐시에 쓰지 않고 모아 두었다가 블록이 끝날 때
+      확장팩마다 한 번만 쓴다.
+"""
+import hashlib
+import threading
+import uuid
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import transaction
+
+PAGE_CACHE_TTL = 60 * 60  # 버전이 바뀌면 어차피 안 읽히므로 넉넉하게
+_VERSION_TTL = None       # 버전 키는 만료시키지 않는다(만료되면 그 게임/확장팩 전체 미스)
+
+# batched() 블록 안에서 미뤄 둔 버전 키 — 스레드마다(중첩되면 가장 바깥 블록이 끝날 때 쓴다)
+_batch = threading.local()
+
+
+def _expansion_key(cfg_key, expansion_id):
+    return f'cardlist:ver:{cfg_key}:{expansion_id}'
+
+
+def _game_key(cfg_key):
+    return f'cardlist:ver:{cfg_key}'
+
+
+def _new_token():
+    return uuid.uuid4().hex[:12]
+
+
+def _tokens(keys):
+    found = cache.get_many(keys)
+    parts = []
+    for key in keys:
+        token = found.get(key)
+        if token is None:
+            cache.add(key, _new_token(), _VERSION_TTL)
+            token = cache.get(key)
+        parts.append(token)
+    return '.'.join(parts)
+
+
+def current_version(cfg_key, expansion_id):
+    """'{게임 버전}.{확장팩 버전}' — 둘 중 하나라도 바뀌면 다른 값"""
+    return _tokens([_game_key(cfg_key), _expansion_key(cfg_key, expansion_id)])
+
+
+def versions_for(cfg_key, expansion_ids):
+    """여러 확장팩에 걸친 응답용(판매처 목록 ETag 등) — 게임 버전 + 확장팩별 버전을 묶은 값"""
+    ids = sorted({eid for eid in expansion_ids if eid is not None})
+    return _tokens([_game_key(cfg_key)] + [_expansion_key(cfg_key, eid) for eid in ids])
+
+
+def _bump_now(keys):
+    cache.set_many({key: _new_token() for key in keys}, _VERSION_TTL)
+
+
+def _bump(keys):
+    # 트랜잭션 안이면 지금 한 번 + 커밋 후 한 번 올린다. 커밋 전에만 올리면 그 사이
+    # 다른 요청이 아직 커밋 안 된(옛) 데이터로 새 버전 캐시를 만들 수 있고, 커밋 후에만
+    # 올리면 같은 트랜잭션 안에서 바로 다시 읽을 때 옛 캐시를 본다.
+    keys = list(keys)
+    if not keys:
+        return
+    pending = getattr(_batch, 'keys', None)
+    if pending is not None:
+        pending.update(keys)
+        return
+    _bump_now(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump_now(keys))
+
+
+@contextmanager
+def batched():
+    """블록 안의 bump를 모아 두었다가 끝날 때 한 번에(키마다 1번) 올린다 — 예외로 끝나도 올린다"""
+    if getattr(_batch, 'keys', None) is not None:
+        yield  # 바깥 블록이 모아서 쓴다
+        return
+    _batch.keys = set()
+    try:
+        yield
+    finally:
+        keys, _batch.keys = _batch.keys, None
+        _bump(keys)
+
+
+def bump_expansions(cfg_key, expansion_ids):
+    _bump(_expansion_key(cfg_key, eid) for eid in set(expansion_ids) if eid is not None)
+
+
+def bump_expansion(cfg_key, expansion_id):
+    bump_expansions(cfg_key, [expansion_id])
+
+
+def bump_game(cfg_key):
+    _bump([_game_key(cfg_key)])
+
+
+def page_key(cfg_key, expansion_id, version, *parts):
+    """목록 페이지 1개(필터/정렬/페이지/판매중 배지 기준 시각 조합)의 캐시 키"""
+    digest = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+    return f'cardlist:page:{cfg_key}:{expansion_id}:{version}:{digest}'
@@ -0,0 +1,102 @@
+"""
+pricehub/management/commands/bench_cache.py
+
+공유 캐시 백엔드 비교 — FileBasedCache(예전 설정)와 SQLiteCache(pricehub/sqlite_cache.py)를
+우리 캐시 키 패턴으로 잰다. 둘 다 임시 디렉터리에 따로 만들어서 운영 캐시에는 영향이 없다.
+
+    - 스토어 카드 목록 get   : card_controltower_client의 스토어별 카드 목록(큰 리스트) 읽기
+    - 목록 버전 get_many     : list_cache의 게임/확장팩 버전 토큰 2개 묶어 읽기
+    - 락 add + delete        : 갱신 잠금/디스패치 잠금 같은 cache.add 단일 실행 락
+    - 이미지 해시 set        : 매번 새 URL 키(30일 TTL) — MAX_ENTRIES를 넘으며 정리가 돈다
+    - 이미지 해시 get        : 위에서 쓴 키 다시 읽기(정리로 지워진 키는 미스)
+
+사용:
+    python manage.py bench_cache
+    python manage.py bench_cache --ops 2000 --cards 10000 --max-entries 300
+"""
+import tempfile
+import time
+import uuid
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management.base import BaseCommand
+
+from pricehub.sqlite_cache import SQLiteCache
+
+_HASH_TTL = 60 * 60 * 24 * 30
+
+
+def _store_cards(count):
+    return [
+        {
+            'product_code': f'PK-{i:06d}',
+            'name': f'테스트 카드 {i}',
+            'price': 1000 + i,
+            'sale_status': 'SALE',
+            'stock': i % 7,
+        }
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = '공유 캐시 백엔드(FileBasedCache / SQLiteCache)의 연산당 시간을 우리 키 패턴으로 비교한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ops', type=int, default=1000, help='패턴별 반복 횟수 (기본 1000)')
+        parser.add_argument('--cards', type=int, default=5000, help='스토어 카드 목록 크기 (기본 5000)')
+        parser.add_argument('--max-entries', type=int, default=300,
+                            help='두 백엔드 공통 MAX_ENTRIES (기본 300 — Django 기본값)')
+
+    def handle(self, *args, **options):
+        n = options['ops']
+        cards = _store_cards(options['cards'])
+        params = {'OPTIONS': {'MAX_ENTRIES': options['max_entries']}}
+        with tempfile.TemporaryDirectory() as tmp:
+            results = {
+                'FileBasedCache': self._bench(FileBasedCache(f'{tmp}/files', params), n, cards),
+                'SQLiteCache': self._bench(SQLiteCache(f'{tmp}/cache.sqlite3', params), n, cards),
+            }
+
+        self.stdout.write(f'패턴별 {n}회, 카드 목록 {len(cards)}건, MAX_ENTRIES {options["max_entries"]}')
+        names = list(results)
+        self.stdout.write(f'  {"":24}' + ''.join(f'{name:>18}' for name in names))
+        for pattern in results[names[0]]:
+            cells = []
+            for name in names:
+                seconds, note = results[name][pattern]
+                cells.append(f'{seconds * 1e6:10.1f} µs{note:>5}')
+            self.stdout.write(f'  {pattern:24}' + ''.join(f'{cell:>18}' for cell in cells))
+
+    def _time(self, n, op):
+        start = time.perf_counter()
+        for i in range(n):
+            op(i)
+        return (time.perf_counter() - start) / n
+
+    def _bench(self, cache, n, cards):
+        result = {}
+        cache.set('controltower:cards:bench', cards, None)
+        result['스토어 카드 목록 get'] = (
+            self._time(max(n // 10, 1), lambda i: cache.get('controltower:cards:bench')), '',
+        )
+
+        version_keys = ['cardlist:ver:pokemon', 'cardlist:ver:pokemon:1']
+        cache.set_many({key: uuid.uuid4().hex[:12] for key in version_keys}, None)
+        result['목록 버전 get_many'] = (self._time(n, lambda i: cache.get_many(version_keys)), '')
+
+        def lock(i):
+            if cache.add('bench:lock', 1, 30):
+                cache.delete('bench:lock')
+        result['락 add + delete'] = (self._time(n, lock), '')
+
+        hash_keys = [f'verify-image-hash:{i}' for i in range(n)]
+        result['이미지 해시 set'] = (
+            self._time(n, lambda i: cache.set(hash_keys[i], uuid.uuid4().hex, _HASH_TTL)), '',
+        )
+        hits = []
+        result['이미지 해시 get'] = (
+            self._time(n, lambda i: hits.append(cache.get(hash_keys[i]) is not None)),
+            f'{sum(hits) * 100 // n}%',
+        )
+        return result
@@ -0,0 +1,73 @@
+"""
+pricehub/management/commands/bench_throttle.py
+
+API Key 요청 한도 판정 1번에 드는 시간 비교 — 예전 방식(DRF SimpleRateThrottle의 요청 시각
+목록을 FileBasedCache에 저장)과 지금 방식(토큰 버킷, pricehub/rate_limit.py의 SQLite WAL).
+둘 다 임시 디렉터리에 따로 만들어서 운영 캐시/한도에는 영향이 없다.
+
+사용:
+    python manage.py bench_throttle
+    python manage.py bench_throttle --requests 1000 --rate 1000/min
+
+횟수 기본값은 한도와 같다 — 한도를 넘으면 예전 방식은 거부 응답에서 쓰기를 건너뛰어 더
+빨라 보이므로, 전부 허용되는 구간(정상 트래픽)끼리 비교한다.
+"""
+import tempfile
+import time
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from pricehub import rate_limit
+
+
+class _HistoryThrottle(SimpleRateThrottle):
+    """예전 APIKeyRateThrottle과 같은 판정(요청 시각 목록)을 임시 FileBasedCache에서"""
+    scope = 'bench'
+
+    def __init__(self, rate, cache):
+        self.rate = rate
+        self.num_requests, self.duration = self.parse_rate(rate)
+        self.cache = cache
+
+    def get_cache_key(self, request, view):
+        return 'throttle_bench_1'
+
+
+class Command(BaseCommand):
+    help = 'API Key 요청 한도 판정의 요청당 시간을 예전/지금 방식으로 비교한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300, help='판정 횟수 (기본 300)')
+        parser.add_argument('--rate', default='300/min', help='한도 (기본 300/min)')
+
+    def handle(self, *args, **options):
+        n = options['requests']
+        rate = options['rate']
+        with tempfile.TemporaryDirectory() as tmp:
+            old = self._bench_history(n, rate, FileBasedCache(tmp, {}))
+            with override_settings(API_THROTTLE_DB=f'{tmp}/throttle.sqlite3'):
+                new = self._bench_bucket(n, rate)
+
+        self.stdout.write(f'{n}회, 한도 {rate} (버킷이 가득 찬 상태에서 시작)')
+        self.stdout.write(f'  요청 시각 목록 + FileBasedCache: {old * 1e6:8.1f} µs/요청')
+        self.stdout.write(f'  토큰 버킷 + SQLite WAL        : {new * 1e6:8.1f} µs/요청')
+        if new:
+            self.stdout.write(self.style.SUCCESS(f'  {old / new:.1f}배'))
+
+    def _bench_history(self, n, rate, cache):
+        throttle = _HistoryThrottle(rate, cache)
+        start = time.perf_counter()
+        for _ in range(n):
+            throttle.allow_request(None, None)
+        return (time.perf_counter() - start) / n
+
+    def _bench_bucket(self, n, rate):
+        num_requests, duration = SimpleRateThrottle.parse_rate(None, rate)
+        rate_limit.consume('throttle_bench_1', num_requests, num_requests / duration)  # 연결/테이블 준비
+        start = time.perf_counter()
+        for _ in range(n):
+            rate_limit.consume('throttle_bench_1', num_requests, num_requests / duration)
+        return (time.perf_counter() - start) / n
@@ -0,0 +1,54 @@
+"""
+pricehub/management/commands/dispatch_price_changes.py
+
+판매가 변경 아웃박스(PriceChangeEvent)를 웹훅(PRICE_CHANGE_WEBHOOK_URL)으로 보낸다.
+마지막으로 보낸 위치(high-water mark)부터 id 순서대로 묶어서 보내고, 실패하면 위치를
+그대로 두고 끝낸다 — 다음 실행이 같은 묶음부터 다시 보낸다. 형식은 pricehub/price_outbox.py.
+
+사용:
+    python manage.py dispatch_price_changes
+    python manage.py dispatch_price_changes --batch-size 200 --prune-days 30
+
+cron 예 (1분마다):
+    * * * * * cd /srv/pricehub && venv/bin/python manage.py dispatch_price_changes --prune-days 30
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pricehub import price_outbox
+from pricehub.price_outbox import PriceChangeDeliveryError
+
+
+class Command(BaseCommand):
+    help = '판매가 변경 이벤트를 웹훅으로 보낸다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='받는 주소 (기본: PRICE_CHANGE_WEBHOOK_URL)')
+        parser.add_argument('--batch-size', type=int, default=price_outbox.BATCH_SIZE,
+                            help=f'한 번에 보낼 이벤트 수 (기본 {price_outbox.BATCH_SIZE})')
+        parser.add_argument('--max-batches', type=int, help='이번 실행에서 보낼 최대 묶음 수')
+        parser.add_argument('--prune-days', type=int,
+                            help='보낸 지 이 일수가 지난 이벤트 삭제')
+
+    def handle(self, *args, **options):
+        url = options.get('url') or settings.PRICE_CHANGE_WEBHOOK_URL
+        if not url:
+            raise CommandError('PRICE_CHANGE_WEBHOOK_URL이 설정되지 않음 (.env 확인 또는 --url)')
+
+        try:
+            sent = price_outbox.dispatch(
+                url=url, batch_size=options['batch_size'], max_batches=options.get('max_batches'),
+            )
+        except PriceChangeDeliveryError as e:
+            raise CommandError(f'{e} — 남은 이벤트 {price_outbox.pending_count()}건') from e
+
+        if sent is None:
+            self.stdout.write('다른 곳에서 전송 중 — 건너뜀')
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'{sent}건 전송 (남은 이벤트 {price_outbox.pending_count()}건)'
+            ))
+
+        if options.get('prune_days'):
+            deleted = price_outbox.prune(options['prune_days'])
+            self.stdout.write(f'보낸 지 {options["prune_days"]}일 지난 이벤트 {deleted}건 삭제')
@@ -0,0 +1,30 @@
+"""
+pricehub/management/commands/rebuild_search_index.py
+
+카드 검색 인덱스(pricehub/search_index.py)를 카드 테이블에서 통째로 다시 만든다.
+카드 save/delete 시그널이 평소에는 1건씩 갱신하지만, queryset.update()나
+스크립트의 일괄 작업(시그널이 안 나가는 경로) 뒤, 또는 최초 배포 시 실행.
+
+사용:
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --game pokemon_kr
+"""
+from django.core.management.base import BaseCommand
+
+from pricehub import search_index
+from pricehub.purchase_config import GAME_TYPE_CARD_MODEL
+
+GAME_KEYS = list(GAME_TYPE_CARD_MODEL)
+
+
+class Command(BaseCommand):
+    help = '카드 검색 인덱스(이름 bigram + 코드 토큰)를 다시 만든다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--game', choices=GAME_KEYS, help='특정 게임만 재색인')
+
+    def handle(self, *args, **options):
+        games = [options['game']] if options.get('game') else GAME_KEYS
+        for game_type in games:
+            count = search_index.rebuild(game_type)
+            self.stdout.write(self.style.SUCCESS(f'[{game_type}] 카드 {count}장 색인 완료'))
@@ -0,0 +1,33 @@
+"""
+pricehub/management/commands/refresh_expansion_stats.py
+
+확장팩 가격 통계(ExpansionPriceStats — 확장팩 상세 API의 price_stats)를 다시 계산한다.
+가격 수집 스크립트가 끝날 때 자동으로 돌지만, 오염 가격 정리처럼 가격 이력을 직접 고친
+뒤나 최초 배포 시 실행. 자세한 건 pricehub/expansion_stats.py.
+
+사용:
+    python manage.py refresh_expansion_stats
+    python manage.py refresh_expansion_stats --expansion M2
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from pricehub import expansion_stats
+from pricehub.models import Expansion
+
+
+class Command(BaseCommand):
+    help = '포켓몬 한글판 확장팩 가격 통계(전체/현재/최근 30일)를 다시 계산한다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--expansion', help='특정 확장팩 코드만')
+
+    def handle(self, *args, **options):
+        expansion_ids = None
+        if options.get('expansion'):
+            expansion_ids = list(
+                Expansion.objects.filter(code=options['expansion']).values_list('id', flat=True)
+            )
+            if not expansion_ids:
+                raise CommandError(f"확장팩 '{options['expansion']}'를 찾을 수 없습니다.")
+        count = expansion_stats.refresh(expansion_ids)
+        self.stdout.write(self.style.SUCCESS(f'확장팩 {count}개 가격 통계 갱신 완료'))
@@ -0,0 +1,46 @@
+"""
+pricehub/management/commands/refresh_store_cards.py
+
+card-controltower 매장별 카드 목록 캐시를 미리 새로 받아둔다. 대시보드 요청은 5분이
+지난 캐시를 받으면 옛 데이터를 바로 보여주고 백그라운드에서 갱신하지만(stale-while-
+revalidate), cron으로 5분보다 짧게 돌려두면 요청 쪽은 항상 신선한 캐시만 보게 된다.
+
+이미 다른 곳(요청의 백그라운드 갱신)이 받는 중인 매장은 건너뛴다 — 같은 잠금을 쓴다.
+
+사용:
+    python manage.py refresh_store_cards
+    python manage.py refresh_store_cards --store busan
+
+cron 예 (4분마다):
+    */4 * * * * cd /srv/pricehub && venv/bin/python manage.py refresh_store_cards
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pricehub import card_controltower_client
+from pricehub.card_controltower_client import CardControltowerAPIError
+
+
+class Command(BaseCommand):
+    help = 'card-controltower 매장별 카드 목록 캐시를 새로 받는다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--store', choices=list(settings.CARD_CONTROLTOWER_STORES),
+                            help='특정 매장만')
+
+    def handle(self, *args, **options):
+        stores = [options['store']] if options.get('store') else list(settings.CARD_CONTROLTOWER_STORES)
+        failed = []
+        for store in stores:
+            try:
+                refreshed = card_controltower_client.refresh_now(store)
+            except CardControltowerAPIError as e:
+                failed.append(store)
+                self.stderr.write(f'[{store}] 실패: {e}')
+                continue
+            if refreshed is None:
+                self.stdout.write(f'[{store}] 다른 곳에서 갱신 중 — 건너뜀')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'[{store}] 카드 {len(refreshed)}건 갱신'))
+        if failed:
+            raise CommandError(f'갱신 실패: {", ".join(failed)}')
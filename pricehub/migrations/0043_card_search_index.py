@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricehub', '0042_digimoncard_needs_rarity_check'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardSearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(max_length=20, verbose_name='게임 구분')),
+                ('card_id', models.PositiveIntegerField(verbose_name='카드 ID')),
+                ('name_norm', models.CharField(max_length=200, verbose_name='정규화 카드명')),
+                ('code_norm', models.CharField(max_length=100, verbose_name='정규화 상품코드')),
+                ('number_norm', models.CharField(blank=True, max_length=40, verbose_name='정규화 카드번호')),
+            ],
+            options={
+                'verbose_name': '카드 검색 인덱스',
+                'verbose_name_plural': '카드 검색 인덱스 목록',
+                'db_table': 'card_search_entry',
+                'unique_together': {('game_type', 'card_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CardSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(max_length=20, verbose_name='게임 구분')),
+                ('token', models.CharField(max_length=64, verbose_name='토큰')),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='pricehub.cardsearchentry', verbose_name='검색 인덱스')),
+            ],
+            options={
+                'verbose_name': '카드 검색 토큰',
+                'verbose_name_plural': '카드 검색 토큰 목록',
+                'db_table': 'card_search_token',
+                'indexes': [models.Index(fields=['token', 'game_type', 'entry'], name='card_search_token_b1a17d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricehub', '0043_card_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cardsearchentry',
+            name='card_number',
+            field=models.CharField(blank=True, max_length=20, verbose_name='카드번호'),
+        ),
+        migrations.AddField(
+            model_name='cardsearchentry',
+            name='expansion_code',
+            field=models.CharField(blank=True, max_length=20, verbose_name='확장팩 코드'),
+        ),
+        migrations.AddField(
+            model_name='cardsearchentry',
+            name='expansion_id',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='확장팩 ID'),
+        ),
+        migrations.AddField(
+            model_name='cardsearchentry',
+            name='expansion_name',
+            field=models.CharField(blank=True, max_length=200, verbose_name='확장팩명'),
+        ),
+        migrations.AddField(
+            model_name='cardsearchentry',
+            name='image_url',
+            field=models.URLField(blank=True, max_length=500, verbose_name='이미지 URL'),
+        ),
+        migrations.AddField(
+            model_name='cardsearchentry',
+            name='name',
+            field=models.CharField(blank=True, max_length=100, verbose_name='카드명'),
+        ),
+        migrations.AddField(
+            model_name='cardsearchentry',
+            name='rarity',
+            field=models.CharField(blank=True, max_length=20, verbose_name='레어도'),
+        ),
+        migrations.AddField(
+            model_name='cardsearchentry',
+            name='shop_product_code',
+            field=models.CharField(blank=True, db_index=True, max_length=50, verbose_name='상품코드'),
+        ),
+        migrations.AddIndex(
+            model_name='cardsearchentry',
+            index=models.Index(fields=['game_type', 'expansion_id'], name='card_search_game_ty_7f8280_idx'),
+        ),
+    ]
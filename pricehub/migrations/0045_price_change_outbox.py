@@ -0,0 +1,48 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricehub', '0044_card_search_entry_display_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceChangeCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='전송 대상')),
+                ('last_event_id', models.PositiveBigIntegerField(default=0, verbose_name='마지막 전송 이벤트 ID')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+            ],
+            options={
+                'verbose_name': '판매가 변경 전송 위치',
+                'verbose_name_plural': '판매가 변경 전송 위치 목록',
+                'db_table': 'price_change_cursor',
+            },
+        ),
+        migrations.CreateModel(
+            name='PriceChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_type', models.CharField(max_length=20, verbose_name='게임 구분')),
+                ('card_id', models.PositiveIntegerField(verbose_name='카드 ID')),
+                ('shop_product_code', models.CharField(blank=True, max_length=50, verbose_name='상품코드')),
+                ('old_price', models.PositiveIntegerField(default=0, verbose_name='변경 전 판매가')),
+                ('new_price', models.PositiveIntegerField(default=0, verbose_name='변경 후 판매가')),
+                ('source', models.CharField(max_length=20, verbose_name='변경 경로')),
+                ('changed_at', models.DateTimeField(auto_now_add=True, verbose_name='변경일시')),
+            ],
+            options={
+                'verbose_name': '판매가 변경 이벤트',
+                'verbose_name_plural': '판매가 변경 이벤트 목록',
+                'db_table': 'price_change_event',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['changed_at'], name='price_chang_changed_23b521_idx')],
+            },
+        ),
+    ]
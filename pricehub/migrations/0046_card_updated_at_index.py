@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricehub', '0045_price_change_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='digimoncard',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='수정일시'),
+        ),
+        migrations.AddField(
+            model_name='japancard',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='수정일시'),
+        ),
+        migrations.AddField(
+            model_name='onepiececard',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='수정일시'),
+        ),
+        migrations.AlterField(
+            model_name='card',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='수정일시'),
+        ),
+    ]
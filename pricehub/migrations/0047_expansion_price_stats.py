@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricehub', '0046_card_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpansionPriceStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('min_price', models.PositiveIntegerField(blank=True, null=True, verbose_name='전체 최저가')),
+                ('max_price', models.PositiveIntegerField(blank=True, null=True, verbose_name='전체 최고가')),
+                ('avg_price', models.PositiveIntegerField(blank=True, null=True, verbose_name='전체 평균가')),
+                ('total_records', models.PositiveIntegerField(default=0, verbose_name='전체 가격 기록 수')),
+                ('current_min_price', models.PositiveIntegerField(blank=True, null=True, verbose_name='현재 최저가')),
+                ('current_max_price', models.PositiveIntegerField(blank=True, null=True, verbose_name='현재 최고가')),
+                ('current_avg_price', models.PositiveIntegerField(blank=True, null=True, verbose_name='현재 평균가')),
+                ('current_total_records', models.PositiveIntegerField(default=0, verbose_name='현재 시장가 있는 카드 수')),
+                ('recent_min_price', models.PositiveIntegerField(blank=True, null=True, verbose_name='최근 30일 최저가')),
+                ('recent_max_price', models.PositiveIntegerField(blank=True, null=True, verbose_name='최근 30일 최고가')),
+                ('recent_avg_price', models.PositiveIntegerField(blank=True, null=True, verbose_name='최근 30일 평균가')),
+                ('recent_total_records', models.PositiveIntegerField(default=0, verbose_name='최근 30일 가격 기록 수')),
+                ('computed_at', models.DateTimeField(verbose_name='계산일시')),
+                ('expansion', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='price_summary', to='pricehub.expansion', verbose_name='확장팩')),
+            ],
+            options={
+                'verbose_name': '포켓몬 한글판 확장팩 가격 통계',
+                'verbose_name_plural': '포켓몬 한글판 확장팩 가격 통계 목록',
+                'db_table': 'expansion_price_stats',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricehub', '0047_expansion_price_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expansionpricestats',
+            name='source_version',
+            field=models.CharField(blank=True, help_text='계산할 때의 확장팩 목록 캐시 버전(list_cache) — 가격/카드가 저장되면 버전이 바뀌어 다음 조회가 다시 계산한다.', max_length=100, verbose_name='계산 시점 목록 버전'),
+        ),
+    ]
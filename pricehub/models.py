@@ -7,6 +7,67 @@ from django.utils import timezone
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 
+
+# 변경분 동기화(/api/<게임>/cards/changes/) 대상 필드 — 이 중 하나라도 값이 바뀌어 저장되면
+# updated_at이 올라간다. 즐겨찾기·수집 raw_data·일괄 설정 임시값처럼 외부에 안 나가는 필드만
+# 바꾼 저장은 올리지 않는다(가격 수집은 매일 전 카드를 저장하지만 시장가가 같으면 그대로).
+SYNC_TRACKED_FIELDS = (
+    'expansion', 'card_number', 'name', 'rarity', 'shop_product_code', 'image_url',
+    'selling_price', 'latest_market_price',
+)
+_SYNC_ATTNAMES = {}
+
+
+class SyncTrackedCard(models.Model):
+    """
+    카드 모델 공통 — 변경분 동기화용 updated_at(인덱스).
+
+    auto_now는 save(update_fields=[...])에 updated_at이 없으면 안 올라가고, 수집 스크립트·
+    판매가 저장은 전부 update_fields를 쓴다. 그래서 DB에서 읽은 시점의 추적 필드 값을 기억해
+    두고, update_fields 저장에서 그중 하나라도 실제로 바뀌었으면 updated_at을 끼워 넣는다.
+    queryset.update()/bulk_update()는 호출부에서 updated_at을 직접 같이 넣는다.
+    """
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name='수정일시')
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def _sync_attnames(cls):
+        # 일본판엔 latest_market_price가 없는 등 모델마다 조금씩 다르다 — 모델별로 한 번만 계산
+        attnames = _SYNC_ATTNAMES.get(cls)
+        if attnames is None:
+            fields = {f.name: f.attname for f in cls._meta.concrete_fields}
+            attnames = _SYNC_ATTNAMES[cls] = [fields[n] for n in SYNC_TRACKED_FIELDS if n in fields]
+        return attnames
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # .only()로 미룬 필드는 __dict__에 없다 — 건드리면 추가 쿼리가 나가므로 있는 것만
+        instance._sync_loaded = {
+            attname: instance.__dict__[attname]
+            for attname in cls._sync_attnames() if attname in instance.__dict__
+        }
+        return instance
+
+    def _sync_fields_changed(self, update_fields):
+        loaded = getattr(self, '_sync_loaded', {})
+        for name in set(update_fields) & set(SYNC_TRACKED_FIELDS):
+            attname = self._meta.get_field(name).attname
+            if attname not in loaded or loaded[attname] != getattr(self, attname):
+                return True
+        return False
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'updated_at' not in update_fields \
+                and self._sync_fields_changed(update_fields):
+            kwargs['update_fields'] = [*update_fields, 'updated_at']
+        super().save(*args, **kwargs)
+        self._sync_loaded = {attname: getattr(self, attname) for attname in self._sync_attnames()}
+
+
 class Expansion(models.Model):
     """확장팩 모델"""
     code = models.CharField(
@@ -48,7 +109,7 @@ class Expansion(models.Model):
         return f"{self.code} - {self.name}"
 
 
-class Card(models.Model):
+class Card(SyncTrackedCard):
     """싱글카드 모델"""
     
     RARITY_CHOICES = [
@@ -115,10 +176,6 @@ class Card(models.Model):
         auto_now_add=True,
         verbose_name='생성일시'
     )
-    updated_at = models.DateTimeField(
-        auto_now=True,
-        verbose_name='수정일시'
-    )
     selling_price = models.PositiveIntegerField(
         default=0,
         verbose_name='판매가',
@@ -206,7 +263,49 @@ class CardPrice(models.Model):
 
     def __str__(self):
         return f"{self.card.name} - {self.price}원 ({self.collected_at.strftime('%Y-%m-%d %H:%M')})"
-    
+
+
+class ExpansionPriceStats(models.Model):
+    """
+    확장팩 가격 통계 요약 — 수집이 끝날 때 확장팩마다 한 행을 다시 계산해 둔다
+    (pricehub/expansion_stats.py). 확장팩 상세 API가 가격 이력 전체를 집계하지 않고 이 행을
+    그대로 읽는다. 구간: 전체 이력 / 현재(카드별 최신 시장가) / 최근 30일.
+    """
+    expansion = models.OneToOneField(
+        Expansion,
+        on_delete=models.CASCADE,
+        related_name='price_summary',
+        verbose_name='확장팩'
+    )
+    min_price = models.PositiveIntegerField(null=True, blank=True, verbose_name='전체 최저가')
+    max_price = models.PositiveIntegerField(null=True, blank=True, verbose_name='전체 최고가')
+    avg_price = models.PositiveIntegerField(null=True, blank=True, verbose_name='전체 평균가')
+    total_records = models.PositiveIntegerField(default=0, verbose_name='전체 가격 기록 수')
+    current_min_price = models.PositiveIntegerField(null=True, blank=True, verbose_name='현재 최저가')
+    current_max_price = models.PositiveIntegerField(null=True, blank=True, verbose_name='현재 최고가')
+    current_avg_price = models.PositiveIntegerField(null=True, blank=True, verbose_name='현재 평균가')
+    current_total_records = models.PositiveIntegerField(default=0, verbose_name='현재 시장가 있는 카드 수')
+    recent_min_price = models.PositiveIntegerField(null=True, blank=True, verbose_name='최근 30일 최저가')
+    recent_max_price = models.PositiveIntegerField(null=True, blank=True, verbose_name='최근 30일 최고가')
+    recent_avg_price = models.PositiveIntegerField(null=True, blank=True, verbose_name='최근 30일 평균가')
+    recent_total_records = models.PositiveIntegerField(default=0, verbose_name='최근 30일 가격 기록 수')
+    computed_at = models.DateTimeField(verbose_name='계산일시')
+    source_version = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='계산 시점 목록 버전',
+        help_text='계산할 때의 확장팩 목록 캐시 버전(list_cache) — 가격/카드가 저장되면 버전이 '
+                  '바뀌어 다음 조회가 다시 계산한다.'
+    )
+
+    class Meta:
+        db_table = 'expansion_price_stats'
+        verbose_name = '포켓몬 한글판 확장팩 가격 통계'
+        verbose_name_plural = '포켓몬 한글판 확장팩 가격 통계 목록'
+
+    def __str__(self):
+        return f"{self.expansion_id} 가격 통계 ({self.computed_at:%Y-%m-%d %H:%M})"
+
 
 # ==================== 원피스 카드 모델 ====================
 
@@ -228,7 +327,7 @@ class OnePieceExpansion(models.Model):
         return f"{self.name} ({self.code})"
 
 
-class OnePieceCard(models.Model):
+class OnePieceCard(SyncTrackedCard):
     """원피스 카드"""
     RARITY_CHOICES = [
         ('SEC', 'SEC'),
@@ -355,7 +454,7 @@ class JapanExpansion(models.Model):
         return f"{self.name} ({self.code})"
 
 
-class JapanCard(models.Model):
+class JapanCard(SyncTrackedCard):
     """포켓몬 일본판 카드"""
     RARITY_CHOICES = [
         ('MUR', 'MUR'),
@@ -448,7 +547,7 @@ class DigimonExpansion(models.Model):
         return f"{self.name} ({self.code})"
 
 
-class DigimonCard(models.Model):
+class DigimonCard(SyncTrackedCard):
     """디지몬 한글판 카드"""
     RARITY_CHOICES = [
         ('SEC', 'SEC'),
@@ -555,6 +654,114 @@ class DigimonCardPrice(models.Model):
         return f"{self.card.name} - {self.price}원 ({self.collected_at.strftime('%Y-%m-%d')})"
 
 
+# ==================== 카드 검색 인덱스 ====================
+# 카드명/카드번호/상품코드 검색용 역색인. name__icontains('%피카%')는 인덱스를
+# 못 타서 카드 테이블 전체를 훑으므로, 카드 저장 시점에 정규화한 토큰(이름 bigram
+# + 상품코드/카드번호 조각)을 미리 만들어 두고 토큰 인덱스로 후보를 좁힌다.
+# 인덱스 갱신은 pricehub/signals.py, 토큰 생성·검색은 pricehub/search_index.py 참고.
+
+class CardSearchEntry(models.Model):
+    """
+    카드 1장 = 검색 인덱스 1행 (게임 구분 + 카드 ID로 원본 카드를 가리킨다).
+
+    전 게임 통합 검색/상품코드 조회가 카드 테이블 4개를 차례로 뒤지지 않도록
+    표시용 필드(카드명·레어도·이미지·확장팩)를 비정규화해서 같이 들고 있다.
+    가격처럼 자주 바뀌는 값은 담지 않는다 — 카드 테이블 캐시 컬럼에서 읽는다.
+    """
+    game_type = models.CharField(max_length=20, verbose_name='게임 구분')
+    card_id = models.PositiveIntegerField(verbose_name='카드 ID')
+    name_norm = models.CharField(max_length=200, verbose_name='정규화 카드명')
+    code_norm = models.CharField(max_length=100, verbose_name='정규화 상품코드')
+    number_norm = models.CharField(max_length=40, blank=True, verbose_name='정규화 카드번호')
+
+    shop_product_code = models.CharField(max_length=50, blank=True, db_index=True, verbose_name='상품코드')
+    name = models.CharField(max_length=100, blank=True, verbose_name='카드명')
+    card_number = models.CharField(max_length=20, blank=True, verbose_name='카드번호')
+    rarity = models.CharField(max_length=20, blank=True, verbose_name='레어도')
+    image_url = models.URLField(max_length=500, blank=True, verbose_name='이미지 URL')
+    expansion_id = models.PositiveIntegerField(null=True, blank=True, verbose_name='확장팩 ID')
+    expansion_code = models.CharField(max_length=20, blank=True, verbose_name='확장팩 코드')
+    expansion_name = models.CharField(max_length=200, blank=True, verbose_name='확장팩명')
+
+    class Meta:
+        db_table = 'card_search_entry'
+        verbose_name = '카드 검색 인덱스'
+        verbose_name_plural = '카드 검색 인덱스 목록'
+        unique_together = [['game_type', 'card_id']]
+        indexes = [
+            models.Index(fields=['game_type', 'expansion_id']),
+        ]
+
+    def __str__(self):
+        return f"[{self.game_type}] {self.card_id} {self.name_norm}"
+
+
+class CardSearchToken(models.Model):
+    """검색 토큰 — 'n:' 접두사는 이름 bigram, 'c:' 접두사는 코드 조각"""
+    entry = models.ForeignKey(
+        CardSearchEntry, on_delete=models.CASCADE,
+        related_name='tokens', verbose_name='검색 인덱스'
+    )
+    game_type = models.CharField(max_length=20, verbose_name='게임 구분')
+    token = models.CharField(max_length=64, verbose_name='토큰')
+
+    class Meta:
+        db_table = 'card_search_token'
+        verbose_name = '카드 검색 토큰'
+        verbose_name_plural = '카드 검색 토큰 목록'
+        indexes = [
+            models.Index(fields=['token', 'game_type', 'entry']),
+        ]
+
+    def __str__(self):
+        return self.token
+
+
+# ==================== 판매가 변경 아웃박스 ====================
+class PriceChangeEvent(models.Model):
+    """
+    판매가 변경 1건 (아웃박스). 판매가를 바꾸는 화면(/set-price/, 일괄 판매가 설정·승인·편집,
+    판매가 초기화)이 같은 트랜잭션 안에서 기록하고, dispatch_price_changes 명령이 id 순서대로
+    묶어서 웹훅으로 보낸다 — card-controltower 같은 하위 시스템이 카탈로그 전체를 다시 읽지
+    않고 바뀐 것만 받아가게. 자세한 건 pricehub/price_outbox.py.
+    """
+    game_type = models.CharField(max_length=20, verbose_name='게임 구분')
+    card_id = models.PositiveIntegerField(verbose_name='카드 ID')
+    shop_product_code = models.CharField(max_length=50, blank=True, verbose_name='상품코드')
+    old_price = models.PositiveIntegerField(default=0, verbose_name='변경 전 판매가')
+    new_price = models.PositiveIntegerField(default=0, verbose_name='변경 후 판매가')
+    source = models.CharField(max_length=20, verbose_name='변경 경로')
+    changed_at = models.DateTimeField(auto_now_add=True, verbose_name='변경일시')
+
+    class Meta:
+        db_table = 'price_change_event'
+        verbose_name = '판매가 변경 이벤트'
+        verbose_name_plural = '판매가 변경 이벤트 목록'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['changed_at']),
+        ]
+
+    def __str__(self):
+        return f"[{self.game_type}] {self.card_id} {self.old_price}→{self.new_price} ({self.source})"
+
+
+class PriceChangeCursor(models.Model):
+    """웹훅 전송 위치(high-water mark) — 이 id까지는 받는 쪽이 200으로 확인함"""
+    name = models.CharField(max_length=50, unique=True, verbose_name='전송 대상')
+    last_event_id = models.PositiveBigIntegerField(default=0, verbose_name='마지막 전송 이벤트 ID')
+    last_error = models.TextField(blank=True, verbose_name='마지막 오류')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일시')
+
+    class Meta:
+        db_table = 'price_change_cursor'
+        verbose_name = '판매가 변경 전송 위치'
+        verbose_name_plural = '판매가 변경 전송 위치 목록'
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_event_id}"
+
+
 # ==================== API KEY 발급 - 외부 프로그램 접근 허용 ====================
 class APIKey(models.Model):
     """
@@ -0,0 +1,248 @@
+"""
+pricehub/price_outbox.py
+
+판매가 변경 아웃박스 — PriceHub 판매가가 바뀔 때마다 (카드, 변경 전, 변경 후, 시각)을
+PriceChangeEvent로 남기고, dispatch()가 id 순서대로 묶어서 웹훅으로 보낸다.
+
+지금은 가격 차이를 찾으려고 card-controltower가 PriceHub 판매가를 통째로 다시 읽고,
+PriceHub는 card-controltower 카드 목록 전체(매장당 1만 건 이상)를 다시 받는다. 바뀐
+것만 밀어주면 하위 시스템은 카탈로그 크기가 아니라 변경 건수만큼만 일하면 된다.
+
+기록:
+    판매가를 바꾸는 화면(views._set_price, 일괄 판매가 설정/승인/편집, 판매가 초기화)이
+    판매가 저장과 같은 트랜잭션 안에서 record()를 부른다 — 저장은 됐는데 이벤트가 빠지거나,
+    롤백됐는데 이벤트만 남는 일이 없다. 값이 그대로인 저장은 남기지 않는다.
+    수집 스크립트나 admin처럼 이 경로를 안 거치는 변경은 기록되지 않는다.
+
+전송(python manage.py dispatch_price_changes, cron):
+    PRICE_CHANGE_WEBHOOK_URL로 POST (JSON)
+        {"events": [{"id", "game_type", "card_id", "shop_product_code",
+                     "old_price", "new_price", "source", "changed_at"}, ...],
+         "high_water_mark": <이 묶음 마지막 id>}
+    PRICE_CHANGE_WEBHOOK_SECRET이 있으면 본문 HMAC-SHA256을
+    X-PriceHub-Signature: sha256=<hex> 헤더로 붙인다.
+
+    2xx를 받으면 PriceChangeCursor.last_event_id(high-water mark)를 그 묶음 마지막 id로
+    올린다. 네트워크 오류/5xx/429는 짧게 몇 번 재시도하고, 그래도 실패하면 위치를 그대로 두고
+    멈춘다 — 다음 실행이 같은 묶음부터 다시 보낸다. 그래서 전달은 "최소 한 번"이고, 받는 쪽은
+    이벤트 id로 중복을 걸러야 한다.
+
+    id는 INSERT 때 매겨지고 보이는 건 커밋 때라, 긴 트랜잭션(판매가 초기화처럼 이벤트를
+    한꺼번에 쓰는 경우)이 잡은 id N보다 짧은 트랜잭션의 N+1이 먼저 보일 수 있다. 그때 N+1을
+    보내고 위치를 넘기면 N은 영영 안 나간다. 그래서 기록된 지 _DISPATCH_SETTLE이 안 지난
+    이벤트 앞에서 묶음을 끊고 다음 실행에 넘긴다(cards/changes/ API의 _CHANGES_SETTLE과 같은
+    방식) — 이벤트를 기록하는 트랜잭션은 그보다 짧아야 한다.
+"""
+import hashlib
+import hmac
+import itertools
+import json
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import PriceChangeCursor, PriceChangeEvent
+from .purchase_config import GAME_TYPE_CARD_MODEL
+
+logger = logging.getLogger(__name__)
+
+# 변경 경로(PriceChangeEvent.source)
+SOURCE_SET_PRICE = 'set_price'
+SOURCE_BULK_RUN = 'bulk_run'
+SOURCE_BULK_APPROVE = 'bulk_approve'
+SOURCE_BULK_EDIT = 'bulk_edit'
+SOURCE_RESET = 'reset'
+
+CURSOR_NAME = 'webhook'
+
+BATCH_SIZE = 500
+_RECORD_BATCH_SIZE = 1000
+
+# 재시도: 1초, 2초, 4초 쉬고 다시 — 그래도 안 되면 다음 cron 실행에 맡긴다
+_DELIVERY_ATTEMPTS = 4
+_RETRY_BACKOFF = 1
+_DELIVERY_TIMEOUT = 10
+
+# 전송 잠금 — cron이 겹쳐 돌아도 같은 묶음을 두 곳에서 보내지 않게(card_controltower_client의
+# 갱신 잠금과 같은 cache.add 방식). 값은 실행마다 새 토큰이라 내 잠금일 때만 푼다. 한 번
+# 실행은 잠금이 끝나기 전에 멈추도록 묶음 하나의 최악 시간(재시도 전부 + 백오프)을 두 번
+# 남겨두고 새 묶음을 시작하지 않는다.
+_DISPATCH_LOCK_KEY = 'price-outbox:dispatch-lock'
+_DISPATCH_LOCK_TTL = 10 * 60
+_BATCH_WORST_CASE = (
+    _DELIVERY_ATTEMPTS * _DELIVERY_TIMEOUT + _RETRY_BACKOFF * (2 ** (_DELIVERY_ATTEMPTS - 1) - 1)
+)
+
+# 기록된 지 이만큼 안 지난 이벤트는 아직 안 보낸다 — 먼저 id를 받은 트랜잭션이 커밋될 시간
+_DISPATCH_SETTLE = timedelta(seconds=60)
+
+_GAME_TYPE_BY_MODEL = {model: game_type for game_type, model in GAME_TYPE_CARD_MODEL.items()}
+
+
+class PriceChangeDeliveryError(Exception):
+    """웹훅 전송 실패 (재시도 후에도 네트워크 오류/비정상 응답)"""
+
+
+def game_type_for(card_model):
+    return _GAME_TYPE_BY_MODEL[card_model]
+
+
+def record(game_type, changes, source):
+    """
+    changes: (카드 ID, 상품코드, 변경 전, 변경 후) 묶음. 값이 같은 건 건너뛴다.
+    판매가 저장과 같은 트랜잭션 안에서 부를 것. 남긴 건수를 반환.
+    """
+    events = [
+        PriceChangeEvent(
+            game_type=game_type, card_id=card_id, shop_product_code=code or '',
+            old_price=int(old or 0), new_price=int(new or 0), source=source,
+        )
+        for card_id, code, old, new in changes
+        if int(old or 0) != int(new or 0)
+    ]
+    PriceChangeEvent.objects.bulk_create(events, batch_size=_RECORD_BATCH_SIZE)
+    return len(events)
+
+
+def record_card(card, old_price, source):
+    """카드 1장 저장 뒤 — card.selling_price가 변경 후 값"""
+    return record(
+        game_type_for(type(card)),
+        [(card.pk, card.shop_product_code, old_price, card.selling_price)],
+        source,
+    )
+
+
+def reset_prices(card_qs, game_type):
+    """
+    판매가 초기화(selling_price=0) + 변경 이벤트 기록. queryset.update()는 변경 전 값을 안
+    돌려주므로 0이 아닌 카드만 먼저 읽어둔다. 실제로 바뀐 카드만 updated_at(변경분 동기화
+    API)을 올린다. 대상 카드 수를 반환.
+    """
+    with transaction.atomic():
+        count = card_qs.count()
+        before = list(
+            card_qs.exclude(selling_price=0).values_list('id', 'shop_product_code', 'selling_price')
+        )
+        card_qs.filter(pk__in=[pk for pk, _, _ in before]).update(selling_price=0, updated_at=timezone.now())
+        record(game_type, [(pk, code, old, 0) for pk, code, old in before], SOURCE_RESET)
+    return count
+
+
+# ════════════════════════════════════════════════════════════════
+# 전송
+# ════════════════════════════════════════════════════════════════
+
+def _payload(events):
+    return {
+        'events': [
+            {
+                'id': e.id,
+                'game_type': e.game_type,
+                'card_id': e.card_id,
+                'shop_product_code': e.shop_product_code,
+                'old_price': e.old_price,
+                'new_price': e.new_price,
+                'source': e.source,
+                'changed_at': e.changed_at,
+            }
+            for e in events
+        ],
+        'high_water_mark': events[-1].id,
+    }
+
+
+def _headers(body):
+    headers = {'Content-Type': 'application/json'}
+    secret = settings.PRICE_CHANGE_WEBHOOK_SECRET
+    if secret:
+        digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        headers['X-PriceHub-Signature'] = f'sha256={digest}'
+    return headers
+
+
+def _deliver(url, body):
+    """재시도 가능한 실패(네트워크/5xx/429)는 지수 백오프로 몇 번 더, 4xx는 바로 실패"""
+    headers = _headers(body)
+    error = None
+    for attempt in range(_DELIVERY_ATTEMPTS):
+        if attempt:
+            time.sleep(_RETRY_BACKOFF * 2 ** (attempt - 1))
+        try:
+            resp = requests.post(url, data=body, headers=headers, timeout=_DELIVERY_TIMEOUT)
+        except requests.RequestException as e:
+            error = f'{type(e).__name__}: {e}'
+            continue
+        if 200 <= resp.status_code < 300:
+            return
+        error = f'HTTP {resp.status_code}'
+        if resp.status_code < 500 and resp.status_code != 429:
+            break  # 받는 쪽이 거부(잘못된 서명/형식 등) — 재시도해도 같다
+    raise PriceChangeDeliveryError(f'판매가 변경 웹훅 전송 실패: {url} ({error})')
+
+
+def dispatch(url=None, batch_size=BATCH_SIZE, max_batches=None):
+    """
+    아직 안 보낸 이벤트를 batch_size씩 보낸다. 보낸 이벤트 수를 반환(다른 곳에서 전송 중이면
+    None). 한 묶음이라도 끝내 실패하면 위치를 그대로 두고 PriceChangeDeliveryError.
+    """
+    url = url or settings.PRICE_CHANGE_WEBHOOK_URL
+    token = uuid.uuid4().hex
+    if not cache.add(_DISPATCH_LOCK_KEY, token, _DISPATCH_LOCK_TTL):
+        return None
+    deadline = time.monotonic() + _DISPATCH_LOCK_TTL - 2 * _BATCH_WORST_CASE
+    try:
+        cursor, _ = PriceChangeCursor.objects.get_or_create(name=CURSOR_NAME)
+        sent = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            settled_before = timezone.now() - _DISPATCH_SETTLE
+            pending = PriceChangeEvent.objects.filter(id__gt=cursor.last_event_id).order_by('id')[:batch_size]
+            # 아직 안 정착된 첫 이벤트 앞에서 끊는다 — 그 뒤 id는 다음 실행에
+            events = list(itertools.takewhile(lambda e: e.changed_at <= settled_before, pending))
+            if not events:
+                break
+            body = json.dumps(_payload(events), cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8')
+            try:
+                _deliver(url, body)
+            except PriceChangeDeliveryError as e:
+                cursor.last_error = str(e)
+                cursor.save(update_fields=['last_error', 'updated_at'])
+                logger.warning('%s — %d번 이벤트부터 다음 실행에 다시 보냄', e, events[0].id)
+                raise
+            cursor.last_event_id = events[-1].id
+            cursor.last_error = ''
+            cursor.save(update_fields=['last_event_id', 'last_error', 'updated_at'])
+            sent += len(events)
+            batches += 1
+            if time.monotonic() > deadline:
+                break  # 나머지는 다음 실행에 — 잠금이 풀린 뒤에도 보내고 있지 않게
+        return sent
+    finally:
+        if cache.get(_DISPATCH_LOCK_KEY) == token:
+            cache.delete(_DISPATCH_LOCK_KEY)
+
+
+def pending_count():
+    cursor = PriceChangeCursor.objects.filter(name=CURSOR_NAME).first()
+    return PriceChangeEvent.objects.filter(id__gt=cursor.last_event_id if cursor else 0).count()
+
+
+def prune(days):
+    """이미 보낸 이벤트 중 days일 지난 것 삭제. 지운 건수를 반환."""
+    cursor = PriceChangeCursor.objects.filter(name=CURSOR_NAME).first()
+    if cursor is None:
+        return 0
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = PriceChangeEvent.objects.filter(
+        id__lte=cursor.last_event_id, changed_at__lt=cutoff,
+    ).delete()
+    return deleted
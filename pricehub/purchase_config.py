@@ -7,6 +7,7 @@ pricehub/purchase_config.py
 from collections import defaultdict
 
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 
 from .models import Card, JapanCard, OnePieceCard, DigimonCard, RarityPurchasePrice
 
@@ -28,6 +29,10 @@ GAME_TYPE_LABELS = {
 # 원화 고정가를 그대로 적용하기 애매하므로(통화 단위가 다름) 제외.
 RARITY_PRICE_GAME_TYPES = ['pokemon_kr', 'onepiece_kr', 'digimon_kr']
 
+# 레어도별 매입가는 관리 화면에서 가끔 바뀌고 매입가 조회마다 읽는다 — 캐시해두고 저장/삭제
+# 시그널(pricehub/signals.py)이 지운다.
+_RARITY_PRICE_CACHE_TTL = 60 * 60
+
 
 def get_card_model(game_type):
     model = GAME_TYPE_CARD_MODEL.get(game_type)
@@ -36,12 +41,24 @@ def get_card_model(game_type):
     return model
 
 
+def _rarity_price_key(game_type):
+    return f'purchase:rarity-prices:{game_type}'
+
+
 def get_rarity_price_map(game_type):
-    """{레어도: 고정 매입가} 딕셔너리. 게임 종류 전체에 공통 적용."""
-    return {
-        r.rarity: r.price
-        for r in RarityPurchasePrice.objects.filter(game_type=game_type)
-    }
+    """{레어도: 고정 매입가} 딕셔너리. 게임 종류 전체에 공통 적용. 반환값은 고치지 않는다(캐시 공유 객체)."""
+    price_map = cache.get(_rarity_price_key(game_type))
+    if price_map is None:
+        price_map = {
+            r.rarity: r.price
+            for r in RarityPurchasePrice.objects.filter(game_type=game_type)
+        }
+        cache.set(_rarity_price_key(game_type), price_map, _RARITY_PRICE_CACHE_TTL)
+    return price_map
+
+
+def invalidate_rarity_price_map(game_type):
+    cache.delete(_rarity_price_key(game_type))
 
 
 def compute_rarity_price(card, price_map):
@@ -20,6 +20,7 @@ from .purchase_config import (
     attach_cards, compute_rarity_price, get_rarity_price_map,
 )
 from .rarity_cleanup_views import RARITY_CLEANUP_GAME_TYPES
+from . import search_index
 from .views import staff_required
 
 
@@ -124,7 +125,7 @@ def purchase_list_detail(request, list_id):
 @staff_required
 @require_GET
 def purchase_list_search_cards(request, list_id):
-    """리스트에 담을 카드를 검색 (AJAX). 이름 / 카드번호 / 상품코드로 검색."""
+    """리스트에 담을 카드를 검색 (AJAX). 이름 / 카드번호 / 상품코드로 검색 (search_index, 순위순)."""
     plist = get_object_or_404(PurchaseList, pk=list_id)
     model = GAME_TYPE_CARD_MODEL.get(plist.game_type)
     if model is None:
@@ -134,15 +135,7 @@ def purchase_list_search_cards(request, list_id):
     if not q:
         return JsonResponse({'results': []})
 
-    qs = (
-        model.objects.select_related('expansion')
-        .filter(
-            Q(name__icontains=q)
-            | Q(card_number__icontains=q)
-            | Q(shop_product_code__icontains=q)
-        )
-        .order_by('name', 'card_number')[:60]
-    )
+    cards = [card for _, card in search_index.search_cards(q, game_types=[plist.game_type], limit=60)]
 
     content_type = ContentType.objects.get_for_model(model)
     existing_ids = set(
@@ -151,7 +144,7 @@ def purchase_list_search_cards(request, list_id):
 
     ratio = float(plist.default_purchase_ratio)
     results = []
-    for c in qs:
+    for c in cards:
         selling_price = getattr(c, 'selling_price', 0) or 0
         results.append({
             'id': c.id,
@@ -0,0 +1,93 @@
+"""
+pricehub/rate_limit.py
+
+API Key별 요청 빈도 제한용 토큰 버킷 — gunicorn 워커 간에 공유되는 SQLite(WAL) 파일에
+키마다 (남은 토큰, 마지막 갱신 시각) 한 행만 둔다.
+
+DRF 기본 SimpleRateThrottle은 키마다 최근 요청 시각 목록 전체(300/min이면 최대 300개)를
+캐시에 두고 요청마다 읽어서 자르고 다시 쓴다 — FileBasedCache에선 요청마다 파일 읽기 +
+unpickle + pickle + 파일 쓰기다. 토큰 버킷은 상태가 숫자 두 개라 요청당 작업량이 한도와
+상관없이 일정하고, SQLite 트랜잭션 하나(BEGIN IMMEDIATE — 워커 간 직렬화)로 끝난다.
+
+동작: 버킷 크기 = 한도(예: 300), 초당 한도/기간만큼(300/min이면 5개) 다시 찬다. 한 번에
+한도만큼 몰아 쓰면 그 뒤로는 초당 5개씩만 허용해서, 오래 보면 평균은 기간당 한도와 같다.
+시각 목록 방식의 "최근 1분에 300개"와 달리 임의의 60초 구간 한도는 아니다 — 가득 찬
+버킷에서 시작하면 60초 안에 버킷 300개 + 그동안 다시 찬 300개, 최대 약 600개(한도의 2배)가
+통과할 수 있다. 그 뒤로는 기간마다 한도만큼.
+
+DB 파일: 설정 API_THROTTLE_DB, 비어 있으면 CACHE_DIR/throttle.sqlite3. 지워도 된다
+(다음 요청이 새로 만들고, 모든 키가 가득 찬 버킷에서 다시 시작).
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+_BUSY_TIMEOUT_MS = 5000
+
+_local = threading.local()
+
+
+def db_path():
+    return str(settings.API_THROTTLE_DB or os.path.join(settings.CACHE_DIR, 'throttle.sqlite3'))
+
+
+def _connection():
+    # 스레드(워커)마다 연결 하나 — sqlite3 연결은 스레드 간 공유하면 안 된다
+    path = db_path()
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)  # FileBasedCache처럼 없으면 만든다
+        conn = sqlite3.connect(path, timeout=_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')  # WAL에선 커밋마다 fsync 안 해도 DB가 깨지지 않는다
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS bucket ('
+            ' key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL'
+            ') WITHOUT ROWID'
+        )
+        conns[path] = conn
+    return conn
+
+
+def consume(key, capacity, refill_per_second, now=None):
+    """
+    토큰 1개를 쓴다. (허용 여부, 다음 토큰까지 남은 초 — 허용이면 0) 반환.
+    capacity: 버킷 크기(한도), refill_per_second: 초당 다시 차는 토큰 수.
+    """
+    now = time.time() if now is None else now
+    conn = _connection()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        row = conn.execute('SELECT tokens, updated FROM bucket WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            tokens = float(capacity)
+        else:
+            tokens = min(float(capacity), row[0] + max(0.0, now - row[1]) * refill_per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        conn.execute(
+            'INSERT INTO bucket (key, tokens, updated) VALUES (?, ?, ?)'
+            ' ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+            (key, tokens, now),
+        )
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    return allowed, 0 if allowed else (1 - tokens) / refill_per_second
+
+
+def reset(key=None):
+    """버킷 비우기(테스트/운영 중 한도 초기화용) — key가 없으면 전부"""
+    conn = _connection()
+    if key is None:
+        conn.execute('DELETE FROM bucket')
+    else:
+        conn.execute('DELETE FROM bucket WHERE key = ?', (key,))
@@ -0,0 +1,392 @@
+"""
+pricehub/search_index.py
+
+카드명 / 카드번호 / 상품코드 검색용 역색인(CardSearchEntry + CardSearchToken).
+
+name__icontains / shop_product_code__icontains는 '%검색어%' LIKE라 인덱스를
+못 타고 카드 테이블 전체를 훑는다. 대신 카드를 저장할 때 미리 토큰을 만들어
+두고, 검색 시에는 토큰 인덱스(token, game_type, entry)로 후보만 좁힌 뒤
+파이썬에서 정확히 검증·정렬한다.
+
+토큰 종류:
+    'n:' + 이름 bigram    — 한글/일본어는 띄어쓰기·형태소가 들쭉날쭉하므로
+                           단어 단위가 아니라 글자 2개씩 자른다. 끝에 '$'를
+                           붙인 bigram도 만들어서 1글자 검색도 접두사 매칭으로 처리.
+    'c:' + 코드 조각      — 상품코드/카드번호를 구분자(-, _ 등)로 나눈 뒤
+                           각 조각부터 끝까지 이어붙인 접미 문자열.
+                           예: PKM-m2-001-K → pkmm2001k, m2001k, 001k, k
+                           → 'm2-001', '001' 처럼 중간부터 입력해도 접두사 매칭.
+
+정규화: NFKC(전각→반각) + 소문자 + 히라가나→가타카나 + 글자/숫자만 남김.
+'리자몽 ex' 와 '리자몽ex', 'ピカチュウ' 와 'ぴかちゅう' 가 같은 검색 결과를 낸다.
+
+인덱스 행에는 표시용 필드(카드명·레어도·이미지·확장팩)도 비정규화해 둬서, 전 게임
+통합 검색/상품코드 조회(card_search_views.py, api_views.py)가 카드 테이블 4개를
+차례로 뒤지지 않고 인덱스 한 곳만 본다.
+
+인덱스 유지: 카드 save/delete 시그널(pricehub/signals.py)이 1건씩 갱신하고,
+queryset.update()·스크립트 일괄 작업 뒤에는
+    python manage.py rebuild_search_index [--game pokemon_kr]
+로 전체를 다시 만든다.
+"""
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Case, Count, Q, Value, When
+from django.db.models.functions import Length
+
+from .models import CardSearchEntry, CardSearchToken
+from .purchase_config import GAME_TYPE_CARD_MODEL
+
+# 인덱스에 영향을 주는 카드 필드 — save(update_fields=[...])가 이 필드를 하나도
+# 건드리지 않으면(가격 수집·판매가 저장 등) 재색인을 건너뛴다.
+INDEXED_FIELDS = frozenset({
+    'name', 'card_number', 'shop_product_code', 'rarity', 'image_url', 'expansion', 'expansion_id',
+})
+
+# 흔한 bigram('몬스' 등)은 후보가 수천 건이 될 수 있다 — 검증·정렬할 후보 상한.
+# 상한은 SQL에서 순위대로 정렬한 뒤에 적용한다(_top_entries)
+_CANDIDATE_LIMIT = 2000
+_TOKEN_MAX_LENGTH = 64
+_REBUILD_BATCH_SIZE = 1000
+
+_CODE_SPLIT_RE = re.compile(r'[^0-9a-z]+')
+
+# 정렬 순위 — 작을수록 위
+RANK_CODE_EXACT = 0
+RANK_CODE_PREFIX = 1
+RANK_NAME_EXACT = 2
+RANK_NAME_PREFIX = 3
+RANK_NAME_CONTAINS = 4
+
+
+def _fold_kana(ch):
+    """히라가나 → 가타카나 (ぁ-ゖ → ァ-ヶ)"""
+    code = ord(ch)
+    if 0x3041 <= code <= 0x3096:
+        return chr(code + 0x60)
+    return ch
+
+
+def normalize(text):
+    """검색/색인 공통 정규화 — 글자/숫자만 남긴 소문자 문자열"""
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKC', str(text)).lower()
+    return ''.join(_fold_kana(ch) for ch in text if ch.isalnum())
+
+
+def name_tokens(name_norm):
+    """정규화된 카드명 → 'n:' bigram 토큰 집합 (마지막 글자는 '$' 패딩)"""
+    if not name_norm:
+        return set()
+    padded = name_norm + '$'
+    return {f'n:{padded[i:i + 2]}' for i in range(len(padded) - 1)}
+
+
+def code_tokens(*codes):
+    """상품코드/카드번호 → 'c:' 접미 조각 토큰 집합"""
+    tokens = set()
+    for code in codes:
+        if not code:
+            continue
+        folded = unicodedata.normalize('NFKC', str(code)).lower()
+        segments = [s for s in _CODE_SPLIT_RE.split(folded) if s]
+        for i in range(len(segments)):
+            tokens.add(('c:' + ''.join(segments[i:]))[:_TOKEN_MAX_LENGTH])
+    return tokens
+
+
+def _entry_values(card):
+    expansion = card.expansion
+    return {
+        'name_norm': normalize(card.name)[:200],
+        'code_norm': normalize(card.shop_product_code)[:100],
+        'number_norm': normalize(card.card_number)[:40],
+        'shop_product_code': card.shop_product_code or '',
+        'name': card.name or '',
+        'card_number': card.card_number or '',
+        'rarity': card.rarity or '',
+        'image_url': card.image_url or '',
+        'expansion_id': expansion.pk,
+        'expansion_code': expansion.code,
+        'expansion_name': expansion.name,
+    }
+
+
+def _tokens_for(card):
+    return name_tokens(normalize(card.name)) | code_tokens(card.shop_product_code, card.card_number)
+
+
+# ════════════════════════════════════════════════════════════════
+# 인덱스 갱신
+# ════════════════════════════════════════════════════════════════
+
+@transaction.atomic
+def index_card(game_type, card):
+    """카드 1장의 인덱스 행 + 토큰을 다시 만든다 (save 시그널에서 호출)"""
+    entry, _ = CardSearchEntry.objects.update_or_create(
+        game_type=game_type, card_id=card.pk, defaults=_entry_values(card),
+    )
+    entry.tokens.all().delete()
+    CardSearchToken.objects.bulk_create([
+        CardSearchToken(entry=entry, game_type=game_type, token=token)
+        for token in _tokens_for(card)
+    ])
+
+
+def remove_card(game_type, card_id):
+    CardSearchEntry.objects.filter(game_type=game_type, card_id=card_id).delete()
+
+
+def update_expansion(game_type, expansion):
+    """확장팩 코드/이름이 바뀌면 그 확장팩 카드들의 비정규화 필드만 일괄 갱신"""
+    CardSearchEntry.objects.filter(game_type=game_type, expansion_id=expansion.pk).update(
+        expansion_code=expansion.code, expansion_name=expansion.name,
+    )
+
+
+def rebuild(game_type):
+    """게임 하나의 인덱스를 통째로 다시 만든다. 만든 카드 수를 반환."""
+    model = GAME_TYPE_CARD_MODEL[game_type]
+    count = 0
+    with transaction.atomic():
+        CardSearchEntry.objects.filter(game_type=game_type).delete()
+        cards = (
+            model.objects.select_related('expansion')
+            .only('id', 'name', 'card_number', 'shop_product_code', 'rarity', 'image_url',
+                  'expansion__id', 'expansion__code', 'expansion__name')
+            .order_by('id')
+        )
+        batch = []
+        for card in cards.iterator(chunk_size=_REBUILD_BATCH_SIZE):
+            batch.append(card)
+            if len(batch) >= _REBUILD_BATCH_SIZE:
+                _bulk_index(game_type, batch)
+                count += len(batch)
+                batch = []
+        if batch:
+            _bulk_index(game_type, batch)
+            count += len(batch)
+    return count
+
+
+def _bulk_index(game_type, cards):
+    CardSearchEntry.objects.bulk_create([
+        CardSearchEntry(game_type=game_type, card_id=card.pk, **_entry_values(card))
+        for card in cards
+    ])
+    # MySQL bulk_create는 pk를 채워주지 않으므로 (game_type, card_id)로 다시 조회
+    entry_ids = dict(
+        CardSearchEntry.objects
+        .filter(game_type=game_type, card_id__in=[card.pk for card in cards])
+        .values_list('card_id', 'id')
+    )
+    CardSearchToken.objects.bulk_create(
+        [
+            CardSearchToken(entry_id=entry_ids[card.pk], game_type=game_type, token=token)
+            for card in cards
+            for token in _tokens_for(card)
+        ],
+        batch_size=_REBUILD_BATCH_SIZE * 4,
+    )
+
+
+# ════════════════════════════════════════════════════════════════
+# 검색
+# ════════════════════════════════════════════════════════════════
+
+def _token_qs(game_types):
+    qs = CardSearchToken.objects.all()
+    if game_types is not None:
+        qs = qs.filter(game_type__in=list(game_types))
+    return qs
+
+
+def _top_entries(token_qs, rank, **filters):
+    """
+    토큰 조건에 걸린 엔트리 id 중 순위가 높은 _CANDIDATE_LIMIT개 — 정렬을 SQL에서 한 뒤에
+    자른다(search_entries()와 같은 순서: rank → 짧은 이름 → 이름순 → 카드번호순). 정렬 없이
+    자르면 DB가 아무 순서로 준 앞쪽만 남아 완전일치가 잘려나갈 수 있다.
+    """
+    return (
+        CardSearchEntry.objects.filter(id__in=token_qs, **filters)
+        .order_by(rank, Length('name_norm'), 'name_norm', 'number_norm')
+        .values_list('id', flat=True)[:_CANDIDATE_LIMIT]
+    )
+
+
+def _name_candidates(q_norm, game_types):
+    if len(q_norm) == 1:
+        # 1글자 — 'n:X?' 접두사 ('$' 패딩 덕에 마지막 글자도 포함).
+        # 접두사 매칭은 startswith가 아니라 istartswith — MySQL에서 startswith는 'LIKE BINARY'로
+        # 번역돼 (token, ...) 인덱스 범위 스캔을 못 탄다. 토큰은 이미 소문자로 정규화돼 있어서
+        # 대소문자 무시 비교여도 결과는 같다(_code_candidates도 같은 이유).
+        token_qs = _token_qs(game_types).filter(token__istartswith=f'n:{q_norm}').values('entry_id')
+    else:
+        grams = {f'n:{q_norm[i:i + 2]}' for i in range(len(q_norm) - 1)}
+        # 검색어의 bigram을 '전부' 가진 카드만 후보 (AND)
+        token_qs = (
+            _token_qs(game_types).filter(token__in=grams)
+            .values('entry_id')
+            .annotate(matched=Count('token', distinct=True))
+            .filter(matched=len(grams))
+            .values('entry_id')
+        )
+    # 이름 완전일치 > 접두사 > 포함 순으로 정렬해 자른다 — bigram은 다 있지만 연속이 아닌
+    # 오탐은 icontains로 미리 걸러 후보 자리를 차지하지 않게
+    return _top_entries(
+        token_qs.order_by(),
+        Case(
+            When(name_norm=q_norm, then=Value(0)),
+            When(name_norm__istartswith=q_norm, then=Value(1)),
+            default=Value(2),
+        ),
+        name_norm__icontains=q_norm,
+    )
+
+
+def _code_candidates(q_norm, game_types):
+    if not q_norm.isascii():
+        return []  # 상품코드/카드번호는 영숫자뿐 — 한글/일본어 검색어는 코드 조회 생략
+    # istartswith — startswith는 MySQL에서 'LIKE BINARY'라 토큰 인덱스를 못 탄다(_name_candidates 참고)
+    token_qs = _token_qs(game_types).filter(token__istartswith=f'c:{q_norm}'[:_TOKEN_MAX_LENGTH])
+    # 코드/카드번호 완전일치가 먼저
+    return _top_entries(
+        token_qs.values('entry_id'),
+        Case(
+            When(Q(code_norm=q_norm) | Q(number_norm=q_norm), then=Value(0)),
+            default=Value(1),
+        ),
+    )
+
+
+def _rank(entry, q_norm, code_hit):
+    if q_norm in (entry.code_norm, entry.number_norm):
+        return RANK_CODE_EXACT
+    if code_hit:
+        return RANK_CODE_PREFIX
+    name = entry.name_norm
+    if name == q_norm:
+        return RANK_NAME_EXACT
+    if name.startswith(q_norm):
+        return RANK_NAME_PREFIX
+    if q_norm in name:
+        return RANK_NAME_CONTAINS
+    return None  # bigram은 다 있지만 연속된 부분 문자열은 아님 — 오탐
+
+
+def search_entries(q, game_types=None, limit=30):
+    """
+    검색어 → 순위순 CardSearchEntry 목록 (최대 limit개).
+
+    game_types: None이면 전체 게임, 아니면 해당 game_type들만.
+    순위: 코드 완전일치 > 코드 접두사 > 이름 완전일치 > 이름 접두사 > 이름 포함,
+    같은 순위 안에서는 짧은 이름 → 이름순 → 카드번호순.
+    """
+    q_norm = normalize(q)
+    if not q_norm:
+        return []
+
+    code_ids = set(_code_candidates(q_norm, game_types))
+    candidate_ids = code_ids | set(_name_candidates(q_norm, game_types))
+    if not candidate_ids:
+        return []
+
+    ranked = []
+    for entry in CardSearchEntry.objects.filter(id__in=candidate_ids):
+        rank = _rank(entry, q_norm, entry.id in code_ids)
+        if rank is None:
+            continue
+        ranked.append(((rank, len(entry.name_norm), entry.name_norm, entry.number_norm), entry))
+    ranked.sort(key=lambda row: row[0])
+    return [entry for _, entry in ranked[:limit]]
+
+
+def search(q, game_types=None, limit=30):
+    """검색어 → [(game_type, card_id), ...] (순위순, 최대 limit개) — search_entries() 참고"""
+    return [(e.game_type, e.card_id) for e in search_entries(q, game_types=game_types, limit=limit)]
+
+
+def resolve_code(code, game_types=None):
+    """
+    상품코드 → CardSearchEntry 목록. 카드 테이블 4개를 차례로 조회하는 대신
+    인덱스의 shop_product_code(인덱스 컬럼) 한 번으로 끝난다. 상품코드는 게임 안에서
+    유일하지만 게임끼리 겹칠 수도 있어서 목록으로 돌려준다.
+    """
+    code = (code or '').strip()
+    if not code:
+        return []
+    qs = CardSearchEntry.objects.filter(shop_product_code=code)
+    if game_types is not None:
+        qs = qs.filter(game_type__in=list(game_types))
+    return list(qs.order_by('game_type'))
+
+
+def cached_prices(entries):
+    """
+    {(game_type, card_id): {'selling_price', 'latest_market_price'}} — 카드 테이블
+    캐시 컬럼에서 게임당 쿼리 1번. 0원(미설정)은 None으로 통일.
+    """
+    ids_by_game = {}
+    for entry in entries:
+        ids_by_game.setdefault(entry.game_type, []).append(entry.card_id)
+
+    prices = {}
+    for game_type, ids in ids_by_game.items():
+        model = GAME_TYPE_CARD_MODEL[game_type]
+        fields = ['id', 'selling_price']
+        if any(f.name == 'latest_market_price' for f in model._meta.concrete_fields):
+            fields.append('latest_market_price')
+        for row in model.objects.filter(pk__in=ids).order_by().values(*fields):
+            prices[(game_type, row['id'])] = {
+                'selling_price': row['selling_price'] or None,
+                'latest_market_price': row.get('latest_market_price'),
+            }
+    return prices
+
+
+def entry_to_dict(entry, prices=None):
+    """통합 검색/조회 응답 1건 — game 키로 어느 게임 카드인지 표시"""
+    price = (prices or {}).get((entry.game_type, entry.card_id))
+    data = {
+        'game': entry.game_type,
+        'id': entry.card_id,
+        'name': entry.name,
+        'card_number': entry.card_number,
+        'rarity': entry.rarity,
+        'shop_product_code': entry.shop_product_code,
+        'image_url': entry.image_url,
+        'expansion': {'code': entry.expansion_code, 'name': entry.expansion_name},
+    }
+    if prices is not None:
+        data['selling_price'] = price['selling_price'] if price else None
+        data['latest_market_price'] = price['latest_market_price'] if price else None
+    return data
+
+
+def search_cards(q, game_types=None, limit=30):
+    """
+    search() 결과를 실제 카드 객체로 — [(game_type, card), ...] (순위 유지).
+
+    게임마다 pk__in 쿼리 1번(+expansion select_related)이라 결과 수와 무관하게
+    쿼리 수가 일정하다. 가격은 카드 테이블의 캐시 컬럼(selling_price /
+    latest_market_price)을 그대로 쓰면 된다 — 가격 히스토리를 건드리지 않는다.
+    """
+    hits = search(q, game_types=game_types, limit=limit)
+    ids_by_game = {}
+    for game_type, card_id in hits:
+        ids_by_game.setdefault(game_type, []).append(card_id)
+
+    cards_by_key = {}
+    for game_type, ids in ids_by_game.items():
+        model = GAME_TYPE_CARD_MODEL[game_type]
+        qs = model.objects.select_related('expansion').filter(pk__in=ids).order_by()
+        if any(f.name == 'latest_raw_data' for f in model._meta.concrete_fields):
+            qs = qs.defer('latest_raw_data')  # 검색 결과에는 안 쓰는 큰 JSON 컬럼
+        for card in qs:
+            cards_by_key[(game_type, card.pk)] = card
+
+    # 인덱스가 늦게 갱신돼 이미 삭제된 카드는 조용히 빠진다
+    return [(key[0], cards_by_key[key]) for key in hits if key in cards_by_key]
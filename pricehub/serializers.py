@@ -4,7 +4,10 @@ pricehub/serializers.py
 selling_price 필드 추가.
 외부 카드 관리 프로그램이 이 값을 받아 바로 판매가로 사용.
 """
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from rest_framework import serializers
+from . import expansion_stats
 from .models import Expansion, Card, CardPrice
 from .models import OnePieceExpansion, OnePieceCard
 from .models import DigimonExpansion, DigimonCard
@@ -12,9 +15,63 @@ from .models import JapanExpansion, JapanCard
 from .models import PurchaseList, PurchaseListItem
 
 
+# ── 필드 고르기 (?fields= / ?exclude=) ───────────────────────
+
+def _field_names(request, param, path):
+    """쿼리 파라미터(쉼표 구분)에서 path 단계의 이름만 — 중첩은 점으로(naver_price_history.price)"""
+    names = set()
+    prefix = f'{path}.' if path else ''
+    for part in request.query_params.get(param, '').split(','):
+        part = part.strip()
+        if not part.startswith(prefix):
+            continue
+        part = part[len(prefix):]
+        if param == 'fields':
+            names.add(part.split('.', 1)[0])  # 'a.b'를 고르면 부모 a는 남긴다
+        elif '.' not in part:
+            names.add(part)
+    return {name for name in names if name}
+
+
+class FieldSelectionMixin:
+    """
+    API 응답 필드 고르기 — ?fields=id,name 이면 그 필드만, ?exclude=raw_data 면 그 필드를 뺀다.
+    중첩 직렬화(카드 상세의 naver_price_history 등)는 점으로: ?exclude=naver_price_history.raw_data.
+    없는 이름은 무시. 요청이 없는 내부 직렬화에는 적용하지 않는다.
+
+    list_default_exclude: 목록 엔드포인트(최상위 many=True)에서는 ?fields=로 직접 고를 때만
+    나가는 무거운 필드(raw_data 등).
+    """
+    list_default_exclude = ()
+
+    def __init__(self, *args, field_path='', **kwargs):
+        self._field_path = field_path
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None:
+            return fields
+        wanted = _field_names(request, 'fields', self._field_path)
+        dropped = _field_names(request, 'exclude', self._field_path)
+        is_list_root = (
+            not self._field_path and isinstance(self.parent, serializers.ListSerializer)
+            and self.parent.parent is None
+        )
+        if is_list_root:
+            dropped |= set(self.list_default_exclude) - wanted
+        for name in list(fields):
+            if (wanted and name not in wanted) or name in dropped:
+                del fields[name]
+        return fields
+
+
 # ── CardPrice ────────────────────────────────────────────────
 
-class CardPriceSerializer(serializers.ModelSerializer):
+class CardPriceSerializer(FieldSelectionMixin, serializers.ModelSerializer):
+    list_default_exclude = ('raw_data',)
+
     class Meta:
         model = CardPrice
         fields = ['id', 'price', 'source', 'raw_data', 'collected_at']
@@ -28,7 +85,40 @@ class CardPriceLatestSerializer(serializers.ModelSerializer):
 
 # ── Card ─────────────────────────────────────────────────────
 
-class CardListSerializer(serializers.ModelSerializer):
+def attach_latest_prices(cards):
+    """
+    카드 목록에 최신 가격 행(price/source/collected_at)을 _latest_price로 붙인다 — 카드마다
+    prices를 조회하지 않고 ROW_NUMBER() 윈도 쿼리 1번. raw_data는 읽지 않는다(용량 큼).
+    가격이 없는 카드는 None.
+    """
+    if not cards:
+        return cards
+    price_model = type(cards[0])._meta.get_field('prices').related_model
+    rows = (
+        price_model.objects.filter(card_id__in=[c.pk for c in cards])
+        .annotate(rank=Window(
+            RowNumber(), partition_by=F('card_id'), order_by=[F('collected_at').desc(), F('id').desc()],
+        ))
+        .filter(rank=1)
+        .values('card_id', 'price', 'source', 'collected_at')
+    )
+    latest = {row.pop('card_id'): row for row in rows}
+    for card in cards:
+        card._latest_price = latest.get(card.pk)
+    return cards
+
+
+class CardListListSerializer(serializers.ListSerializer):
+    """many=True 목록 — 직렬화 전에 attach_latest_prices로 최신 가격을 한 번에 붙인다"""
+
+    def to_representation(self, data):
+        cards = list(data.all() if hasattr(data, 'all') else data)
+        if 'latest_price' in self.child.fields:  # ?exclude=latest_price면 쿼리도 안 한다
+            attach_latest_prices(cards)
+        return super().to_representation(cards)
+
+
+class CardListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """
     카드 목록용.
     selling_price: 관리자가 설정한 판매가 → 외부 프로그램에서 바로 사용.
@@ -47,15 +137,18 @@ class CardListSerializer(serializers.ModelSerializer):
             'latest_price',         # ← 최신 시장가 (네이버)
             'latest_market_price',  # ← 매일 갱신되는 시장 최저가 캐시
         ]
+        list_serializer_class = CardListListSerializer
 
     def get_latest_price(self, obj):
-        # card_id + collected_at 인덱스를 타는 단건 조회 — 카드당 가격 이력이
-        # 수백 건씩 쌓여도(raw_data까지 포함해 용량이 큼) 전체를 안 불러온다.
+        if hasattr(obj, '_latest_price'):  # 목록 — CardListListSerializer가 한 번에 붙여둔 값
+            latest = obj._latest_price
+            return CardPriceLatestSerializer(latest).data if latest else None
+        # 단건 — card_id + collected_at 인덱스를 타는 조회 1번
         latest = obj.prices.order_by('-collected_at').first()
         return CardPriceLatestSerializer(latest).data if latest else None
 
 
-class CardDetailSerializer(serializers.ModelSerializer):
+class CardDetailSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """
     카드 상세용.
     naver_price_history
@@ -79,12 +172,18 @@ class CardDetailSerializer(serializers.ModelSerializer):
 
     def get_naver_price_history(self, obj):
         limit = self.context.get('price_limit', 30)
-        return CardPriceSerializer(obj.prices.all()[:limit], many=True).data
+        serializer = CardPriceSerializer(
+            many=True, context=self.context, field_path='naver_price_history',
+        )
+        prices = obj.prices.all()
+        if 'raw_data' not in serializer.child.fields:
+            prices = prices.defer('raw_data')  # 안 내보낼 거면 DB에서도 안 읽는다(용량 큼)
+        return serializer.to_representation(prices[:limit])
 
 
 # ── Expansion ────────────────────────────────────────────────
 
-class ExpansionListSerializer(serializers.ModelSerializer):
+class ExpansionListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     card_count = serializers.IntegerField(read_only=True)
 
     class Meta:
@@ -92,7 +191,7 @@ class ExpansionListSerializer(serializers.ModelSerializer):
         fields = ['id', 'code', 'name', 'image_url', 'release_date', 'card_count']
 
 
-class ExpansionDetailSerializer(serializers.ModelSerializer):
+class ExpansionDetailSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     card_count = serializers.IntegerField(read_only=True)
     price_stats = serializers.SerializerMethodField()
 
@@ -104,22 +203,16 @@ class ExpansionDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_price_stats(self, obj):
-        from django.db.models import Min, Max, Avg, Count
-        stats = CardPrice.objects.filter(card__expansion=obj).aggregate(
-            min_price=Min('price'), max_price=Max('price'),
-            avg_price=Avg('price'), total_records=Count('id'),
-        )
-        if stats['avg_price']:
-            stats['avg_price'] = round(stats['avg_price'])
-        return stats
+        # 수집 때 계산해 둔 요약 행(expansion_stats) — 가격 이력 전체를 집계하지 않는다
+        return expansion_stats.as_dict(expansion_stats.for_expansion(obj))
 
-class OnePieceExpansionListSerializer(serializers.ModelSerializer):
+class OnePieceExpansionListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     card_count = serializers.IntegerField(read_only=True)
     class Meta:
         model = OnePieceExpansion
         fields = ['id', 'code', 'name', 'image_url', 'release_date', 'card_count']
 
-class OnePieceCardListSerializer(serializers.ModelSerializer):
+class OnePieceCardListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     expansion = serializers.SerializerMethodField()
     class Meta:
         model = OnePieceCard
@@ -129,14 +222,14 @@ class OnePieceCardListSerializer(serializers.ModelSerializer):
         return {'code': obj.expansion.code, 'name': obj.expansion.name}
 
 
-class DigimonExpansionListSerializer(serializers.ModelSerializer):
+class DigimonExpansionListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     card_count = serializers.IntegerField(read_only=True)
     class Meta:
         model = DigimonExpansion
         fields = ['id', 'code', 'name', 'image_url', 'release_date', 'card_count']
 
 
-class DigimonCardListSerializer(serializers.ModelSerializer):
+class DigimonCardListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     expansion = serializers.SerializerMethodField()
     class Meta:
         model = DigimonCard
@@ -149,14 +242,14 @@ class DigimonCardListSerializer(serializers.ModelSerializer):
         return {'code': obj.expansion.code, 'name': obj.expansion.name}
 
 
-class JapanExpansionListSerializer(serializers.ModelSerializer):
+class JapanExpansionListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     card_count = serializers.IntegerField(read_only=True)
     class Meta:
         model = JapanExpansion
         fields = ['id', 'code', 'name', 'image_url', 'release_date', 'card_count']
 
 
-class JapanCardListSerializer(serializers.ModelSerializer):
+class JapanCardListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     expansion = serializers.SerializerMethodField()
     class Meta:
         model = JapanCard
@@ -171,7 +264,7 @@ class JapanCardListSerializer(serializers.ModelSerializer):
 # ── 매입리스트 ───────────────────────────────────────────────
 # 외부 프로그램이 카드 목록/이미지/카드 정보/매입가를 받아갈 때 사용.
 
-class PurchaseListItemSerializer(serializers.ModelSerializer):
+class PurchaseListItemSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     """
     매입리스트 항목 — 외부 연동용.
     카드 정보(이름/번호/레어도/이미지/확장팩), 판매가, 매입가를 함께 제공한다.
@@ -238,7 +331,7 @@ class PurchaseListItemSerializer(serializers.ModelSerializer):
         return price if price else None
 
 
-class PurchaseListSerializer(serializers.ModelSerializer):
+class PurchaseListSerializer(FieldSelectionMixin, serializers.ModelSerializer):
     game_type_label = serializers.CharField(source='get_game_type_display', read_only=True)
     item_count = serializers.IntegerField(read_only=True)
     decided_count = serializers.IntegerField(read_only=True)
@@ -267,4 +360,4 @@ class PurchaseListDetailSerializer(PurchaseListSerializer):
         if items is None:
             items = list(obj.items.select_related('content_type').order_by('-added_at'))
             attach_cards(items)
-        return PurchaseListItemSerializer(items, many=True).data
\ No newline at end of file
+        return PurchaseListItemSerializer(items, many=True, context=self.context, field_path='items').data
\ No newline at end of file
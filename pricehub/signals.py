@@ -0,0 +1,128 @@
+"""
+pricehub/signals.py
+
+1) 검색 인덱스(pricehub/search_index.py)
+   카드 저장/삭제 시 1건씩 갱신. 확장팩 저장 시에는 그 확장팩 카드들의 비정규화된
+   확장팩 코드/이름만 갱신.
+
+   가격 수집·판매가 저장처럼 save(update_fields=[...])로 이름/카드번호/상품코드를
+   건드리지 않는 저장은 재색인을 건너뛴다 — 수집 스크립트가 카드마다 save를
+   부르므로 여기서 매번 토큰을 다시 쓰면 수집이 눈에 띄게 느려진다.
+   queryset.update()/bulk_update()는 시그널이 안 나가므로, 이름·코드를 일괄로
+   바꾼 뒤에는 `python manage.py rebuild_search_index`를 돌린다.
+
+2) 카드 목록 페이지 캐시(pricehub/list_cache.py)
+   카드·가격 히스토리·확장팩이 바뀌면 그 확장팩의 목록 캐시 버전을 올린다.
+   가격만 바뀌어도 목록 화면(판매가/시장가/수집일시)이 달라지므로 update_fields와
+   상관없이 항상 올린다. 가격 수집 스크립트는 list_cache.batched() 안에서 돌아 행마다
+   캐시에 쓰지 않고 확장팩마다 한 번으로 합친다.
+
+3) 변경분 동기화 API(/api/<게임>/cards/changes/)
+   카드 응답에 확장팩 코드/이름이 들어가므로, 확장팩이 바뀌면 그 확장팩 카드들의
+   updated_at을 같이 올린다. 카드 자체는 SyncTrackedCard.save가 처리한다.
+
+4) API Key 확인 캐시(pricehub/authentication.py)
+   키를 저장(비활성화 포함)/삭제하면 캐시 버전을 바꿔 모든 워커에서 바로 무효화한다.
+   admin "선택 항목 삭제"처럼 queryset으로 지워도 post_delete는 행마다 나간다.
+
+5) 레어도별 매입가 캐시(pricehub/purchase_config.py)
+   레어도 고정가를 저장/삭제하면 그 게임의 {레어도: 매입가} 캐시를 지운다.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from . import list_cache, search_index
+from .authentication import invalidate_key_cache
+from .models import APIKey, RarityPurchasePrice
+from .purchase_config import GAME_TYPE_CARD_MODEL, invalidate_rarity_price_map
+
+
+def _make_handlers(game_type):
+    def on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+        if raw:
+            return  # loaddata — 픽스처 적재 후 rebuild_search_index로 한꺼번에
+        list_cache.bump_expansion(game_type, instance.expansion_id)
+        if update_fields is not None and not (set(update_fields) & search_index.INDEXED_FIELDS):
+            return
+        search_index.index_card(game_type, instance)
+
+    def on_delete(sender, instance, **kwargs):
+        list_cache.bump_expansion(game_type, instance.expansion_id)
+        search_index.remove_card(game_type, instance.pk)
+
+    return on_save, on_delete
+
+
+def _make_expansion_handler(game_type, card_model):
+    # 인덱스 행에 확장팩 코드/이름을 비정규화해 뒀으므로 확장팩이 바뀌면 같이 갱신.
+    # 목록 행의 네이버 검색어도 확장팩명을 쓰므로 목록 캐시도 무효화.
+    def on_save(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+        if raw or created:
+            return
+        list_cache.bump_expansion(game_type, instance.pk)
+        search_index.update_expansion(game_type, instance)
+        if update_fields is None or {'code', 'name'} & set(update_fields):
+            card_model.objects.filter(expansion_id=instance.pk).update(updated_at=timezone.now())
+
+    return on_save
+
+
+def _make_price_handler(game_type, card_model):
+    # 가격 히스토리 행에는 expansion_id가 없다 — 카드를 이미 들고 있으면(수집 스크립트의
+    # CardPrice.objects.create(card=card)) 그걸 쓰고, 아니면 카드에서 한 번 더 찾는다 (PK 조회 1번).
+    # 대량 수집은 list_cache.batched() 안에서 돌아 bump가 확장팩마다 한 번으로 합쳐진다.
+    def on_change(sender, instance, raw=False, **kwargs):
+        if raw:
+            return
+        if sender.card.is_cached(instance):
+            expansion_id = instance.card.expansion_id
+        else:
+            expansion_id = (
+                card_model.objects.filter(pk=instance.card_id)
+                .values_list('expansion_id', flat=True).first()
+            )
+        list_cache.bump_expansion(game_type, expansion_id)
+
+    return on_change
+
+
+for _game_type, _model in GAME_TYPE_CARD_MODEL.items():
+    _on_save, _on_delete = _make_handlers(_game_type)
+    post_save.connect(_on_save, sender=_model, weak=False, dispatch_uid=f'search_index_save_{_game_type}')
+    post_delete.connect(_on_delete, sender=_model, weak=False, dispatch_uid=f'search_index_delete_{_game_type}')
+
+    _expansion_model = _model._meta.get_field('expansion').related_model
+    post_save.connect(
+        _make_expansion_handler(_game_type, _model), sender=_expansion_model, weak=False,
+        dispatch_uid=f'search_index_expansion_save_{_game_type}',
+    )
+
+    _price_model = _model._meta.get_field('prices').related_model
+    _on_price_change = _make_price_handler(_game_type, _model)
+    post_save.connect(
+        _on_price_change, sender=_price_model, weak=False,
+        dispatch_uid=f'list_cache_price_save_{_game_type}',
+    )
+    post_delete.connect(
+        _on_price_change, sender=_price_model, weak=False,
+        dispatch_uid=f'list_cache_price_delete_{_game_type}',
+    )
+
+
+def _on_api_key_change(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and set(update_fields) <= {'last_used_at'}):
+        return
+    invalidate_key_cache()
+
+
+post_save.connect(_on_api_key_change, sender=APIKey, dispatch_uid='api_key_cache_save')
+post_delete.connect(_on_api_key_change, sender=APIKey, dispatch_uid='api_key_cache_delete')
+
+
+def _on_rarity_price_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_rarity_price_map(instance.game_type)
+
+
+post_save.connect(_on_rarity_price_change, sender=RarityPurchasePrice, dispatch_uid='rarity_price_cache_save')
+post_delete.connect(_on_rarity_price_change, sender=RarityPurchasePrice, dispatch_uid='rarity_price_cache_delete')
@@ -0,0 +1,295 @@
+"""
+pricehub/sqlite_cache.py
+
+Django 캐시 백엔드 — gunicorn 워커 간에 공유되는 SQLite(WAL) 파일 하나에 모든 항목을 둔다.
+
+FileBasedCache는 항목마다 파일 하나라 get마다 open + 읽기 + zlib 해제 + unpickle, set마다
+임시 파일 쓰기 + rename이고, MAX_ENTRIES(기본 300)를 넘으면 디렉터리 전체를 나열해 아무
+파일이나 1/3을 지운다 — 스토어 카드 목록처럼 비싼 항목이 방금 만든 락/토큰 때문에 밀려나고,
+30일짜리 이미지 해시도 수시로 날아간다. 여기서는:
+
+  - 만료: expires 인덱스 — 만료 항목 정리는 DELETE 한 번.
+  - 축출: LRU. 읽을 때 accessed를 갱신하고(같은 항목은 _ACCESS_RESOLUTION초에 한 번만 —
+    읽기마다 쓰기가 생기지 않게) 개수(MAX_ENTRIES)나 전체 크기(MAX_SIZE, 바이트)를 넘으면
+    가장 오래 안 쓴 것부터 지운다. 정리는 워커(프로세스)마다 첫 쓰기 때, 그 뒤로 그 워커의
+    쓰기 _CULL_EVERY번마다 한 번(스레드마다 따로 세지 않는다 — 백엔드 인스턴스는 스레드마다
+    만들어지므로 카운터는 파일 경로별로 모듈에 둔다). 정리는 쓰기 잠금(BEGIN IMMEDIATE) 안에서
+    돌기 때문에, 평소에는 만료 DELETE(인덱스) + COUNT/SUM 한 번만 하고 한도를 넘었을 때만
+    정렬이 필요한 축출 DELETE를 돌린다.
+  - get_many/set_many/delete_many: 쿼리/트랜잭션 하나로 묶는다.
+  - add: INSERT ... ON CONFLICT DO UPDATE WHERE 만료됨 — 문장 하나라 워커 간에도 원자적
+    (cache.add 단일 실행 락이 그대로 동작). incr도 트랜잭션 안에서 읽고 쓴다.
+
+설정 예:
+
+    CACHES = {'default': {
+        'BACKEND': 'pricehub.sqlite_cache.SQLiteCache',
+        'LOCATION': '/path/to/cache.sqlite3',
+        'OPTIONS': {'MAX_ENTRIES': 100000, 'MAX_SIZE': 512 * 1024 * 1024},
+    }}
+
+파일은 지워도 된다(다음 요청이 새로 만들고 캐시가 비어서 시작). python manage.py bench_cache로
+FileBasedCache와 비교할 수 있다.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_BUSY_TIMEOUT_MS = 5000
+_ACCESS_RESOLUTION = 60
+_CULL_EVERY = 100
+_IN_CHUNK = 500  # IN (...) 한 번에 넣는 키 수 — SQLite 바인드 변수 한도 아래로
+
+# {파일 경로: 이 프로세스의 쓰기 수} — 정리 주기용. 스레드별 인스턴스가 같이 센다
+_write_counts = {}
+_write_counts_lock = threading.Lock()
+
+
+class SQLiteCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = str(location)
+        options = params.get('OPTIONS', {})
+        self._max_size = int(options.get('MAX_SIZE') or 0)
+        self._local = threading.local()
+
+    # --- 연결 ---
+
+    def _connection(self):
+        # 스레드마다 연결 하나. fork 전에 만든 연결은 자식 프로세스에서 쓰면 안 되므로 pid도 본다
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        os.makedirs(os.path.dirname(self._path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')  # WAL에선 커밋마다 fsync 안 해도 DB가 깨지지 않는다
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entry ('
+            ' key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL,'
+            ' accessed REAL NOT NULL, size INTEGER NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS cache_entry_expires ON cache_entry (expires)')
+        conn.execute('CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed)')
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _transaction(self, conn, work):
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = work()
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return result
+
+    # --- 직렬화 ---
+
+    def _dumps(self, value):
+        return pickle.dumps(value, self.pickle_protocol)
+
+    @staticmethod
+    def _loads(blob):
+        return pickle.loads(blob)
+
+    @staticmethod
+    def _alive(expires, now):
+        return expires is None or expires > now
+
+    # --- 조회 ---
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            'SELECT value, expires, accessed FROM cache_entry WHERE key = ?', (key,),
+        ).fetchone()
+        if row is None or not self._alive(row[1], now):
+            return default
+        if now - row[2] >= _ACCESS_RESOLUTION:
+            conn.execute('UPDATE cache_entry SET accessed = ? WHERE key = ?', (now, key))
+        return self._loads(row[0])
+
+    def get_many(self, keys, version=None):
+        return {key: value for key, (value, _) in self.get_many_with_expiry(keys, version=version).items()}
+
+    def get_many_with_expiry(self, keys, version=None):
+        """{키: (값, 만료 time.time() 또는 None)} — TieredCache가 L1 TTL을 남은 TTL로 자를 때 쓴다"""
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        conn = self._connection()
+        now = time.time()
+        found, touched = {}, []
+        made_keys = list(key_map)
+        for start in range(0, len(made_keys), _IN_CHUNK):
+            chunk = made_keys[start:start + _IN_CHUNK]
+            rows = conn.execute(
+                'SELECT key, value, expires, accessed FROM cache_entry'
+                f' WHERE key IN ({",".join("?" * len(chunk))})',
+                chunk,
+            )
+            for made_key, blob, expires, accessed in rows:
+                if not self._alive(expires, now):
+                    continue
+                found[key_map[made_key]] = (self._loads(blob), expires)
+                if now - accessed >= _ACCESS_RESOLUTION:
+                    touched.append((now, made_key))
+        if touched:
+            self._transaction(conn, lambda: conn.executemany(
+                'UPDATE cache_entry SET accessed = ? WHERE key = ?', touched,
+            ))
+        return found
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT expires FROM cache_entry WHERE key = ?', (key,),
+        ).fetchone()
+        return row is not None and self._alive(row[0], time.time())
+
+    # --- 쓰기 ---
+
+    _UPSERT = (
+        'INSERT INTO cache_entry (key, value, expires, accessed, size) VALUES (?, ?, ?, ?, ?)'
+        ' ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires,'
+        ' accessed = excluded.accessed, size = excluded.size'
+    )
+
+    def _row(self, key, value, expires, now):
+        blob = self._dumps(value)
+        return (key, blob, expires, now, len(blob))
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        if not data:
+            return []
+        expires = self.get_backend_timeout(timeout)
+        now = time.time()
+        made = [(self.make_and_validate_key(key, version=version), value) for key, value in data.items()]
+        conn = self._connection()
+        if expires is not None and expires <= now:
+            # timeout 0 이하 — 저장하지 않고 기존 값만 지운다(FileBasedCache와 같음)
+            self._delete(conn, [key for key, _ in made])
+            return []
+        rows = [self._row(key, value, expires, now) for key, value in made]
+        self._transaction(conn, lambda: conn.executemany(self._UPSERT, rows))
+        self._after_write(conn, len(rows))
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        expires = self.get_backend_timeout(timeout)
+        now = time.time()
+        conn = self._connection()
+        # 없거나 만료된 경우에만 쓴다 — 살아 있는 항목이 있으면 DO UPDATE의 WHERE가 거짓이라 rowcount 0
+        added = conn.execute(
+            self._UPSERT + ' WHERE cache_entry.expires IS NOT NULL AND cache_entry.expires <= ?',
+            (*self._row(key, value, expires, now), now),
+        ).rowcount > 0
+        if added:
+            self._after_write(conn, 1)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        return self._connection().execute(
+            'UPDATE cache_entry SET expires = ?, accessed = ?'
+            ' WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), now, key, now),
+        ).rowcount > 0
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+
+        def work():
+            now = time.time()
+            row = conn.execute(
+                'SELECT value, expires FROM cache_entry WHERE key = ?', (key,),
+            ).fetchone()
+            if row is None or not self._alive(row[1], now):
+                raise ValueError("Key '%s' not found" % key)
+            new_value = self._loads(row[0]) + delta
+            blob = self._dumps(new_value)
+            conn.execute(
+                'UPDATE cache_entry SET value = ?, accessed = ?, size = ? WHERE key = ?',
+                (blob, now, len(blob), key),
+            )
+            return new_value
+
+        return self._transaction(conn, work)
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._delete(self._connection(), [key]) > 0
+
+    def delete_many(self, keys, version=None):
+        made_keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if made_keys:
+            self._delete(self._connection(), made_keys)
+
+    def _delete(self, conn, made_keys):
+        def work():
+            deleted = 0
+            for start in range(0, len(made_keys), _IN_CHUNK):
+                chunk = made_keys[start:start + _IN_CHUNK]
+                deleted += conn.execute(
+                    f'DELETE FROM cache_entry WHERE key IN ({",".join("?" * len(chunk))})', chunk,
+                ).rowcount
+            return deleted
+        return self._transaction(conn, work)
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entry')
+
+    # --- 정리(만료 + LRU 축출) ---
+
+    def _after_write(self, conn, count):
+        with _write_counts_lock:
+            before = _write_counts.get(self._path, 0)
+            _write_counts[self._path] = before + count
+        if before // _CULL_EVERY != (before + count) // _CULL_EVERY or before == 0:
+            self._cull(conn)
+
+    def _cull(self, conn):
+        def totals():
+            return conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry').fetchone()
+
+        def work():
+            conn.execute('DELETE FROM cache_entry WHERE expires <= ?', (time.time(),))
+            total, size = totals()
+            if self._max_entries and total > self._max_entries:
+                # CULL_FREQUENCY의 뜻은 Django 기본 백엔드와 같다 — 0이면 전부, N이면 1/N.
+                # 다만 아무거나가 아니라 가장 오래 안 쓴 것부터
+                excess = total if self._cull_frequency == 0 else max(
+                    total - self._max_entries, total // self._cull_frequency,
+                )
+                conn.execute(
+                    'DELETE FROM cache_entry WHERE key IN'
+                    ' (SELECT key FROM cache_entry ORDER BY accessed LIMIT ?)',
+                    (excess,),
+                )
+                total, size = totals()
+            if self._max_size and size > self._max_size:
+                # 최근에 쓴 것부터 크기를 누적해 MAX_SIZE를 넘는 지점 뒤(더 오래된 쪽)를 지운다 —
+                # 전체 정렬이라 한도를 넘었을 때만
+                conn.execute(
+                    'DELETE FROM cache_entry WHERE key IN (SELECT key FROM ('
+                    ' SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS running'
+                    ' FROM cache_entry) WHERE running > ?)',
+                    (self._max_size,),
+                )
+        self._transaction(conn, work)
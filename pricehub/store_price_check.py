@@ -13,11 +13,25 @@ card-controltower(네이버 스마트스토어 매장 관리 백엔드)가 알
   것. PriceHub가 아예 취급하지 않는 카드 종류(홀로라이브/니케/쿠키런 등)는 매칭 모델 자체가
   없어 전부 여기로 떨어진다 — "카탈로그 미보유"가 자연스럽게 포함되는 정의라 별도 분기가
   필요 없다.
+
+분류 결과는 (매장, 매장별 card-controltower 조회 시각) 단위로 캐시한다(categorized) — 탭
+전환/페이지 이동/검색마다 전체 목록을 다시 분류하지 않고, 새로 받은 뒤 첫 화면만 분류 비용을
+낸다. 검색(q)은 같이 캐시해둔 bigram 색인으로 후보만 좁혀서 확인.
 """
+from django.conf import settings
+from django.core.cache import cache
+
+from . import card_controltower_client, list_cache
+from .search_index import normalize
 from .models import Card, OnePieceCard, DigimonCard, CardPrice, OnePieceCardPrice, DigimonCardPrice
 
 _DROP_STATUSES = {'SLIGHT_DROP', 'MODERATE_DROP', 'SEVERE_DROP'}
 
+TABS = ('drop', 'rise', 'unregistered')
+
+# 조회 시각이 키에 들어가므로 새로 받으면 어차피 다른 키 — 카드 목록 캐시와 같은 수명
+_CATEGORIZED_TTL = 60 * 60
+
 
 # card-controltower의 CardType enum 실제 값 기준(2026-08-06 확인, CardType.java) — "ONEPIECE"가
 # 아니라 "ONE_PIECE"다. 여기서 한 번 틀렸다가 실제 데이터로 검증하는 과정에서 원피스 카드
@@ -55,22 +69,49 @@ _PRICE_MODEL_BY_CARD_TYPE = {
     'ONE_PIECE': OnePieceCardPrice,
     'DIGIMON': DigimonCardPrice,
 }
+# 목록 캐시 버전(list_cache) 키 — views.CATEGORY_CONFIGS의 cfg_key
+_GAME_TYPE_BY_CARD_TYPE = {
+    'POKEMON': 'pokemon_kr',
+    'ONE_PIECE': 'onepiece_kr',
+    'DIGIMON': 'digimon_kr',
+}
+
+
+def parse_pricehub_keys(keys, limit=200):
+    """
+    pricehub_key('POKEMON:7142') 목록 → {cardType: [카드 id, ...]}. 모르는 cardType이나
+    형식이 안 맞는 키는 조용히 건너뛴다(최대 limit개).
+    """
+    ids_by_type = {}
+    for key in keys[:limit]:
+        card_type, _, card_id = key.partition(':')
+        if card_type in _PRICE_MODEL_BY_CARD_TYPE and card_id.isdigit():
+            ids_by_type.setdefault(card_type, set()).add(int(card_id))
+    return ids_by_type
 
 
-def fetch_market_raw_data(rows):
+def market_raw_data_version(ids_by_type):
+    """판매처 목록 응답의 ETag 재료 — 게임별로 그 카드들이 속한 확장팩의 목록 캐시 버전"""
+    parts = []
+    for card_type in sorted(ids_by_type):
+        ids = ids_by_type[card_type]
+        expansion_ids = (
+            _GAME_MODEL_BY_CARD_TYPE[card_type].objects.filter(pk__in=ids)
+            .values_list('expansion_id', flat=True).distinct()
+        )
+        game_type = _GAME_TYPE_BY_CARD_TYPE[card_type]
+        parts.append(f'{card_type}:{sorted(ids)}:{list_cache.versions_for(game_type, expansion_ids)}')
+    return '|'.join(parts)
+
+
+def fetch_market_raw_data(ids_by_type):
     """
-    현재 화면에 보이는 행(페이지 분량)들의 pricehub_key별 최신 판매처 목록(raw_data) —
-    카드 목록 페이지(_card_list_view)의 사이드 패널과 동일한 패턴. 전체가 아니라
-    "지금 보이는 페이지"만 조회해서 무거워지지 않게 한다.
+    pricehub_key별 최신 판매처 목록(raw_data) — 사이드 패널이 클릭한 행만 요청한다
+    (store_price_check_raw_data). ids_by_type은 parse_pricehub_keys 결과.
 
     키를 pricehub_id(순수 정수)가 아니라 pricehub_key(cardType 접두사 포함)로 쓰는 이유는
     categorize()의 pricehub_key 주석 참고 — 여기서도 안 맞추면 결국 같은 충돌이 재현된다.
     """
-    ids_by_type = {}
-    for r in rows:
-        if r.get('pricehub_id') and r.get('cardType') in _PRICE_MODEL_BY_CARD_TYPE:
-            ids_by_type.setdefault(r['cardType'], set()).add(r['pricehub_id'])
-
     raw_by_key = {}
     for card_type, ids in ids_by_type.items():
         price_model = _PRICE_MODEL_BY_CARD_TYPE[card_type]
@@ -101,21 +142,53 @@ def _tag_badges(card_type, row):
     return []
 
 
+def _match_fields(card_type, match):
+    """PriceHub 쪽 매칭 카드(.values() dict) → 행에 덧붙일 필드. 매칭 없으면 전부 None."""
+    if not match:
+        return {
+            'pricehub_id': None,
+            'pricehub_key': None,
+            'pricehub_price': None,
+            'pricehub_name': None,
+            'pricehub_image_url': None,
+            'set_price_url': None,
+            'tag_badges': [],
+        }
+    base_url = _BASE_URL_BY_CARD_TYPE[card_type]
+    return {
+        'pricehub_id': match['id'],
+        # POKEMON/ONE_PIECE/DIGIMON은 서로 다른 Django 모델(각자 독립된 auto-increment
+        # PK)이라, 같은 정수 id가 게임이 다른 카드를 가리키는 경우가 실제로 있다(2026-08-06,
+        # 8페이지에서 포켓몬 id=7142와 디지몬 id=7142가 동시에 나타나 클릭 시 엉뚱한 카드의
+        # 판매처 목록이 뜨는 버그로 발견). DOM id/JS 키로는 반드시 이 pricehub_key(카드
+        # 종류 접두사 포함)를 쓰고, pricehub_id는 실제 PriceHub URL(/set-price/ 등)에만 쓴다.
+        'pricehub_key': f"{card_type}:{match['id']}",
+        'pricehub_price': match['selling_price'],
+        'pricehub_name': match['name'],
+        'pricehub_image_url': match.get('image_url'),
+        'set_price_url': f"{base_url}/cards/{match['id']}/set-price/",
+        'tag_badges': _tag_badges(card_type, match),
+    }
+
+
+def _lookup_fields(card_type):
+    return ('id', 'shop_product_code', 'selling_price', 'name', 'image_url') \
+        + _EXTRA_TAG_FIELDS_BY_CARD_TYPE.get(card_type, ())
+
+
 def _bulk_pricehub_lookup(cards):
     """cardType별로 shop_product_code→PriceHub 카드를 한 번씩만 조회(카드 수만큼 N+1 방지)."""
     codes_by_type = {}
     for c in cards:
-        card_type = c.get('cardType')
-        code = c.get('sellerProductCode')
+        card_type = c.cardType
+        code = c.sellerProductCode
         if card_type in _GAME_MODEL_BY_CARD_TYPE and code:
             codes_by_type.setdefault(card_type, set()).add(code)
 
     lookup = {}
     for card_type, codes in codes_by_type.items():
         model = _GAME_MODEL_BY_CARD_TYPE[card_type]
-        fields = ('id', 'shop_product_code', 'selling_price', 'name', 'image_url') \
-            + _EXTRA_TAG_FIELDS_BY_CARD_TYPE.get(card_type, ())
-        rows = model.objects.filter(shop_product_code__in=codes).values(*fields)
+        rows = model.objects.filter(shop_product_code__in=codes).values(*_lookup_fields(card_type))
         for row in rows:
             lookup[(card_type, row['shop_product_code'])] = row
     return lookup
@@ -125,18 +198,14 @@ def _store_image_index(all_store_cards):
     """{store: {sellerProductCode: imageUrl}} — 스토어별 카드 이미지 인덱스(부산/광주 이미지 나란히 표시용)."""
     index = {}
     for store, cards in all_store_cards.items():
-        idx = {}
-        for c in cards:
-            code = c.get('sellerProductCode')
-            if code:
-                idx[code] = c.get('imageUrl')
-        index[store] = idx
+        index[store] = {c.sellerProductCode: c.imageUrl for c in cards if c.sellerProductCode}
     return index
 
 
 def categorize(all_store_cards, primary_store):
     """
-    all_store_cards: {store: GET /api/cards 결과} — 설정된 전 매장(현재 busan/gwangju) 데이터.
+    all_store_cards: {store: [StoreCard, ...]} — 설정된 전 매장(현재 busan/gwangju) 데이터
+    (card_controltower_client.fetch_all_store_cards).
     primary_store: 하락/상승/미등록 분류 기준이 되는 매장(지금 보고 있는 탭).
 
     각 행에 PriceHub 쪽 매칭 정보(pricehub_price/pricehub_name/set_price_url, 매칭 없으면
@@ -151,40 +220,18 @@ def categorize(all_store_cards, primary_store):
     drops, rises, unregistered = [], [], []
 
     for c in cards:
-        card_type = c.get('cardType')
-        code = c.get('sellerProductCode')
+        card_type = c.cardType
+        code = c.sellerProductCode
         match = lookup.get((card_type, code))
 
-        row = dict(c)
+        row = c._asdict()
         row['game_label'] = _GAME_LABEL_BY_CARD_TYPE.get(card_type, card_type)
         row['store_images'] = {
             store: idx.get(code) for store, idx in image_index.items()
         }
+        row.update(_match_fields(card_type, match))
 
-        if match:
-            base_url = _BASE_URL_BY_CARD_TYPE[card_type]
-            row['pricehub_id'] = match['id']
-            # POKEMON/ONE_PIECE/DIGIMON은 서로 다른 Django 모델(각자 독립된 auto-increment
-            # PK)이라, 같은 정수 id가 게임이 다른 카드를 가리키는 경우가 실제로 있다(2026-08-06,
-            # 8페이지에서 포켓몬 id=7142와 디지몬 id=7142가 동시에 나타나 클릭 시 엉뚱한 카드의
-            # 판매처 목록이 뜨는 버그로 발견). DOM id/JS 키로는 반드시 이 pricehub_key(카드
-            # 종류 접두사 포함)를 쓰고, pricehub_id는 실제 PriceHub URL(/set-price/ 등)에만 쓴다.
-            row['pricehub_key'] = f"{card_type}:{match['id']}"
-            row['pricehub_price'] = match['selling_price']
-            row['pricehub_name'] = match['name']
-            row['pricehub_image_url'] = match.get('image_url')
-            row['set_price_url'] = f"{base_url}/cards/{match['id']}/set-price/"
-            row['tag_badges'] = _tag_badges(card_type, match)
-        else:
-            row['pricehub_id'] = None
-            row['pricehub_key'] = None
-            row['pricehub_price'] = None
-            row['pricehub_name'] = None
-            row['pricehub_image_url'] = None
-            row['set_price_url'] = None
-            row['tag_badges'] = []
-
-        status = c.get('priceChangeStatus')
+        status = c.priceChangeStatus
         if match is None:
             unregistered.append(row)
         elif status in _DROP_STATUSES:
@@ -198,3 +245,102 @@ def categorize(all_store_cards, primary_store):
     unregistered.sort(key=lambda r: r.get('productName') or '')
 
     return drops, rises, unregistered
+
+
+# ════════════════════════════════════════════════════════════════
+# 분류 결과 캐시 + 검색 색인
+# ════════════════════════════════════════════════════════════════
+
+def build_search_index(rows):
+    """
+    행 목록 → (행별 정규화한 '상품명|상품코드', {bigram: 행 번호 목록}). 정규화는 카드 검색
+    (search_index.normalize)과 같아서 '리자몽 ex'로 '리자몽ex'도 찾는다. '|'는 정규화 결과에
+    안 나오는 글자라 상품명 끝과 코드 앞이 이어져 엉뚱하게 맞는 일이 없다.
+    """
+    haystacks = []
+    postings = {}
+    for i, r in enumerate(rows):
+        text = f"{normalize(r.get('productName'))}|{normalize(r.get('sellerProductCode'))}"
+        haystacks.append(text)
+        for gram in {text[j:j + 2] for j in range(len(text) - 1)}:
+            postings.setdefault(gram, []).append(i)
+    return haystacks, postings
+
+
+def search(rows, index, q):
+    """q가 상품명/상품코드에 들어간 행만(원래 순서 유지). 2글자 이상이면 bigram 후보만 확인."""
+    nq = normalize(q)
+    if not nq:
+        # 기호만 입력('-' 등) — 정규화하면 비므로 원문 그대로 훑는다
+        return [
+            r for r in rows
+            if q in (r.get('productName') or '') or q in (r.get('sellerProductCode') or '')
+        ]
+    haystacks, postings = index
+    if len(nq) == 1:
+        candidates = range(len(rows))
+    else:
+        lists = sorted((postings.get(nq[j:j + 2], ()) for j in range(len(nq) - 1)), key=len)
+        candidates = set(lists[0])
+        for other in lists[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(other)
+        candidates = sorted(candidates)
+    return [rows[i] for i in candidates if nq in haystacks[i]]
+
+
+def _categorized_key(store, stamps):
+    digest = '.'.join(at.isoformat() for at in stamps)
+    return f'store-price-check:categorized:{store}:{digest}'
+
+
+def categorized(store, force_refresh=False):
+    """
+    {'drop'|'rise'|'unregistered': (행 목록, 검색 색인)} — categorize 결과를 (매장, 전 매장
+    조회 시각) 키로 캐시. 다른 매장 이미지도 행에 들어가므로 시각은 전 매장 것.
+    5분이 지난 매장은 캐시된 결과를 그대로 주되 백그라운드 갱신을 건다(fetch_store_cards와 같음).
+    card-controltower 실패는 CardControltowerAPIError 그대로.
+    """
+    stores = list(settings.CARD_CONTROLTOWER_STORES)
+    if not force_refresh:
+        stamps = card_controltower_client.fetched_at_stamps(stores)
+        if None not in stamps:
+            for s, at in zip(stores, stamps):
+                if not card_controltower_client.is_fresh(at):
+                    card_controltower_client.refresh_in_background(s)
+            found = cache.get(_categorized_key(store, stamps))
+            if found is not None:
+                return found
+
+    # 조회 시각은 목록을 받은 "뒤"에 읽는다 — 받는 사이 갱신됐으면 새 시각 + 새 목록이라
+    # 옛 분류가 새 시각에 묶이지 않는다(반대로 새 분류가 옛 시각에 묶이면 한 번 더 분류할 뿐).
+    all_store_cards = card_controltower_client.fetch_all_store_cards(force_refresh=force_refresh)
+    stamps = card_controltower_client.fetched_at_stamps(stores)
+    drops, rises, unregistered = categorize(all_store_cards, store)
+    result = {
+        tab: (rows, build_search_index(rows))
+        for tab, rows in zip(TABS, (drops, rises, unregistered))
+    }
+    if None not in stamps:
+        cache.set(_categorized_key(store, stamps), result, _CATEGORIZED_TTL)
+    return result
+
+
+def refresh_pricehub_fields(rows):
+    """
+    화면에 나갈 행(한 페이지)만 PriceHub 쪽 매칭 정보를 다시 읽는다 — 분류 결과는 캐시된
+    것이라, 그 사이 /set-price/에서 바꾼 판매가가 다음 card-controltower 조회 전까지 옛 값으로
+    보이지 않도록. 게임별 PK 조회 1번씩. 매칭 카드가 지워졌으면 그 행은 그대로 둔다.
+    """
+    ids_by_type = parse_pricehub_keys([r['pricehub_key'] for r in rows if r.get('pricehub_key')],
+                                      limit=len(rows))
+    fresh = {}
+    for card_type, ids in ids_by_type.items():
+        model = _GAME_MODEL_BY_CARD_TYPE[card_type]
+        for match in model.objects.filter(pk__in=ids).values(*_lookup_fields(card_type)):
+            fresh[f"{card_type}:{match['id']}"] = _match_fields(card_type, match)
+    return [
+        {**r, **fresh[r['pricehub_key']]} if r.get('pricehub_key') in fresh else r
+        for r in rows
+    ]
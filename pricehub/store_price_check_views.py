@@ -9,12 +9,10 @@ from django.conf import settings
 from django.http import Http404
 from django.shortcuts import render, redirect
 
-from .views import staff_required
+from .views import raw_data_json_response, staff_required
 from . import card_controltower_client, store_price_check
 from .card_controltower_client import CardControltowerAPIError
-from .utils import safe_json_dumps
 
-_TABS = ('drop', 'rise', 'unregistered')
 _PER_PAGE = 100
 
 
@@ -30,33 +28,31 @@ def store_price_check_view(request, store):
 
     force_refresh = request.GET.get('refresh') == '1'
     error = None
-    drops, rises, unregistered = [], [], []
+    empty = ([], ([], {}))
+    categorized = dict.fromkeys(store_price_check.TABS, empty)
 
     try:
         # 부산/광주 이미지를 나란히 보여주려면 보고 있는 매장뿐 아니라 전 매장 데이터가 필요.
-        all_store_cards = card_controltower_client.fetch_all_store_cards(force_refresh=force_refresh)
-        drops, rises, unregistered = store_price_check.categorize(all_store_cards, store)
+        # 분류 결과는 조회 시각 기준으로 캐시 — 탭/페이지/검색은 캐시된 목록을 자르기만 한다.
+        categorized = store_price_check.categorized(store, force_refresh=force_refresh)
     except CardControltowerAPIError as e:
         error = str(e)
 
     tab = request.GET.get('tab', 'drop')
-    if tab not in _TABS:
+    if tab not in store_price_check.TABS:
         tab = 'drop'
-    rows = {'drop': drops, 'rise': rises, 'unregistered': unregistered}[tab]
+    rows, search_index = categorized[tab]
 
     q = request.GET.get('q', '').strip()
     if q:
-        rows = [
-            r for r in rows
-            if q in (r.get('productName') or '') or q in (r.get('sellerProductCode') or '')
-        ]
+        rows = store_price_check.search(rows, search_index, q)
 
     total_count = len(rows)
     page = max(1, int(request.GET.get('page', 1) or 1))
     total_pages = max(1, -(-total_count // _PER_PAGE))
     page = min(page, total_pages)
     offset = (page - 1) * _PER_PAGE
-    page_rows = rows[offset:offset + _PER_PAGE]
+    page_rows = store_price_check.refresh_pricehub_fields(rows[offset:offset + _PER_PAGE])
 
     half = 3
     start = max(1, page - half)
@@ -68,14 +64,15 @@ def store_price_check_view(request, store):
             start = max(1, end - 6)
     page_range = list(range(start, end + 1))
 
-    # 판매처 목록 사이드 패널 — 지금 보이는 페이지 분량만 조회(카드 목록 페이지와 동일 패턴).
-    card_raw = store_price_check.fetch_market_raw_data(page_rows)
-
     # "이 비교가 언제 card-controltower에 요청한 데이터 기준인지" — 매장별로 다를 수 있다
     # (부산/광주 캐시가 서로 다른 시점에 채워졌을 수 있어서, 둘 다 표시).
     fetched_at = {
         s: card_controltower_client.get_fetched_at(s) for s in settings.CARD_CONTROLTOWER_STORES
     }
+    # 5분이 지난 데이터는 바로 보여주고 백그라운드에서 새로 받는 중(stale-while-revalidate)
+    stale = {
+        s: at is not None and not card_controltower_client.is_fresh(at) for s, at in fetched_at.items()
+    }
 
     return render(request, 'dashboard/store_price_check.html', {
         'error': error,
@@ -83,11 +80,11 @@ def store_price_check_view(request, store):
         'store_label': settings.CARD_CONTROLTOWER_STORES[store]['label'],
         'stores': settings.CARD_CONTROLTOWER_STORES,
         'fetched_at': fetched_at,
+        'stale': stale,
         'tab': tab,
         'q': q,
         'rows': page_rows,
-        'card_raw_json': safe_json_dumps(card_raw, ensure_ascii=False),
-        'counts': {'drop': len(drops), 'rise': len(rises), 'unregistered': len(unregistered)},
+        'counts': {t: len(categorized[t][0]) for t in store_price_check.TABS},
         'total_count': total_count,
         'page': page,
         'total_pages': total_pages,
@@ -97,3 +94,18 @@ def store_price_check_view(request, store):
             ('스토어 가격 비교', None),
         ],
     })
+
+
+@staff_required
+def store_price_check_raw_data(request):
+    """
+    사이드 패널 판매처 목록 — GET ?keys=POKEMON:7142,DIGIMON:7142 → {"POKEMON:7142": [...]}.
+    한 목록에 세 게임 카드가 섞여 있어 카드 목록 페이지용(<게임>/cards/raw-data/) 대신
+    pricehub_key를 그대로 받는다. ETag/304 처리는 그쪽과 같다.
+    """
+    keys = [k.strip() for k in request.GET.get('keys', '').split(',') if k.strip()]
+    ids_by_type = store_price_check.parse_pricehub_keys(keys)
+    return raw_data_json_response(
+        request, store_price_check.market_raw_data_version(ids_by_type),
+        lambda: store_price_check.fetch_market_raw_data(ids_by_type),
+    )
@@ -0,0 +1,42 @@
+"""
+pricehub/test_runner.py
+
+manage.py test 러너 — DiscoverRunner에 더해, 테스트 동안 워커 간 공유 상태 파일을 실행마다
+새 임시 디렉터리로 돌린다:
+
+  - API Key 요청 한도 상태(API_THROTTLE_DB, pricehub/rate_limit.py)
+  - SQLite 공유 캐시(CACHES의 SQLiteCache 항목 LOCATION, pricehub/sqlite_cache.py)
+
+안 그러면 테스트가 운영과 같은 django_cache/ 파일에 버킷 행·캐시 항목을 쓰고(cache.clear()는
+운영 캐시를 통째로 비운다), 앞 실행이 남긴 상태 때문에 결과가 달라질 수 있다. 파일을 따로
+지정하는 테스트(override_settings)는 그대로.
+"""
+import copy
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+_SQLITE_CACHE_BACKEND = 'pricehub.sqlite_cache.SQLiteCache'
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._state_dir = tempfile.TemporaryDirectory(prefix='pricehub-test-')
+        caches = copy.deepcopy(settings.CACHES)
+        for alias, config in caches.items():
+            if config.get('BACKEND') == _SQLITE_CACHE_BACKEND:
+                config['LOCATION'] = f'{self._state_dir.name}/cache-{alias}.sqlite3'
+        # override_settings(CACHES=...)는 이미 만든 캐시 연결도 닫고 새 설정으로 다시 만든다
+        self._state_override = override_settings(
+            API_THROTTLE_DB=f'{self._state_dir.name}/throttle.sqlite3',
+            CACHES=caches,
+        )
+        self._state_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._state_override.disable()
+        self._state_dir.cleanup()
+        super().teardown_test_environment(**kwargs)
@@ -1,11 +1,38 @@
+import concurrent.futures
+import gzip
+import hashlib
+import hmac
+import http.server
+import io
 import json
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+import requests
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
-from django.test import Client, SimpleTestCase, TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from pricehub.bulk_api_views import _clean_supplied_items
-from pricehub.models import Card, CardPrice, Expansion, PurchaseList, PurchaseListItem, round_to_100
+from pricehub import (
+    api_views, authentication, card_controltower_client, expansion_stats, list_cache, price_outbox, search_index,
+    store_price_check,
+)
+from pricehub.card_controltower_client import StoreCard
+from pricehub.models import (
+    APIKey, Card, CardPrice, CardSearchEntry, DigimonCard, DigimonExpansion, Expansion, ExpansionPriceStats, JapanCard,
+    JapanExpansion, OnePieceCard, OnePieceExpansion, PriceChangeCursor, PriceChangeEvent, PurchaseList, PurchaseListItem,
+    round_to_100,
+)
 from pricehub.utils import (
     _doong_item_is_valid,
     _doong_search_query,
@@ -1246,6 +1273,1623 @@ class PurchaseListCrudViewsTests(TestCase):
         self.assertFalse(PurchaseList.objects.filter(id=plist.id).exists())
 
 
+class SearchIndexTokenTests(SimpleTestCase):
+    """검색 인덱스 정규화/토큰 생성 단위 테스트"""
+
+    def test_normalize_strips_spaces_and_folds_width_and_kana(self):
+        self.assertEqual(search_index.normalize('리자몽 ex'), '리자몽ex')
+        self.assertEqual(search_index.normalize('ＰＫＭ－Ｍ２'), 'pkmm2')
+        self.assertEqual(search_index.normalize('ぴかちゅう'), search_index.normalize('ピカチュウ'))
+
+    def test_name_tokens_pad_last_char(self):
+        self.assertEqual(
+            search_index.name_tokens('피카츄'), {'n:피카', 'n:카츄', 'n:츄$'},
+        )
+
+    def test_code_tokens_are_suffixes_from_each_segment(self):
+        self.assertEqual(
+            search_index.code_tokens('PKM-m2-001-K'),
+            {'c:pkmm2001k', 'c:m2001k', 'c:001k', 'c:k'},
+        )
+
+
+class CardSearchIndexTests(TestCase):
+    """검색 인덱스 갱신(시그널) + 검색 뷰 통합 테스트"""
+
+    def setUp(self):
+        user_model = get_user_model()
+        self.staff = user_model.objects.create_user(
+            'search_staff', password='pw', is_staff=True, is_active=True,
+        )
+        self.client.force_login(self.staff)
+        self.expansion = Expansion.objects.create(
+            code='m2', name='인페르노X', image_url='https://example.com/exp.png',
+        )
+        self.pikachu = self._card('001', '피카츄', 'PKM-m2-001-K', selling_price=3000)
+        self.pikachu_ex = self._card('002', '피카츄 ex', 'PKM-m2-002-K', latest_market_price=12000)
+        self.raichu = self._card('003', '라이츄', 'PKM-m2-003-K')
+
+    def _card(self, number, name, code, **extra):
+        return Card.objects.create(
+            expansion=self.expansion, card_number=number, name=name, rarity='U',
+            shop_product_code=code, image_url='https://example.com/card.png', **extra,
+        )
+
+    def _names(self, q, **kwargs):
+        return [card.name for _, card in search_index.search_cards(q, **kwargs)]
+
+    def test_name_search_ranks_exact_before_prefix_before_contains(self):
+        self.assertEqual(self._names('피카츄'), ['피카츄', '피카츄 ex'])
+        self.assertEqual(self._names('츄'), ['라이츄', '피카츄', '피카츄 ex'])
+
+    def test_bigrams_present_but_not_contiguous_are_not_matched(self):
+        self._card('004', '카츄피', 'PKM-m2-004-K')
+        self.assertNotIn('카츄피', self._names('피카츄'))
+
+    def test_exact_match_survives_candidate_limit(self):
+        # 후보 상한보다 많은 카드가 검색어를 포함해도 완전일치가 잘려나가지 않는다 —
+        # 완전일치 카드를 가장 나중에(가장 큰 id로) 만든다
+        for i in range(10):
+            self._card(f'1{i:02d}', f'피카츄 V 카드 {i}', f'PKM-m2-1{i:02d}-K')
+            self._card(f'2{i:02d}', f'라이츄 {i}', f'PKM-m2-50{i:02d}-K')
+        exact = self._card('300', '피카츄 V', 'PKM-m2-300-K')
+        code_exact = self._card('500', '라이츄 리턴', 'PKM-m2-500-K')
+        with mock.patch.object(search_index, '_CANDIDATE_LIMIT', 5):
+            self.assertEqual(self._names('피카츄v')[0], exact.name)
+            self.assertEqual(self._names('500')[0], code_exact.name)
+
+    def test_code_search_matches_from_any_segment(self):
+        self.assertEqual(self._names('m2-002'), ['피카츄 ex'])
+        self.assertEqual(self._names('003')[0], '라이츄')
+
+    def test_rename_and_delete_update_index(self):
+        self.raichu.name = '라이츄 V'
+        self.raichu.save()
+        self.assertEqual(self._names('라이츄v'), ['라이츄 V'])
+
+        self.raichu.delete()
+        self.assertEqual(self._names('라이츄'), [])
+
+    def test_price_only_save_skips_reindex(self):
+        entry = CardSearchEntry.objects.get(game_type='pokemon_kr', card_id=self.pikachu.id)
+        CardSearchEntry.objects.filter(pk=entry.pk).update(name_norm='stale')
+
+        self.pikachu.selling_price = 5000
+        self.pikachu.save(update_fields=['selling_price'])
+        entry.refresh_from_db()
+        self.assertEqual(entry.name_norm, 'stale')
+
+    def test_game_type_filter_and_rebuild(self):
+        jp_expansion = JapanExpansion.objects.create(code='sv1', name='スカーレットex')
+        JapanCard.objects.create(
+            expansion=jp_expansion, card_number='001', name='ピカチュウ', rarity='C',
+            shop_product_code='PKJ-sv1-001',
+        )
+        CardSearchEntry.objects.all().delete()
+        self.assertEqual(self._names('ぴかちゅう'), [])
+
+        call_command('rebuild_search_index', stdout=io.StringIO())
+        self.assertEqual(self._names('ぴかちゅう', game_types=['pokemon_jp']), ['ピカチュウ'])
+        self.assertEqual(self._names('ぴかちゅう', game_types=['pokemon_kr']), [])
+
+    def test_card_search_view_uses_cached_price_columns(self):
+        CardPrice.objects.create(card=self.pikachu_ex, price=99999, source='naver')
+
+        with self.assertNumQueries(5):  # 세션/유저 2 + 이름 후보 1 + 인덱스 1 + 카드 1
+            res = self.client.get('/pokemon/kr/cards/search/', {'name': '피카츄'})
+        results = res.json()['results']
+
+        self.assertEqual([r['name'] for r in results], ['피카츄', '피카츄 ex'])
+        self.assertEqual(results[0]['selling_price'], 3000)
+        self.assertIsNone(results[0]['latest_price'])
+        self.assertEqual(results[1]['latest_price'], 12000.0)
+        self.assertEqual(results[1]['expansion'], {'code': 'm2', 'name': '인페르노X'})
+
+    def test_purchase_list_search_matches_product_code(self):
+        plist = PurchaseList.objects.create(name='검색', game_type='pokemon_kr')
+        res = self.client.get(
+            f'/purchase-lists/detail/{plist.id}/search-cards/', {'q': 'PKM-m2-003'},
+        )
+        self.assertEqual([r['name'] for r in res.json()['results']], ['라이츄'])
+
+
+class UnifiedCardSearchTests(TestCase):
+    """전 게임 통합 검색/상품코드 조회 (대시보드 + API)"""
+
+    def setUp(self):
+        user_model = get_user_model()
+        self.staff = user_model.objects.create_user(
+            'unified_staff', password='pw', is_staff=True, is_active=True,
+        )
+        _, self.raw_key = APIKey.create_key(name='테스트')
+        self.expansion = Expansion.objects.create(
+            code='m2', name='인페르노X', image_url='https://example.com/exp.png',
+        )
+        self.pokemon = Card.objects.create(
+            expansion=self.expansion, card_number='006', name='리자몽 ex', rarity='SAR',
+            shop_product_code='PKM-m2-006-K', image_url='https://example.com/card.png',
+            selling_price=50000, latest_market_price=48000,
+        )
+        op_expansion = OnePieceExpansion.objects.create(code='OP01', name='로마공방')
+        self.onepiece = OnePieceCard.objects.create(
+            expansion=op_expansion, shop_product_code='OP-OP01-006-K', card_number='OP01-006',
+            name='리자몽 코스프레 루피', rarity='C',
+        )
+
+    def _api(self, url, **params):
+        return self.client.get(url, params, HTTP_AUTHORIZATION=f'Api-Key {self.raw_key}')
+
+    def test_api_search_spans_games_and_tags_game_key(self):
+        res = self._api('/api/cards/search/', q='리자몽')
+        results = res.json()['results']
+
+        self.assertEqual([r['game'] for r in results], ['pokemon_kr', 'onepiece_kr'])
+        self.assertEqual(results[0]['selling_price'], 50000)
+        self.assertEqual(results[0]['latest_market_price'], 48000)
+        self.assertEqual(results[0]['expansion'], {'code': 'm2', 'name': '인페르노X'})
+
+    def test_api_search_game_filter(self):
+        res = self._api('/api/cards/search/', q='리자몽', game='onepiece_kr')
+        self.assertEqual([r['id'] for r in res.json()['results']], [self.onepiece.id])
+
+    def test_api_search_limit_is_at_least_one(self):
+        for limit in ('0', '-5'):
+            with self.subTest(limit=limit):
+                res = self._api('/api/cards/search/', q='리자몽', game='onepiece_kr', limit=limit)
+                self.assertEqual([r['id'] for r in res.json()['results']], [self.onepiece.id])
+
+    def test_api_resolve_is_single_index_lookup(self):
+        with self.assertNumQueries(4):  # API Key 조회·갱신 2 + 인덱스 1 + 가격 컬럼 1
+            res = self._api('/api/cards/resolve/OP-OP01-006-K/')
+        data = res.json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'][0]['game'], 'onepiece_kr')
+        self.assertEqual(data['results'][0]['id'], self.onepiece.id)
+
+        self.assertEqual(self._api('/api/cards/resolve/NOPE-001/').status_code, 404)
+
+    def test_expansion_rename_updates_denormalized_fields(self):
+        self.expansion.name = '인페르노X 개정판'
+        self.expansion.save()
+        res = self._api('/api/cards/resolve/PKM-m2-006-K/')
+        self.assertEqual(res.json()['results'][0]['expansion']['name'], '인페르노X 개정판')
+
+    def test_dashboard_results_link_to_each_game_detail_page(self):
+        self.client.force_login(self.staff)
+        res = self.client.get('/cards/search/results/', {'name': '리자몽'})
+        urls = [r['detail_url'] for r in res.json()['results']]
+        self.assertEqual(urls, [
+            f'/pokemon/kr/cards/{self.pokemon.id}/', f'/onepiece/kr/cards/{self.onepiece.id}/',
+        ])
+        self.assertEqual(self.client.get('/cards/search/').status_code, 200)
+
+
+class CardListPageCacheTests(TestCase):
+    """확장팩 카드 목록 페이지 캐시 — 재사용 + 카드/가격/초기화 시 무효화"""
+
+    def setUp(self):
+        cache.clear()
+        user_model = get_user_model()
+        self.staff = user_model.objects.create_user(
+            'list_cache_staff', password='pw', is_staff=True, is_active=True,
+        )
+        self.client.force_login(self.staff)
+        self.expansion = Expansion.objects.create(
+            code='LC', name='캐시팩', image_url='https://example.com/exp.png',
+        )
+        self.other = Expansion.objects.create(
+            code='LC2', name='다른팩', image_url='https://example.com/exp.png',
+        )
+        self.card = Card.objects.create(
+            expansion=self.expansion, card_number='001', name='피카츄', rarity='U',
+            shop_product_code='PKM-LC-001-K', selling_price=1000,
+        )
+        self.url = f'/pokemon/kr/expansions/{self.expansion.code}/cards/'
+
+    def _rows(self, url=None):
+        return self.client.get(url or self.url).context['rows_html']
+
+    def test_repeat_request_skips_card_queries(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(self.url)
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('피카츄', res.context['rows_html'])
+        sqls = ' '.join(q['sql'] for q in ctx.captured_queries)
+        self.assertNotIn('pricehub_card"', sqls)
+
+    def test_card_save_invalidates(self):
+        self.assertIn('피카츄', self._rows())
+        self.card.name = '라이츄'
+        self.card.save(update_fields=['name'])
+        self.assertIn('라이츄', self._rows())
+
+    def test_price_save_invalidates(self):
+        self._rows()
+        Card.objects.filter(pk=self.card.pk).update(selling_price=7700)  # 시그널 없음 → 아직 캐시
+        self.assertNotIn('data-selling="7700"', self._rows())
+        CardPrice.objects.create(card=self.card, price=7000, source='테스트몰', raw_data=[])
+        self.assertIn('data-selling="7700"', self._rows())
+
+    def test_price_save_with_loaded_card_skips_expansion_lookup(self):
+        with CaptureQueriesContext(connection) as ctx:
+            CardPrice.objects.create(card=self.card, price=7000, source='테스트몰', raw_data=[])
+        self.assertEqual(len(ctx.captured_queries), 1)  # INSERT만
+
+    def test_batched_collection_bumps_each_expansion_once(self):
+        self._rows()
+        before = list_cache.current_version('pokemon_kr', self.expansion.pk)
+        with mock.patch.object(list_cache, '_bump_now', wraps=list_cache._bump_now) as bump_now:
+            with list_cache.batched():
+                for price in (7000, 7100, 7200):
+                    CardPrice.objects.create(card=self.card, price=price, source='테스트몰', raw_data=[])
+                    self.card.latest_market_price = price
+                    self.card.save(update_fields=['latest_market_price'])
+                bump_now.assert_not_called()
+                # 블록 안에서는 아직 옛 버전 — 끝날 때 한 번에
+                self.assertEqual(list_cache.current_version('pokemon_kr', self.expansion.pk), before)
+        self.assertEqual(bump_now.call_count, 1)
+        self.assertNotEqual(list_cache.current_version('pokemon_kr', self.expansion.pk), before)
+
+    def test_reset_prices_invalidates_only_that_expansion(self):
+        other_url = f'/pokemon/kr/expansions/{self.other.code}/cards/'
+        self._rows()
+        self._rows(other_url)
+        other_version = list_cache.current_version('pokemon_kr', self.other.pk)
+
+        self.client.post(f'/pokemon/kr/expansions/{self.expansion.code}/reset-prices/')
+
+        self.assertIn('data-selling="0"', self._rows())
+        self.assertEqual(list_cache.current_version('pokemon_kr', self.other.pk), other_version)
+
+    def test_reset_all_prices_bumps_game_version(self):
+        self._rows()
+        self.client.post('/pokemon/kr/reset-all-prices/')
+        self.assertIn('data-selling="0"', self._rows())
+
+
+class CardRawDataEndpointTests(TestCase):
+    """사이드 패널 판매처 목록 배치 조회 — HTML에 심지 않고 ?ids=로 받아가기 + ETag/304"""
+
+    URL = '/pokemon/kr/cards/raw-data/'
+
+    def setUp(self):
+        cache.clear()
+        user_model = get_user_model()
+        self.staff = user_model.objects.create_user(
+            'raw_data_staff', password='pw', is_staff=True, is_active=True,
+        )
+        self.client.force_login(self.staff)
+        self.expansion = Expansion.objects.create(
+            code='RD', name='원본팩', image_url='https://example.com/exp.png',
+        )
+        self.card = Card.objects.create(
+            expansion=self.expansion, card_number='001', name='피카츄', rarity='U',
+            shop_product_code='PKM-RD-001-K',
+        )
+        self.bare = Card.objects.create(
+            expansion=self.expansion, card_number='002', name='라이츄', rarity='U',
+            shop_product_code='PKM-RD-002-K',
+        )
+        self.raw = [{'mallName': '테스트몰', 'lprice': '5000'}]
+        CardPrice.objects.create(card=self.card, price=5000, source='테스트몰', raw_data=self.raw)
+
+    def test_returns_raw_for_requested_ids_only(self):
+        res = self.client.get(self.URL, {'ids': f'{self.card.id},{self.bare.id}'})
+        self.assertEqual(res.json(), {str(self.card.id): self.raw})
+        self.assertIn('ETag', res)
+        self.assertIn('private', res['Cache-Control'])
+
+    def test_card_list_html_no_longer_embeds_raw_data(self):
+        res = self.client.get(f'/pokemon/kr/expansions/{self.expansion.code}/cards/')
+        self.assertNotContains(res, '테스트몰')
+        self.assertContains(res, self.URL)
+
+    def test_etag_revalidates_until_new_price_collected(self):
+        params = {'ids': str(self.card.id)}
+        etag = self.client.get(self.URL, params)['ETag']
+
+        res = self.client.get(self.URL, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+        CardPrice.objects.create(
+            card=self.card, price=4500, source='다른몰',
+            raw_data=[{'mallName': '다른몰', 'lprice': '4500'}],
+        )
+        res = self.client.get(self.URL, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()[str(self.card.id)][0]['mallName'], '다른몰')
+
+    def test_invalid_ids_is_400(self):
+        self.assertEqual(self.client.get(self.URL, {'ids': '1,abc'}).status_code, 400)
+
+    def test_store_price_check_raw_data_uses_composite_keys(self):
+        key = f'POKEMON:{self.card.id}'
+        res = self.client.get(
+            '/store-price-check/raw-data/', {'keys': f'{key},DIGIMON:{self.card.id},NIKKE:1'},
+        )
+        self.assertEqual(res.json(), {key: self.raw})
+        etag = res['ETag']
+        res = self.client.get('/store-price-check/raw-data/', {'keys': key}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)  # 키 목록이 다르면 다른 ETag
+
+
+_CT_STORES = {
+    'busan':   {'label': '부산', 'username': 'b', 'password': 'pw'},
+    'gwangju': {'label': '광주', 'username': 'g', 'password': 'pw'},
+}
+
+
+@override_settings(CARD_CONTROLTOWER_STORES=_CT_STORES)
+class CardControltowerClientTests(SimpleTestCase):
+    """
+    card-controltower 클라이언트 — 판매중 배지 인덱스는 목록을 새로 받을 때 한 번만 만들고
+    요청마다는 메모 재사용, 매장별 조회는 동시에, 재로그인은 매장당 한 번만.
+    """
+
+    def setUp(self):
+        cache.clear()
+        card_controltower_client._sale_status_memo = (None, {})
+        self.cards = {
+            'b': [{'sellerProductCode': 'PKM-1', 'naverSaleStatus': 'SALE'}],
+            'g': [
+                {'sellerProductCode': 'PKM-1', 'naverSaleStatus': 'SUSPENSION'},
+                {'sellerProductCode': 'PKM-2', 'naverSaleStatus': 'SALE'},
+            ],
+        }
+
+    def _post(self, url, json=None, timeout=None):
+        return mock.Mock(status_code=200, json=lambda: {'token': json['id']}, raise_for_status=lambda: None)
+
+    def _get(self, url, headers=None, timeout=None):
+        cards = self.cards[headers['Authorization'].split()[-1]]
+        return mock.Mock(status_code=200, json=lambda: list(cards), raise_for_status=lambda: None)
+
+    def _patch_session(self, **methods):
+        session = mock.Mock(**{
+            'post.side_effect': methods.get('post', self._post),
+            'get.side_effect': methods.get('get', self._get),
+        })
+        return mock.patch.object(card_controltower_client, '_get_http_session', return_value=session)
+
+    def test_index_built_once_and_memoised_by_fetch_time(self):
+        with self._patch_session() as session:
+            index = card_controltower_client.sale_status_index()
+            self.assertEqual(index, {
+                'PKM-1': {'busan': True, 'gwangju': False},
+                'PKM-2': {'gwangju': True},
+            })
+            self.assertEqual(session.return_value.get.call_count, 2)
+
+            with mock.patch.object(card_controltower_client, '_store_sale_status') as rebuild:
+                self.assertIs(card_controltower_client.sale_status_index(), index)
+            rebuild.assert_not_called()
+
+            # 새로고침(다시 조회)하면 조회 시각이 바뀌어 새 인덱스
+            self.cards['b'][0]['naverSaleStatus'] = 'OUTOFSTOCK'
+            card_controltower_client.fetch_store_cards('busan', force_refresh=True)
+            self.assertFalse(card_controltower_client.sale_status_index()['PKM-1']['busan'])
+
+    def test_builds_index_from_cached_list_when_index_entry_missing(self):
+        with self._patch_session() as session:
+            card_controltower_client.fetch_all_store_cards()
+            cache.delete('card-controltower:sale-status:busan')
+            card_controltower_client._sale_status_memo = (None, {})
+            self.assertTrue(card_controltower_client.sale_status_index()['PKM-1']['busan'])
+            self.assertEqual(session.return_value.get.call_count, 2)  # 카드 목록은 캐시에서
+
+    def test_api_failure_returns_empty(self):
+        with self._patch_session(post=requests.ConnectionError('down')):
+            self.assertEqual(card_controltower_client.sale_status_index(), {})
+
+    def test_stores_fetched_concurrently(self):
+        def slow_get(url, headers=None, timeout=None):
+            time.sleep(0.3)
+            return self._get(url, headers=headers, timeout=timeout)
+
+        with self._patch_session(get=slow_get):
+            started = time.monotonic()
+            result = card_controltower_client.fetch_all_store_cards()
+            elapsed = time.monotonic() - started
+        self.assertEqual(set(result), {'busan', 'gwangju'})
+        self.assertLess(elapsed, 0.55)  # 순차면 0.6초 이상
+
+    def test_concurrent_401_relogin_happens_once(self):
+        cache.set('card-controltower:token:busan', 'expired', 60)
+        logins = []
+
+        def post(url, json=None, timeout=None):
+            logins.append(json['id'])
+            time.sleep(0.1)
+            return self._post(url, json=json, timeout=timeout)
+
+        def get(url, headers=None, timeout=None):
+            if headers['Authorization'] == 'Bearer expired':
+                return mock.Mock(status_code=401)
+            return self._get(url, headers=headers, timeout=timeout)
+
+        with self._patch_session(post=post, get=get):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(
+                    lambda _: card_controltower_client.fetch_store_cards('busan', force_refresh=True),
+                    range(4),
+                ))
+        self.assertEqual(logins, ['b'])
+        expected = card_controltower_client.project_cards(self.cards['b'])
+        self.assertTrue(all(r == expected for r in results))
+
+    def test_cached_list_keeps_only_fields_pricehub_reads(self):
+        self.cards['b'] = [{
+            'sellerProductCode': 'PKM-1', 'cardType': 'POKEMON', 'naverSaleStatus': 'SALE',
+            'currentPrice': 3000, 'naverProductId': 123, 'description': 'x' * 1000,
+        }]
+        with self._patch_session():
+            card_controltower_client.fetch_store_cards('busan', force_refresh=True)
+        cached = cache.get(card_controltower_client._cards_key('busan'))
+        self.assertEqual(cached, [StoreCard(
+            sellerProductCode='PKM-1', cardType='POKEMON', naverSaleStatus='SALE', currentPrice=3000,
+        )])
+        self.assertNotIn('description', cached[0]._fields)
+
+    def test_categorize_reads_projected_cards(self):
+        # PriceHub 카탈로그에 없는 카드 종류 — DB 조회 없이 미등록으로
+        card = StoreCard(sellerProductCode='HL-1', cardType='HOLOLIVE', productName='페코라',
+                         priceChangeStatus='INCREASED', priceChangeRate=10, imageUrl='b.png')
+        drops, rises, unregistered = store_price_check.categorize(
+            {'busan': [card], 'gwangju': [card._replace(imageUrl='g.png')]}, 'busan',
+        )
+        self.assertEqual((drops, rises), ([], []))
+        row = unregistered[0]
+        self.assertEqual((row['productName'], row['game_label']), ('페코라', '홀로라이브'))
+        self.assertEqual(row['store_images'], {'busan': 'b.png', 'gwangju': 'g.png'})
+        self.assertIsNone(row['pricehub_key'])
+
+
+@override_settings(CARD_CONTROLTOWER_STORES=_CT_STORES)
+class CardControltowerStaleWhileRevalidateTests(SimpleTestCase):
+    """5분 지난 매장 카드 목록 — 옛 데이터를 바로 주고 한 곳만 백그라운드 갱신"""
+
+    def setUp(self):
+        cache.clear()
+        card_controltower_client._sale_status_memo = (None, {})
+        self.old = [StoreCard(sellerProductCode='PKM-1', naverSaleStatus='SALE')]
+        cache.set(card_controltower_client._cards_key('busan'), self.old, 3600)
+        cache.set(
+            'card-controltower:cards-fetched-at:busan',
+            timezone.now() - timedelta(minutes=10), 3600,
+        )
+
+    def test_stale_data_served_and_refresh_spawned_once(self):
+        with mock.patch.object(card_controltower_client, '_run_in_background') as spawn:
+            self.assertEqual(card_controltower_client.fetch_store_cards('busan'), self.old)
+            self.assertEqual(card_controltower_client.fetch_store_cards('busan'), self.old)
+        spawn.assert_called_once_with(card_controltower_client._background_refresh, 'busan')
+
+    def test_background_refresh_replaces_data_and_releases_lock(self):
+        new = [StoreCard(sellerProductCode='PKM-1', naverSaleStatus='SUSPENSION')]
+
+        def fetch(store):
+            cache.set(card_controltower_client._cards_key('busan'), new, 3600)
+            cache.set('card-controltower:cards-fetched-at:busan', timezone.now(), 3600)
+
+        with mock.patch.object(card_controltower_client, '_fetch_and_cache', side_effect=fetch), \
+                mock.patch.object(card_controltower_client, '_run_in_background', side_effect=lambda f, *a: f(*a)):
+            self.assertEqual(card_controltower_client.fetch_store_cards('busan'), self.old)
+            self.assertIsNone(cache.get('card-controltower:refresh-lock:busan'))
+            self.assertEqual(card_controltower_client.fetch_store_cards('busan'), new)
+
+    def test_cold_cache_waits_for_refresh_in_progress(self):
+        cache.delete(card_controltower_client._cards_key('busan'))
+        cache.add('card-controltower:refresh-lock:busan', 'other', 60)
+        fresh = [StoreCard(sellerProductCode='PKM-9')]
+
+        def other_worker():
+            time.sleep(0.2)
+            cache.set(card_controltower_client._cards_key('busan'), fresh, 3600)
+            cache.delete('card-controltower:refresh-lock:busan')
+
+        threading.Thread(target=other_worker).start()
+        with mock.patch.object(card_controltower_client, '_fetch_and_cache') as fetch:
+            self.assertEqual(card_controltower_client.fetch_store_cards('busan'), fresh)
+        fetch.assert_not_called()
+
+    def test_refresh_command_skips_store_being_refreshed(self):
+        cache.add('card-controltower:refresh-lock:busan', 'other', 60)
+        out = io.StringIO()
+        with mock.patch.object(card_controltower_client, '_fetch_and_cache', return_value=[{}, {}]) as fetch:
+            call_command('refresh_store_cards', stdout=out)
+        fetch.assert_called_once_with('gwangju')
+        self.assertIn('[busan] 다른 곳에서 갱신 중', out.getvalue())
+        self.assertIn('[gwangju] 카드 2건 갱신', out.getvalue())
+
+
+@override_settings(CARD_CONTROLTOWER_STORES=_CT_STORES)
+class StorePriceCheckCategorizedCacheTests(TestCase):
+    """스토어 가격 비교 — 분류 결과는 조회 시각 기준 캐시, 검색은 bigram 색인, 판매가는 페이지 행만 새로"""
+
+    def setUp(self):
+        cache.clear()
+        staff = get_user_model().objects.create_user('spc_staff', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        expansion = Expansion.objects.create(code='SP', name='스토어팩', image_url='https://example.com/e.png')
+        self.card = Card.objects.create(
+            expansion=expansion, card_number='001', name='리자몽 ex', rarity='RR',
+            shop_product_code='PKM-SP-001-K', selling_price=5000,
+        )
+        self.cards = [
+            StoreCard(sellerProductCode='PKM-SP-001-K', cardType='POKEMON', productName='리자몽 ex RR',
+                      priceChangeStatus='SEVERE_DROP', priceChangeRate=-30),
+            StoreCard(sellerProductCode='HL-1', cardType='HOLOLIVE', productName='페코라'),
+            StoreCard(sellerProductCode='HL-2', cardType='HOLOLIVE', productName='미코 리자'),
+        ]
+        now = timezone.now()
+        for store in _CT_STORES:
+            cache.set(f'card-controltower:cards-fetched-at:{store}', now, 3600)
+        patcher = mock.patch.object(
+            card_controltower_client, 'fetch_all_store_cards',
+            return_value={'busan': self.cards, 'gwangju': []},
+        )
+        self.fetch = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_tabs_pages_and_search_reuse_one_categorization(self):
+        res = self.client.get('/store-price-check/busan/')
+        self.assertEqual(res.context['counts'], {'drop': 1, 'rise': 0, 'unregistered': 2})
+        self.client.get('/store-price-check/busan/?tab=unregistered')
+        res = self.client.get('/store-price-check/busan/?tab=unregistered&q=페코')
+        self.assertEqual([r['sellerProductCode'] for r in res.context['rows']], ['HL-1'])
+        self.assertEqual(self.fetch.call_count, 1)
+
+        # 새로 받으면(조회 시각 변경) 다시 분류
+        cache.set('card-controltower:cards-fetched-at:busan', timezone.now() + timedelta(seconds=1), 3600)
+        self.client.get('/store-price-check/busan/')
+        self.assertEqual(self.fetch.call_count, 2)
+
+    def test_page_rows_show_current_pricehub_price(self):
+        self.client.get('/store-price-check/busan/')
+        Card.objects.filter(pk=self.card.pk).update(selling_price=4200)
+        res = self.client.get('/store-price-check/busan/')
+        self.assertEqual(res.context['rows'][0]['pricehub_price'], 4200)
+        self.assertEqual(self.fetch.call_count, 1)
+
+    def test_search_matches_normalized_name_and_code(self):
+        rows = [c._asdict() for c in self.cards]
+        index = store_price_check.build_search_index(rows)
+
+        def codes(q):
+            return [r['sellerProductCode'] for r in store_price_check.search(rows, index, q)]
+
+        self.assertEqual(codes('리자몽ex'), ['PKM-SP-001-K'])
+        self.assertEqual(codes('리자'), ['PKM-SP-001-K', 'HL-2'])
+        self.assertEqual(codes('sp-001'), ['PKM-SP-001-K'])
+        self.assertEqual(codes('코'), ['HL-1', 'HL-2'])
+        self.assertEqual(codes('-'), ['PKM-SP-001-K', 'HL-1', 'HL-2'])
+        self.assertEqual(codes('없는카드'), [])
+
+
+@override_settings(CARD_CONTROLTOWER_STORES=_CT_STORES)
+class CardControltowerCircuitBreakerTests(TestCase):
+    """연속 실패 시 card-controltower 호출 차단 → 쿨다운 후 시험 호출 1번 + 홈 화면 상태 표시"""
+
+    def setUp(self):
+        cache.clear()
+        card_controltower_client._sale_status_memo = (None, {})
+        self.session = mock.Mock()
+        self.session.post.side_effect = requests.ConnectionError('down')
+        patcher = mock.patch.object(card_controltower_client, '_get_http_session', return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _fail(self, times):
+        for _ in range(times):
+            with self.assertRaises(card_controltower_client.CardControltowerAPIError):
+                card_controltower_client.fetch_store_cards('busan', force_refresh=True)
+
+    def test_opens_after_threshold_and_skips_calls(self):
+        self._fail(card_controltower_client._BREAKER_THRESHOLD)
+        calls = self.session.post.call_count
+
+        with self.assertRaises(card_controltower_client.CardControltowerUnavailable):
+            card_controltower_client.fetch_store_cards('busan')
+        self.assertEqual(self.session.post.call_count, calls)
+        self.assertEqual(card_controltower_client.sale_status_index(), {})
+        # gwangju는 차단기가 닫혀 있어 로그인 1번 시도, busan은 호출 없음
+        self.assertEqual(self.session.post.call_count, calls + 1)
+
+    def test_single_probe_after_cooldown_and_reset_on_success(self):
+        self._fail(card_controltower_client._BREAKER_THRESHOLD)
+        cache.delete('card-controltower:breaker:busan:open-until')  # 쿨다운 끝
+
+        self.session.post.side_effect = None
+        self.session.post.return_value = mock.Mock(json=lambda: {'token': 't'}, raise_for_status=lambda: None)
+        self.session.get.return_value = mock.Mock(status_code=200, json=lambda: [], raise_for_status=lambda: None)
+
+        cache.add('card-controltower:breaker:busan:probe', 1, 60)  # 다른 워커가 시험 호출 중
+        with self.assertRaises(card_controltower_client.CardControltowerUnavailable):
+            card_controltower_client.fetch_store_cards('busan', force_refresh=True)
+        cache.delete('card-controltower:breaker:busan:probe')
+
+        self.assertEqual(card_controltower_client.fetch_store_cards('busan', force_refresh=True), [])
+        self.assertEqual(card_controltower_client.health()[0]['state'], 'ok')
+
+    def test_home_shows_health(self):
+        self._fail(card_controltower_client._BREAKER_THRESHOLD)
+        staff = get_user_model().objects.create_user('ct_staff', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        res = self.client.get('/')
+        self.assertContains(res, '부산:')
+        self.assertContains(res, f'연결 안 됨 — 연속 실패 {card_controltower_client._BREAKER_THRESHOLD}회')
+        self.assertContains(res, '아직 조회 안 됨')  # 광주
+
+
+class _StubWebhookReceiver:
+    """판매가 변경 웹훅을 받는 로컬 HTTP 서버 — 받은 본문/헤더를 모아두고 정해진 상태 코드로 응답"""
+
+    def __init__(self, statuses=(200,)):
+        received = self.received = []
+        statuses = list(statuses)
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                received.append((body, dict(self.headers)))
+                self.send_response(statuses.pop(0) if len(statuses) > 1 else statuses[0])
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/price-changes'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def events(self):
+        return [e for body, _ in self.received for e in json.loads(body)['events']]
+
+
+@override_settings(PRICE_CHANGE_WEBHOOK_URL='', PRICE_CHANGE_WEBHOOK_SECRET='s3cret')
+class PriceChangeOutboxTests(TestCase):
+    """판매가 변경 아웃박스 — 판매가 저장 경로마다 기록, 웹훅으로 묶어 전송 + 재시도 + 전송 위치"""
+
+    def setUp(self):
+        cache.clear()
+        staff = get_user_model().objects.create_user('outbox_staff', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        self.expansion = Expansion.objects.create(code='OB', name='아웃박스팩', image_url='https://example.com/e.png')
+        self.card = Card.objects.create(
+            expansion=self.expansion, card_number='001', name='피카츄', rarity='U',
+            shop_product_code='PKM-OB-001-K', selling_price=1000,
+        )
+        self.other = Card.objects.create(
+            expansion=self.expansion, card_number='002', name='라이츄', rarity='U',
+            shop_product_code='PKM-OB-002-K', selling_price=0,
+        )
+        # 방금 기록한 이벤트도 바로 보내게 — 정착 대기는 test_unsettled_event_holds_back_later_ids에서
+        settle = mock.patch.object(price_outbox, '_DISPATCH_SETTLE', timedelta(0))
+        settle.start()
+        self.addCleanup(settle.stop)
+
+    def _set_price(self, card, price):
+        return self.client.post(
+            f'/pokemon/kr/cards/{card.pk}/set-price/',
+            data=json.dumps({'selling_price': price}), content_type='application/json',
+        )
+
+    def _changes(self):
+        return list(PriceChangeEvent.objects.values_list('card_id', 'old_price', 'new_price', 'source'))
+
+    def test_price_changing_views_record_events(self):
+        self._set_price(self.card, 1000)  # 그대로 — 기록 안 함
+        self._set_price(self.card, 1200)
+        self.client.post(
+            '/pokemon/kr/bulk-price/edit/',
+            data=json.dumps({'card_id': self.other.pk, 'price': 500}), content_type='application/json',
+        )
+        self.client.post(f'/pokemon/kr/expansions/{self.expansion.code}/reset-prices/')
+        self.assertEqual(self._changes(), [
+            (self.card.pk, 1000, 1200, 'set_price'),
+            (self.other.pk, 0, 500, 'bulk_edit'),
+            (self.card.pk, 1200, 0, 'reset'),
+            (self.other.pk, 500, 0, 'reset'),
+        ])
+        self.assertEqual(PriceChangeEvent.objects.first().shop_product_code, 'PKM-OB-001-K')
+
+    def test_dispatch_to_stub_receiver_advances_high_water_mark(self):
+        for price in (1100, 1200, 1300):
+            self._set_price(self.card, price)
+        receiver = _StubWebhookReceiver()
+        self.addCleanup(receiver.close)
+
+        out = io.StringIO()
+        call_command('dispatch_price_changes', url=receiver.url, batch_size=2, stdout=out)
+        self.assertEqual(len(receiver.received), 2)  # 2건 + 1건
+        self.assertEqual([e['new_price'] for e in receiver.events()], [1100, 1200, 1300])
+        self.assertIn('3건 전송', out.getvalue())
+
+        body, headers = receiver.received[0]
+        expected = hmac.new(b's3cret', body, hashlib.sha256).hexdigest()
+        self.assertEqual(headers['X-PriceHub-Signature'], f'sha256={expected}')
+        self.assertEqual(json.loads(body)['high_water_mark'], receiver.events()[1]['id'])
+
+        call_command('dispatch_price_changes', url=receiver.url, stdout=io.StringIO())
+        self.assertEqual(len(receiver.received), 2)  # 새 이벤트 없음
+        self.assertEqual(PriceChangeCursor.objects.get().last_event_id, PriceChangeEvent.objects.last().id)
+
+    def test_failed_delivery_retries_then_keeps_position(self):
+        self._set_price(self.card, 1100)
+        receiver = _StubWebhookReceiver(statuses=(503, 503, 503, 503, 200))
+        self.addCleanup(receiver.close)
+
+        with mock.patch.object(price_outbox, '_RETRY_BACKOFF', 0):
+            with self.assertRaises(CommandError):
+                call_command('dispatch_price_changes', url=receiver.url, stdout=io.StringIO())
+            self.assertEqual(len(receiver.received), price_outbox._DELIVERY_ATTEMPTS)
+            self.assertEqual(PriceChangeCursor.objects.get().last_event_id, 0)
+            self.assertIn('HTTP 503', PriceChangeCursor.objects.get().last_error)
+
+            # 다음 실행이 같은 이벤트부터 다시
+            call_command('dispatch_price_changes', url=receiver.url, stdout=io.StringIO())
+        self.assertEqual([e['new_price'] for e in receiver.events()][-1], 1100)
+        self.assertEqual(PriceChangeCursor.objects.get().last_event_id, PriceChangeEvent.objects.get().id)
+
+    def test_unsettled_event_holds_back_later_ids(self):
+        # 긴 트랜잭션이 id 10을 잡고 있는 사이 짧은 트랜잭션의 11이 먼저 커밋된 상황
+        def event(pk, price):
+            return PriceChangeEvent.objects.create(
+                id=pk, game_type='pokemon_kr', card_id=self.card.pk, old_price=0, new_price=price, source='set_price',
+            )
+
+        receiver = _StubWebhookReceiver()
+        self.addCleanup(receiver.close)
+        later = timezone.now() + timedelta(seconds=61)
+        with mock.patch.object(price_outbox, '_DISPATCH_SETTLE', timedelta(seconds=60)):
+            event(11, 1100)
+            self.assertEqual(price_outbox.dispatch(url=receiver.url), 0)  # 11은 아직 정착 전
+
+            event(10, 1000)  # 긴 트랜잭션이 이제야 커밋
+            with mock.patch('pricehub.price_outbox.timezone.now', return_value=later):
+                self.assertEqual(price_outbox.dispatch(url=receiver.url), 2)
+        self.assertEqual([e['id'] for e in receiver.events()], [10, 11])
+        self.assertEqual(PriceChangeCursor.objects.get().last_event_id, 11)
+
+    def test_dispatch_stops_before_lock_expiry_and_keeps_others_lock(self):
+        for price in (1100, 1200, 1300):
+            self._set_price(self.card, price)
+        receiver = _StubWebhookReceiver()
+        self.addCleanup(receiver.close)
+
+        # 잠금 시간을 다 쓴 것처럼 — 묶음 하나만 보내고 멈춘다
+        with mock.patch.object(price_outbox, '_BATCH_WORST_CASE', price_outbox._DISPATCH_LOCK_TTL):
+            self.assertEqual(price_outbox.dispatch(url=receiver.url, batch_size=1), 1)
+        self.assertIsNone(cache.get(price_outbox._DISPATCH_LOCK_KEY))
+
+        # 전송 중 잠금이 끝나 다른 실행이 잡았으면 그 잠금은 건드리지 않는다
+        def deliver(url, body):
+            cache.set(price_outbox._DISPATCH_LOCK_KEY, 'other-run')
+
+        with mock.patch.object(price_outbox, '_deliver', side_effect=deliver):
+            self.assertEqual(price_outbox.dispatch(url=receiver.url), 2)
+        self.assertEqual(cache.get(price_outbox._DISPATCH_LOCK_KEY), 'other-run')
+
+
+class APIKeyAuthenticationCacheTests(TestCase):
+    """API Key 확인 캐시 — 연달아 부르면 DB를 안 보고, 키를 끄면 바로 거부, last_used_at은 1분에 한 번"""
+
+    URL = '/api/pokemon/kr/expansions/'
+
+    def setUp(self):
+        cache.clear()
+        self.api_key, raw_key = APIKey.create_key(name='캐시')
+        self.auth = {'HTTP_AUTHORIZATION': f'Api-Key {raw_key}'}
+
+    def _api_key_queries(self, ctx):
+        return [q['sql'] for q in ctx.captured_queries if 'api_key' in q['sql']]
+
+    def test_repeated_requests_skip_key_lookup_and_coalesce_last_used(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(self.URL, **self.auth).status_code, 200)
+        self.assertEqual(len(self._api_key_queries(ctx)), 2)  # SELECT + last_used_at UPDATE
+        self.assertIsNotNone(APIKey.objects.get(pk=self.api_key.pk).last_used_at)
+
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(3):
+                self.assertEqual(self.client.get(self.URL, **self.auth).status_code, 200)
+        self.assertEqual(self._api_key_queries(ctx), [])
+
+    def test_last_used_marker_is_tried_once_per_interval_per_worker(self):
+        with mock.patch('pricehub.authentication.cache.add', wraps=cache.add) as add:
+            for _ in range(3):
+                self.assertEqual(self.client.get(self.URL, **self.auth).status_code, 200)
+        touched = [c for c in add.call_args_list if c.args[0].startswith('api-key:touched:')]
+        self.assertEqual(len(touched), 1)
+
+    def test_deactivating_key_revokes_immediately(self):
+        self.assertEqual(self.client.get(self.URL, **self.auth).status_code, 200)
+
+        self.api_key.is_active = False
+        self.api_key.save()
+
+        self.assertIn(self.client.get(self.URL, **self.auth).status_code, (401, 403))
+
+    def test_deleting_key_revokes_immediately(self):
+        self.assertEqual(self.client.get(self.URL, **self.auth).status_code, 200)
+        APIKey.objects.filter(pk=self.api_key.pk).delete()
+        self.assertIn(self.client.get(self.URL, **self.auth).status_code, (401, 403))
+
+    def test_invalid_key_is_not_cached(self):
+        bad = {'HTTP_AUTHORIZATION': 'Api-Key nope'}
+        self.assertIn(self.client.get(self.URL, **bad).status_code, (401, 403))
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.URL, **bad)
+        self.assertEqual(len(self._api_key_queries(ctx)), 1)
+
+
+class APIKeyRateLimitTests(TestCase):
+    """토큰 버킷 요청 한도 — 워커 간 공유 SQLite 파일에 키마다 한 행"""
+
+    def setUp(self):
+        import tempfile
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(API_THROTTLE_DB=f'{tmp.name}/throttle.sqlite3')
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_bucket_allows_capacity_then_refills(self):
+        from pricehub import rate_limit
+
+        results = [rate_limit.consume('k', 3, 1.0, now=100.0)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+        allowed, wait = rate_limit.consume('k', 3, 1.0, now=100.5)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 0.5)
+        self.assertTrue(rate_limit.consume('k', 3, 1.0, now=101.0)[0])
+        self.assertTrue(rate_limit.consume('other', 3, 1.0, now=101.0)[0])  # 키마다 따로
+
+    def test_concurrent_connections_share_one_bucket(self):
+        from pricehub import rate_limit
+
+        def worker():
+            return sum(rate_limit.consume('shared', 20, 0.001, now=200.0)[0] for _ in range(10))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            allowed = sum(pool.map(lambda _: worker(), range(4)))
+        self.assertEqual(allowed, 20)
+
+    def test_api_returns_429_with_retry_after(self):
+        from pricehub.throttling import APIKeyRateThrottle
+
+        cache.clear()
+        _, raw_key = APIKey.create_key(name='한도')
+        auth = {'HTTP_AUTHORIZATION': f'Api-Key {raw_key}'}
+        with mock.patch.dict(APIKeyRateThrottle.THROTTLE_RATES, {'api_key': '2/min'}):
+            codes = [self.client.get('/api/pokemon/kr/expansions/', **auth).status_code for _ in range(3)]
+            res = self.client.get('/api/pokemon/kr/expansions/', **auth)
+        self.assertEqual(codes, [200, 200, 429])
+        self.assertGreater(int(res['Retry-After']), 0)
+
+
+class TestRunnerStateTests(SimpleTestCase):
+    """테스트 러너 — 요청 한도 상태/공유 캐시 파일은 실행마다 임시 파일, 운영 django_cache/에 쓰지 않는다"""
+
+    def test_throttle_db_is_outside_cache_dir(self):
+        from pathlib import Path
+
+        from django.conf import settings
+        from pricehub import rate_limit
+
+        path = Path(rate_limit.db_path())
+        self.assertTrue(settings.API_THROTTLE_DB)
+        self.assertNotEqual(path.parent, Path(settings.CACHE_DIR))
+        self.assertNotIn(Path(settings.BASE_DIR), path.parents)
+
+    def test_sqlite_cache_files_are_outside_base_dir(self):
+        from pathlib import Path
+
+        from django.conf import settings
+
+        for alias, config in settings.CACHES.items():
+            if config['BACKEND'] == 'pricehub.sqlite_cache.SQLiteCache':
+                with self.subTest(alias=alias):
+                    self.assertNotIn(Path(settings.BASE_DIR), Path(config['LOCATION']).parents)
+
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    """공유 캐시 백엔드 — SQLite(WAL) 파일 하나, 인덱스 만료 + LRU 축출"""
+
+    def _cache(self, **options):
+        import tempfile
+        from pricehub.sqlite_cache import SQLiteCache
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        return SQLiteCache(f'{tmp.name}/cache.sqlite3', {'OPTIONS': options})
+
+    def test_basic_operations_and_expiry(self):
+        c = self._cache()
+        c.set('a', {'x': [1, 2]}, 60)
+        self.assertEqual(c.get('a'), {'x': [1, 2]})
+        self.assertTrue(c.has_key('a'))
+        self.assertTrue(c.add('n', 1))
+        self.assertFalse(c.add('n', 5))
+        self.assertEqual(c.incr('n'), 2)
+        with self.assertRaises(ValueError):
+            c.incr('missing')
+
+        c.set('old', 1, 60)
+        with mock.patch('pricehub.sqlite_cache.time.time', return_value=time.time() + 61):
+            self.assertIsNone(c.get('old'))
+            self.assertFalse(c.has_key('old'))
+            self.assertTrue(c.add('old', 2, 60))  # 만료된 항목 자리에는 add 가능
+        self.assertTrue(c.delete('a'))
+        self.assertFalse(c.delete('a'))
+        c.set('zero', 1, 0)
+        self.assertIsNone(c.get('zero'))
+
+    def test_add_is_a_lock_across_instances(self):
+        c = self._cache()
+        from pricehub.sqlite_cache import SQLiteCache
+        other = SQLiteCache(c._path, {})  # 다른 워커와 같은 파일
+
+        def worker(i):
+            return (c if i % 2 else other).add('lock', i, 30)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            won = sum(pool.map(worker, range(20)))
+        self.assertEqual(won, 1)
+        self.assertEqual(other.get('lock'), c.get('lock'))
+
+    def test_get_many_and_set_many(self):
+        c = self._cache(MAX_ENTRIES=5000)
+        data = {f'k{i}': i for i in range(1200)}  # IN 묶음 여러 개
+        self.assertEqual(c.set_many(data, 60), [])
+        self.assertEqual(c.get_many(list(data) + ['none']), data)
+        c.delete_many([f'k{i}' for i in range(1000)])
+        self.assertEqual(len(c.get_many(list(data))), 200)
+
+    @mock.patch('pricehub.sqlite_cache._ACCESS_RESOLUTION', 0)
+    @mock.patch('pricehub.sqlite_cache._CULL_EVERY', 1)
+    def test_evicts_least_recently_used(self):
+        c = self._cache(MAX_ENTRIES=3, CULL_FREQUENCY=3)
+        now = time.time()
+        for i, key in enumerate(['a', 'b', 'c']):
+            with mock.patch('pricehub.sqlite_cache.time.time', return_value=now + i):
+                c.set(key, key)
+        with mock.patch('pricehub.sqlite_cache.time.time', return_value=now + 3):
+            c.get('a')  # a를 최근으로
+        with mock.patch('pricehub.sqlite_cache.time.time', return_value=now + 4):
+            c.set('d', 'd')
+        self.assertEqual(sorted(c.get_many(['a', 'b', 'c', 'd'])), ['a', 'c', 'd'])
+
+    @mock.patch('pricehub.sqlite_cache._CULL_EVERY', 1)
+    def test_evicts_by_total_size(self):
+        c = self._cache(MAX_SIZE=25000)
+        now = time.time()
+        for i in range(4):
+            with mock.patch('pricehub.sqlite_cache.time.time', return_value=now + i):
+                c.set(f'big{i}', b'x' * 10000)
+        self.assertEqual(sorted(c.get_many([f'big{i}' for i in range(4)])), ['big2', 'big3'])
+
+    @mock.patch('pricehub.sqlite_cache._CULL_EVERY', 1)
+    def test_cull_under_limits_skips_eviction_sort(self):
+        c = self._cache(MAX_ENTRIES=100, MAX_SIZE=10 ** 6)
+        statements = []
+        c._connection().set_trace_callback(statements.append)
+        c.set('a', 1)
+        self.assertTrue(any('COUNT(*)' in sql for sql in statements))
+        self.assertFalse(any('OVER' in sql or 'ORDER BY accessed' in sql for sql in statements))
+
+    def test_cull_interval_is_counted_across_threads(self):
+        from pricehub import sqlite_cache
+
+        c = self._cache()
+        with mock.patch.object(sqlite_cache.SQLiteCache, '_cull') as cull, \
+                mock.patch.object(sqlite_cache, '_CULL_EVERY', 4):
+            c.set('first', 1)  # 첫 쓰기
+            # 스레드마다 인스턴스가 따로여도 같은 파일이면 쓰기 수를 같이 센다
+            other = sqlite_cache.SQLiteCache(c._path, {})
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+                pool.submit(lambda: [other.set(f'k{i}', i) for i in range(3)]).result()
+            c.set('fifth', 5)
+        self.assertEqual(cull.call_count, 2)
+
+
+_TIERED_CACHES = {
+    'default': {
+        'BACKEND': 'pricehub.tiered_cache.TieredCache',
+        'LOCATION': 'shared',
+        'OPTIONS': {'L1_PREFIXES': {'hot:': 30}, 'L1_VERSION_CHECK': 1, 'L1_STATS_FLUSH': 0},
+    },
+    'shared': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tiered-test'},
+}
+
+
+@override_settings(CACHES=_TIERED_CACHES)
+class TieredCacheTests(TestCase):
+    """캐시 2단 — 접두사에 맞는 키만 워커 메모리 L1, 워커 간 무효화는 공유 캐시의 접두사 버전"""
+
+    def setUp(self):
+        from django.core.cache import caches
+        from pricehub import tiered_cache
+
+        self.shared = caches['shared']
+        self.shared.clear()
+        caches['default']._tier = tiered_cache._LocalTier(1000)  # 테스트마다 새 워커
+        # 같은 공유 캐시를 보는 다른 워커 — L1만 따로
+        self.other = tiered_cache.TieredCache('shared', _TIERED_CACHES['default'])
+        self.other._tier = tiered_cache._LocalTier(1000)
+        self.now = time.monotonic()
+
+    def _at(self, offset):
+        return mock.patch('pricehub.tiered_cache.time.monotonic', return_value=self.now + offset)
+
+    def test_only_prefixed_keys_are_kept_in_l1(self):
+        with self._at(0):
+            cache.set('hot:a', 1)
+            cache.set('cold:a', 1)
+            self.assertEqual(cache.get_many(['hot:a', 'cold:a']), {'hot:a': 1, 'cold:a': 1})
+            self.shared.set('hot:a', 2)   # 버전을 안 거치고 공유 캐시만 바꾸면
+            self.shared.set('cold:a', 2)
+            self.assertEqual(cache.get('hot:a'), 1)  # L1 값
+            self.assertEqual(cache.get('cold:a'), 2)
+        with self._at(31):
+            self.assertEqual(cache.get('hot:a'), 2)  # L1 TTL 지남
+
+    def test_l1_expiry_is_capped_at_remaining_shared_ttl(self):
+        import tempfile
+        from pricehub import tiered_cache
+        from pricehub.sqlite_cache import SQLiteCache
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        shared = SQLiteCache(f'{tmp.name}/cache.sqlite3', {})
+        worker = tiered_cache.TieredCache('shared', _TIERED_CACHES['default'])
+        worker._tier = tiered_cache._LocalTier(1000)
+        wall = time.time()
+        with mock.patch.object(tiered_cache.TieredCache, 'shared', new_callable=mock.PropertyMock, return_value=shared):
+            with self._at(0):
+                shared.set('hot:short', 1, 5)  # L2 TTL 5초 < L1 TTL 30초
+                shared.set('hot:long', 1, 60)
+                self.assertEqual(worker.get_many(['hot:short', 'hot:long']), {'hot:short': 1, 'hot:long': 1})
+            with self._at(10), mock.patch('pricehub.sqlite_cache.time.time', return_value=wall + 10):
+                self.assertIsNone(worker.get('hot:short'))  # L2에서 만료 — L1도 같이
+                shared.set('hot:long', 2, 60)   # 버전을 안 거치고 공유 캐시만 바꾸면
+                self.assertEqual(worker.get('hot:long'), 1)  # 남은 TTL이 길면 L1 TTL 그대로
+
+    def test_write_from_other_worker_invalidates_after_version_check(self):
+        with self._at(0):
+            cache.set('hot:a', 1)
+            self.assertEqual(cache.get('hot:a'), 1)
+            self.other.set('hot:a', 2)
+            self.assertEqual(cache.get('hot:a'), 1)  # 버전 확인 주기 안에서는 옛 값
+        with self._at(1.5):
+            self.assertEqual(cache.get('hot:a'), 2)
+            cache.delete('hot:a')
+            self.assertIsNone(cache.get('hot:a'))  # 이 워커가 쓴 것은 바로
+
+    def test_add_is_decided_by_shared_cache(self):
+        with self._at(0):
+            self.assertTrue(cache.add('hot:lock', 1, 30))
+            self.assertFalse(self.other.add('hot:lock', 2, 30))
+            self.assertEqual(cache.incr('hot:lock'), 2)
+            self.assertEqual(self.shared.get('hot:lock'), 2)
+
+    def test_diagnostics_page_shows_hit_counts(self):
+        with self._at(0):
+            cache.set('hot:a', 1)
+            cache.get('hot:a')  # 미스 — 공유 캐시에서 읽어 L1에
+            cache.get('hot:a')  # 적중
+        with self._at(2):
+            cache.get('hot:a')  # 적중 — 버전 확인 때 이전 카운트를 공유 캐시에 반영
+        staff = get_user_model().objects.create_user('cache_staff', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        res = self.client.get('/diagnostics/cache/')
+        self.assertEqual(res.status_code, 200)
+        row = res.context['stats']['rows'][0]
+        self.assertEqual((row['prefix'], row['local_hits'], row['local_misses']), ('hot:', 2, 1))
+        self.assertEqual((row['total_hits'], row['total_misses']), (1, 1))
+
+
+class RarityPriceMapCacheTests(TestCase):
+    """레어도별 매입가 맵 — 캐시해두고 저장/삭제 시그널이 지운다"""
+
+    def test_map_is_cached_until_rarity_price_changes(self):
+        from pricehub.models import RarityPurchasePrice
+        from pricehub.purchase_config import get_rarity_price_map
+
+        cache.clear()
+        row = RarityPurchasePrice.objects.create(game_type='pokemon_kr', rarity='SR', price=3000)
+        self.assertEqual(get_rarity_price_map('pokemon_kr'), {'SR': 3000})
+        with self.assertNumQueries(0):
+            get_rarity_price_map('pokemon_kr')
+        row.price = 3500
+        row.save()
+        self.assertEqual(get_rarity_price_map('pokemon_kr'), {'SR': 3500})
+        row.delete()
+        self.assertEqual(get_rarity_price_map('pokemon_kr'), {})
+
+class ApiConditionalResponseTests(TestCase):
+    """API ETag/304 — 카드 목록은 목록 캐시 버전, 가격 스냅샷/이력은 최신 가격 행 기준"""
+
+    def setUp(self):
+        cache.clear()
+        _, raw_key = APIKey.create_key(name='조건부')
+        self.auth = {'HTTP_AUTHORIZATION': f'Api-Key {raw_key}'}
+        self.expansion = Expansion.objects.create(code='ET', name='태그팩', image_url='https://example.com/e.png')
+        self.card = Card.objects.create(
+            expansion=self.expansion, card_number='001', name='피카츄', rarity='C',
+            shop_product_code='PKM-ET-001-K',
+        )
+        CardPrice.objects.create(card=self.card, price=5000, source='테스트몰', raw_data=[])
+
+    def _get(self, url, etag=None, **params):
+        extra = dict(self.auth)
+        if etag:
+            extra['HTTP_IF_NONE_MATCH'] = etag
+        return self.client.get(url, params, **extra)
+
+    def test_card_list_revalidates_until_card_changes(self):
+        url = f'/api/pokemon/kr/expansions/{self.expansion.code}/cards/'
+        res = self._get(url)
+        etag = res['ETag']
+        self.assertIn('private', res['Cache-Control'])
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self._get(url, etag).status_code, 304)
+        self.assertFalse(any('pricehub_card' in q['sql'] and 'LIMIT' in q['sql'] for q in ctx.captured_queries))
+        self.assertNotEqual(self._get(url, rarity='C')['ETag'], etag)
+
+        self.card.name = '라이츄'
+        self.card.save(update_fields=['name'])
+        res = self._get(url, etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('라이츄', res.content.decode('utf-8'))
+
+    def test_price_snapshot_and_history_revalidate_until_new_price(self):
+        for path in ('price-snapshot', 'price-history'):
+            url = f'/api/pokemon/kr/cards/{self.card.pk}/{path}/'
+            etag = self._get(url)['ETag']
+            self.assertEqual(self._get(url, etag).status_code, 304, path)
+
+        CardPrice.objects.create(card=self.card, price=4500, source='다른몰', raw_data=[])
+        for path in ('price-snapshot', 'price-history'):
+            url = f'/api/pokemon/kr/cards/{self.card.pk}/{path}/'
+            self.assertEqual(self._get(url, etag='"stale"').status_code, 200, path)
+
+    def test_price_snapshot_without_key_is_rejected_before_etag(self):
+        url = f'/api/pokemon/kr/cards/{self.card.pk}/price-snapshot/'
+        etag = self._get(url)['ETag']
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertIn(res.status_code, (401, 403))
+
+
+
+class ApiCardListQueryCountTests(TestCase):
+    """API 카드 목록 — 카드 수와 무관하게 쿼리 수가 일정(최신 가격은 윈도 쿼리 1번)"""
+
+    GAMES = {
+        'pokemon/kr': (Expansion, Card, {}),
+        'onepiece/kr': (OnePieceExpansion, OnePieceCard, {}),
+        'digimon/kr': (DigimonExpansion, DigimonCard, {'category_id': 1}),
+        'pokemon/jp': (JapanExpansion, JapanCard, {}),
+    }
+
+    def setUp(self):
+        cache.clear()
+        _, raw_key = APIKey.create_key(name='목록')
+        self.auth = {'HTTP_AUTHORIZATION': f'Api-Key {raw_key}'}
+
+    def _add_cards(self, path, count, start=0):
+        expansion_model, card_model, expansion_extra = self.GAMES[path]
+        price_model = card_model._meta.get_field('prices').related_model
+        expansion, _ = expansion_model.objects.get_or_create(
+            code='QC', defaults={'name': '쿼리팩', **expansion_extra},
+        )
+        for i in range(start, start + count):
+            card = card_model.objects.create(
+                expansion=expansion, card_number=f'{i:03d}', name=f'카드{i}', rarity='C',
+                shop_product_code=f'QC-{path}-{i:03d}',
+            )
+            for day in (2, 1):
+                price = price_model.objects.create(
+                    card=card, price=1000 * (i + 1) + day, source=f'몰{day}',
+                    collected_at=timezone.now(),
+                )
+                # collected_at이 auto_now_add인 모델도 있어 저장 뒤에 과거로 옮긴다
+                price_model.objects.filter(pk=price.pk).update(
+                    collected_at=timezone.now() - timedelta(days=day),
+                )
+
+    def _count_queries(self, path):
+        url = f'/api/{path}/expansions/QC/cards/'
+        cache.clear()  # 키 확인/목록 버전 캐시 상태를 매번 같게
+        authentication.invalidate_key_cache()  # 워커 메모리의 키 확인/last_used 시도 기록도
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url, **self.auth)
+        self.assertEqual(res.status_code, 200)
+        return len(ctx.captured_queries), res.json()
+
+    def test_query_count_does_not_grow_with_cards(self):
+        for path in self.GAMES:
+            self._add_cards(path, 2)
+            small, _ = self._count_queries(path)
+            self._add_cards(path, 6, start=2)
+            large, body = self._count_queries(path)
+            self.assertEqual(large, small, path)
+            results = body['results'] if isinstance(body, dict) else body
+            self.assertEqual(len(results), 8, path)
+
+    def test_latest_price_is_most_recent_row(self):
+        self._add_cards('pokemon/kr', 2)
+        _, body = self._count_queries('pokemon/kr')
+        results = body['results'] if isinstance(body, dict) else body
+        self.assertEqual(
+            [(r['latest_price']['price'], r['latest_price']['source']) for r in results],
+            [(1001, '몰1'), (2001, '몰1')],
+        )
+
+
+class ApiFieldSelectionTests(TestCase):
+    """?fields= / ?exclude= 응답 필드 고르기, prices/latest 커서 페이지 + raw_data 기본 제외"""
+
+    def setUp(self):
+        cache.clear()
+        _, raw_key = APIKey.create_key(name='필드')
+        self.auth = {'HTTP_AUTHORIZATION': f'Api-Key {raw_key}'}
+        self.expansion = Expansion.objects.create(code='FS', name='필드팩', image_url='https://example.com/e.png')
+        self.card = Card.objects.create(
+            expansion=self.expansion, card_number='001', name='피카츄', rarity='C',
+            shop_product_code='PKM-FS-001-K',
+        )
+        for price in (1000, 1100, 1200):
+            CardPrice.objects.create(card=self.card, price=price, source='몰', raw_data=[{'lprice': price}])
+
+    def _get(self, url, **params):
+        res = self.client.get(url, params, **self.auth)
+        self.assertEqual(res.status_code, 200)
+        return res.json()
+
+    def test_latest_prices_are_cursor_paged_without_raw_data(self):
+        body = self._get('/api/pokemon/kr/prices/latest/', limit=2)
+        self.assertEqual([r['price'] for r in body['results']], [1200, 1100])
+        self.assertNotIn('raw_data', body['results'][0])
+
+        rest = self.client.get(body['next'], **self.auth).json()
+        self.assertEqual([r['price'] for r in rest['results']], [1000])
+        self.assertIsNone(rest['next'])
+
+        body = self._get('/api/pokemon/kr/prices/latest/', fields='price,raw_data', limit=5000)
+        self.assertEqual(body['results'][0], {'price': 1200, 'raw_data': [{'lprice': 1200}]})
+
+    def test_card_detail_projects_nested_history_and_caps_limit(self):
+        url = f'/api/pokemon/kr/cards/{self.card.pk}/'
+        body = self._get(url)
+        self.assertIn('raw_data', body['naver_price_history'][0])  # 상세는 기본 그대로
+
+        body = self._get(url, exclude='naver_price_history.raw_data,created_at')
+        self.assertNotIn('raw_data', body['naver_price_history'][0])
+        self.assertNotIn('created_at', body)
+
+        body = self._get(url, fields='id,naver_price_history.price', price_limit=2)
+        self.assertEqual(body, {'id': self.card.pk, 'naver_price_history': [{'price': 1200}, {'price': 1100}]})
+
+        with mock.patch('pricehub.api_views._PRICE_LIMIT_MAX', 1):
+            self.assertEqual(len(self._get(url, price_limit=50)['naver_price_history']), 1)
+
+    def test_card_list_fields_and_skipped_latest_price_query(self):
+        url = f'/api/pokemon/kr/expansions/{self.expansion.code}/cards/'
+        self.assertEqual(self._get(url, fields='id,name'), [{'id': self.card.pk, 'name': '피카츄'}])
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as full:
+            self._get(url)
+        cache.clear()
+        with CaptureQueriesContext(connection) as slim:
+            body = self._get(url, exclude='latest_price')
+        self.assertNotIn('latest_price', body[0])
+        self.assertEqual(len(slim.captured_queries), len(full.captured_queries) - 1)
+
+
+class ApiCatalogPagingExportTests(TestCase):
+    """카드 목록/검색 커서 페이지(?limit= 있을 때만), cards/export.ndjson 스트림"""
+
+    def setUp(self):
+        cache.clear()
+        _, raw_key = APIKey.create_key(name='내보내기')
+        self.auth = {'HTTP_AUTHORIZATION': f'Api-Key {raw_key}'}
+        self.expansion = Expansion.objects.create(code='EX', name='내보내기팩', image_url='https://example.com/e.png')
+        other = Expansion.objects.create(code='EY', name='다른팩', image_url='https://example.com/e.png')
+        self.cards = [
+            Card.objects.create(
+                expansion=self.expansion if i < 5 else other, card_number=f'{5 - i:03d}',
+                name=f'카드{i}', rarity='C', shop_product_code=f'PKM-EX-{i:03d}-K',
+            )
+            for i in range(7)
+        ]
+        CardPrice.objects.create(card=self.cards[0], price=1500, source='몰')
+
+    def _export(self, **extra):
+        res = self.client.get('/api/pokemon/kr/cards/export.ndjson', extra.pop('params', {}), **self.auth, **extra)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.streaming)
+        return res, b''.join(res.streaming_content)
+
+    def test_card_list_is_unpaged_without_limit_and_cursor_paged_with_it(self):
+        url = f'/api/pokemon/kr/expansions/{self.expansion.code}/cards/'
+        self.assertEqual(len(self.client.get(url, **self.auth).json()), 5)
+
+        ids, next_url = [], f'{url}?limit=2&ordering=name'
+        while next_url:
+            body = self.client.get(next_url, **self.auth).json()
+            ids += [r['id'] for r in body['results']]
+            next_url = body['next']
+        self.assertEqual(ids, [c.pk for c in self.cards[:5]])  # ordering과 상관없이 id 순
+
+        body = self.client.get('/api/pokemon/kr/cards/search/', {'limit': 4}, **self.auth).json()
+        self.assertEqual([r['id'] for r in body['results']], [c.pk for c in self.cards[:4]])
+        self.assertEqual(body['results'][0]['latest_price']['price'], 1500)
+
+    def test_export_streams_one_card_per_line_in_id_chunks(self):
+        with mock.patch('pricehub.api_views._EXPORT_CHUNK', 3):
+            with CaptureQueriesContext(connection) as ctx:
+                res, content = self._export()
+        self.assertEqual(res['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        rows = [json.loads(line) for line in content.decode('utf-8').splitlines()]
+        self.assertEqual([r['id'] for r in rows], [c.pk for c in self.cards])
+        self.assertEqual(rows[0]['latest_price']['price'], 1500)
+        self.assertIsNone(rows[1]['latest_price'])
+        # 청크 3개(3+3+1) — OFFSET 없이 id 키셋
+        card_queries = [q for q in ctx.captured_queries if '"card"."id" >' in q['sql']]
+        self.assertEqual(len(card_queries), 3)
+        self.assertNotIn('OFFSET', card_queries[-1]['sql'])
+
+        _, content = self._export(params={'expansion': 'EY', 'fields': 'id,name'})
+        self.assertEqual(
+            [json.loads(line) for line in content.splitlines()],
+            [{'id': self.cards[5].pk, 'name': '카드5'}, {'id': self.cards[6].pk, 'name': '카드6'}],
+        )
+
+    def test_export_gzip_when_accepted(self):
+        res, content = self._export(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(res['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', res['Vary'])
+        self.assertEqual(len(gzip.decompress(content).splitlines()), 7)
+
+    def test_export_other_games_and_auth(self):
+        expansion = OnePieceExpansion.objects.create(code='OP01', name='원피스팩')
+        OnePieceCard.objects.create(
+            expansion=expansion, card_number='001', name='루피', rarity='L', shop_product_code='OP-001',
+        )
+        res = self.client.get('/api/onepiece/kr/cards/export.ndjson', **self.auth)
+        self.assertEqual(json.loads(b''.join(res.streaming_content))['name'], '루피')
+
+        res = self.client.get('/api/pokemon/kr/cards/export.ndjson', HTTP_ACCEPT='application/x-ndjson')
+        self.assertIn(res.status_code, (401, 403))
+        self.assertIn('detail', json.loads(res.content))
+
+
+class ExpansionPriceStatsTests(TestCase):
+    """확장팩 상세 price_stats — 수집 때 계산한 요약 행(전체/현재/최근 30일)에서 읽는다"""
+
+    def setUp(self):
+        cache.clear()
+        _, raw_key = APIKey.create_key(name='통계')
+        self.auth = {'HTTP_AUTHORIZATION': f'Api-Key {raw_key}'}
+        self.expansion = Expansion.objects.create(code='ST', name='통계팩', image_url='https://example.com/e.png')
+        Expansion.objects.create(code='SE', name='빈팩', image_url='https://example.com/e.png')
+        card = Card.objects.create(
+            expansion=self.expansion, card_number='001', name='피카츄', rarity='C',
+            shop_product_code='PKM-ST-001-K', latest_market_price=2000,
+        )
+        Card.objects.create(
+            expansion=self.expansion, card_number='002', name='라이츄', rarity='C',
+            shop_product_code='PKM-ST-002-K', latest_market_price=3001,
+        )
+        for price, days in ((1000, 90), (2000, 10), (4001, 1)):
+            row = CardPrice.objects.create(card=card, price=price, source='몰')
+            CardPrice.objects.filter(pk=row.pk).update(collected_at=timezone.now() - timedelta(days=days))
+
+    def _stats(self, code='ST'):
+        res = self.client.get(f'/api/pokemon/kr/expansions/{code}/', **self.auth)
+        self.assertEqual(res.status_code, 200)
+        return res.json()['price_stats']
+
+    def test_refresh_computes_windows_and_api_reads_row(self):
+        self.assertEqual(expansion_stats.refresh(), 2)
+        self._stats()  # API Key 확인 캐시 채우기
+        with CaptureQueriesContext(connection) as ctx:
+            stats = self._stats()
+        self.assertFalse([q for q in ctx.captured_queries if 'card_price' in q['sql']])
+        self.assertEqual(
+            {k: stats[k] for k in ('min_price', 'max_price', 'avg_price', 'total_records')},
+            {'min_price': 1000, 'max_price': 4001, 'avg_price': 2334, 'total_records': 3},
+        )
+        self.assertEqual(stats['current'], {'min_price': 2000, 'max_price': 3001, 'avg_price': 2500, 'total_records': 2})
+        self.assertEqual(
+            stats['last_30_days'], {'min_price': 2000, 'max_price': 4001, 'avg_price': 3000, 'total_records': 2},
+        )
+        self.assertEqual(
+            self._stats('SE')['current'], {'min_price': None, 'max_price': None, 'avg_price': None, 'total_records': 0},
+        )
+
+        # 가격이 지워지면(시그널이 목록 버전을 바꾼다) 다음 조회가 다시 계산
+        CardPrice.objects.get(price=1000).delete()
+        self.assertEqual(self._stats()['min_price'], 2000)
+        call_command('refresh_expansion_stats', '--expansion', 'ST', stdout=io.StringIO())
+        self.assertEqual(self._stats()['min_price'], 2000)
+
+    def test_price_saved_through_collect_api_shows_up(self):
+        from pricehub import bulk_api_views
+
+        self.assertEqual(self._stats()['current']['min_price'], 2000)
+        card = Card.objects.get(card_number='001')
+
+        def matched(cleaned, card):  # 매칭 결과 고정 — 작업자가 900원 판매처를 붙여넣은 경우
+            return 900, 1, '몰', cleaned
+
+        with mock.patch.dict(bulk_api_views._FILTER_CONFIG, {'pokemon_kr': matched}):
+            res = self.client.post(
+                f'/api/pokemon/kr/bulk-price/collect-card/{card.pk}/',
+                data=json.dumps({'items': [{'title': '피카츄', 'mallName': '몰', 'lprice': 900}]}),
+                content_type='application/json', **self.auth,
+            )
+        self.assertTrue(res.json()['saved'])
+
+        stats = self._stats()
+        self.assertEqual(stats['min_price'], 900)
+        self.assertEqual(stats['current']['min_price'], 900)
+        self.assertEqual(stats['last_30_days']['total_records'], 3)
+
+    def test_row_older_than_max_age_is_recomputed(self):
+        self._stats()
+        ExpansionPriceStats.objects.update(computed_at=timezone.now() - timedelta(hours=2), min_price=1)
+        self.assertEqual(self._stats()['min_price'], 1000)
+
+    def test_missing_row_is_computed_on_first_read(self):
+        self.assertFalse(ExpansionPriceStats.objects.exists())
+        self.assertEqual(self._stats()['total_records'], 3)
+        self.assertEqual(list(ExpansionPriceStats.objects.values_list('expansion__code', flat=True)), ['ST'])
+
+
+class CardPriceSnapshotsApiTests(TestCase):
+    """가격 요약 일괄 — latest_raw_data 캐시 컬럼에서 카드 조회 1번으로"""
+
+    URL = '/api/pokemon/kr/cards/price-snapshots/'
+
+    def setUp(self):
+        _, raw_key = APIKey.create_key(name='요약')
+        self.auth = {'HTTP_AUTHORIZATION': f'Api-Key {raw_key}'}
+        expansion = Expansion.objects.create(code='PS', name='요약팩', image_url='https://example.com/e.png')
+        self.card = Card.objects.create(
+            expansion=expansion, card_number='001', name='피카츄', rarity='C', shop_product_code='PKM-PS-001-K',
+            latest_raw_data=[{'mallName': '가', 'lprice': '3000'}, {'mallName': '나', 'lprice': '1000'},
+                             {'mallName': '다', 'lprice': '2000'}, {'mallName': '라', 'lprice': '0'}],
+        )
+        self.bare = Card.objects.create(
+            expansion=expansion, card_number='002', name='라이츄', rarity='C', shop_product_code='PKM-PS-002-K',
+        )
+        CardPrice.objects.create(card=self.card, price=1000, source='naver', raw_data=self.card.latest_raw_data)
+
+    def test_returns_compact_stats_for_requested_ids(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(self.URL, {'ids': f'{self.card.pk},{self.bare.pk},999999'}, **self.auth)
+        results = res.json()['results']
+
+        self.assertEqual(
+            {k: v for k, v in results[str(self.card.pk)].items() if k != 'collected_at'},
+            {'min': 1000, 'median': 2000, 'max': 3000, 'count': 3},
+        )
+        self.assertIsNotNone(results[str(self.card.pk)]['collected_at'])
+        self.assertEqual(results[str(self.bare.pk)]['count'], 0)
+        self.assertNotIn('999999', results)
+        self.assertEqual(len([q for q in ctx.captured_queries if 'FROM "card"' in q['sql']]), 1)
+
+    def test_skips_malformed_raw_data_items(self):
+        Card.objects.filter(pk=self.bare.pk).update(
+            latest_raw_data=[{'mallName': '가', 'lprice': '품절'}, 'garbage', None, {'mallName': '나', 'lprice': '1500'}],
+        )
+        res = self.client.get(self.URL, {'ids': str(self.bare.pk)}, **self.auth)
+        self.assertEqual(res.status_code, 200)
+        stats = res.json()['results'][str(self.bare.pk)]
+        self.assertEqual((stats['min'], stats['max'], stats['count']), (1500, 1500, 1))
+
+    def test_rejects_bad_or_too_many_ids(self):
+        self.assertEqual(self.client.get(self.URL, {'ids': 'a,b'}, **self.auth).status_code, 400)
+        self.assertEqual(self.client.get(self.URL, **self.auth).status_code, 400)
+        too_many = ','.join(str(i) for i in range(1, api_views._SNAPSHOTS_MAX_IDS + 2))
+        self.assertEqual(self.client.get(self.URL, {'ids': too_many}, **self.auth).status_code, 400)
+
+    def test_not_offered_for_japan(self):
+        res = self.client.get('/api/pokemon/jp/cards/price-snapshots/', {'ids': '1'}, **self.auth)
+        self.assertEqual(res.status_code, 404)
+
+
+class CardChangesApiTests(TestCase):
+    """변경분 동기화 — updated_at은 동기화 대상 필드가 실제로 바뀔 때만, since 토큰으로 바뀐 카드만"""
+
+    def setUp(self):
+        cache.clear()
+        _, self.raw_key = APIKey.create_key(name='변경분')
+        staff = get_user_model().objects.create_user('changes_staff', password='pw', is_staff=True)
+        self.client.force_login(staff)
+        self.expansion = Expansion.objects.create(code='CH', name='변경팩', image_url='https://example.com/e.png')
+        self.cards = [
+            Card.objects.create(
+                expansion=self.expansion, card_number=f'00{i}', name=f'카드{i}', rarity='C',
+                shop_product_code=f'PKM-CH-00{i}-K', selling_price=1000 * i, latest_market_price=900,
+            )
+            for i in (1, 2, 3)
+        ]
+        self.past = timezone.now() - timedelta(days=1)
+        Card.objects.update(updated_at=self.past)
+        patcher = mock.patch.object(api_views, '_CHANGES_SETTLE', timedelta(0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _changes(self, **params):
+        return self.client.get('/api/pokemon/kr/cards/changes/', params,
+                               HTTP_AUTHORIZATION=f'Api-Key {self.raw_key}').json()
+
+    def _updated(self, card):
+        return Card.objects.get(pk=card.pk).updated_at
+
+    def test_updated_at_moves_only_when_synced_fields_change(self):
+        card = Card.objects.get(pk=self.cards[0].pk)
+        card.latest_market_price = 900
+        card.latest_raw_data = [{'mallName': 'x'}]
+        card.save(update_fields=['latest_raw_data', 'latest_market_price'])  # 같은 시장가 — 수집
+        card.is_favorite = True
+        card.save(update_fields=['is_favorite'])
+        self.assertEqual(self._updated(card), self.past)
+
+        card.latest_market_price = 800
+        card.save(update_fields=['latest_raw_data', 'latest_market_price'])
+        self.assertGreater(self._updated(card), self.past)
+
+    def test_full_sync_then_only_changes_since_token(self):
+        first = self._changes(limit=2)
+        self.assertTrue(first['has_more'])
+        rest = self._changes(since=first['next_since'], limit=2)
+        self.assertFalse(rest['has_more'])
+        self.assertEqual(
+            [c['shop_product_code'] for c in first['results'] + rest['results']],
+            ['PKM-CH-001-K', 'PKM-CH-002-K', 'PKM-CH-003-K'],
+        )
+        token = rest['next_since']
+        self.assertEqual(self._changes(since=token)['results'], [])
+        self.assertEqual(self._changes(since=token)['next_since'], token)
+
+        self.client.post(f'/pokemon/kr/cards/{self.cards[1].pk}/set-price/',
+                         data=json.dumps({'selling_price': 2500}), content_type='application/json')
+        delta = self._changes(since=token)
+        self.assertEqual([(c['id'], c['selling_price']) for c in delta['results']], [(self.cards[1].pk, 2500)])
+
+    def test_bulk_reset_bumps_only_changed_cards(self):
+        Card.objects.filter(pk=self.cards[2].pk).update(selling_price=0)
+        token = self._changes()['next_since']
+        self.client.post(f'/pokemon/kr/expansions/{self.expansion.code}/reset-prices/')
+        delta = self._changes(since=token)
+        self.assertEqual({c['id'] for c in delta['results']}, {self.cards[0].pk, self.cards[1].pk})
+
+    def test_expansion_rename_marks_its_cards_changed(self):
+        token = self._changes()['next_since']
+        self.expansion.name = '새 이름'
+        self.expansion.save()
+        delta = self._changes(since=token)
+        self.assertEqual(len(delta['results']), 3)
+        self.assertEqual(delta['results'][0]['expansion']['name'], '새 이름')
+
+    def test_invalid_token_is_rejected(self):
+        res = self.client.get('/api/pokemon/kr/cards/changes/', {'since': 'garbage'},
+                              HTTP_AUTHORIZATION=f'Api-Key {self.raw_key}')
+        self.assertEqual(res.status_code, 400)
+
+
 class RobotsTxtTests(SimpleTestCase):
     def test_disallows_everything_except_prices(self):
         res = self.client.get('/robots.txt')
@@ -1,6 +1,8 @@
 # pricehub/throttling.py
 from rest_framework.throttling import SimpleRateThrottle
 
+from . import rate_limit
+
 
 class APIKeyRateThrottle(SimpleRateThrottle):
     """
@@ -10,6 +12,9 @@ class APIKeyRateThrottle(SimpleRateThrottle):
     UserRateThrottle/AnonRateThrottle로는 모든 클라이언트가 같은 버킷을
     공유하게 된다. 대신 인증된 APIKey 인스턴스(request.auth)를 기준으로
     나눠서 클라이언트별로 독립적인 한도를 적용한다.
+
+    한도 계산은 SimpleRateThrottle의 요청 시각 목록(캐시) 대신 토큰 버킷
+    (pricehub/rate_limit.py, 워커 간 공유 SQLite) — 요청당 작업량이 한도와 무관하게 일정.
     """
     scope = 'api_key'
 
@@ -22,3 +27,17 @@ class APIKeyRateThrottle(SimpleRateThrottle):
             'scope': self.scope,
             'ident': api_key.pk,
         }
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, self._wait = rate_limit.consume(
+            self.key, self.num_requests, self.num_requests / self.duration,
+        )
+        return allowed
+
+    def wait(self):
+        return self._wait
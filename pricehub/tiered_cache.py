@@ -0,0 +1,343 @@
+"""
+pricehub/tiered_cache.py
+
+2단 캐시 백엔드 — 워커(프로세스)마다 메모리 L1을 두고, 그 뒤에 워커 간 공유 캐시(L2,
+pricehub/sqlite_cache.py)를 둔다. 대시보드 요청마다 읽는 작고 뜨거운 키(card-controltower
+토큰, 판매중 인덱스, 조회 시각, 목록 버전 토큰, 레어도별 매입가)를 요청마다 디스크에서
+꺼내 unpickle하지 않기 위함.
+
+  - L1에 올리는 키는 설정한 접두사(L1_PREFIXES: {접두사: L1 TTL초})에 맞는 것만. 나머지
+    키(락, 카드 목록 같은 큰 항목)는 그대로 L2로 간다. 접두사가 여럿 맞으면 가장 긴 것.
+  - L1은 크기 제한(L1_MAX_ENTRIES) LRU. 값은 pickle 없이 객체 그대로 두므로 L1 접두사에는
+    호출부가 고치지 않는 값만 넣는다.
+  - 워커 간 무효화: 접두사마다 L2에 버전 키(l1:version:<접두사>)를 둔다. L1 키를 쓰거나
+    지우면 이 워커의 L1에서 그 키를 고치고 버전을 새 랜덤 토큰으로 바꾼다. 다른 워커는
+    L1_VERSION_CHECK초마다 한 번 버전들을 get_many 한 번으로 읽어, 바뀐 접두사의 L1 항목을
+    버린다. 그래서 다른 워커가 쓴 값이 보이기까지 최대 min(L1 TTL, L1_VERSION_CHECK)초.
+    L1 만료는 L2에 남은 TTL을 넘지 않는다 — L2가 get_many_with_expiry(SQLiteCache)를
+    제공하면 그 만료로 자르고, 없는 백엔드면 L1 TTL 그대로(L2에서 만료돼도 최대 L1 TTL초 보인다).
+  - add/incr/touch는 항상 L2에서 처리한다(워커 간 원자성). 성공하면 위와 같이 무효화.
+  - 접두사별 L1 적중/미스는 워커마다 세고, L1_STATS_FLUSH초마다 L2 카운터(incr)에 더한다.
+    스태프 진단 화면(/diagnostics/cache/)에서 전 워커 합계와 지금 워커 값을 본다.
+
+설정 예:
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'pricehub.tiered_cache.TieredCache',
+            'LOCATION': 'shared',            # L2로 쓸 캐시 별칭
+            'OPTIONS': {'L1_PREFIXES': {'cardlist:ver:': 5}, 'L1_MAX_ENTRIES': 1000},
+        },
+        'shared': {'BACKEND': 'pricehub.sqlite_cache.SQLiteCache', ...},
+    }
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_VERSION_KEY_PREFIX = 'l1:version:'
+_STATS_KEY_PREFIX = 'l1:stats:'
+_MISSING = object()
+
+# L1은 프로세스에 하나 — Django는 캐시 백엔드 인스턴스를 스레드마다 만들므로
+# (LocMemCache의 _caches처럼) 모듈 수준에서 L2 별칭별로 공유한다.
+_tiers = {}
+_tiers_lock = threading.Lock()
+
+
+class _LocalTier:
+    """프로세스 하나의 L1 — {L2 키: (값, 만료 monotonic, 접두사)} LRU + 접두사별 버전/카운터"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.checked_at = None
+        self.counts = {}        # {접두사: [적중, 미스]} — 이 워커가 시작된 뒤 전체
+        self.unflushed = {}     # {접두사: [적중, 미스]} — 아직 L2 카운터에 안 더한 몫
+        self.flushed_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def get(self, key, now):
+        entry = self.entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry[1] <= now:
+            self.entries.pop(key, None)
+            return _MISSING
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, expires, prefix):
+        self.entries[key] = (value, expires, prefix)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def drop_prefix(self, prefix):
+        for key in [k for k, entry in self.entries.items() if entry[2] == prefix]:
+            del self.entries[key]
+
+    def count(self, prefix, hit):
+        for table in (self.counts, self.unflushed):
+            table.setdefault(prefix, [0, 0])[0 if hit else 1] += 1
+
+
+def _local_tier(shared_alias, max_entries):
+    with _tiers_lock:
+        tier = _tiers.get(shared_alias)
+        if tier is None:
+            tier = _tiers[shared_alias] = _LocalTier(max_entries)
+        return tier
+
+
+def _new_token():
+    return uuid.uuid4().hex[:12]
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._shared_alias = location or 'shared'
+        # 긴 접두사부터 — 'a:b:'와 'a:'가 둘 다 맞으면 'a:b:'의 TTL
+        self._prefixes = sorted(options.get('L1_PREFIXES', {}).items(), key=lambda p: -len(p[0]))
+        self._version_check = options.get('L1_VERSION_CHECK', 1)
+        self._stats_flush = options.get('L1_STATS_FLUSH', 10)
+        self._tier = _local_tier(self._shared_alias, int(options.get('L1_MAX_ENTRIES', 1000)))
+
+    @property
+    def shared(self):
+        return caches[self._shared_alias]
+
+    def _prefix_for(self, key):
+        for prefix, ttl in self._prefixes:
+            if key.startswith(prefix):
+                return prefix, ttl
+        return None, None
+
+    # --- 버전(워커 간 무효화) / 카운터 ---
+
+    def _sync(self, now):
+        """L1_VERSION_CHECK초에 한 번 — 다른 워커가 바꾼 접두사의 L1 항목을 버린다(tier.lock 안에서)"""
+        tier = self._tier
+        if tier.checked_at is not None and now - tier.checked_at < self._version_check:
+            return
+        tier.checked_at = now
+        version_keys = {_VERSION_KEY_PREFIX + prefix: prefix for prefix, _ in self._prefixes}
+        found = self.shared.get_many(list(version_keys))
+        for version_key, prefix in version_keys.items():
+            token = found.get(version_key)
+            if token is None:
+                # 처음이거나 L2가 비워졌다 — 새 토큰을 두고, 이 워커의 L1도 믿지 않는다
+                self.shared.add(version_key, _new_token(), None)
+                token = self.shared.get(version_key)
+            if tier.versions.get(prefix) != token:
+                tier.drop_prefix(prefix)
+                tier.versions[prefix] = token
+        if now - tier.flushed_at >= self._stats_flush:
+            self._flush_stats(now)
+
+    def _flush_stats(self, now):
+        tier = self._tier
+        pending, tier.unflushed, tier.flushed_at = tier.unflushed, {}, now
+        for prefix, (hits, misses) in pending.items():
+            for kind, delta in (('hits', hits), ('misses', misses)):
+                if delta:
+                    stats_key = f'{_STATS_KEY_PREFIX}{kind}:{prefix}'
+                    self.shared.add(stats_key, 0, None)
+                    self.shared.incr(stats_key, delta)
+
+    def _invalidate(self, made_keys):
+        """이 워커가 쓴 키 — 여기 L1에서 빼고, 접두사 버전을 바꿔 다른 워커에 알린다"""
+        tier = self._tier
+        changed = set()
+        with tier.lock:
+            for made_key, prefix in made_keys:
+                tier.entries.pop(made_key, None)
+                changed.add(prefix)
+            bumped = {_VERSION_KEY_PREFIX + prefix: _new_token() for prefix in changed}
+            if bumped:
+                self.shared.set_many(bumped, None)
+                for prefix in changed:
+                    tier.versions[prefix] = bumped[_VERSION_KEY_PREFIX + prefix]
+
+    def _l1_keys(self, keys, version):
+        """[(원래 키, L2 키, 접두사, TTL)] — L1 대상이 아닌 키는 접두사 None"""
+        result = []
+        for key in keys:
+            made_key = self.shared.make_and_validate_key(key, version=version)
+            prefix, ttl = self._prefix_for(key)
+            result.append((key, made_key, prefix, ttl))
+        return result
+
+    def _fetch(self, keys, version):
+        """
+        L2에서 읽기 — {키: (값, L1 만료까지 남은 초 상한 또는 None)}. L2가 만료 시각을 알려주면
+        그 남은 시간, 아니면 None(L1 TTL 그대로).
+        """
+        with_expiry = getattr(self.shared, 'get_many_with_expiry', None)
+        if with_expiry is None:
+            return {key: (value, None) for key, value in self.shared.get_many(keys, version=version).items()}
+        wall_now = time.time()
+        return {
+            key: (value, None if expires is None else expires - wall_now)
+            for key, (value, expires) in with_expiry(keys, version=version).items()
+        }
+
+    @staticmethod
+    def _l1_expires(now, ttl, remaining):
+        return now + (ttl if remaining is None else min(ttl, remaining))
+
+    def stats(self):
+        """진단 화면용 — 접두사별 설정/지금 워커 값/전 워커 합계(마지막 반영분까지)"""
+        tier = self._tier
+        totals = self.shared.get_many([
+            f'{_STATS_KEY_PREFIX}{kind}:{prefix}'
+            for prefix, _ in self._prefixes for kind in ('hits', 'misses')
+        ])
+        with tier.lock:
+            sizes = {}
+            for _, _, prefix in tier.entries.values():
+                sizes[prefix] = sizes.get(prefix, 0) + 1
+            rows = []
+            for prefix, ttl in sorted(self._prefixes):
+                local_hits, local_misses = tier.counts.get(prefix, (0, 0))
+                rows.append({
+                    'prefix': prefix,
+                    'ttl': ttl,
+                    'entries': sizes.get(prefix, 0),
+                    'local_hits': local_hits,
+                    'local_misses': local_misses,
+                    'total_hits': totals.get(f'{_STATS_KEY_PREFIX}hits:{prefix}', 0),
+                    'total_misses': totals.get(f'{_STATS_KEY_PREFIX}misses:{prefix}', 0),
+                })
+            return {
+                'rows': rows,
+                'entries': len(tier.entries),
+                'max_entries': tier.max_entries,
+                'version_check': self._version_check,
+                'stats_flush': self._stats_flush,
+            }
+
+    # --- 조회 ---
+
+    def get(self, key, default=None, version=None):
+        prefix, ttl = self._prefix_for(key)
+        if prefix is None:
+            return self.shared.get(key, default, version=version)
+        made_key = self.shared.make_and_validate_key(key, version=version)
+        tier = self._tier
+        now = time.monotonic()
+        with tier.lock:
+            self._sync(now)
+            value = tier.get(made_key, now)
+            tier.count(prefix, value is not _MISSING)
+            if value is not _MISSING:
+                return value
+            checked_version = tier.versions.get(prefix)
+        fetched = self._fetch([key], version)
+        if key not in fetched:
+            return default
+        value, remaining = fetched[key]
+        with tier.lock:
+            # 읽는 사이 이 워커가 그 접두사를 무효화했으면 방금 읽은 값은 L1에 두지 않는다
+            if tier.versions.get(prefix) == checked_version:
+                tier.put(made_key, value, self._l1_expires(now, ttl, remaining), prefix)
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found, remote = {}, []
+        tier = self._tier
+        now = time.monotonic()
+        targets = self._l1_keys(keys, version)
+        with tier.lock:
+            if any(prefix for _, _, prefix, _ in targets):
+                self._sync(now)
+            checked_versions = dict(tier.versions)
+            for key, made_key, prefix, ttl in targets:
+                if prefix is None:
+                    remote.append((key, made_key, prefix, ttl))
+                    continue
+                value = tier.get(made_key, now)
+                tier.count(prefix, value is not _MISSING)
+                if value is _MISSING:
+                    remote.append((key, made_key, prefix, ttl))
+                else:
+                    found[key] = value
+        if remote:
+            fetched = self._fetch([key for key, _, _, _ in remote], version)
+            found.update({key: value for key, (value, _) in fetched.items()})
+            with tier.lock:
+                for key, made_key, prefix, ttl in remote:
+                    if prefix is not None and key in fetched and tier.versions.get(prefix) == checked_versions.get(prefix):
+                        value, remaining = fetched[key]
+                        tier.put(made_key, value, self._l1_expires(now, ttl, remaining), prefix)
+        return found
+
+    def has_key(self, key, version=None):
+        prefix, _ = self._prefix_for(key)
+        if prefix is not None:
+            made_key = self.shared.make_and_validate_key(key, version=version)
+            now = time.monotonic()
+            with self._tier.lock:
+                self._sync(now)
+                if self._tier.get(made_key, now) is not _MISSING:
+                    return True
+        return self.shared.has_key(key, version=version)
+
+    # --- 쓰기 (항상 L2, L1 키면 무효화) ---
+
+    def _after_write(self, keys, version):
+        targets = [(made_key, prefix) for _, made_key, prefix, _ in self._l1_keys(keys, version) if prefix]
+        if targets:
+            self._invalidate(targets)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self._after_write([key], version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        self._after_write(list(data), version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self._after_write([key], version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        touched = self.shared.touch(key, timeout, version=version)
+        if touched:
+            self._after_write([key], version)
+        return touched
+
+    def incr(self, key, delta=1, version=None):
+        value = self.shared.incr(key, delta, version=version)
+        self._after_write([key], version)
+        return value
+
+    def delete(self, key, version=None):
+        deleted = self.shared.delete(key, version=version)
+        self._after_write([key], version)
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.shared.delete_many(keys, version=version)
+        self._after_write(keys, version)
+
+    def clear(self):
+        self.shared.clear()
+        tier = self._tier
+        with tier.lock:
+            tier.entries.clear()
+            tier.versions.clear()
+            tier.checked_at = None
@@ -6,6 +6,8 @@ from . import views as v
 from . import purchase_views as pv
 from . import rarity_cleanup_views as rcv
 from . import store_price_check_views as spcv
+from . import card_search_views as search_views
+from . import diagnostics_views as dv
 from pricehub import api_docs_views
 
 app_name = 'pricehub'
@@ -34,6 +36,11 @@ def _card_urls(prefix, views, *, has_bulk=False, has_shop_stats=False,
              name=f'{name}-set-price'),
     ]
 
+    if 'card_raw_data' in views:
+        patterns.append(
+            path('cards/raw-data/', views['card_raw_data'], name=f'{name}-card-raw-data')
+        )
+
     if has_price_history:
         patterns.append(
             path('cards/<int:pk>/price-history/',
@@ -94,7 +101,7 @@ _pokemon_kr_views = {
     'shop_stats_detail': v.pokemon_kr_shop_stats_detail,
     'toggle_favorite':   v.pokemon_kr_toggle_favorite,
     'price_history':     v.pokemon_kr_price_history,
-    **v.game_views('pokemon_kr'),  # card_detail, bulk_* 12종
+    **v.game_views('pokemon_kr'),  # card_detail, card_raw_data, bulk_* 12종
 }
 
 _pokemon_jp_views = {
@@ -116,7 +123,7 @@ _onepiece_kr_views = {
     'reset_all':       v.onepiece_kr_reset_all_prices,
     'toggle_favorite': v.onepiece_kr_toggle_favorite,
     'price_history':   v.onepiece_kr_price_history,
-    **v.game_views('onepiece_kr'),  # card_detail, bulk_* 12종
+    **v.game_views('onepiece_kr'),  # card_detail, card_raw_data, bulk_* 12종
 }
 
 _digimon_kr_views = {
@@ -129,7 +136,7 @@ _digimon_kr_views = {
     'reset_all':       v.digimon_kr_reset_all_prices,
     'toggle_favorite': v.digimon_kr_toggle_favorite,
     'price_history':   v.digimon_kr_price_history,
-    **v.game_views('digimon_kr'),  # card_detail, bulk_* 12종
+    **v.game_views('digimon_kr'),  # card_detail, card_raw_data, bulk_* 12종
 }
 
 
@@ -152,8 +159,15 @@ urlpatterns = [
                 has_search=True, has_reset=True, has_bulk=True,
                 has_favorites=True, has_price_history=True),
 
+    # ── 전 게임 통합 카드 검색 ──
+    path('cards/search/',         search_views.card_search_page,    name='card-search'),
+    path('cards/search/results/', search_views.card_search_results, name='card-search-results'),
+
     path('api-docs/', api_docs_views.api_docs, name='api-docs'),
 
+    # ── 진단 (캐시 L1 적중률) ──
+    path('diagnostics/cache/', dv.cache_diagnostics, name='cache-diagnostics'),
+
     # ── 매입리스트 관리 ──
     path('purchase-lists/',
          pv.purchase_list_index, name='purchase-list-index'),
@@ -191,6 +205,8 @@ urlpatterns = [
     # ── 스토어 가격 비교 (card-controltower 실제 판매가 vs PriceHub 판매가) ──
     path('store-price-check/',
          spcv.store_price_check_index, name='store-price-check-index'),
+    path('store-price-check/raw-data/',
+         spcv.store_price_check_raw_data, name='store-price-check-raw-data'),
     path('store-price-check/<str:store>/',
          spcv.store_price_check_view, name='store-price-check'),
 ]
\ No newline at end of file
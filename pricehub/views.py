@@ -19,7 +19,12 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.core.cache import cache
 from django.views.decorators.http import require_POST
+from django.conf import settings
 from django.http import JsonResponse
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.safestring import mark_safe
+from django.db import transaction
 from django.db.models import OuterRef, Subquery, F, Count, Q
 
 logger = logging.getLogger(__name__)
@@ -42,7 +47,7 @@ from .utils import (
     OUR_SHOPS, safe_json_dumps,
     generate_pokemon_search_query, generate_onepiece_search_query, generate_digimon_search_query,
 )
-from . import card_controltower_client
+from . import card_controltower_client, list_cache, price_outbox, search_index
 
 # card-controltower가 도메인 판매를 취급하지 않는 카테고리(일본판)는 "부산/광주 판매중"
 # 배지가 애초에 의미가 없어 조회 자체를 스킵한다.
@@ -101,6 +106,9 @@ CATEGORY_CONFIGS = {
     },
 }
 
+# 카드 모델 → 카테고리 키 (검색 인덱스의 game_type과 같은 값)
+_GAME_TYPE_BY_CARD_MODEL = {cfg['card_model']: key for key, cfg in CATEGORY_CONFIGS.items()}
+
 def _cfg(key):
     return CATEGORY_CONFIGS[key]
 
@@ -236,6 +244,14 @@ def home(request):
     ]
 
     tools = [
+        {
+            'icon': '🔍',
+            'title': '통합 카드 검색',
+            'desc': '어느 게임 카드인지 몰라도 카드명·카드번호·상품코드로 포켓몬(한글/일본)·원피스·디지몬 카드를 한 번에 찾습니다.',
+            'items': [
+                {'label': '통합 검색 바로가기', 'url': '/cards/search/'},
+            ],
+        },
         {
             'icon': '📋',
             'title': '엑셀-DB 상품코드 검증',
@@ -271,6 +287,8 @@ def home(request):
                 {'label': '부산', 'url': '/store-price-check/busan/'},
                 {'label': '광주', 'url': '/store-price-check/gwangju/'},
             ],
+            # 매장별 연동 상태(캐시만 읽음) — 차단 중이면 카드 목록 판매중 배지도 비어 보인다
+            'health': card_controltower_client.health(),
         },
     ]
 
@@ -322,6 +340,56 @@ def _collect_mall_names(card_model, expansion_code=None, limit=500):
     return sorted(name_count.items(), key=lambda x: -x[1])
 
 
+def _has_raw_data(price_model):
+    return any(f.name == 'raw_data' for f in price_model._meta.get_fields())
+
+
+def _latest_raw_by_card(price_model, card_ids):
+    """
+    카드 id → 가장 최근에 수집된 raw_data(빈 값 제외). 사이드 패널 판매처 목록용.
+    raw_data 필드가 없는 가격 모델(일본판)은 빈 dict.
+    """
+    if not card_ids or not _has_raw_data(price_model):
+        return {}
+    seen_raw = {}
+    for cp in (
+        price_model.objects.filter(card_id__in=card_ids)
+        .exclude(raw_data={}).exclude(raw_data=[])
+        .order_by('-collected_at')
+        .values('card_id', 'raw_data')
+    ):
+        seen_raw.setdefault(cp['card_id'], cp['raw_data'])
+    return seen_raw
+
+
+_RAW_DATA_MAX_IDS = 200
+_RAW_DATA_MAX_AGE = 60
+
+
+def _parse_id_list(value, limit=_RAW_DATA_MAX_IDS):
+    """'1,2,3' → [1, 2, 3] (중복 제거, 최대 limit개). 숫자가 아닌 값이 있으면 ValueError."""
+    ids = []
+    for part in value.split(','):
+        part = part.strip()
+        if part and int(part) not in ids:
+            ids.append(int(part))
+    return ids[:limit]
+
+
+def raw_data_json_response(request, etag_source, load):
+    """
+    판매처 목록 배치 응답 공용. etag_source(데이터 버전을 담은 문자열)의 해시를 ETag로
+    쓰고, 브라우저가 같은 ETag로 재요청하면 load()를 부르지 않고 304로 끝낸다.
+    """
+    etag = '"%s"' % hashlib.md5(etag_source.encode('utf-8')).hexdigest()
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(load())
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=_RAW_DATA_MAX_AGE)
+    return response
+
+
 def _calc_shop_stats(raw_data_list):
     """raw_data 리스트에서 샵별 통계 집계"""
     shops = {}
@@ -418,6 +486,8 @@ def _set_price(model_class, pk, request):
     있는 모델(한글판 3종)이면 같이 찍어서, 이 가격으로 확정한 카드가 같은
     시장가로 저가 경고 목록에 다시 뜨지 않게 한다.
 
+    판매가가 바뀌면 판매가 변경 아웃박스(price_outbox)에 같은 트랜잭션으로 남긴다.
+
     modified_price(일괄 판매가 설정에서 계산해둔 대기 중 가격)가 있는 모델이면
     0으로 같이 초기화한다 — 안 그러면 여기서 판매가를 새로 확정해도 예전
     modified_price가 그대로 남아, 새 selling_price와 비교되어 가격 하락/상승
@@ -430,6 +500,7 @@ def _set_price(model_class, pk, request):
         price = int(data.get('selling_price', 0))
         if price < 0:
             return JsonResponse({'success': False, 'error': '올바른 가격을 입력하세요.'})
+        old_price = obj.selling_price
         obj.selling_price = price
         update_fields = ['selling_price']
         if hasattr(obj, 'reviewed_market_price'):
@@ -438,7 +509,9 @@ def _set_price(model_class, pk, request):
         if hasattr(obj, 'modified_price'):
             obj.modified_price = 0
             update_fields.append('modified_price')
-        obj.save(update_fields=update_fields)
+        with transaction.atomic():
+            obj.save(update_fields=update_fields)
+            price_outbox.record_card(obj, old_price, price_outbox.SOURCE_SET_PRICE)
         return JsonResponse({'success': True, 'selling_price': obj.selling_price})
     except (ValueError, TypeError) as e:
         return JsonResponse({'success': False, 'error': str(e)})
@@ -705,20 +778,108 @@ _SEARCH_QUERY_FUNCS = {
 }
 
 
+def _sale_status_stamps():
+    """
+    부산/광주 판매중 배지 데이터의 매장별 기준 시각 — 카드 목록 캐시 키에 넣어서
+    card-controltower 데이터가 새로 조회되면(백그라운드 갱신/새로고침) 배지가 들어간 행도
+    다시 그리게 하고, 화면에 "n분 전 기준"으로도 보여준다. 캐시가 비어 있으면 예전처럼
+    그 자리에서 조회한다(sale_status_index가 실패해도 조용히 None).
+    """
+    stamps = card_controltower_client.fetched_at_stamps()
+    if any(stamp is None for stamp in stamps):
+        card_controltower_client.sale_status_index()
+        stamps = card_controltower_client.fetched_at_stamps()
+    return stamps
+
+
 def _card_list_view(request, cfg_key, code, extra_ctx=None):
+    """
+    확장팩 카드 목록. 행 HTML + 사이드 패널 JSON 등 무거운 부분은 확장팩 버전 키
+    (list_cache.py) 아래 캐시 — 그 확장팩 카드/가격이 안 바뀌었으면 버전 확인 +
+    캐시 읽기만으로 끝난다. 캐시 미스 때 실제로 만드는 건 _build_card_list_page.
+    """
+    cfg = _cfg(cfg_key)
+    base_url = cfg['base_url']
+
+    expansion = get_object_or_404(cfg['expansion_model'], code=code)
+
+    filter_type = request.GET.get('filter', 'all')
+    selected_rarities = request.GET.getlist('rarities')
+    sort = request.GET.get("sort", "number")
+    page = max(1, int(request.GET.get('page', 1) or 1))
+    show_store_status = cfg_key in _STORE_BADGE_GAME_KEYS
+    sale_stamps = _sale_status_stamps() if show_store_status else ()
+    sale_stamp = tuple(str(stamp) for stamp in sale_stamps) if show_store_status else None
+    sale_fetched_at = min((stamp for stamp in sale_stamps if stamp), default=None)
+
+    # 버전은 페이지를 만들기 "전에" 읽는다 — 만드는 도중 쓰기가 생기면 옛 버전 이름으로
+    # 저장될 뿐이라 다음 요청은 새 버전으로 다시 만든다.
+    version = list_cache.current_version(cfg_key, expansion.pk)
+    cache_key = list_cache.page_key(
+        cfg_key, expansion.pk, version,
+        filter_type, sorted(selected_rarities), sort, page, sale_stamp,
+    )
+    page_data = cache.get(cache_key)
+    if page_data is None:
+        page_data = _build_card_list_page(
+            cfg_key, expansion, filter_type, selected_rarities, sort, page, show_store_status,
+        )
+        cache.set(cache_key, page_data, list_cache.PAGE_CACHE_TTL)
+
+    fav_ctx = {}
+    if 'toggle_favorite_url_base' in cfg:
+        fav_ctx = {
+            'toggle_favorite_url_base': cfg['toggle_favorite_url_base'],
+            'favorite_count': page_data['favorite_count'],
+        }
+
+    ctx = {
+        'expansion':        expansion,
+        'has_cards':        page_data['has_cards'],
+        'rows_html':        mark_safe(page_data['rows_html']),
+        'filter_type':      filter_type,
+        'all_rarities':     page_data['all_rarities'],
+        'selected_rarities': selected_rarities,
+        'selected_rarities_json': safe_json_dumps(selected_rarities),
+        # 판매처 목록(raw_data)은 HTML에 심지 않고 사이드 패널이 필요할 때 받아간다
+        'card_raw_url':     f'{base_url}/cards/raw-data/' if _has_raw_data(cfg['price_model']) else '',
+        'card_search_query_json': page_data['card_search_query_json'],
+        'total_count':      page_data['total_count'],
+        'page':             page_data['page'],
+        'total_pages':      page_data['total_pages'],
+        'page_range':       page_data['page_range'],
+        'sort':             sort,
+        'show_tag_column':  page_data['show_tag_column'],
+        'show_store_status': show_store_status,
+        'sale_status_fetched_at': sale_fetched_at,
+        'sale_status_stale': sale_fetched_at is not None and not card_controltower_client.is_fresh(sale_fetched_at),
+        'show_underpriced_filter': cfg_key != 'pokemon_jp',
+        'breadcrumb': [
+            ('홈', '/'),
+            (cfg['label'], f'{base_url}/expansions/'),
+            (expansion.name, None),
+        ],
+        'detail_base_url': f'{base_url}/cards',
+        'back_url':        f'{base_url}/expansions/',
+        **fav_ctx,
+    }
+    if extra_ctx:
+        ctx.update(extra_ctx)
+    return render(request, 'dashboard/card_list.html', ctx)
+
+
+def _build_card_list_page(cfg_key, expansion, filter_type, selected_rarities, sort, page, show_store_status):
+    """카드 목록 한 페이지의 캐시 대상 부분(행 HTML, 사이드 패널 JSON, 페이지/필터 정보)"""
     cfg = _cfg(cfg_key)
-    expansion_model = cfg['expansion_model']
     card_model = cfg['card_model']
     price_model = cfg['price_model']
     base_url = cfg['base_url']
 
-    expansion = get_object_or_404(expansion_model, code=code)
     # latest_market_price는 카드 테이블의 캐시 컬럼(가격 수집 시 갱신)을 그대로 사용한다.
     # latest_collected_at은 캐시하지 않으므로, 화면에 보여줄 페이지 분량만큼만
     # 뒤에서(list 슬라이싱 후) 조회해 붙인다 — 서브쿼리를 전체 카드에 돌리지 않기 위함.
     cards_qs = card_model.objects.filter(expansion=expansion).order_by('card_number')
 
-    filter_type = request.GET.get('filter', 'all')
     if filter_type == 'unpriced':
         cards_qs = cards_qs.filter(selling_price=0)
     elif filter_type == 'priced':
@@ -739,12 +900,10 @@ def _card_list_view(request, cfg_key, code, extra_ctx=None):
         .distinct()
         .order_by('rarity')
     )
-    selected_rarities = request.GET.getlist('rarities')
     if selected_rarities:
         cards_qs = cards_qs.filter(rarity__in=selected_rarities)
 
     # 정렬
-    sort = request.GET.get("sort", "number")
     if sort == "price_asc":
         from django.db.models import Case, When, IntegerField
         cards_qs = cards_qs.annotate(
@@ -777,7 +936,6 @@ def _card_list_view(request, cfg_key, code, extra_ctx=None):
     # 페이지네이션
     per_page    = 100
     total_count = cards_qs.count()
-    page        = max(1, int(request.GET.get('page', 1) or 1))
     total_pages = max(1, -(-total_count // per_page))
     page        = min(page, total_pages)
     offset      = (page - 1) * per_page
@@ -803,7 +961,6 @@ def _card_list_view(request, cfg_key, code, extra_ctx=None):
             c.tag_badges = tag_func(c)
 
     # 부산/광주 판매중 배지 (card-controltower 연동, 2026-08-06)
-    show_store_status = cfg_key in _STORE_BADGE_GAME_KEYS
     if show_store_status:
         sale_index = card_controltower_client.sale_status_index()
         for c in cards_list:
@@ -821,21 +978,6 @@ def _card_list_view(request, cfg_key, code, extra_ctx=None):
             _start = max(1, _end - 6)
     page_range = list(range(_start, _end + 1))
 
-    # 카드별 최신 raw_data (사이드 패널 판매처 목록용 — raw_data 필드 없는 모델은 스킵)
-    card_ids = [c.pk for c in cards_list]
-    seen_raw = {}
-    if hasattr(price_model, 'raw_data') or any(
-        f.name == 'raw_data' for f in price_model._meta.get_fields()
-    ):
-        for cp in (
-            price_model.objects.filter(card_id__in=card_ids)
-            .exclude(raw_data={}).exclude(raw_data=[])
-            .order_by('-collected_at')
-            .values('card_id', 'raw_data')
-        ):
-            if cp['card_id'] not in seen_raw:
-                seen_raw[cp['card_id']] = cp['raw_data']
-
     # 카드별 네이버쇼핑 수동 검색어 (사이드 패널 "검색" 링크 + 행별 검색 버튼용)
     search_query_func = _SEARCH_QUERY_FUNCS.get(cfg_key)
     card_search_queries = {}
@@ -848,42 +990,56 @@ def _card_list_view(request, cfg_key, code, extra_ctx=None):
         for c in cards_list:
             c.naver_search_url = None
 
-    fav_ctx = {}
+    favorite_count = None
     if 'toggle_favorite_url_base' in cfg:
-        fav_ctx = {
-            'toggle_favorite_url_base': cfg['toggle_favorite_url_base'],
-            'favorite_count': card_model.objects.filter(expansion=expansion, is_favorite=True).count(),
-        }
+        favorite_count = card_model.objects.filter(expansion=expansion, is_favorite=True).count()
 
-    ctx = {
-        'expansion':        expansion,
-        'cards':            cards_list,
-        'filter_type':      filter_type,
-        'all_rarities':     all_rarities,
-        'selected_rarities': selected_rarities,
-        'selected_rarities_json': safe_json_dumps(selected_rarities),
-        'card_raw_json':    safe_json_dumps(seen_raw, ensure_ascii=False),
-        'card_search_query_json': safe_json_dumps(card_search_queries, ensure_ascii=False),
-        'total_count':      total_count,
-        'page':             page,
-        'total_pages':      total_pages,
-        'page_range':       page_range,
-        'sort':             sort,
-        'show_tag_column':  show_tag_column,
+    rows_html = render_to_string('dashboard/partials/_card_list_rows.html', {
+        'cards':             cards_list,
+        'show_tag_column':   show_tag_column,
         'show_store_status': show_store_status,
-        'show_underpriced_filter': cfg_key != 'pokemon_jp',
-        'breadcrumb': [
-            ('홈', '/'),
-            (cfg['label'], f'{base_url}/expansions/'),
-            (expansion.name, None),
-        ],
-        'detail_base_url': f'{base_url}/cards',
-        'back_url':        f'{base_url}/expansions/',
-        **fav_ctx,
+        'detail_base_url':   f'{base_url}/cards',
+    })
+
+    # 캐시에 들어가므로 모델 객체가 아니라 문자열/기본 타입만 담는다
+    return {
+        'has_cards':       bool(cards_list),
+        'rows_html':       str(rows_html),
+        'all_rarities':    all_rarities,
+        'card_search_query_json': safe_json_dumps(card_search_queries, ensure_ascii=False),
+        'total_count':     total_count,
+        'page':            page,
+        'total_pages':     total_pages,
+        'page_range':      page_range,
+        'show_tag_column': show_tag_column,
+        'favorite_count':  favorite_count,
     }
-    if extra_ctx:
-        ctx.update(extra_ctx)
-    return render(request, 'dashboard/card_list.html', ctx)
+
+
+def _card_raw_data_view(request, cfg_key):
+    """
+    사이드 패널 판매처 목록(raw_data) 배치 조회 — GET ?ids=1,2,3 → {"1": [...], ...}
+    (데이터 없는 카드는 키가 빠진다). 목록 페이지들은 raw_data를 HTML에 심지 않고,
+    화면에 보이는 행/클릭한 카드만 이걸로 받아간다(dashboard.js loadCardRaw).
+
+    ETag = 카드 id + 그 카드들이 속한 확장팩의 목록 캐시 버전(list_cache) — 가격이
+    새로 수집되면 시그널이 버전을 올리므로, 그대로면 raw_data를 읽지 않고 304.
+    """
+    cfg = _cfg(cfg_key)
+    try:
+        ids = _parse_id_list(request.GET.get('ids', ''))
+    except ValueError:
+        return JsonResponse({'error': 'Invalid ids'}, status=400)
+
+    expansion_ids = (
+        cfg['card_model'].objects.filter(pk__in=ids)
+        .values_list('expansion_id', flat=True).distinct()
+    ) if ids else []
+    versions = list_cache.versions_for(cfg_key, expansion_ids)
+    return raw_data_json_response(
+        request, f'{cfg_key}:{sorted(ids)}:{versions}',
+        lambda: {str(k): v for k, v in _latest_raw_by_card(cfg['price_model'], ids).items()},
+    )
 
 
 def _card_detail_view(request, cfg_key, pk):
@@ -923,31 +1079,29 @@ def _card_detail_view(request, cfg_key, pk):
 
 
 def _card_search_view(request, card_model):
+    """
+    카드명/카드번호/상품코드 검색 (AJAX). 검색 인덱스(search_index)로 후보를 좁히고
+    순위순으로 반환 — name__icontains 풀스캔 + 카드별 가격 히스토리 조회를 하지 않는다.
+    latest_price는 카드 테이블의 latest_market_price 캐시 컬럼 (일본판은 컬럼 없음 → None).
+    """
     q = request.GET.get('name', '').strip()
     page_size = min(int(request.GET.get('page_size', 30)), 50)
 
     if not q:
         return JsonResponse({'results': []})
 
-    cards = (
-        card_model.objects
-        .filter(name__icontains=q)
-        .select_related('expansion')
-        .order_by('expansion__release_date', 'card_number')
-        [:page_size]
-    )
-
+    game_type = _GAME_TYPE_BY_CARD_MODEL[card_model]
     results = []
-    for card in cards:
-        latest = card.prices.first()
+    for _, card in search_index.search_cards(q, game_types=[game_type], limit=page_size):
+        latest_price = getattr(card, 'latest_market_price', None)
         results.append({
             'id': card.id,
             'name': card.name,
             'rarity': card.rarity,
             'card_number': card.card_number,
             'image_url': card.image_url,
-            'selling_price': card.selling_price if card.selling_price != 0 else None,
-            'latest_price': float(latest.price) if latest else None,
+            'selling_price': card.selling_price or None,
+            'latest_price': float(latest_price) if latest_price is not None else None,
             'expansion': {
                 'code': card.expansion.code,
                 'name': card.expansion.name,
@@ -1118,6 +1272,7 @@ def _bulk_run_view(request, cfg_key):
     no_match   = []
 
     result_detail = {'new': 0, 'same_or_up': 0, 'rise': 0, 'drop': 0}
+    old_prices = {}  # 판매가 변경 아웃박스용 — card.id → 변경 전 판매가
 
     for card in cards_list:
         if skip_priced and card.selling_price != 0:
@@ -1163,6 +1318,7 @@ def _bulk_run_view(request, cfg_key):
             matched_price = min_price_floor
 
         old_selling = int(card.selling_price) if card.selling_price else 0
+        old_prices[card.id] = old_selling
         card.modified_price = matched_price
 
         if old_selling == 0:
@@ -1185,7 +1341,23 @@ def _bulk_run_view(request, cfg_key):
         to_update.append(card)
 
     if to_update:
-        card_model.objects.bulk_update(to_update, ['selling_price', 'modified_price'], batch_size=200)
+        # 판매가가 실제로 바뀐 카드만 updated_at(변경분 동기화 API)을 올린다 — 나머지는 읽어온
+        # 값을 그대로 다시 쓴다(modified_price만 바뀐 건 외부에 안 나가는 값)
+        now = timezone.now()
+        for c in to_update:
+            if c.selling_price != old_prices[c.id]:
+                c.updated_at = now
+        with transaction.atomic():
+            card_model.objects.bulk_update(
+                to_update, ['selling_price', 'modified_price', 'updated_at'], batch_size=200,
+            )
+            price_outbox.record(
+                cfg_key,
+                [(c.id, c.shop_product_code, old_prices[c.id], c.selling_price) for c in to_update],
+                price_outbox.SOURCE_BULK_RUN,
+            )
+        # bulk_update는 시그널이 안 나가므로 목록 캐시를 직접 무효화
+        list_cache.bump_expansions(cfg_key, {c.expansion_id for c in to_update})
 
     applied_count = result_detail['new'] + result_detail['same_or_up']
 
@@ -1225,6 +1397,7 @@ def _common_issues_config(cfg):
         'unpriced_url':         f'{base_url}/bulk-price/unpriced/',
         'underpriced_url':      f'{base_url}/bulk-price/underpriced/',
         'inline_cards_url':     f'{base_url}/bulk-price/inline-cards/',
+        'card_raw_url':         f'{base_url}/cards/raw-data/',
     }
 
 
@@ -1316,16 +1489,13 @@ def _bulk_trend_view(request, cfg_key, trend):
             d['card'].tag_badges = tag_func(d['card'])
 
     item_card_ids = [d['card'].pk for d in items]
-    seen_raw = {}
     _latest_collected = {}
     for cp in (
         price_model.objects.filter(card_id__in=item_card_ids)
         .order_by('-collected_at')
-        .values('card_id', 'collected_at', 'raw_data')
+        .values('card_id', 'collected_at')
     ):
         _latest_collected.setdefault(cp['card_id'], cp['collected_at'])
-        if cp['card_id'] not in seen_raw and cp['raw_data'] not in ({}, []):
-            seen_raw[cp['card_id']] = cp['raw_data']
     for d in items:
         d['card'].latest_collected_at = _latest_collected.get(d['card'].pk)
 
@@ -1344,7 +1514,6 @@ def _bulk_trend_view(request, cfg_key, trend):
         'all_rarities':           all_rarities,
         'selected_rarities':      selected_rarities,
         'selected_rarities_json': safe_json_dumps(selected_rarities),
-        'card_raw_json':          safe_json_dumps(seen_raw, ensure_ascii=False),
         'page':                   page,
         'total_pages':            total_pages,
         'per_page':               per_page,
@@ -1448,18 +1617,15 @@ def _underpriced_view(request, cfg_key):
         for d in under_cards:
             d['card'].tag_badges = tag_func(d['card'])
 
-    # 최신 수집 시각/raw_data는 캐시하지 않으므로, 현재 페이지에 보여줄 카드만 배치로 조회한다.
+    # 최신 수집 시각은 캐시하지 않으므로, 현재 페이지에 보여줄 카드만 배치로 조회한다.
     under_card_ids = [d['card'].pk for d in under_cards]
     _latest_collected = {}
-    seen_raw = {}
     for cp in (
         price_model.objects.filter(card_id__in=under_card_ids)
         .order_by('-collected_at')
-        .values('card_id', 'collected_at', 'raw_data')
+        .values('card_id', 'collected_at')
     ):
         _latest_collected.setdefault(cp['card_id'], cp['collected_at'])
-        if cp['card_id'] not in seen_raw and cp['raw_data'] not in ({}, []):
-            seen_raw[cp['card_id']] = cp['raw_data']
     for d in under_cards:
         d['collected_at'] = _latest_collected.get(d['card'].pk)
         d['card'].latest_collected_at = d['collected_at']
@@ -1479,7 +1645,6 @@ def _underpriced_view(request, cfg_key):
         'active_tab':             'underpriced',
         'under_cards':            under_cards,
         'show_tag_column':        show_tag_column,
-        'card_raw_json':          safe_json_dumps(seen_raw, ensure_ascii=False),
         'expansions':             expansions,
         'expansion_code':         expansion_code,
         'sort':                   sort,
@@ -1558,16 +1723,13 @@ def _bulk_unpriced_view(request, cfg_key):
             c.tag_badges = tag_func(c)
 
     card_ids = [c.pk for c in cards_page]
-    seen_raw = {}
     _latest_collected = {}
     for cp in (
         price_model.objects.filter(card_id__in=card_ids)
         .order_by('-collected_at')
-        .values('card_id', 'collected_at', 'raw_data')
+        .values('card_id', 'collected_at')
     ):
         _latest_collected.setdefault(cp['card_id'], cp['collected_at'])
-        if cp['card_id'] not in seen_raw and cp['raw_data'] not in ({}, []):
-            seen_raw[cp['card_id']] = cp['raw_data']
     for c in cards_page:
         c.latest_collected_at = _latest_collected.get(c.pk)
 
@@ -1582,7 +1744,6 @@ def _bulk_unpriced_view(request, cfg_key):
         'all_rarities':           all_rarities,
         'selected_rarities':      selected_rarities,
         'selected_rarities_json': safe_json_dumps(selected_rarities),
-        'card_raw_json':          safe_json_dumps(seen_raw, ensure_ascii=False),
         'page':                   page,
         'total_pages':            total_pages,
         'per_page':               per_page,
@@ -1627,15 +1788,7 @@ def _bulk_inline_cards_view(request, cfg_key):
     )
 
     # raw_data 수집 (카드 ID별 최신 1건)
-    seen_raw = {}
-    for cp in (
-        price_model.objects.filter(card_id__in=card_ids)
-        .exclude(raw_data={}).exclude(raw_data=[])
-        .order_by('-collected_at')
-        .values('card_id', 'raw_data')
-    ):
-        if cp['card_id'] not in seen_raw:
-            seen_raw[cp['card_id']] = cp['raw_data']
+    seen_raw = _latest_raw_by_card(price_model, card_ids)
 
     # 하락/상승 모드면 drop_pct 계산 추가 (상승은 음수로 나타남)
     result_cards = []
@@ -1703,7 +1856,9 @@ def _bulk_approve_view(request, cfg_key):
     if hasattr(card, 'reviewed_market_price'):
         card.reviewed_market_price = market_price
         update_fields.append('reviewed_market_price')
-    card.save(update_fields=update_fields)
+    with transaction.atomic():
+        card.save(update_fields=update_fields)
+        price_outbox.record_card(card, old_price, price_outbox.SOURCE_BULK_APPROVE)
 
     return JsonResponse({
         'success':   True,
@@ -1740,7 +1895,9 @@ def _bulk_edit_view(request, cfg_key):
     if hasattr(card, 'reviewed_market_price'):
         card.reviewed_market_price = getattr(card, 'latest_market_price', None)
         update_fields.append('reviewed_market_price')
-    card.save(update_fields=update_fields)
+    with transaction.atomic():
+        card.save(update_fields=update_fields)
+        price_outbox.record_card(card, old_price, price_outbox.SOURCE_BULK_EDIT)
 
     return JsonResponse({
         'success':   True,
@@ -1834,7 +1991,7 @@ def _fetch_image_hash(url):
 def _verify_image_hashes(urls):
     """
     여러 이미지 URL의 내용 해시를 동시에(스레드풀) 받아와 {url: hash_or_None} 로 반환.
-    URL별로 캐시(FileBasedCache, 워커 간 공유)해서 재검증 시 재다운로드하지 않음.
+    URL별로 워커 간 공유 캐시에 저장해서 재검증 시 재다운로드하지 않음.
 
     행마다 순차로 다운로드하면 URL 하나가 응답 없을 때마다 타임아웃만큼 그대로
     누적돼(확인 필요한 행이 많으면 페이지가 몇 분씩 걸리거나 gunicorn 기본
@@ -2088,7 +2245,7 @@ def _bulk_verify_candidates_view(request, cfg_key):
 
 
 # ════════════════════════════════════════════════════════════════
-# 게임별 얇은 위임 뷰 생성 — bulk_* 12종 + card_detail
+# 게임별 얇은 위임 뷰 생성 — bulk_* 12종 + card_detail/card_raw_data
 #
 # 게임 카테고리(포켓몬/원피스/디지몬 한글판) 간 차이가 cfg_key 하나뿐인
 # 뷰들만 대상으로 한다. expansion_list/card_list는 게임별 extra_ctx가
@@ -2128,6 +2285,7 @@ _GAME_VIEW_TYPES = [
     ('bulk_inline_cards',      _bulk_inline_cards_view,       True),
     ('bulk_edit',              _bulk_edit_view,               True),
     ('card_detail',            _card_detail_view,            False),
+    ('card_raw_data',          _card_raw_data_view,          False),
 ]
 
 
@@ -2189,14 +2347,16 @@ def pokemon_kr_card_search(request):
 @staff_required
 @require_POST
 def pokemon_kr_reset_prices(request, expansion_code):
-    count = Card.objects.filter(expansion__code=expansion_code).update(selling_price=0)
+    count = price_outbox.reset_prices(Card.objects.filter(expansion__code=expansion_code), 'pokemon_kr')
+    list_cache.bump_expansions('pokemon_kr', Expansion.objects.filter(code=expansion_code).values_list('id', flat=True))
     return JsonResponse({'success': True, 'count': count})
 
 
 @staff_required
 @require_POST
 def pokemon_kr_reset_all_prices(request):
-    count = Card.objects.all().update(selling_price=0)
+    count = price_outbox.reset_prices(Card.objects.all(), 'pokemon_kr')
+    list_cache.bump_game('pokemon_kr')
     return JsonResponse({'success': True, 'count': count})
 
 
@@ -2352,14 +2512,16 @@ def onepiece_kr_price_history(request, pk):
 @staff_required
 @require_POST
 def onepiece_kr_reset_prices(request, expansion_code):
-    count = OnePieceCard.objects.filter(expansion__code=expansion_code).update(selling_price=0)
+    count = price_outbox.reset_prices(OnePieceCard.objects.filter(expansion__code=expansion_code), 'onepiece_kr')
+    list_cache.bump_expansions('onepiece_kr', OnePieceExpansion.objects.filter(code=expansion_code).values_list('id', flat=True))
     return JsonResponse({'success': True, 'count': count})
 
 
 @staff_required
 @require_POST
 def onepiece_kr_reset_all_prices(request):
-    count = OnePieceCard.objects.all().update(selling_price=0)
+    count = price_outbox.reset_prices(OnePieceCard.objects.all(), 'onepiece_kr')
+    list_cache.bump_game('onepiece_kr')
     return JsonResponse({'success': True, 'count': count})
 
 
@@ -2431,14 +2593,16 @@ def digimon_kr_card_search(request):
 @staff_required
 @require_POST
 def digimon_kr_reset_prices(request, expansion_code):
-    count = DigimonCard.objects.filter(expansion__code=expansion_code).update(selling_price=0)
+    count = price_outbox.reset_prices(DigimonCard.objects.filter(expansion__code=expansion_code), 'digimon_kr')
+    list_cache.bump_expansions('digimon_kr', DigimonExpansion.objects.filter(code=expansion_code).values_list('id', flat=True))
     return JsonResponse({'success': True, 'count': count})
 
 
 @staff_required
 @require_POST
 def digimon_kr_reset_all_prices(request):
-    count = DigimonCard.objects.all().update(selling_price=0)
+    count = price_outbox.reset_prices(DigimonCard.objects.all(), 'digimon_kr')
+    list_cache.bump_game('digimon_kr')
     return JsonResponse({'success': True, 'count': count})
 
 
@@ -8,10 +8,29 @@ PRICEHUB_API_BASE_URL만 실제 도메인으로 바꾸면 그대로 동작한다
 
 인증: 서버 간 통신이라 Api-Key를 서버(pricesite 백엔드)에서만 보관하고
 쓴다 — 브라우저(공개 사용자)에는 절대 노출되지 않는다.
+
+호출은 keep-alive 공유 세션 하나로 보내고, 연결 실패·502/503/504는 짧게 몇 번
+재시도한다(GET만 — 전부 조회라 다시 보내도 안전). 가격 조회는 캐시 키마다 한 요청만
+pricehub를 부르고 같은 카드를 동시에 연 나머지는 그 결과를 기다린다. pricehub가
+응답하지 않으면 마지막으로 받아둔 값(최대 하루 전)을 대신 보여준다.
+
+가격 버전(price_version): 게임마다 캐시에 둔 토큰. 다시 받아온 가격 응답이 직전에 받아둔
+값과 다르면 새 토큰으로 바꾸고, 토큰 자체도 _PRICE_CACHE_TTL마다 새로 만든다. 뷰는 가격
+API를 부르기 전에 이 토큰으로 ETag를 만들어 304를 판정한다(pricesite/views.py) — 가격이 바뀐
+뒤 새 ETag가 나가기까지는 가격 캐시와 같은 정도(최대 약 2 × _PRICE_CACHE_TTL) 늦을 수 있다.
 """
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
 import requests
 from django.conf import settings
 from django.core.cache import cache
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
 
 _GAME_API_PATH = {
     'pokemon_kr': 'pokemon/kr',
@@ -27,22 +46,136 @@ _GAME_API_PATH = {
 # 않는다 — 부하 방지용 완충일 뿐, 하루 단위로 보면 항상 최신 값을 반영함.
 _PRICE_CACHE_TTL = 600  # 10분
 
+# pricehub 장애 때 대신 보여줄 마지막 응답 보관 기간(stale-if-error)
+_PRICE_STALE_TTL = 24 * 3600  # 1일
+
+# 캐시 미스 때 한 요청만 pricehub를 부르는 잠금(card_controltower_client의 갱신 잠금과 같은
+# cache.add 방식). 재시도까지 포함한 호출 최대 시간보다 넉넉히.
+_FILL_LOCK_TTL = 30
+_FILL_WAIT_INTERVAL = 0.1
+
+# 카탈로그 동기화가 확장팩별 카드 목록을 동시에 받으므로 그만큼 커넥션을 재사용
+_HTTP_POOL_SIZE = 8
+
+# cards/price-snapshots/(가격 요약 일괄)는 latest_raw_data 캐시 컬럼이 있는 한글판만 지원
+_PRICE_SNAPSHOTS_GAMES = {'pokemon_kr', 'onepiece_kr', 'digimon_kr'}
+
+# 연결 실패·게이트웨이 오류 재시도 — 0.3초, 0.6초 쉬고 최대 2번 더
+_HTTP_RETRIES = Retry(
+    total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({'GET'}), raise_on_status=False,
+)
+
 
 class PricehubAPIError(Exception):
     """pricehub API 호출 실패 (네트워크 오류, 5xx, 타임아웃 등)"""
 
 
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _get_http_session():
+    """
+    pricehub 호출용 공유 세션 — 같은 호스트만 부르므로 keep-alive로 커넥션을 재사용한다
+    (pricehub/card_controltower_client.py의 _get_http_session과 같은 구성).
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=_HTTP_POOL_SIZE, pool_maxsize=_HTTP_POOL_SIZE,
+                    max_retries=_HTTP_RETRIES,
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _http_session = session
+    return _http_session
+
+
 def _get(path, params=None, timeout=5):
     url = f'{settings.PRICEHUB_API_BASE_URL}{path}'
     headers = {'Authorization': f'Api-Key {settings.PRICEHUB_API_KEY}'}
     try:
-        resp = requests.get(url, headers=headers, params=params, timeout=timeout)
+        resp = _get_http_session().get(url, headers=headers, params=params, timeout=timeout)
         resp.raise_for_status()
         return resp.json()
     except requests.RequestException as e:
         raise PricehubAPIError(f'pricehub API 호출 실패: {url} ({e})') from e
 
 
+def _stale_key(cache_key):
+    return f'{cache_key}:stale'
+
+
+def _price_version_key(game_key):
+    return f'pricesite:price-version:{game_key}'
+
+
+def price_version(game_key):
+    """게임의 가격 버전 토큰(ETag용) — 캐시 조회 1번, 없으면 새로 만든다"""
+    key = _price_version_key(game_key)
+    token = cache.get(key)
+    if token is None:
+        cache.add(key, uuid.uuid4().hex[:12], _PRICE_CACHE_TTL)
+        token = cache.get(key)
+    return token
+
+
+def _fill_lock_key(cache_key):
+    return f'{cache_key}:lock'
+
+
+def _fetch_and_cache(game_key, cache_key, path, params):
+    """
+    pricehub 호출 후 캐시. 실패하면 마지막으로 받아둔 값을 대신 돌려주고(캐시하지 않음 —
+    다음 요청이 다시 시도), 그것도 없으면 PricehubAPIError. 받아둔 값과 달라졌으면 게임의
+    가격 버전을 바꾼다(처음 받는 키는 그 값으로 만든 ETag가 아직 없으니 그대로).
+    """
+    previous = cache.get(_stale_key(cache_key))
+    try:
+        data = _get(path, params=params)
+    except PricehubAPIError as e:
+        if previous is None:
+            raise
+        logger.warning('%s — 마지막으로 받은 값으로 대신 응답', e)
+        return previous
+    if previous is not None and previous != data:
+        cache.set(_price_version_key(game_key), uuid.uuid4().hex[:12], _PRICE_CACHE_TTL)
+    cache.set(cache_key, data, _PRICE_CACHE_TTL)
+    cache.set(_stale_key(cache_key), data, _PRICE_STALE_TTL)
+    return data
+
+
+def _cached_get(game_key, cache_key, path, params=None):
+    """
+    _PRICE_CACHE_TTL 동안 캐시. 캐시 미스가 동시에 몰리면(인기 카드) 잠금을 잡은 한 요청만
+    pricehub를 부르고, 나머지는 그 결과가 캐시에 들어오길 기다린다.
+    """
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    lock_key = _fill_lock_key(cache_key)
+    if cache.add(lock_key, 1, _FILL_LOCK_TTL):
+        try:
+            return _fetch_and_cache(game_key, cache_key, path, params)
+        finally:
+            cache.delete(lock_key)
+
+    # 다른 요청이 받는 중 — 끝나길 기다렸다가 그 결과를 쓴다(실패해서 잠금만 풀리면 직접 받는다)
+    deadline = time.monotonic() + _FILL_LOCK_TTL
+    while time.monotonic() < deadline and cache.get(lock_key) is not None:
+        time.sleep(_FILL_WAIT_INTERVAL)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+    cached = cache.get(cache_key)
+    return cached if cached is not None else _fetch_and_cache(game_key, cache_key, path, params)
+
+
 def fetch_expansions(game_key):
     """확장팩 목록 (카탈로그 동기화용)"""
     path = _GAME_API_PATH[game_key]
@@ -52,8 +185,8 @@ def fetch_expansions(game_key):
 def fetch_cards(game_key, expansion_code):
     """
     확장팩별 카드 목록 (카탈로그 동기화용). 사용자 요청이 아니라 백그라운드
-    동기화라 응답 속도보다 완주가 중요함 — 카드 수가 많은 확장팩은 카드당
-    가격 인덱스 조회가 누적돼 수십 초 걸릴 수 있어 타임아웃을 넉넉히 잡는다.
+    동기화라 응답 속도보다 완주가 중요함 — 목록은 카드 수와 무관하게 쿼리 몇 번이지만
+    DB가 바쁠 때도 끊기지 않게 타임아웃을 넉넉히 잡는다.
     """
     path = _GAME_API_PATH[game_key]
     return _get(f'/api/{path}/expansions/{expansion_code}/cards/', timeout=60)
@@ -65,23 +198,35 @@ def fetch_price_snapshot(game_key, source_id):
     일본판은 latest_prices(출처×등급별 최신가). 카드 상세 페이지 방문마다
     호출되므로 짧게 캐시해서(_PRICE_CACHE_TTL) 부하를 줄인다.
     """
-    cache_key = f'pricesite:price-snapshot:{game_key}:{source_id}'
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
     path = _GAME_API_PATH[game_key]
-    data = _get(f'/api/{path}/cards/{source_id}/price-snapshot/')
-    cache.set(cache_key, data, _PRICE_CACHE_TTL)
-    return data
+    return _cached_get(
+        game_key, f'pricesite:price-snapshot:{game_key}:{source_id}',
+        f'/api/{path}/cards/{source_id}/price-snapshot/',
+    )
 
 
 def fetch_price_history(game_key, source_id, range_key='week'):
     """가격 변화 그래프용 기간별(1주/1개월/1년) 이력 — 짧게 캐시(_PRICE_CACHE_TTL)."""
-    cache_key = f'pricesite:price-history:{game_key}:{source_id}:{range_key}'
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
     path = _GAME_API_PATH[game_key]
-    data = _get(f'/api/{path}/cards/{source_id}/price-history/', params={'range': range_key})
-    cache.set(cache_key, data, _PRICE_CACHE_TTL)
-    return data
+    return _cached_get(
+        game_key, f'pricesite:price-history:{game_key}:{source_id}:{range_key}',
+        f'/api/{path}/cards/{source_id}/price-history/', params={'range': range_key},
+    )
+
+
+def fetch_price_snapshots(game_key, source_ids):
+    """
+    카드 여러 장의 가격 요약(min/median/max/count/collected_at) — {source_id: 요약}.
+    카드 목록 한 페이지에 한 번만 부른다(카드마다 fetch_price_snapshot을 부르지 않게).
+    페이지(카드 id 조합)마다 _PRICE_CACHE_TTL 캐시. 일본판은 지원 안 함 — 빈 딕셔너리.
+    """
+    ids = sorted(set(source_ids))
+    if not ids or game_key not in _PRICE_SNAPSHOTS_GAMES:
+        return {}
+    digest = hashlib.md5(','.join(map(str, ids)).encode('utf-8')).hexdigest()
+    path = _GAME_API_PATH[game_key]
+    data = _cached_get(
+        game_key, f'pricesite:price-snapshots:{game_key}:{digest}',
+        f'/api/{path}/cards/price-snapshots/', params={'ids': ','.join(map(str, ids))},
+    )
+    return {int(source_id): summary for source_id, summary in data['results'].items()}
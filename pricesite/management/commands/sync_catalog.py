@@ -11,29 +11,84 @@ pricehub API에서 확장팩/카드 카탈로그(메타데이터)를 가져와 
 빠르게 보여준다(최신값이 아니라 이 동기화 시점 기준 스냅샷 — cron으로
 주기적으로 이 커맨드를 돌려서 신선도를 유지).
 
+확장팩별 카드 목록은 공유 세션(커넥션 재사용)으로 _FETCH_WORKERS개씩 동시에 받고,
+DB 쓰기는 메인 스레드에서 확장팩마다 bulk_create(update_conflicts=True) 몇 번으로
+끝낸다. 동기화한 필드 값의 해시(Card.content_hash)가 그대로인 카드는 쓰지 않는다 —
+대부분의 실행에서 바뀌는 건 시장 최저가가 달라진 카드 몇 장뿐이다.
+
+삭제는 카드 목록을 제대로 받은 확장팩에서만, 응답에 없는 카드를 쿼리 한 번으로 지운다.
+조회가 실패한 확장팩의 카드는 그대로 둔다(다음 실행에서 다시 맞춘다).
+
+PRICESITE_STATIC_DIR이 설정돼 있으면 끝에 공개 카탈로그 페이지를 정적 HTML로 다시
+만든다(pricesite/static_build.py).
+
 사용:
     python manage.py sync_catalog
     python manage.py sync_catalog --game pokemon_kr
+    python manage.py sync_catalog --no-prerender
 """
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 
+from pricesite import static_build
 from pricesite.api_client import PricehubAPIError, fetch_cards, fetch_expansions
 from pricesite.models import Card, Expansion
 
 GAME_KEYS = ['pokemon_kr', 'pokemon_jp', 'onepiece_kr', 'digimon_kr']
 
+# 동시에 받을 확장팩 수 — pricehub 쪽 카드 목록 API가 무거워서 너무 늘리지 않는다
+_FETCH_WORKERS = 4
+_WRITE_BATCH_SIZE = 500
+
+_EXPANSION_FIELDS = ['name', 'image_url', 'release_date', 'card_count']
+_CARD_FIELDS = ['expansion', 'card_number', 'name', 'rarity', 'image_url', 'is_mirror', 'latest_market_price']
+
+
+def _upsert(model, objs, unique_fields, update_fields):
+    """
+    있으면 갱신, 없으면 추가를 묶어서 한 번에. MySQL은 충돌 대상 컬럼을 지정할 수 없고
+    (ON DUPLICATE KEY UPDATE가 모든 유니크 키에 걸림) 지정하면 오류이므로 지원할 때만 넘긴다.
+    """
+    if not objs:
+        return
+    kwargs = {'update_conflicts': True, 'update_fields': update_fields + ['synced_at']}
+    if connection.features.supports_update_conflicts_with_target:
+        kwargs['unique_fields'] = unique_fields
+    model.objects.bulk_create(objs, batch_size=_WRITE_BATCH_SIZE, **kwargs)
+
+
+def _content_hash(expansion_code, c):
+    values = [
+        expansion_code, c['card_number'], c['name'], c.get('rarity') or '', c.get('image_url') or '',
+        bool(c.get('is_mirror')), c.get('latest_market_price'),
+    ]
+    return hashlib.md5(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
 
 class Command(BaseCommand):
     help = 'pricehub API에서 확장팩/카드 카탈로그(메타데이터)를 동기화한다.'
 
     def add_arguments(self, parser):
         parser.add_argument('--game', choices=GAME_KEYS, help='특정 게임만 동기화')
+        parser.add_argument('--no-prerender', action='store_true',
+                            help='정적 카탈로그 페이지를 다시 만들지 않음')
 
     def handle(self, *args, **options):
         games = [options['game']] if options.get('game') else GAME_KEYS
         for game_key in games:
             self._sync_game(game_key)
 
+        if settings.PRICESITE_STATIC_DIR and not options['no_prerender']:
+            count = static_build.build()
+            self.stdout.write(self.style.SUCCESS(
+                f'정적 페이지 {count}개 생성 → {settings.PRICESITE_STATIC_DIR}'
+            ))
+
     def _sync_game(self, game_key):
         self.stdout.write(f'[{game_key}] 확장팩 동기화 중...')
         try:
@@ -41,55 +96,79 @@ class Command(BaseCommand):
         except PricehubAPIError as e:
             raise CommandError(str(e))
 
-        synced_codes = set()
-        synced_source_ids = set()
-
-        for exp in expansions:
-            expansion, _ = Expansion.objects.update_or_create(
-                game_type=game_key, code=exp['code'],
-                defaults={
-                    'name': exp['name'],
-                    'image_url': exp.get('image_url') or '',
-                    'release_date': exp.get('release_date'),
-                    'card_count': exp.get('card_count') or 0,
-                },
-            )
-            synced_codes.add(exp['code'])
-            synced_source_ids |= self._sync_cards(game_key, expansion)
-
+        synced_codes = [exp['code'] for exp in expansions]
+        _upsert(
+            Expansion,
+            [
+                Expansion(
+                    game_type=game_key, code=exp['code'], name=exp['name'],
+                    image_url=exp.get('image_url') or '', release_date=exp.get('release_date'),
+                    card_count=exp.get('card_count') or 0,
+                )
+                for exp in expansions
+            ],
+            unique_fields=['game_type', 'code'], update_fields=_EXPANSION_FIELDS,
+        )
         deleted_exp, _ = (
             Expansion.objects.filter(game_type=game_key).exclude(code__in=synced_codes).delete()
         )
+        expansion_ids = dict(
+            Expansion.objects.filter(game_type=game_key).values_list('code', 'id')
+        )
+        known_hashes = dict(
+            Card.objects.filter(game_type=game_key).values_list('source_id', 'content_hash')
+        )
+
+        fetched = {
+            code: cards for code, cards in self._fetch_all_cards(game_key, synced_codes)
+            if cards is not None
+        }
+        written = 0
+        for code, cards in fetched.items():
+            written += self._upsert_cards(game_key, code, expansion_ids[code], cards, known_hashes)
+
+        # 다른 확장팩으로 옮겨간 카드를 지우지 않도록, 받은 카드 전체를 기준으로 뺀다
+        fetched_source_ids = {c['id'] for cards in fetched.values() for c in cards}
         deleted_card, _ = (
-            Card.objects.filter(game_type=game_key)
-            .exclude(source_id__in=synced_source_ids).delete()
+            Card.objects.filter(game_type=game_key, expansion_id__in=[expansion_ids[code] for code in fetched])
+            .exclude(source_id__in=fetched_source_ids).delete()
         )
 
         self.stdout.write(self.style.SUCCESS(
             f'[{game_key}] 확장팩 {len(expansions)}개 동기화 완료'
-            f' (삭제: 확장팩 {deleted_exp}, 카드 {deleted_card})'
+            f' (카드 갱신 {written}, 삭제: 확장팩 {deleted_exp}, 카드 {deleted_card})'
         ))
 
-    def _sync_cards(self, game_key, expansion):
-        try:
-            cards = fetch_cards(game_key, expansion.code)
-        except PricehubAPIError as e:
-            self.stderr.write(self.style.WARNING(f'  {expansion.code}: 카드 조회 실패 ({e})'))
-            return set()
-
-        source_ids = set()
+    def _fetch_all_cards(self, game_key, codes):
+        """(확장팩 코드, 카드 목록) — 조회 실패한 확장팩은 카드 목록이 None. 요청 순서대로."""
+        def fetch(code):
+            try:
+                return fetch_cards(game_key, code)
+            except PricehubAPIError as e:
+                self.stderr.write(self.style.WARNING(f'  {code}: 카드 조회 실패 ({e})'))
+                return None
+
+        with ThreadPoolExecutor(max_workers=_FETCH_WORKERS) as pool:
+            yield from zip(codes, pool.map(fetch, codes))
+
+    def _upsert_cards(self, game_key, code, expansion_id, cards, known_hashes):
+        """해시가 달라진(또는 새) 카드만 upsert. 쓴 카드 수를 반환."""
+        changed = []
         for c in cards:
-            Card.objects.update_or_create(
-                game_type=game_key, source_id=c['id'],
-                defaults={
-                    'expansion': expansion,
-                    'card_number': c['card_number'],
-                    'name': c['name'],
-                    'rarity': c.get('rarity') or '',
-                    'image_url': c.get('image_url') or '',
-                    'is_mirror': c.get('is_mirror') or False,
-                    'latest_market_price': c.get('latest_market_price'),
-                },
-            )
-            source_ids.add(c['id'])
-        return source_ids
+            content_hash = _content_hash(code, c)
+            if known_hashes.get(c['id']) == content_hash:
+                continue
+            changed.append(Card(
+                game_type=game_key, source_id=c['id'], expansion_id=expansion_id,
+                card_number=c['card_number'], name=c['name'],
+                rarity=c.get('rarity') or '', image_url=c.get('image_url') or '',
+                is_mirror=c.get('is_mirror') or False,
+                latest_market_price=c.get('latest_market_price'),
+                content_hash=content_hash,
+            ))
+
+        _upsert(
+            Card, changed,
+            unique_fields=['game_type', 'source_id'], update_fields=_CARD_FIELDS + ['content_hash'],
+        )
+        return len(changed)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pricesite', '0002_card_is_mirror'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='card',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='동기화한 필드 값의 해시 — sync_catalog가 안 바뀐 카드는 다시 쓰지 않는다', max_length=32),
+        ),
+    ]
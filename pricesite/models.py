@@ -47,6 +47,10 @@ class Card(models.Model):
     image_url = models.URLField(max_length=500, blank=True)
     is_mirror = models.BooleanField(default=False, help_text='포켓몬 일본판 미러 카드 여부')
     latest_market_price = models.PositiveIntegerField(null=True, blank=True)
+    content_hash = models.CharField(
+        max_length=32, blank=True,
+        help_text='동기화한 필드 값의 해시 — sync_catalog가 안 바뀐 카드는 다시 쓰지 않는다',
+    )
     synced_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -0,0 +1,106 @@
+"""
+pricesite/static_build.py
+
+공개 카탈로그 페이지(홈, 게임별 확장팩 목록, 확장팩별 카드 목록 첫 페이지)를 정적 HTML로
+미리 만들어 nginx가 Django를 거치지 않고 바로 내보내게 한다. 이 페이지들은 동기화된
+카탈로그(pricesite.models)만으로 결정되고 카탈로그는 하루 한 번 sync_catalog로만 바뀌므로,
+동기화 직후 한 번 만들어두면 다음 동기화까지 그대로다. 카드 목록의 가격 요약은 하루 종일
+바뀌므로 굽지 않는다 — 동기화한 시장 최저가만 넣고, 페이지가 열리면 브라우저가
+/prices/<game>/cards/prices/?ids=(views.card_prices)로 받아 채운다.
+
+설정 PRICESITE_STATIC_DIR이 비어 있으면 만들지 않는다(기본값). 설정하면 sync_catalog가
+끝날 때마다 다시 만든다(--no-prerender로 끌 수 있음).
+
+교체는 원자적 — 새 빌드를 {PRICESITE_STATIC_DIR}.builds/ 아래 새 디렉터리에 다 쓴 뒤
+PRICESITE_STATIC_DIR 심볼릭 링크만 새 디렉터리로 바꾼다(rename). nginx는 항상 옛 빌드
+전체 아니면 새 빌드 전체를 본다. 바로 이전 빌드 하나는 남겨두고(교체 순간 읽던 요청용)
+나머지는 지운다.
+
+파일 경로는 URL과 같다 — /prices/pokemon_kr/expansions/ → prices/pokemon_kr/expansions/index.html.
+검색어/레어도/페이지 쿼리가 붙은 요청과 미리 만들지 않은 페이지(카드 상세 — 가격을 매번
+pricehub API에서 받는다)는 그대로 Django로 넘긴다:
+
+    location /prices/ {
+        error_page 418 = @django;
+        if ($args) { return 418; }
+        root /home/ubuntu/pricehub/pricesite_static;
+        try_files $uri/index.html @django;
+    }
+"""
+import os
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Expansion
+from .views import GAME_CONFIG, card_list_context, expansion_list_context
+
+_KEEP_PREVIOUS_BUILDS = 1
+
+
+def _write(build_dir, url, html):
+    path = build_dir / unquote(url).lstrip('/') / 'index.html'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(html, encoding='utf-8')
+
+
+def _render_all(build_dir):
+    """페이지를 전부 build_dir에 쓰고 쓴 페이지 수를 반환"""
+    _write(build_dir, reverse('pricesite:home'),
+           render_to_string('pricesite/home.html', {'games': GAME_CONFIG}))
+    count = 1
+    for game_key in GAME_CONFIG:
+        _write(build_dir, reverse('pricesite:expansion-list', args=[game_key]),
+               render_to_string('pricesite/expansion_list.html', expansion_list_context(game_key)))
+        count += 1
+        for expansion in Expansion.objects.filter(game_type=game_key):
+            _write(build_dir, reverse('pricesite:card-list', args=[game_key, expansion.code]),
+                   render_to_string('pricesite/card_list.html',
+                                    card_list_context(game_key, expansion, live_prices=False)))
+            count += 1
+    return count
+
+
+def _swap(output_dir, build_dir):
+    """output_dir 심볼릭 링크를 build_dir로 원자적으로 바꾼다"""
+    if output_dir.exists() and not output_dir.is_symlink():
+        raise RuntimeError(f'{output_dir}가 심볼릭 링크가 아님 — 옮기거나 지운 뒤 다시 실행')
+    tmp_link = output_dir.with_name(f'.{output_dir.name}.{uuid.uuid4().hex[:8]}')
+    os.symlink(build_dir, tmp_link)
+    os.replace(tmp_link, output_dir)
+
+
+def _prune(builds_dir, current):
+    builds = sorted(
+        (p for p in builds_dir.iterdir() if p.is_dir() and p != current),
+        key=lambda p: p.stat().st_mtime_ns, reverse=True,
+    )
+    for old in builds[_KEEP_PREVIOUS_BUILDS:]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def build(output_dir=None):
+    """
+    정적 페이지를 새로 만들고 output_dir(기본 PRICESITE_STATIC_DIR)을 새 빌드로 교체.
+    쓴 페이지 수를 반환. 실패하면 만들던 디렉터리만 지우고 지금 빌드는 그대로 둔다.
+    """
+    output_dir = Path(output_dir or settings.PRICESITE_STATIC_DIR)
+    builds_dir = output_dir.with_name(f'{output_dir.name}.builds')
+    builds_dir.mkdir(parents=True, exist_ok=True)
+    build_dir = Path(tempfile.mkdtemp(prefix=timezone.now().strftime('%Y%m%d-%H%M%S-'), dir=builds_dir))
+    try:
+        os.chmod(build_dir, 0o755)  # mkdtemp는 0700 — nginx 워커가 읽을 수 있게
+        count = _render_all(build_dir)
+        _swap(output_dir, build_dir)
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+    _prune(builds_dir, build_dir)
+    return count
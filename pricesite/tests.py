@@ -6,11 +6,14 @@ pricesite는 pricehub DB를 직접 참조하지 않고 전부 api_client(HTTP)
 실제 네트워크 호출 없이 검증한다. 카탈로그(확장팩/카드) 쪽은 pricesite
 자체 로컬 모델이라 일반 Django TestCase 픽스처로 바로 만든다.
 """
+import hashlib
 from datetime import date
 from unittest.mock import patch
 
 from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from . import api_client
@@ -63,7 +66,11 @@ class CardListViewTests(TestCase):
     def setUp(self):
         self.expansion = _make_expansion()
         self.card1 = _make_card(self.expansion, source_id=1, card_number='001', name='이상해씨', rarity='C')
-        self.card2 = _make_card(self.expansion, source_id=2, card_number='002', name='피카츄', rarity='R')
+        self.card2 = _make_card(self.expansion, source_id=2, card_number='002', name='피카츄', rarity='R',
+                                latest_market_price=700)
+        patcher = patch('pricesite.views.fetch_price_snapshots', return_value={})
+        self.mock_snapshots = patcher.start()
+        self.addCleanup(patcher.stop)
 
     def _url(self, **params):
         url = reverse('pricesite:card-list', args=['pokemon_kr', self.expansion.code])
@@ -94,6 +101,108 @@ class CardListViewTests(TestCase):
         )
         self.assertEqual(resp.status_code, 404)
 
+    def test_shows_price_summary_from_one_batch_call(self):
+        self.mock_snapshots.return_value = {
+            1: {'min': 1200, 'median': 1500, 'max': 2000, 'count': 4, 'collected_at': None},
+        }
+        resp = self.client.get(self._url())
+
+        self.mock_snapshots.assert_called_once_with('pokemon_kr', [1, 2])
+        self.assertContains(resp, '1200원')
+        self.assertContains(resp, '중간 1500원 · 4곳')
+        self.assertContains(resp, '700원')  # 요약이 없는 카드는 동기화한 시장 최저가
+
+    def test_price_summary_failure_falls_back_to_synced_price(self):
+        self.mock_snapshots.side_effect = api_client.PricehubAPIError('boom')
+        resp = self.client.get(self._url())
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, '700원')
+
+
+class ConditionalResponseTests(TestCase):
+    """ETag/304 — 같은 ETag로 재요청하면 렌더링 없이 304, 카탈로그/가격이 바뀌면 새 ETag."""
+
+    def setUp(self):
+        cache.clear()
+        self.expansion = _make_expansion()
+        self.card = _make_card(self.expansion, source_id=42, name='이상해씨')
+        patcher = patch('pricesite.views.fetch_price_snapshots', return_value={})
+        self.mock_snapshots = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_card_list_revalidates_until_catalog_changes(self):
+        url = reverse('pricesite:card-list', args=['pokemon_kr', 'SV1'])
+        resp = self.client.get(url)
+        etag = resp['ETag']
+        self.assertIn('public', resp['Cache-Control'])
+
+        self.mock_snapshots.reset_mock()
+        with patch('pricesite.views.render') as mock_render, CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        mock_render.assert_not_called()
+        self.mock_snapshots.assert_not_called()  # 가격 API도 안 부른다
+        self.assertEqual(len(ctx.captured_queries), 2)  # 확장팩 + 카드 동기화 집계
+
+        # 쿼리가 다르면 다른 ETag
+        self.assertNotEqual(self.client.get(url, {'q': '이상'})['ETag'], etag)
+
+        _make_card(self.expansion, source_id=43, card_number='002', name='이상해풀')
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, '이상해풀')
+
+    @patch.object(api_client, '_get')
+    def test_card_list_etag_follows_price_version(self, mock_get):
+        url = reverse('pricesite:card-list', args=['pokemon_kr', 'SV1'])
+        mock_get.return_value = {'results': {'42': {'min': 1000, 'median': 1000, 'count': 1}}}
+        with patch('pricesite.views.fetch_price_snapshots', api_client.fetch_price_snapshots):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+            # 카탈로그는 그대로, 작업자가 낮에 가격을 새로 넣었고 가격 캐시가 만료됐다 — 다음에
+            # 다시 받아온 요청이 가격 버전을 바꾸면 옛 ETag로는 304가 안 나간다
+            mock_get.return_value = {'results': {'42': {'min': 900, 'median': 950, 'count': 2}}}
+            cache.delete(f'pricesite:price-snapshots:pokemon_kr:{hashlib.md5(b"42").hexdigest()}')
+            self.assertContains(self.client.get(url), '900원')
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp['ETag'], etag)
+        self.assertContains(resp, '900원')
+
+    def test_expansion_list_revalidates(self):
+        url = reverse('pricesite:expansion-list', args=['pokemon_kr'])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    @patch('pricesite.views.fetch_price_history')
+    @patch('pricesite.views.fetch_price_snapshot')
+    def test_card_detail_etag_follows_price_version(self, mock_snapshot, mock_history):
+        mock_snapshot.return_value = {'market_items': [], 'stats': {'min': 1000}}
+        mock_history.return_value = {'range': 'week', 'history': []}
+        url = reverse('pricesite:card-detail', args=['pokemon_kr', self.card.pk])
+
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        mock_snapshot.reset_mock()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        mock_snapshot.assert_not_called()  # 304면 가격 API를 안 부른다
+
+        mock_snapshot.return_value = {'market_items': [], 'stats': {'min': 900}}
+        cache.delete(api_client._price_version_key('pokemon_kr'))  # 가격 버전이 바뀌면
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    @patch('pricesite.views.fetch_price_history')
+    @patch('pricesite.views.fetch_price_snapshot')
+    def test_card_detail_error_page_has_no_etag(self, mock_snapshot, mock_history):
+        mock_snapshot.side_effect = api_client.PricehubAPIError('boom')
+        resp = self.client.get(reverse('pricesite:card-detail', args=['pokemon_kr', self.card.pk]))
+        self.assertNotIn('ETag', resp)
+
 
 class CardDetailViewTests(TestCase):
     def setUp(self):
@@ -226,9 +335,10 @@ class ApiClientCachingTests(TestCase):
         api_client.fetch_price_history('pokemon_kr', 1, 'week')
         self.assertEqual(mock_get.call_count, 2)
 
-    @patch('pricesite.api_client.requests.get')
-    def test_request_exception_raises_pricehub_api_error_and_is_not_cached(self, mock_requests_get):
+    @patch('pricesite.api_client._get_http_session')
+    def test_request_exception_raises_pricehub_api_error_and_is_not_cached(self, mock_session):
         import requests
+        mock_requests_get = mock_session.return_value.get
         mock_requests_get.side_effect = requests.Timeout('timed out')
 
         with self.assertRaises(api_client.PricehubAPIError):
@@ -240,6 +350,77 @@ class ApiClientCachingTests(TestCase):
             api_client.fetch_price_snapshot('pokemon_kr', 5)
         self.assertEqual(mock_requests_get.call_count, 2)
 
+    @patch.object(api_client, '_get')
+    def test_serves_last_good_value_when_pricehub_fails(self, mock_get):
+        mock_get.return_value = {'market_items': [], 'stats': {'min': 100}}
+        api_client.fetch_price_snapshot('pokemon_kr', 1)
+        cache.delete('pricesite:price-snapshot:pokemon_kr:1')  # 10분 캐시 만료
+
+        mock_get.side_effect = api_client.PricehubAPIError('timed out')
+        data = api_client.fetch_price_snapshot('pokemon_kr', 1)
+
+        self.assertEqual(data['stats'], {'min': 100})
+        # 옛 값은 다시 캐시하지 않는다 — 다음 요청이 pricehub를 다시 시도
+        api_client.fetch_price_snapshot('pokemon_kr', 1)
+        self.assertEqual(mock_get.call_count, 3)
+
+    @patch.object(api_client, '_get')
+    def test_concurrent_miss_waits_for_in_flight_request(self, mock_get):
+        import threading
+
+        key = 'pricesite:price-history:pokemon_kr:1:week'
+        cache.add(f'{key}:lock', 1, 30)  # 다른 요청이 받는 중
+        timer = threading.Timer(0.2, cache.set, (key, {'range': 'week', 'history': [1]}, 60))
+        timer.start()
+        try:
+            data = api_client.fetch_price_history('pokemon_kr', 1, 'week')
+        finally:
+            timer.join()
+
+        self.assertEqual(data['history'], [1])
+        mock_get.assert_not_called()
+
+    @patch.object(api_client, '_get')
+    def test_fill_lock_is_released_after_failure(self, mock_get):
+        mock_get.side_effect = api_client.PricehubAPIError('timed out')
+        with self.assertRaises(api_client.PricehubAPIError):
+            api_client.fetch_price_snapshot('pokemon_kr', 7)
+        self.assertIsNone(cache.get('pricesite:price-snapshot:pokemon_kr:7:lock'))
+
+    @patch.object(api_client, '_get')
+    def test_price_snapshots_one_call_per_page_and_cached(self, mock_get):
+        mock_get.return_value = {'results': {'2': {'min': 100, 'median': 100, 'max': 100, 'count': 1}}}
+
+        data = api_client.fetch_price_snapshots('pokemon_kr', [2, 1, 2])
+        api_client.fetch_price_snapshots('pokemon_kr', [1, 2])
+
+        self.assertEqual(data, {2: {'min': 100, 'median': 100, 'max': 100, 'count': 1}})
+        mock_get.assert_called_once_with('/api/pokemon/kr/cards/price-snapshots/', params={'ids': '1,2'})
+        self.assertEqual(api_client.fetch_price_snapshots('pokemon_jp', [1]), {})
+
+    def test_session_retries_idempotent_gets(self):
+        adapter = api_client._get_http_session().get_adapter('https://pricehub.example')
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+        self.assertEqual(adapter.max_retries.allowed_methods, frozenset({'GET'}))
+
+    @patch.object(api_client, '_get')
+    def test_price_version_changes_only_when_refetched_prices_differ(self, mock_get):
+        key = 'pricesite:price-snapshot:pokemon_kr:1'
+        mock_get.return_value = {'market_items': [], 'stats': {'min': 100}}
+        version = api_client.price_version('pokemon_kr')
+        api_client.fetch_price_snapshot('pokemon_kr', 1)
+        self.assertEqual(api_client.price_version('pokemon_kr'), version)  # 처음 받은 값
+
+        cache.delete(key)  # 10분 캐시 만료 — 같은 값을 다시 받으면 그대로
+        api_client.fetch_price_snapshot('pokemon_kr', 1)
+        self.assertEqual(api_client.price_version('pokemon_kr'), version)
+
+        mock_get.return_value = {'market_items': [], 'stats': {'min': 90}}
+        cache.delete(key)
+        api_client.fetch_price_snapshot('pokemon_kr', 1)
+        self.assertNotEqual(api_client.price_version('pokemon_kr'), version)
+
 
 class SyncCatalogCommandTests(TestCase):
     """카탈로그 동기화 커맨드 — pricehub API를 mock으로 대체해 upsert/삭제 로직만 검증."""
@@ -284,3 +465,157 @@ class SyncCatalogCommandTests(TestCase):
 
         self.assertFalse(Expansion.objects.filter(pk=stale.pk).exists())
         self.assertFalse(Card.objects.filter(expansion_id=stale.pk).exists())
+
+    _EXPANSIONS = [
+        {'code': 'SV1', 'name': '최초의 벚꽃', 'image_url': '', 'release_date': '2024-01-01', 'card_count': 2},
+    ]
+    _CARDS = [
+        {'id': 10, 'card_number': '001', 'name': '이상해씨', 'rarity': 'C', 'image_url': '', 'latest_market_price': 500},
+        {'id': 11, 'card_number': '002', 'name': '이상해풀', 'rarity': 'U', 'image_url': '', 'latest_market_price': 800},
+    ]
+
+    def _sync(self):
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        out = StringIO()
+        call_command('sync_catalog', '--game', 'pokemon_kr', stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    @patch('pricesite.management.commands.sync_catalog.fetch_cards')
+    @patch('pricesite.management.commands.sync_catalog.fetch_expansions')
+    def test_second_sync_only_writes_changed_cards(self, mock_expansions, mock_cards):
+        mock_expansions.return_value = self._EXPANSIONS
+        mock_cards.return_value = self._CARDS
+        self.assertIn('카드 갱신 2', self._sync())
+        first_pks = dict(Card.objects.values_list('source_id', 'pk'))
+
+        mock_cards.return_value = [self._CARDS[0], {**self._CARDS[1], 'latest_market_price': 900}]
+        self.assertIn('카드 갱신 1', self._sync())
+
+        self.assertEqual(Card.objects.get(source_id=11).latest_market_price, 900)
+        self.assertEqual(dict(Card.objects.values_list('source_id', 'pk')), first_pks)
+
+    @patch('pricesite.management.commands.sync_catalog.fetch_cards')
+    @patch('pricesite.management.commands.sync_catalog.fetch_expansions')
+    def test_removes_cards_missing_from_fetched_expansion(self, mock_expansions, mock_cards):
+        mock_expansions.return_value = self._EXPANSIONS
+        mock_cards.return_value = self._CARDS
+        self._sync()
+
+        mock_cards.return_value = self._CARDS[:1]
+        self._sync()
+
+        self.assertEqual(list(Card.objects.values_list('source_id', flat=True)), [10])
+
+    @patch('pricesite.management.commands.sync_catalog.fetch_cards')
+    @patch('pricesite.management.commands.sync_catalog.fetch_expansions')
+    def test_failed_card_fetch_keeps_existing_cards(self, mock_expansions, mock_cards):
+        from pricesite.api_client import PricehubAPIError
+
+        mock_expansions.return_value = self._EXPANSIONS
+        mock_cards.return_value = self._CARDS
+        self._sync()
+
+        mock_cards.side_effect = PricehubAPIError('timed out')
+        self._sync()
+
+        self.assertEqual(Card.objects.filter(game_type='pokemon_kr').count(), 2)
+
+
+class StaticBuildTests(TestCase):
+    """공개 카탈로그 정적 페이지 빌드 — 임시 디렉터리에 만들고 심볼릭 링크 교체까지 확인."""
+
+    def setUp(self):
+        import tempfile
+        from pathlib import Path
+
+        self.tmp = Path(tempfile.mkdtemp())
+        self.output = self.tmp / 'pricesite_static'
+        expansion = _make_expansion(game_type='pokemon_kr', code='SV1', name='최초의 벚꽃')
+        _make_card(expansion, source_id=10, name='이상해씨')
+        patcher = patch('pricesite.views.fetch_price_snapshots', return_value={})
+        self.mock_snapshots = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_writes_pages_at_url_paths(self):
+        from pricesite import static_build
+
+        count = static_build.build(self.output)
+
+        self.assertEqual(count, 1 + 4 + 1)  # 홈 + 게임별 확장팩 목록 + 카드 목록
+        card_list = self.output / 'prices/pokemon_kr/expansions/SV1/cards/index.html'
+        self.assertIn('이상해씨', card_list.read_text(encoding='utf-8'))
+        self.assertIn('최초의 벚꽃', (self.output / 'prices/pokemon_kr/expansions/index.html').read_text(encoding='utf-8'))
+        self.assertTrue((self.output / 'prices/index.html').exists())
+
+    def test_card_list_prices_are_loaded_by_browser_not_baked(self):
+        from pricesite import static_build
+
+        self.mock_snapshots.return_value = {10: {'min': 1200, 'median': 1500, 'count': 4}}
+        static_build.build(self.output)
+        html = (self.output / 'prices/pokemon_kr/expansions/SV1/cards/index.html').read_text(encoding='utf-8')
+        self.mock_snapshots.assert_not_called()
+        self.assertNotIn('1200원', html)
+        card = Card.objects.get(source_id=10)
+        self.assertIn(f'data-price-card="{card.pk}"', html)
+        self.assertIn(reverse('pricesite:card-prices', args=['pokemon_kr']), html)
+
+        resp = self.client.get(reverse('pricesite:card-prices', args=['pokemon_kr']), {'ids': f'{card.pk},999'})
+        self.assertEqual(resp.json(), {str(card.pk): {'min': 1200, 'median': 1500, 'count': 4}})
+        self.mock_snapshots.assert_called_once_with('pokemon_kr', [10])
+        self.assertEqual(
+            self.client.get(reverse('pricesite:card-prices', args=['pokemon_kr']), {'ids': 'x'}).status_code, 400,
+        )
+
+    def test_rebuild_swaps_link_and_keeps_one_previous_build(self):
+        from pricesite import static_build
+
+        static_build.build(self.output)
+        first = self.output.resolve()
+        Card.objects.filter(source_id=10).update(name='이상해풀')
+        static_build.build(self.output)
+        static_build.build(self.output)
+
+        self.assertTrue(self.output.is_symlink())
+        self.assertNotEqual(self.output.resolve(), first)
+        self.assertIn('이상해풀', (self.output / 'prices/pokemon_kr/expansions/SV1/cards/index.html').read_text(encoding='utf-8'))
+        self.assertEqual(len(list((self.tmp / 'pricesite_static.builds').iterdir())), 2)
+
+    def test_failed_build_leaves_current_pages(self):
+        from pricesite import static_build
+
+        static_build.build(self.output)
+        current = self.output.resolve()
+        with patch.object(static_build, 'render_to_string', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                static_build.build(self.output)
+
+        self.assertEqual(self.output.resolve(), current)
+        self.assertEqual(len(list((self.tmp / 'pricesite_static.builds').iterdir())), 1)
+
+    @patch('pricesite.management.commands.sync_catalog.fetch_cards')
+    @patch('pricesite.management.commands.sync_catalog.fetch_expansions')
+    def test_sync_catalog_prerenders_when_configured(self, mock_expansions, mock_cards):
+        from io import StringIO
+
+        from django.core.management import call_command
+        from django.test import override_settings
+
+        mock_expansions.return_value = [
+            {'code': 'SV1', 'name': '최초의 벚꽃', 'image_url': '', 'release_date': '2024-01-01', 'card_count': 1},
+        ]
+        mock_cards.return_value = [
+            {'id': 10, 'card_number': '001', 'name': '이상해씨', 'rarity': 'C', 'image_url': '', 'latest_market_price': 500},
+        ]
+        with override_settings(PRICESITE_STATIC_DIR=str(self.output)):
+            call_command('sync_catalog', '--game', 'pokemon_kr', '--no-prerender', stdout=StringIO())
+            self.assertFalse(self.output.exists())
+            call_command('sync_catalog', '--game', 'pokemon_kr', stdout=StringIO())
+
+        self.assertTrue((self.output / 'prices/pokemon_kr/expansions/SV1/cards/index.html').exists())
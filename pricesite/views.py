@@ -16,15 +16,26 @@ pricehub의 DB를 직접 참조하지 않는다 — 대신:
 추후 별도 프로젝트/도메인으로 분리할 것을 염두에 두고 있어서, pricehub와의
 결합은 REST API 하나로 최소화한다 — 이 파일은 pricehub.models나
 pricehub.views를 import하지 않는다.
+
+조건부 요청: 목록/상세/가격 이력 응답에 ETag와 public Cache-Control을 붙인다(공개
+페이지라 nginx/CDN이 캐시해도 된다). ETag는 카탈로그 동기화 시각(synced_at)이나 API
+응답 내용으로 만들어서, 같은 ETag로 재요청하면 목록 쿼리·가격 API 호출·템플릿 렌더링 없이
+304로 끝난다. 가격이 들어가는 페이지(카드 목록/상세)는 게임의 가격 버전 토큰
+(api_client.price_version — 캐시 조회 1번)도 ETag에 넣는다 — 가격은 작업자가 하루 종일
+넣으므로 날짜나 카탈로그 동기화만으로는 안 바뀐다.
 """
+import hashlib
 import json
 
-from django.db.models import Q
+from django.db.models import Count, Max, Q
 from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, render
+from django.utils.cache import add_never_cache_headers, get_conditional_response, patch_cache_control
 from django.views.decorators.http import require_GET
 
-from .api_client import PricehubAPIError, fetch_price_history, fetch_price_snapshot
+from .api_client import (
+    PricehubAPIError, fetch_price_history, fetch_price_snapshot, fetch_price_snapshots, price_version,
+)
 from .models import Card, Expansion
 
 GAME_CONFIG = {
@@ -35,6 +46,11 @@ GAME_CONFIG = {
 }
 
 
+# 카탈로그는 하루 한 번 동기화, 가격은 api_client가 10분 캐시
+_CATALOG_MAX_AGE = 300
+_PRICE_MAX_AGE = 60
+
+
 def _cfg(game_key):
     cfg = GAME_CONFIG.get(game_key)
     if cfg is None:
@@ -42,30 +58,57 @@ def _cfg(game_key):
     return cfg
 
 
+def _conditional(request, etag_source, build, max_age):
+    """
+    etag_source(데이터 버전을 담은 문자열)의 해시를 ETag로 쓰고, 같은 ETag로 재요청하면
+    build()를 부르지 않고 304로 끝낸다. 로그인 없는 공개 페이지라 public. build()가 캐시하지
+    말라고 표시한 응답(no-store — 가격 API 오류 화면)은 ETag 없이 그대로.
+    """
+    etag = '"%s"' % hashlib.md5(etag_source.encode('utf-8')).hexdigest()
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = build()
+        if 'no-store' in response.get('Cache-Control', ''):
+            return response
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=max_age)
+    return response
+
+
+def _sync_stamp(qs):
+    """마지막 동기화 시각 + 행 수 — 추가/수정/삭제 어느 쪽이든 바뀐다(집계 쿼리 1번)"""
+    stamp = qs.aggregate(synced=Max('synced_at'), count=Count('id'))
+    return f'{stamp["synced"]}|{stamp["count"]}'
+
+
 @require_GET
 def home(request):
     return render(request, 'pricesite/home.html', {'games': GAME_CONFIG})
 
 
-@require_GET
-def expansion_list(request, game_key):
+def expansion_list_context(game_key):
+    """확장팩 목록 템플릿 컨텍스트 — 뷰와 정적 페이지 빌드(static_build)가 같이 쓴다."""
     cfg = _cfg(game_key)
-    expansions = Expansion.objects.filter(game_type=game_key).order_by('-release_date')
-    return render(request, 'pricesite/expansion_list.html', {
+    return {
         'game_key': game_key,
         'label': cfg['label'],
-        'expansions': expansions,
-    })
+        'expansions': Expansion.objects.filter(game_type=game_key).order_by('-release_date'),
+    }
 
 
-@require_GET
-def card_list(request, game_key, code):
-    cfg = _cfg(game_key)
-    expansion = get_object_or_404(Expansion, game_type=game_key, code=code)
+def _price_summaries(game_key, cards):
+    """카드들의 가격 요약 {source_id: 요약} — 실패하면 빈 딕셔너리"""
+    try:
+        return fetch_price_snapshots(game_key, [card.source_id for card in cards])
+    except PricehubAPIError:
+        return {}
+
 
+def card_list_context(game_key, expansion, q='', selected_rarities=(), page=1, live_prices=True):
+    """카드 목록 템플릿 컨텍스트 — 뷰와 정적 페이지 빌드(static_build)가 같이 쓴다."""
+    cfg = _cfg(game_key)
     cards_qs = Card.objects.filter(expansion=expansion).order_by('card_number')
 
-    q = (request.GET.get('q') or '').strip()
     if q:
         cards_qs = cards_qs.filter(Q(name__icontains=q) | Q(card_number__icontains=q))
 
@@ -74,18 +117,26 @@ def card_list(request, game_key, code):
         .exclude(rarity='').values_list('rarity', flat=True)
         .distinct().order_by('rarity')
     )
-    selected_rarities = request.GET.getlist('rarities')
+    selected_rarities = list(selected_rarities)
     if selected_rarities:
         cards_qs = cards_qs.filter(rarity__in=selected_rarities)
 
     per_page = 100
     total_count = cards_qs.count()
-    page = max(1, int(request.GET.get('page', 1) or 1))
+    page = max(1, page)
     total_pages = max(1, -(-total_count // per_page))
     page = min(page, total_pages)
     offset = (page - 1) * per_page
     cards = list(cards_qs[offset:offset + per_page])
 
+    # 가격 요약은 페이지 전체를 pricehub에 한 번만 묻는다. 실패하면 동기화해둔
+    # latest_market_price만 보여준다. 정적 페이지(live_prices=False)는 가격을 굽지 않고
+    # 브라우저가 card_prices로 받아 채운다.
+    if live_prices and not cfg['is_japan']:
+        snapshots = _price_summaries(game_key, cards)
+        for card in cards:
+            card.price_stats = snapshots.get(card.source_id)
+
     _half = 3
     _start = max(1, page - _half)
     _end = min(total_pages, page + _half)
@@ -96,7 +147,7 @@ def card_list(request, game_key, code):
             _start = max(1, _end - 6)
     page_range = list(range(_start, _end + 1))
 
-    return render(request, 'pricesite/card_list.html', {
+    return {
         'game_key': game_key,
         'label': cfg['label'],
         'is_japan': cfg['is_japan'],
@@ -109,7 +160,64 @@ def card_list(request, game_key, code):
         'page': page,
         'total_pages': total_pages,
         'page_range': page_range,
-    })
+        'prices_deferred': not live_prices and not cfg['is_japan'],
+    }
+
+
+@require_GET
+def expansion_list(request, game_key):
+    _cfg(game_key)
+    return _conditional(
+        request, f'{request.get_full_path()}|{_sync_stamp(Expansion.objects.filter(game_type=game_key))}',
+        lambda: render(request, 'pricesite/expansion_list.html', expansion_list_context(game_key)),
+        _CATALOG_MAX_AGE,
+    )
+
+
+@require_GET
+def card_list(request, game_key, code):
+    _cfg(game_key)
+    expansion = get_object_or_404(Expansion, game_type=game_key, code=code)
+    # ETag는 싼 값만으로 — 확장팩 동기화 시각, 카드 동기화 집계(쿼리 1번), 가격 버전(캐시
+    # 조회 1번). 목록 쿼리·레어도 목록·가격 요약 호출은 304가 아닐 때 build 안에서만
+    etag_source = (
+        f'{request.get_full_path()}|{expansion.synced_at}'
+        f'|{_sync_stamp(Card.objects.filter(expansion=expansion))}|{price_version(game_key)}'
+    )
+
+    def build():
+        ctx = card_list_context(
+            game_key, expansion,
+            q=(request.GET.get('q') or '').strip(),
+            selected_rarities=request.GET.getlist('rarities'),
+            page=int(request.GET.get('page', 1) or 1),
+        )
+        return render(request, 'pricesite/card_list.html', ctx)
+
+    return _conditional(request, etag_source, build, _PRICE_MAX_AGE)
+
+
+_CARD_PRICES_MAX_IDS = 100  # 카드 목록 한 페이지
+
+
+@require_GET
+def card_prices(request, game_key):
+    """
+    정적 카드 목록 페이지가 브라우저에서 가격 칸을 채우는 AJAX 엔드포인트 — ?ids=(pricesite
+    카드 id, 최대 한 페이지) → {카드 id: 가격 요약}. 일본판은 요약이 없어 빈 객체.
+    """
+    cfg = _cfg(game_key)
+    try:
+        ids = [int(i) for i in request.GET.get('ids', '').split(',') if i.strip()][:_CARD_PRICES_MAX_IDS]
+    except ValueError:
+        return JsonResponse({'error': 'ids는 쉼표로 구분한 정수여야 합니다.'}, status=400)
+    cards = list(Card.objects.filter(game_type=game_key, pk__in=ids)) if not cfg['is_japan'] else []
+    snapshots = _price_summaries(game_key, cards) if cards else {}
+    data = {card.pk: snapshots.get(card.source_id) for card in cards}
+    return _conditional(
+        request, f'{game_key}|{json.dumps(data, sort_keys=True, default=str)}',
+        lambda: JsonResponse({str(pk): summary for pk, summary in data.items()}), _PRICE_MAX_AGE,
+    )
 
 
 @require_GET
@@ -118,39 +226,47 @@ def card_detail(request, game_key, pk):
     card = get_object_or_404(
         Card.objects.select_related('expansion'), game_type=game_key, pk=pk
     )
+    # 가격 스냅샷/이력 호출은 304가 아닐 때 build 안에서만 — ETag는 카드 동기화 시각 + 가격 버전
+    etag_source = f'{card.pk}|{card.synced_at}|{price_version(game_key)}'
+
+    def build():
+        try:
+            snapshot = fetch_price_snapshot(game_key, card.source_id)
+            history = fetch_price_history(game_key, card.source_id, 'week')
+            api_error = None
+        except PricehubAPIError:
+            snapshot = None
+            history = {'history': []}
+            api_error = '가격 정보를 불러오지 못했습니다. 잠시 후 다시 시도해주세요.'
+
+        ctx = {
+            'game_key': game_key,
+            'label': cfg['label'],
+            'card': card,
+            'is_japan': cfg['is_japan'],
+            'api_error': api_error,
+            'price_history_week_json': json_dumps(history.get('history', [])),
+        }
+
+        if cfg['is_japan']:
+            ctx.update({
+                'latest_prices': snapshot['latest_prices'] if snapshot else [],
+                'stats': snapshot['stats'] if snapshot else {},
+            })
+        else:
+            market_items = snapshot['market_items'] if snapshot else []
+            ctx.update({
+                'market_items': market_items,
+                'market_items_json': json_dumps(market_items),
+                'stats': snapshot['stats'] if snapshot else {},
+            })
 
-    try:
-        snapshot = fetch_price_snapshot(game_key, card.source_id)
-        history = fetch_price_history(game_key, card.source_id, 'week')
-        api_error = None
-    except PricehubAPIError:
-        snapshot = None
-        history = {'history': []}
-        api_error = '가격 정보를 불러오지 못했습니다. 잠시 후 다시 시도해주세요.'
-
-    ctx = {
-        'game_key': game_key,
-        'label': cfg['label'],
-        'card': card,
-        'is_japan': cfg['is_japan'],
-        'api_error': api_error,
-        'price_history_week_json': json_dumps(history.get('history', [])),
-    }
-
-    if cfg['is_japan']:
-        ctx.update({
-            'latest_prices': snapshot['latest_prices'] if snapshot else [],
-            'stats': snapshot['stats'] if snapshot else {},
-        })
-    else:
-        market_items = snapshot['market_items'] if snapshot else []
-        ctx.update({
-            'market_items': market_items,
-            'market_items_json': json_dumps(market_items),
-            'stats': snapshot['stats'] if snapshot else {},
-        })
+        response = render(request, 'pricesite/card_detail.html', ctx)
+        if api_error:
+            add_never_cache_headers(response)  # 오류 화면은 캐시하지 않게
+        return response
 
-    return render(request, 'pricesite/card_detail.html', ctx)
+    return _conditional(request, etag_source, build, _PRICE_MAX_AGE)
 
 
 @require_GET
@@ -165,7 +281,10 @@ def price_history(request, game_key, pk):
     except PricehubAPIError:
         return JsonResponse({'range': range_key, 'history': []})
 
-    return JsonResponse(data)
+    return _conditional(
+        request, f'{card.pk}|{json.dumps(data, sort_keys=True, default=str)}',
+        lambda: JsonResponse(data), _PRICE_MAX_AGE,
+    )
 
 
 def json_dumps(value):
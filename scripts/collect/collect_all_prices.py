@@ -5,6 +5,7 @@ import django
 import time
 import json
 
+from itertools import groupby
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -13,6 +14,7 @@ sys.path.insert(0, str(BASE_DIR))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
 
+from pricehub import expansion_stats, list_cache
 from pricehub.models import Card, CardPrice
 from pricehub.utils import get_all_prices_for_card
 
@@ -32,46 +34,51 @@ def collect_all_prices_integrated():
     fail_count = 0
     api_calls = 0
     
-    for idx, card in enumerate(cards, 1):
-        print(f"\n[{idx}/{total_cards}] {card.name} ({card.card_number})")
-        print("-" * 60)
+    # 확장팩 순서로 돌면서 확장팩 하나가 끝날 때 목록 캐시 버전을 한 번 올린다 — 카드/가격
+    # 저장 시그널이 행마다 버전을 쓰지 않게(list_cache.batched)
+    numbered = enumerate(cards.order_by('expansion_id', 'id'), 1)
+    for _, expansion_cards in groupby(numbered, key=lambda row: row[1].expansion_id):
+        with list_cache.batched():
+            for idx, card in expansion_cards:
+                print(f"\n[{idx}/{total_cards}] {card.name} ({card.card_number})")
+                print("-" * 60)
         
-        try:
-            result = get_all_prices_for_card(
-                card_name=card.name,
-                rarity=card.rarity,
-                expansion_name=card.expansion.name,
-                is_teukil=card.is_teukil,
-            )
-
-            api_calls += 1
-
-            general_price, valid_count, general_mall = result['general_price']
-            valid_items = result['valid_items']
-
-            if general_price is not None and general_mall:
-                CardPrice.objects.create(
-                    card=card,
-                    price=int(general_price),
-                    source=general_mall,
-                    raw_data=valid_items,
-                )
-                # 최신 raw_data / 시장 최저가 캐시 업데이트
-                card.latest_raw_data = valid_items
-                card.latest_market_price = int(general_price)
-                card.save(update_fields=['latest_raw_data', 'latest_market_price'])
-                print(f"✅ 일반 최저가 저장: {int(general_price)}원 ({general_mall})")
-                general_success += 1
-            else:
-                print(f"❌ 일반 최저가 없음")
-                fail_count += 1
+                try:
+                    result = get_all_prices_for_card(
+                        card_name=card.name,
+                        rarity=card.rarity,
+                        expansion_name=card.expansion.name,
+                        is_teukil=card.is_teukil,
+                    )
+
+                    api_calls += 1
+
+                    general_price, valid_count, general_mall = result['general_price']
+                    valid_items = result['valid_items']
+
+                    if general_price is not None and general_mall:
+                        CardPrice.objects.create(
+                            card=card,
+                            price=int(general_price),
+                            source=general_mall,
+                            raw_data=valid_items,
+                        )
+                        # 최신 raw_data / 시장 최저가 캐시 업데이트
+                        card.latest_raw_data = valid_items
+                        card.latest_market_price = int(general_price)
+                        card.save(update_fields=['latest_raw_data', 'latest_market_price'])
+                        print(f"✅ 일반 최저가 저장: {int(general_price)}원 ({general_mall})")
+                        general_success += 1
+                    else:
+                        print(f"❌ 일반 최저가 없음")
+                        fail_count += 1
             
-            time.sleep(0.3)
+                    time.sleep(0.3)
             
-        except Exception as e:
-            print(f"❌ 오류 발생: {e}")
-            fail_count += 1
-            continue
+                except Exception as e:
+                    print(f"❌ 오류 발생: {e}")
+                    fail_count += 1
+                    continue
     
     print("\n" + "=" * 80)
     print("📊 가격 수집 완료")
@@ -82,6 +89,10 @@ def collect_all_prices_integrated():
     if total_cards > 0:
         print(f"📈 성공률: {(general_success / total_cards * 100):.1f}%")
 
+    # 확장팩 상세 API의 가격 통계 요약 다시 계산 (pricehub/expansion_stats.py)
+    stats_count = expansion_stats.refresh()
+    print(f"📊 확장팩 가격 통계 갱신: {stats_count}개")
+
 
 def collect_expansion_prices_integrated(expansion_code: str):
     """특정 확장팩의 가격 통합 수집"""
@@ -99,43 +110,46 @@ def collect_expansion_prices_integrated(expansion_code: str):
     general_success = 0
     api_calls = 0
     
-    for idx, card in enumerate(cards, 1):
-        print(f"[{idx}/{total_cards}] {card.name} ({card.rarity})")
+    # 카드/가격 저장 시그널이 행마다 목록 캐시 버전을 쓰지 않게 — 끝날 때 한 번(list_cache.batched)
+    with list_cache.batched():
+        for idx, card in enumerate(cards, 1):
+            print(f"[{idx}/{total_cards}] {card.name} ({card.rarity})")
         
-        try:
-            result = get_all_prices_for_card(
-                card_name=card.name,
-                rarity=card.rarity,
-                expansion_name=card.expansion.name,
-                is_teukil=card.is_teukil,
-            )
-
-            api_calls += 1
-
-            general_price, valid_count, general_mall = result['general_price']
-            valid_items = result['valid_items']
-
-            if general_price is not None and general_mall:
-                CardPrice.objects.create(
-                    card=card,
-                    price=int(general_price),
-                    source=general_mall,
-                    raw_data=valid_items,
+            try:
+                result = get_all_prices_for_card(
+                    card_name=card.name,
+                    rarity=card.rarity,
+                    expansion_name=card.expansion.name,
+                    is_teukil=card.is_teukil,
                 )
-                # 최신 raw_data / 시장 최저가 캐시 업데이트
-                card.latest_raw_data = valid_items
-                card.latest_market_price = int(general_price)
-                card.save(update_fields=['latest_raw_data', 'latest_market_price'])
-                print(f"✅ 일반: {int(general_price)}원 ({general_mall})")
-                general_success += 1
+
+                api_calls += 1
+
+                general_price, valid_count, general_mall = result['general_price']
+                valid_items = result['valid_items']
+
+                if general_price is not None and general_mall:
+                    CardPrice.objects.create(
+                        card=card,
+                        price=int(general_price),
+                        source=general_mall,
+                        raw_data=valid_items,
+                    )
+                    # 최신 raw_data / 시장 최저가 캐시 업데이트
+                    card.latest_raw_data = valid_items
+                    card.latest_market_price = int(general_price)
+                    card.save(update_fields=['latest_raw_data', 'latest_market_price'])
+                    print(f"✅ 일반: {int(general_price)}원 ({general_mall})")
+                    general_success += 1
             
-            time.sleep(0.3)
+                time.sleep(0.3)
             
-        except Exception as e:
-            print(f"❌ 오류: {e}")
-            continue
+            except Exception as e:
+                print(f"❌ 오류: {e}")
+                continue
     
     print(f"\n✅ 완료: {general_success}개 저장 (API {api_calls}회 호출)")
+    expansion_stats.refresh([cards.first().expansion_id])
 
 
 def test_single_card_integrated(card_id: int):
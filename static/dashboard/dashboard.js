@@ -206,7 +206,10 @@ async function searchCards() {
   body.innerHTML = '<div class="search-loading"><span class="spinner"></span>검색 중...</div>';
   count.textContent = '';
   try {
-    const res   = await fetch(`${CARD_SEARCH_URL}?name=${encodeURIComponent(q)}&page_size=30`);
+    // 통합 검색 페이지(card_search.html)만 CARD_SEARCH_GAME(게임 필터)을 정의한다
+    const game  = typeof CARD_SEARCH_GAME !== 'undefined' && CARD_SEARCH_GAME
+      ? `&game=${encodeURIComponent(CARD_SEARCH_GAME)}` : '';
+    const res   = await fetch(`${CARD_SEARCH_URL}?name=${encodeURIComponent(q)}&page_size=30${game}`);
     const data  = await res.json();
     const cards = data.results || data;
     if (!cards.length) {
@@ -222,13 +225,15 @@ async function searchCards() {
       const latestPrice = item.latest_price
         ? `<div class="result-market-price">시장가 ${parseInt(item.latest_price).toLocaleString()}원</div>`
         : '';
-      return `<a href="${CARD_DETAIL_BASE_URL}${item.id}/" class="search-result-item">
+      const detailUrl = item.detail_url || `${CARD_DETAIL_BASE_URL}${item.id}/`;
+      return `<a href="${detailUrl}" class="search-result-item">
         ${item.image_url
           ? `<img src="${item.image_url}" class="result-thumb" loading="lazy" onerror="cardImgFallback(this)">`
           : `<div class="result-thumb" style="display:flex;align-items:center;justify-content:center;font-size:18px;">🃏</div>`}
         <div class="result-info">
           <div class="result-name">${item.name}</div>
           <div class="result-meta">
+            ${item.game_label ? `<span class="result-game">${item.game_label}</span>` : ''}
             <span class="result-rarity">${item.rarity}</span>
             ${item.expansion?.name || ''} · No.${item.card_number}
           </div>
@@ -851,13 +856,64 @@ function resetBulkResult() {
    ================================================================ */
 
 /* 페이지에서 선언해야 하는 변수:
-   const APPROVE_URL, EDIT_URL, SET_PRICE_URL_PREFIX, CARD_RAW
+   const APPROVE_URL, EDIT_URL, SET_PRICE_URL_PREFIX, CARD_RAW_URL
    let   selectedRarities (Set)
-   _issuesRemainCount, _activeCardId 는 이 파일에서 선언 */
+   _issuesRemainCount, _activeCardId, CARD_RAW 는 이 파일에서 선언 */
 
 let _issuesRemainCount = 0;
 let _activeCardId      = null;
 
+/* ── 판매처 목록(raw_data) 지연 로딩 ──
+   예전엔 카드 100장 분량 raw_data를 페이지 HTML에 통째로 심었는데(cardRawData), 실제로
+   사이드 패널을 열어보는 건 몇 장뿐이라 페이지만 무거웠다. 이제 페이지는 CARD_RAW_URL
+   (<게임>/cards/raw-data/)만 선언하고, 화면에 보이는 행/클릭한 카드만 받아 CARD_RAW에
+   모은다. 서버가 ETag를 주므로 같은 카드를 다시 받을 땐 304로 끝난다.
+   CARD_RAW 값: 배열(판매처 목록) / null(데이터 없음) / 키 없음(아직 안 받음) */
+const CARD_RAW = {};
+const _cardRawPending = new Map();   // 카드 id → 진행 중인 요청 Promise
+const CARD_RAW_BATCH = 100;
+
+async function loadCardRaw(ids) {
+  const wanted = [...new Set(ids.map(String))];
+  if (typeof CARD_RAW_URL === 'undefined' || !CARD_RAW_URL) {
+    wanted.forEach(id => { if (!(id in CARD_RAW)) CARD_RAW[id] = null; });
+    return;
+  }
+  const missing = wanted.filter(id => !(id in CARD_RAW) && !_cardRawPending.has(id));
+  for (let i = 0; i < missing.length; i += CARD_RAW_BATCH) {
+    const chunk = missing.slice(i, i + CARD_RAW_BATCH);
+    const req = fetch(`${CARD_RAW_URL}?ids=${chunk.join(',')}`, { credentials: 'same-origin' })
+      .then(res => res.ok ? res.json() : Promise.reject(res.status))
+      .then(data => { chunk.forEach(id => { CARD_RAW[id] = data[id] || null; }); })
+      .catch(() => {})   /* 실패하면 키를 안 남겨서 다음에 다시 시도 */
+      .finally(() => chunk.forEach(id => _cardRawPending.delete(id)));
+    chunk.forEach(id => _cardRawPending.set(id, req));
+  }
+  await Promise.all(wanted.map(id => _cardRawPending.get(id)).filter(Boolean));
+}
+
+/* 화면에 들어온 행(tr[data-id])만 모아서 미리 받기. onLoaded(ids)는 받을 때마다 호출
+   (판매가 미설정 페이지는 여기서 행별 시장가 통계를 그린다). */
+function prefetchVisibleCardRaw(onLoaded) {
+  const rows = [...document.querySelectorAll('#cardTableBody tr[data-id]')];
+  if (!rows.length) return;
+  const load = ids => loadCardRaw(ids).then(() => { if (onLoaded) onLoaded(ids); });
+  if (!('IntersectionObserver' in window)) { load(rows.map(r => r.dataset.id)); return; }
+
+  let batch = [], timer = null;
+  const observer = new IntersectionObserver(entries => {
+    entries.forEach(e => {
+      if (!e.isIntersecting) return;
+      batch.push(e.target.dataset.id);
+      observer.unobserve(e.target);
+    });
+    if (batch.length && !timer) {
+      timer = setTimeout(() => { const ids = batch; batch = []; timer = null; load(ids); }, 100);
+    }
+  }, { rootMargin: '300px 0px' });
+  rows.forEach(r => observer.observe(r));
+}
+
 /* ── 토스트 ── */
 function showIssueToast(msg, type) {
   const t = document.getElementById('toast');
@@ -995,8 +1051,24 @@ function showIssuesSidePanel(cardId) {
     summaryEl.style.display = 'block';
   }
 
-  /* 판매처 목록 (JSON key는 항상 문자열) */
-  const raw   = (typeof CARD_RAW !== 'undefined') ? CARD_RAW[String(cardId)] : null;
+  /* 판매처 목록 (JSON key는 항상 문자열) — 아직 안 받은 카드면 받아서 그린다 */
+  const key = String(cardId);
+  if (key in CARD_RAW) {
+    renderIssuesStoreList(cardId, CARD_RAW[key]);
+  } else {
+    document.getElementById('sideEmptyText').textContent = '판매처 목록 불러오는 중…';
+    document.getElementById('sideEmpty').style.display = 'flex';
+    document.getElementById('sideStoreList').style.display = 'none';
+    loadCardRaw([cardId]).then(() => {
+      if (String(_activeCardId) === key) renderIssuesStoreList(cardId, CARD_RAW[key]);
+    });
+  }
+
+  const input = document.getElementById(`input-${cardId}`);
+  if (input && !input.disabled) setTimeout(() => input.focus(), 50);
+}
+
+function renderIssuesStoreList(cardId, raw) {
   const empty = document.getElementById('sideEmpty');
   const list  = document.getElementById('sideStoreList');
 
@@ -1033,9 +1105,6 @@ function showIssuesSidePanel(cardId) {
     }).join('');
     empty.style.display = 'none'; list.style.display = 'block';
   }
-
-  const input = document.getElementById(`input-${cardId}`);
-  if (input && !input.disabled) setTimeout(() => input.focus(), 50);
 }
 
 /* ── 판매처 클릭 → 가격 입력창 채우기 ── */
@@ -1253,10 +1322,12 @@ function applyIssuesRarityFilter() {
   if (el) el.textContent = selectedRarities.size > 0 ? `(필터: ${visible}개)` : '';
   document.getElementById('checkAll').checked = false;
 }
-function applyIssuesBulkPrice(mode) {
+async function applyIssuesBulkPrice(mode) {
   const minFloor = parseInt(document.getElementById('bulkMinPrice').value) || 0;
+  const rows = [...document.querySelectorAll('#cardTableBody tr:not(.hidden):not(.done)')];
+  await loadCardRaw(rows.map(row => row.dataset.id));
   let applied = 0;
-  document.querySelectorAll('#cardTableBody tr:not(.hidden):not(.done)').forEach(row => {
+  rows.forEach(row => {
     const cardId = row.dataset.id, raw = CARD_RAW[cardId];
     const input  = document.getElementById(`input-${cardId}`);
     if (!input || input.disabled) return;
@@ -1320,8 +1391,10 @@ async function saveAllIssues() {
     failed === 0 ? 'ok' : 'err'
   );
 }
-function renderIssuesStats(cardRaw) {
-  for (const [cardId, raw] of Object.entries(cardRaw)) {
+function renderIssuesStats(cardIds) {
+  for (const cardId of cardIds) {
+    if (!(String(cardId) in CARD_RAW)) continue;   /* 받기 실패 — 다음 기회에 */
+    const raw = CARD_RAW[String(cardId)];
     const prices = Array.isArray(raw) ? raw.map(i => parseInt(i.lprice)).filter(p => p > 0) : [];
     const el = document.getElementById(`stats-${cardId}`);
     if (!el) continue;